@@ -0,0 +1,293 @@
+"""
+NeuroPsy Assist - API HTTP locale de génération de rapports (ASGI, sans Streamlit).
+
+Destinée aux intégrations (dossier patient informatisé) : un dossier sérialisé par
+utils.serialization est reçu, le rapport est rédigé par un processus de travail et
+renvoyé dans le format demandé. Le nombre de rédactions simultanées est limité ; une
+requête qui ne peut être prise en charge ou terminée à temps reçoit une erreur 503 ou 504.
+
+Lancement :
+    uvicorn api:app [--host 127.0.0.1] [--port 8600]
+
+Routes :
+    GET  /sante
+        État du service
+    POST /rapports[?langue=fr&format=markdown&modele=NOM]
+        Corps : dossier en JSON (application/json) ou au format binaire (application/octet-stream)
+        Réponse : rapport rendu (format markdown, html ou texte)
+
+Les rapports rendus sont conservés dans le cache disque partagé (utils.artifacts, chiffré
+avec la clé du cabinet) : un dossier déjà rendu est servi sans nouvelle rédaction, y
+compris par un autre processus serveur (uvicorn --workers N).
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+from dataclasses import asdict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from utils.artifacts import ArtifactCache, artifact_key
+from utils.semantic_engine import SemanticEngine
+from utils.renderers import get_renderer
+from utils.serialization import loads_binary, loads_json
+from utils.templates import load_template
+from utils.vault import ClinicCipher, load_key
+from config.constants import LANGUES_RAPPORT, LANGUE_DEFAUT
+
+
+# Nombre maximal de rédactions en cours ou en attente d'un processus (au-delà : attente)
+REQUETES_SIMULTANEES = 64
+
+# Délai maximal de traitement d'une requête, attente comprise (secondes)
+DELAI_REQUETE = 10.0
+
+# Taille maximale du corps d'une requête (octets)
+TAILLE_MAX_CORPS = 2 * 1024 * 1024
+
+TYPE_BINAIRE = "application/octet-stream"
+
+Message = Dict[str, Any]
+Reception = Callable[[], Awaitable[Message]]
+Envoi = Callable[[Message], Awaitable[None]]
+
+
+class HTTPError(Exception):
+    """Erreur renvoyée au client (statut HTTP et message)."""
+
+    def __init__(self, statut: int, message: str):
+        super().__init__(message)
+        self.statut = statut
+        self.message = message
+
+
+def generer_rapport(corps: bytes, binaire: bool, langue: str = LANGUE_DEFAUT,
+                    format_rapport: str = "markdown", modele: Optional[str] = None) -> str:
+    """
+    Rédige le rapport d'un dossier sérialisé (exécuté dans un processus de travail).
+
+    Args:
+        corps: Dossier sérialisé
+        binaire: Format binaire (sinon JSON)
+        langue: Langue du rapport
+        format_rapport: Format de rendu (voir utils.renderers)
+        modele: Nom d'un modèle de rapport enregistré (rédaction standard si None)
+
+    Raises:
+        ValueError: Si le dossier, la langue, le format ou le modèle sont invalides
+    """
+    case = loads_binary(corps) if binaire else loads_json(corps.decode("utf-8"))
+    # Le processus de travail est l'unité de parallélisme : sections rédigées séquentiellement
+    moteur = SemanticEngine(case.patient, case.anamnese, parallele=False, **case.managers)
+    document = moteur.generate_document(langue) if modele is None else load_template(modele).document(moteur, langue)
+    return get_renderer(format_rapport).render(document)
+
+
+class ReportService:
+    """Application ASGI de génération de rapports."""
+
+    def __init__(self, processus: Optional[int] = None, requetes_simultanees: int = REQUETES_SIMULTANEES,
+                 delai: float = DELAI_REQUETE, taille_max: int = TAILLE_MAX_CORPS, cache: bool = True):
+        """
+        Args:
+            processus: Nombre de processus de rédaction (nombre de cœurs par défaut)
+            requetes_simultanees: Nombre maximal de rédactions confiées aux processus
+            delai: Délai maximal de traitement d'une requête (secondes)
+            taille_max: Taille maximale du corps d'une requête (octets)
+            cache: Conserver les rapports rendus dans le cache disque du cabinet
+        """
+        self.processus = processus or os.cpu_count() or 1
+        self.requetes_simultanees = requetes_simultanees
+        self.delai = delai
+        self.taille_max = taille_max
+        self.utiliser_cache = cache
+        self.cache: Optional[ArtifactCache] = None
+        self._executeur: Optional[Executor] = None
+        self._places: Optional[asyncio.Semaphore] = None
+        self._en_cours: Dict[str, asyncio.Future] = {}  # Rédactions en cours, par clé de cache
+
+    async def __call__(self, scope: Message, receive: Reception, send: Envoi) -> None:
+        if scope["type"] == "lifespan":
+            await self._cycle_de_vie(receive, send)
+        elif scope["type"] == "http":
+            try:
+                statut, type_contenu, contenu = await self._traiter(scope, receive)
+            except HTTPError as e:
+                statut, type_contenu, contenu = e.statut, "application/json", _json({"erreur": e.message})
+            await _repondre(send, statut, type_contenu, contenu)
+
+    def close(self) -> None:
+        """Arrête les processus de rédaction."""
+        if self._executeur is not None:
+            self._executeur.shutdown(cancel_futures=True)
+            self._executeur = None
+
+    async def _cycle_de_vie(self, receive: Reception, send: Envoi) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self._demarrer()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _demarrer(self) -> None:
+        # Créés à la première requête si le serveur ne gère pas le cycle de vie ASGI
+        if self._executeur is None:
+            # Processus démarrés sans copie du serveur (socket d'écoute, boucle d'événements)
+            self._executeur = ProcessPoolExecutor(max_workers=self.processus,
+                                                  mp_context=multiprocessing.get_context("spawn"))
+        if self._places is None:
+            self._places = asyncio.Semaphore(self.requetes_simultanees)
+        if self.utiliser_cache and self.cache is None:
+            self.cache = ArtifactCache(chiffrement=ClinicCipher(load_key()))
+
+    async def _traiter(self, scope: Message, receive: Reception) -> Tuple[int, str, bytes]:
+        route = (scope["method"], scope["path"].rstrip("/"))
+
+        if route == ("GET", "/sante"):
+            sante = {"statut": "ok", "processus": self.processus}
+            if self.cache is not None:
+                stats = await asyncio.get_running_loop().run_in_executor(None, self.cache.stats)
+                sante["cache"] = {**asdict(stats), "taux_succes": round(stats.taux_succes, 4)}
+            return 200, "application/json", _json(sante)
+
+        if route != ("POST", "/rapports"):
+            if scope["path"].rstrip("/") in ("/sante", "/rapports"):
+                raise HTTPError(405, "Méthode non autorisée")
+            raise HTTPError(404, "Ressource introuvable")
+
+        parametres = {cle: valeurs[-1] for cle, valeurs in parse_qs(scope["query_string"].decode("latin-1")).items()}
+        langue = parametres.get("langue", LANGUE_DEFAUT)
+        format_rapport = parametres.get("format", "markdown")
+        if langue not in LANGUES_RAPPORT:
+            raise HTTPError(400, f"Langue de rapport non prise en charge : {langue}")
+        try:
+            renderer = get_renderer(format_rapport)
+        except ValueError as e:
+            raise HTTPError(400, str(e)) from None
+
+        binaire = _entete(scope, b"content-type").split(";")[0].strip() == TYPE_BINAIRE
+        corps = await self._lire_corps(receive)
+
+        modele = parametres.get("modele")
+        self._demarrer()
+        if self.cache is None:
+            contenu = (await self._rediger(corps, binaire, langue, format_rapport, modele)).encode("utf-8")
+            return 200, f"{renderer.mime}; charset=utf-8", contenu
+
+        # Cache consulté hors de la boucle d'événements (index partagé avec d'autres processus)
+        boucle = asyncio.get_running_loop()
+        try:
+            cle = await boucle.run_in_executor(None, _cle_rapport, corps, langue, format_rapport, modele)
+        except ValueError as e:
+            raise HTTPError(400, str(e)) from None
+
+        # Requêtes simultanées pour un même rapport : une seule rédaction
+        if cle in self._en_cours:
+            return 200, f"{renderer.mime}; charset=utf-8", await asyncio.shield(self._en_cours[cle])
+
+        self._en_cours[cle] = redaction = boucle.create_future()
+        try:
+            contenu = await boucle.run_in_executor(None, self.cache.get, cle)
+            if contenu is None:
+                contenu = (await self._rediger(corps, binaire, langue, format_rapport, modele)).encode("utf-8")
+                # Enregistrement après la réponse, sans la retarder
+                boucle.run_in_executor(None, self._mettre_en_cache, cle, contenu)
+            redaction.set_result(contenu)
+        except Exception as e:
+            # Erreur transmise aux requêtes en attente (marquée comme lue s'il n'y en a pas)
+            redaction.set_exception(e)
+            redaction.exception()
+            raise
+        finally:
+            del self._en_cours[cle]
+            if not redaction.done():
+                redaction.cancel()
+
+        return 200, f"{renderer.mime}; charset=utf-8", contenu
+
+    def _mettre_en_cache(self, cle: str, contenu: bytes) -> None:
+        try:
+            self.cache.put(cle, contenu)
+        except OSError:
+            # Cache indisponible (disque plein, droits) : le rapport a été rendu, seul le cache est perdu
+            pass
+
+    async def _lire_corps(self, receive: Reception) -> bytes:
+        morceaux: List[bytes] = []
+        taille = 0
+
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                raise HTTPError(400, "Requête interrompue")
+            morceaux.append(message.get("body", b""))
+            taille += len(morceaux[-1])
+            if taille > self.taille_max:
+                raise HTTPError(413, f"Dossier trop volumineux (maximum {self.taille_max} octets)")
+            if not message.get("more_body", False):
+                return b"".join(morceaux)
+
+    async def _rediger(self, corps: bytes, binaire: bool, langue: str, format_rapport: str,
+                       modele: Optional[str]) -> str:
+        """Confie la rédaction à un processus, dans la limite des places et du délai."""
+        self._demarrer()
+        boucle = asyncio.get_running_loop()
+        echeance = boucle.time() + self.delai
+
+        try:
+            await asyncio.wait_for(self._places.acquire(), self.delai)
+        except asyncio.TimeoutError:
+            raise HTTPError(503, "Service surchargé, réessayez plus tard") from None
+
+        # La place n'est libérée qu'à la fin de la rédaction, même si le client n'attend plus
+        tache = boucle.run_in_executor(self._executeur, generer_rapport, corps, binaire, langue, format_rapport,
+                                       modele)
+        tache.add_done_callback(lambda _: self._places.release())
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(tache), max(echeance - boucle.time(), 0))
+        except asyncio.TimeoutError:
+            raise HTTPError(504, "Délai de rédaction dépassé") from None
+        except ValueError as e:
+            raise HTTPError(400, str(e)) from None
+        except BrokenProcessPool:
+            # Un processus de rédaction s'est arrêté brutalement : processus recréés à la requête suivante
+            self.close()
+            raise HTTPError(503, "Service momentanément indisponible, réessayez plus tard") from None
+
+
+def _cle_rapport(corps: bytes, langue: str, format_rapport: str, modele: Optional[str]) -> str:
+    """Clé du rapport dans le cache (le modèle est identifié par son contenu)."""
+    return artifact_key(corps, langue, format_rapport, load_template(modele).empreinte if modele is not None else "")
+
+
+def _entete(scope: Message, nom: bytes) -> str:
+    for cle, valeur in scope["headers"]:
+        if cle.lower() == nom:
+            return valeur.decode("latin-1")
+    return ""
+
+
+def _json(donnees: Dict[str, Any]) -> bytes:
+    return json.dumps(donnees, ensure_ascii=False).encode("utf-8")
+
+
+async def _repondre(send: Envoi, statut: int, type_contenu: str, contenu: bytes) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": statut,
+        "headers": [(b"content-type", type_contenu.encode("latin-1")),
+                    (b"content-length", str(len(contenu)).encode("latin-1"))]
+    })
+    await send({"type": "http.response.body", "body": contenu})
+
+
+app = ReportService()
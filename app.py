@@ -11,6 +11,22 @@ from modules.kabc_ii import render_kabc_ii_module
 from modules.attention import render_attention_module
 from modules.comportement import render_comportement_module
 from modules.rapport import render_rapport_module
+from modules.cohorte import render_cohorte_module
+from modules.vues import vue_derivee
+from modules.brouillon import abandonner_brouillon, render_reprise_brouillon, sauvegarder_brouillon
+from modules.importation import render_import_scores
+
+
+# Gestionnaires de scores résumés dans la barre latérale (clé de session, libellé)
+TESTS_SAISIS = [
+    ("wisc_v_manager", "WISC-V"),
+    ("kabc_ii_manager", "KABC-II"),
+    ("teach_manager", "TEA-Ch"),
+    ("nepsy_ii_manager", "NEPSY-II"),
+    ("brown_manager", "Brown"),
+    ("conners_parent_manager", "Conners Parent"),
+    ("conners_teacher_manager", "Conners Enseignant")
+]
 
 
 # Configuration de la page
@@ -65,7 +81,8 @@ def main():
                 "🎯 Tests Cognitifs - KABC-II",
                 "👁️ Attention & Exécutif",
                 "📝 Évaluation Comportementale",
-                "📄 Génération du Rapport"
+                "📄 Génération du Rapport",
+                "📊 Statistiques de Cohorte"
             ],
             key="navigation"
         )
@@ -75,6 +92,9 @@ def main():
         # Informations sur les données sauvegardées
         st.markdown("### 💾 Données Sauvegardées")
         
+        # Reprise d'une évaluation interrompue (fermeture du navigateur, redémarrage)
+        render_reprise_brouillon()
+        
         # Patient
         if 'patient' in st.session_state and st.session_state.patient.format_nom_complet():
             st.success(f"✅ Patient: {st.session_state.patient.format_nom_complet()}")
@@ -87,29 +107,18 @@ def main():
         else:
             st.info("ℹ️ Anamnèse non renseignée")
         
-        # Tests
-        tests_completes = []
-        
-        if 'wisc_v_manager' in st.session_state and st.session_state.wisc_v_manager.has_scores():
-            tests_completes.append("WISC-V")
-        
-        if 'kabc_ii_manager' in st.session_state and st.session_state.kabc_ii_manager.has_scores():
-            tests_completes.append("KABC-II")
-        
-        if 'teach_manager' in st.session_state and st.session_state.teach_manager.has_scores():
-            tests_completes.append("TEA-Ch")
-        
-        if 'nepsy_ii_manager' in st.session_state and st.session_state.nepsy_ii_manager.has_scores():
-            tests_completes.append("NEPSY-II")
-        
-        if 'brown_manager' in st.session_state and st.session_state.brown_manager.has_scores():
-            tests_completes.append("Brown")
-        
-        if 'conners_parent_manager' in st.session_state and st.session_state.conners_parent_manager.has_scores():
-            tests_completes.append("Conners Parent")
-        
-        if 'conners_teacher_manager' in st.session_state and st.session_state.conners_teacher_manager.has_scores():
-            tests_completes.append("Conners Enseignant")
+        # Tests (liste recalculée seulement si un gestionnaire de scores a changé)
+        gestionnaires = [
+            (label, st.session_state[cle]) for cle, label in TESTS_SAISIS if cle in st.session_state
+        ] + [
+            (f"Conners {label}", st.session_state[f'{cle}_manager'])
+            for cle, label in st.session_state.get('conners_informateurs', {}).items()
+            if f'{cle}_manager' in st.session_state
+        ]
+        tests_completes = vue_derivee(
+            "tests_completes", [manager for _, manager in gestionnaires],
+            lambda: [label for label, manager in gestionnaires if manager.has_scores()]
+        )
         
         if tests_completes:
             st.success(f"✅ {len(tests_completes)} test(s) complété(s)")
@@ -120,9 +129,14 @@ def main():
         
         st.markdown("---")
         
+        # Import des exports des logiciels de cotation
+        with st.expander("📥 Importer des scores"):
+            render_import_scores()
+        
         # Bouton de réinitialisation
         if st.button("🔄 Nouvelle Évaluation", use_container_width=True):
-            # Effacer toutes les données de session
+            # Effacer toutes les données de session (et le brouillon de l'évaluation)
+            abandonner_brouillon()
             for key in list(st.session_state.keys()):
                 del st.session_state[key]
             st.rerun()
@@ -175,8 +189,9 @@ def main():
             complet au format Markdown.
             
             💡 **Astuce :** Les données sont sauvegardées 
-            automatiquement pendant la session. Vous pouvez 
-            naviguer librement entre les sections.
+            automatiquement sur le disque. Vous pouvez 
+            naviguer librement entre les sections, et 
+            reprendre une évaluation interrompue.
             """)
     
     # Affichage de la page sélectionnée
@@ -198,6 +213,12 @@ def main():
     elif page == "📄 Génération du Rapport":
         render_rapport_module()
     
+    elif page == "📊 Statistiques de Cohorte":
+        render_cohorte_module()
+    
+    # Sauvegarde automatique (écriture en arrière-plan)
+    sauvegarder_brouillon()
+    
     # Footer
     st.markdown("---")
     st.markdown(
@@ -42,6 +42,64 @@ T_SCORE_CLASSIFICATIONS = [
 # Seuils d'hétérogénéité
 HETEROGENEITE_SEUIL = 15  # Différence significative entre indices
 
+# Normes par type de score (clé = ScoreType.value)
+# sens = 1 si un score élevé est favorable, -1 si un score élevé traduit une difficulté
+NORMES_TYPES_SCORES = {
+    "standard": {"moyenne": 100, "ecart_type": 15, "sens": 1},
+    "scalaire": {"moyenne": 10, "ecart_type": 3, "sens": 1},
+    "t_score": {"moyenne": 50, "ecart_type": 10, "sens": -1},
+}
+
+# Seuils d'analyse du profil par type de score : (valeur seuil, comparaison)
+# None signifie que le critère ne s'applique pas à ce type de score
+SEUILS_PROFIL = {
+    "force": {
+        "standard": (110, ">="),
+        "scalaire": (12, ">="),
+        "t_score": None,
+    },
+    "fragilite": {
+        "standard": (85, "<"),
+        "scalaire": (7, "<="),
+        "t_score": (65, ">="),
+    },
+    "significatif": {
+        "standard": (80, "<"),   # Zone limite ou très faible
+        "scalaire": (5, "<="),   # Zone limite ou très faible
+        "t_score": (65, ">="),   # Zone à risque ou très élevée
+    },
+}
+
+# Fidélité test-retest par défaut, par type de score
+FIDELITE_TEST_RETEST_DEFAUT = {
+    "standard": 0.90,
+    "scalaire": 0.80,
+    "t_score": 0.85,
+}
+
+# Fidélités test-retest spécifiques (batterie, échelle)
+# Valeurs indicatives, à ajuster selon les manuels techniques utilisés
+FIDELITES_TEST_RETEST = {
+    ("wisc_v", "ICV"): 0.94,
+    ("wisc_v", "IVS"): 0.81,
+    ("wisc_v", "IRF"): 0.75,
+    ("wisc_v", "IMT"): 0.82,
+    ("wisc_v", "IVT"): 0.83,
+    ("wisc_v", "IQT"): 0.92,
+}
+
+# Effets de pratique attendus au retest, en points (batterie, échelle)
+# Valeurs indicatives pour un intervalle de 18 à 24 mois ; 0 par défaut
+EFFETS_PRATIQUE = {
+    ("wisc_v", "IVS"): 2,
+    ("wisc_v", "IRF"): 2,
+    ("wisc_v", "IVT"): 3,
+    ("wisc_v", "IQT"): 2,
+}
+
+# Seuil de l'indice de changement fiable (bilatéral, p < .05)
+SEUIL_CHANGEMENT_FIABLE = 1.96
+
 # Structure WISC-V
 WISC_V_STRUCTURE = {
     "ICV": {
@@ -183,6 +241,19 @@ CONNERS_3_ECHELLES = [
     "Indice Global Conners"
 ]
 
+# Informateurs Conners-3 par défaut (clé de batterie -> libellé)
+# Les informateurs supplémentaires utilisent des clés préfixées par "conners_"
+CONNERS_3_INFORMATEURS = {
+    "conners_parent": "Parent",
+    "conners_teacher": "Enseignant",
+}
+
+# Types d'informateurs proposés pour les cotations supplémentaires
+CONNERS_3_TYPES_INFORMATEURS = ["Parent", "Enseignant", "Auto-questionnaire"]
+
+# Écart (en points T) à partir duquel deux informateurs divergent
+SEUIL_DIVERGENCE_INFORMATEURS = 10
+
 # Échelles Brown
 BROWN_ECHELLES = [
     "Activation",
@@ -266,3 +337,280 @@ INTERPRETATIONS_T_SCORE = {
         "significatif": False
     }
 }
+
+# Étiquettes de domaine clinique des échelles (famille de batterie, échelle)
+# Les informateurs Conners-3 partagent la famille "conners" ; les subtests WISC-V
+# ("IMT_Mémoire des Chiffres") héritent des étiquettes de leur indice
+_DOMAINES_INDICES_WISC_V = {
+    "ICV": ("langage",),
+    "IVS": ("visuospatial",),
+    "IRF": ("raisonnement",),
+    "IMT": ("memoire",),
+    "IVT": ("vitesse", "attention"),
+    "IQT": ("global",),
+    "IRQ": ("raisonnement",),
+    "IMTA": ("memoire",),
+    "INV": ("raisonnement",),
+    "IAG": ("global",),
+    "ICC": ("memoire", "vitesse")
+}
+
+_DOMAINES_GROUPES_NEPSY_II = {
+    "Attention/Fonctions exécutives": ("attention", "executif"),
+    "Fonctions sensorimotrices": ("sensorimoteur",)
+}
+
+DOMAINES_ECHELLES = {
+    **{("wisc_v", idx): domaines for idx, domaines in _DOMAINES_INDICES_WISC_V.items()},
+    **{("wisc_v", f"{idx}_{subtest}"): _DOMAINES_INDICES_WISC_V[idx]
+       for idx, info in WISC_V_STRUCTURE.items() for subtest in info['subtests']},
+    ("kabc_ii", "IFC"): ("global",),
+    ("kabc_ii", "ISQ"): ("memoire",),
+    ("kabc_ii", "ISI"): ("visuospatial",),
+    ("kabc_ii", "IPL"): ("raisonnement", "executif"),
+    ("kabc_ii", "IAP"): ("memoire",),
+    ("kabc_ii", "ICO"): ("langage",),
+    **{("teach", subtest): ("attention",) for subtests in TEACH_STRUCTURE.values() for subtest in subtests},
+    **{("nepsy_ii", subtest): _DOMAINES_GROUPES_NEPSY_II[groupe]
+       for groupe, subtests in NEPSY_II_STRUCTURE.items() for subtest in subtests},
+    ("brown", "Activation"): ("executif",),
+    ("brown", "Attention"): ("attention",),
+    ("brown", "Effort"): ("vitesse",),
+    ("brown", "Émotion"): ("emotion",),
+    ("brown", "Mémoire"): ("memoire",),
+    ("brown", "Action"): ("comportement",),
+    ("brown", "Score Total"): ("attention",),
+    ("conners", "Inattention"): ("attention",),
+    ("conners", "Hyperactivité/Impulsivité"): ("comportement",),
+    ("conners", "Problèmes d'Apprentissage"): ("apprentissage",),
+    ("conners", "Fonctions Exécutives"): ("executif",),
+    ("conners", "Défiance/Agressivité"): ("comportement",),
+    ("conners", "Relations avec les Pairs"): ("social",),
+    ("conners", "Indice TDAH Inattentif"): ("attention",),
+    ("conners", "Indice TDAH Hyperactif/Impulsif"): ("comportement",),
+    ("conners", "Indice TDAH Combiné"): ("attention", "comportement"),
+    ("conners", "Indice Global Conners"): ("comportement",)
+}
+
+# Libellés de domaine des phrases d'interprétation, par échelle (nom du score)
+# Ces libellés sont des identifiants des catalogues de traduction du rapport
+LIBELLES_DOMAINES = {
+    **{cle: info["domaine"] for structure in (WISC_V_STRUCTURE, KABC_II_STRUCTURE)
+       for idx, info in structure.items() for cle in (idx, info["nom"])},
+    **{f"{idx}_{subtest}": subtest.lower() for idx, info in WISC_V_STRUCTURE.items() for subtest in info['subtests']},
+    **{subtest: subtest.lower() for subtests in TEACH_STRUCTURE.values() for subtest in subtests},
+    **{subtest: subtest.lower() for subtests in NEPSY_II_STRUCTURE.values() for subtest in subtests},
+    **{echelle: echelle.lower() for echelle in BROWN_ECHELLES + CONNERS_3_ECHELLES}
+}
+
+# Types de score attendus des échelles (famille de batterie, échelle) -> ScoreType.value
+TYPES_ECHELLES = {
+    **{("wisc_v", idx): "standard" for idx in WISC_V_STRUCTURE},
+    **{("wisc_v", f"{idx}_{subtest}"): "scalaire"
+       for idx, info in WISC_V_STRUCTURE.items() for subtest in info['subtests']},
+    **{("kabc_ii", idx): "standard" for idx in KABC_II_STRUCTURE},
+    **{("teach", subtest): "scalaire" for subtests in TEACH_STRUCTURE.values() for subtest in subtests},
+    **{("nepsy_ii", subtest): "scalaire" for subtests in NEPSY_II_STRUCTURE.values() for subtest in subtests},
+    **{("brown", echelle): "t_score" for echelle in BROWN_ECHELLES},
+    **{("conners", echelle): "t_score" for echelle in CONNERS_3_ECHELLES}
+}
+
+# Indice de rattachement des subtests (famille de batterie, subtest) -> indice
+INDICES_SUBTESTS = {
+    ("wisc_v", f"{idx}_{subtest}"): idx
+    for idx, info in WISC_V_STRUCTURE.items() for subtest in info['subtests']
+}
+
+# Bornes admissibles des valeurs par type de score (bornes de saisie des modules)
+BORNES_TYPES_SCORES = {
+    "standard": (40, 160),
+    "scalaire": (1, 19),
+    "t_score": (20, 80),
+}
+
+# Écart maximal (en écarts-types) entre un indice et la moyenne de ses subtests
+SEUIL_COHERENCE_SUBTESTS = 2.0
+
+# Import des exports des logiciels de cotation des éditeurs
+# Les libellés sont comparés sans casse, accents ni ponctuation ; les noms et codes des
+# structures ci-dessus sont reconnus d'office, les alias complètent les libellés des éditeurs.
+# Libellés des batteries -> famille de batterie
+ALIAS_BATTERIES_IMPORT = {
+    "wisc_v": ["WISC-V", "WISC V", "WISC5", "WISC-V FR", "WISC-V CDN-F"],
+    "kabc_ii": ["KABC-II", "K-ABC-II", "K-ABC II", "KABC2", "KABC-II NU"],
+    "teach": ["TEA-Ch", "TEACh"],
+    "nepsy_ii": ["NEPSY-II", "NEPSY II", "NEPSY2"],
+    "brown": ["Brown", "Brown EF/A", "BADDS"],
+    "conners": ["Conners 3", "Conners-3", "Conners3", "Conners"]
+}
+
+# Libellés des échelles (famille de batterie, échelle) -> alias des éditeurs
+ALIAS_ECHELLES_IMPORT = {
+    ("wisc_v", "ICV"): ["Verbal Comprehension Index", "VCI"],
+    ("wisc_v", "IVS"): ["Visual Spatial Index", "VSI"],
+    ("wisc_v", "IRF"): ["Fluid Reasoning Index", "FRI"],
+    ("wisc_v", "IMT"): ["Working Memory Index", "WMI"],
+    ("wisc_v", "IVT"): ["Processing Speed Index", "PSI"],
+    ("wisc_v", "IQT"): ["Full Scale IQ", "FSIQ", "QIT"],
+    ("wisc_v", "IRQ"): ["Quantitative Reasoning Index", "QRI"],
+    ("wisc_v", "IMTA"): ["Auditory Working Memory Index", "AWMI"],
+    ("wisc_v", "INV"): ["Nonverbal Index", "NVI"],
+    ("wisc_v", "IAG"): ["General Ability Index", "GAI"],
+    ("wisc_v", "ICC"): ["Cognitive Proficiency Index", "CPI"],
+    ("wisc_v", "ICV_Similitudes"): ["Similarities", "SIM"],
+    ("wisc_v", "ICV_Vocabulaire"): ["Vocabulary", "VOC"],
+    ("wisc_v", "ICV_Information"): ["INF"],
+    ("wisc_v", "ICV_Compréhension"): ["Comprehension", "COM"],
+    ("wisc_v", "IVS_Cubes"): ["Block Design", "CUB"],
+    ("wisc_v", "IVS_Puzzles Visuels"): ["Visual Puzzles", "PUZ"],
+    ("wisc_v", "IRF_Matrices"): ["Matrix Reasoning", "MAT"],
+    ("wisc_v", "IRF_Balances"): ["Figure Weights", "BAL"],
+    ("wisc_v", "IRF_Arithmétique"): ["Arithmetic", "ARI"],
+    ("wisc_v", "IMT_Mémoire des Chiffres"): ["Digit Span", "MCH"],
+    ("wisc_v", "IMT_Mémoire des Images"): ["Picture Span", "MIM"],
+    ("wisc_v", "IMT_Séquence Lettres-Chiffres"): ["Letter-Number Sequencing", "SLC"],
+    ("wisc_v", "IVT_Code"): ["Coding", "COD"],
+    ("wisc_v", "IVT_Symboles"): ["Symbol Search", "SYM"],
+    ("wisc_v", "IVT_Barrage"): ["Cancellation", "BAR"],
+    ("kabc_ii", "IFC"): ["Fluid-Crystallized Index", "FCI", "Mental Processing Index", "MPI"],
+    ("kabc_ii", "ISQ"): ["Sequential", "Sequential/Gsm", "Gsm"],
+    ("kabc_ii", "ISI"): ["Simultaneous", "Simultaneous/Gv", "Gv"],
+    ("kabc_ii", "IPL"): ["Planning", "Planning/Gf", "Gf"],
+    ("kabc_ii", "IAP"): ["Learning", "Learning/Glr", "Glr"],
+    ("kabc_ii", "ICO"): ["Knowledge", "Knowledge/Gc", "Gc"],
+    ("conners", "Inattention"): ["IN"],
+    ("conners", "Hyperactivité/Impulsivité"): ["Hyperactivity/Impulsivity", "HY"],
+    ("conners", "Problèmes d'Apprentissage"): ["Learning Problems", "LP"],
+    ("conners", "Fonctions Exécutives"): ["Executive Functioning", "EF"],
+    ("conners", "Défiance/Agressivité"): ["Defiance/Aggression", "AG"],
+    ("conners", "Relations avec les Pairs"): ["Peer Relations", "PR"],
+    ("conners", "Indice TDAH Inattentif"): ["ADHD Inattentive", "DSM-5 ADHD Inattentive"],
+    ("conners", "Indice TDAH Hyperactif/Impulsif"): ["ADHD Hyperactive-Impulsive",
+                                                     "DSM-5 ADHD Hyperactive-Impulsive"],
+    ("conners", "Indice TDAH Combiné"): ["ADHD Combined", "DSM-5 ADHD Combined"],
+    ("conners", "Indice Global Conners"): ["Conners 3 Global Index", "Global Index", "GI"],
+}
+
+# Libellés des informateurs Conners-3 -> informateur (CONNERS_3_TYPES_INFORMATEURS)
+ALIAS_INFORMATEURS_IMPORT = {
+    "Parent": ["Parent", "P", "Parent Form"],
+    "Enseignant": ["Enseignant", "Teacher", "T", "Teacher Form"],
+    "Auto-questionnaire": ["Auto-questionnaire", "Self-Report", "Self", "SR"]
+}
+
+# Colonnes (CSV) ou éléments et attributs (XML) des exports -> rôle
+# Un score est une ligne (CSV) ou un élément (XML) comportant une échelle et une valeur ;
+# la batterie, l'informateur et l'identité du patient peuvent figurer sur un élément parent.
+COLONNES_IMPORT = {
+    "echelle": ["Scale", "Subtest", "Index", "Composite", "Scale Name", "Échelle", "Subtest/Indice", "Indice"],
+    "valeur": ["Score", "Standard Score", "Scaled Score", "Composite Score", "T-Score", "T Score",
+               "Valeur", "Note", "Note Standard", "Note Scalaire", "Score T"],
+    "batterie": ["Test", "Battery", "Assessment", "Instrument", "Batterie"],
+    "informateur": ["Rater", "Informant", "Form", "Rater Type", "Informateur"],
+    "nom": ["Last Name", "LastName", "Examinee Last Name", "Nom"],
+    "prenom": ["First Name", "FirstName", "Examinee First Name", "Prénom"],
+    "date_naissance": ["Date of Birth", "DOB", "Birth Date", "BirthDate", "Date de Naissance"],
+    "date_examen": ["Test Date", "Administration Date", "Date Tested", "Assessment Date", "Date d'Examen"]
+}
+
+# Priorité des recommandations associées aux classifications (plus élevée = citée en premier)
+PRIORITES_CLASSIFICATIONS = {
+    "Très Faible": 90,
+    "Limite (Zone Frontière)": 80,
+    "Moyen Faible": 60,
+    "Moyen": 20,
+    "Moyen Fort": 20,
+    "Supérieur": 30,
+    "Très Supérieur": 30
+}
+
+# Règles de recommandation
+# Conditions possibles : batterie (clé ou famille), echelle, domaine, classification,
+# type (standard, scalaire, t_score) et niveau (force, fragilite, significatif).
+# Toutes les conditions doivent être satisfaites par un même score ; un tuple de
+# valeurs accepte l'une quelconque d'entre elles. Une règle sans condition s'applique toujours.
+REGLES_RECOMMANDATIONS = [
+    *[
+        {
+            "recommandation": info["recommandation"],
+            "priorite": PRIORITES_CLASSIFICATIONS[classification],
+            "conditions": {"type": "standard", "classification": classification}
+        }
+        for classification, info in INTERPRETATIONS_SEMANTIQUES.items()
+    ],
+    {
+        "recommandation": "Prévoir des temps de pause réguliers et limiter les distracteurs environnementaux",
+        "priorite": 70,
+        "conditions": {"domaine": "attention", "niveau": "fragilite"}
+    },
+    {
+        "recommandation": "Privilégier les consignes courtes et vérifier la compréhension",
+        "priorite": 65,
+        "conditions": {"domaine": "attention", "niveau": "fragilite"}
+    },
+    {
+        "recommandation": "Fournir des supports écrits pour compenser les difficultés mnésiques",
+        "priorite": 70,
+        "conditions": {"domaine": "memoire", "niveau": "fragilite"}
+    },
+    {
+        "recommandation": "Encourager l'utilisation d'outils d'aide à la mémorisation (agenda, pictogrammes)",
+        "priorite": 65,
+        "conditions": {"domaine": "memoire", "niveau": "fragilite"}
+    },
+    {
+        "recommandation": "Accorder du temps supplémentaire pour les évaluations et exercices",
+        "priorite": 70,
+        "conditions": {"domaine": "vitesse", "niveau": "fragilite"}
+    },
+    {
+        "recommandation": "Réduire la quantité de travail écrit demandé",
+        "priorite": 65,
+        "conditions": {"domaine": "vitesse", "niveau": "fragilite"}
+    },
+    {
+        "recommandation": "Envisager un accompagnement thérapeutique ciblé (guidance parentale, thérapie cognitivo-comportementale)",
+        "priorite": 75,
+        "conditions": {"batterie": "conners", "niveau": "significatif"}
+    },
+    {
+        "recommandation": "Favoriser un cadre structuré et des routines prévisibles",
+        "priorite": 70,
+        "conditions": {"batterie": "conners", "niveau": "significatif"}
+    },
+    {
+        "recommandation": "Maintenir une communication régulière entre la famille, l'école et les professionnels suivant l'enfant",
+        "priorite": 10,
+        "conditions": {}
+    },
+    {
+        "recommandation": "Valoriser systématiquement les efforts et les progrès réalisés",
+        "priorite": 10,
+        "conditions": {}
+    }
+]
+
+# Phrases de synthèse du QIT par classification
+SYNTHESES_QIT = {
+    "Très Supérieur": "des capacités intellectuelles exceptionnelles",
+    "Supérieur": "un fonctionnement intellectuel au-dessus de la moyenne",
+    "Moyen Fort": "des compétences cognitives satisfaisantes",
+    "Moyen": "un fonctionnement intellectuel dans la norme attendue",
+    "Moyen Faible": "un fonctionnement intellectuel fragile",
+    "Limite (Zone Frontière)": "des difficultés intellectuelles significatives",
+    "Très Faible": "des difficultés intellectuelles majeures"
+}
+
+SYNTHESE_QIT_DEFAUT = "un profil cognitif particulier"
+
+# Langues de rédaction du rapport
+# Le français est la langue source : les catalogues (locales/<langue>/LC_MESSAGES/rapport.po)
+# traduisent les phrases françaises du moteur
+LANGUE_DEFAUT = "fr"
+
+LANGUES_RAPPORT = {
+    "fr": {"nom": "Français", "separateur_decimal": ",", "deux_points": " :"},
+    "nl": {"nom": "Nederlands", "separateur_decimal": ",", "deux_points": ":"},
+    "de": {"nom": "Deutsch", "separateur_decimal": ",", "deux_points": ":"},
+    "en": {"nom": "English", "separateur_decimal": ".", "deux_points": ":"}
+}
@@ -0,0 +1,40 @@
+"""
+Paramètres d'exécution de NeuroPsy Assist (emplacements de stockage locaux).
+"""
+
+import os
+from pathlib import Path
+
+
+# Dossier des données locales (surchargeable par la variable d'environnement NEUROPSY_DATA_DIR)
+DOSSIER_DONNEES = Path(os.environ.get("NEUROPSY_DATA_DIR", Path.home() / ".neuropsy_assist"))
+
+# Base SQLite de l'historique des évaluations
+CHEMIN_HISTORIQUE = DOSSIER_DONNEES / "historique.sqlite3"
+
+# Catalogues de traduction du rapport (sources .po et catalogues compilés .mo)
+DOSSIER_LOCALES = Path(__file__).resolve().parent.parent / "locales"
+
+# Modèles de rapport enregistrés par les cliniciens
+DOSSIER_TEMPLATES = DOSSIER_DONNEES / "templates"
+
+# Brouillons de l'évaluation en cours (sauvegarde automatique)
+DOSSIER_BROUILLONS = DOSSIER_DONNEES / "brouillons"
+
+# Clé de chiffrement du cabinet (créée au premier usage)
+CHEMIN_CLE_CABINET = DOSSIER_DONNEES / "cabinet.key"
+
+# Coffre chiffré des dossiers et des rapports
+DOSSIER_COFFRE = DOSSIER_DONNEES / "coffre"
+
+# Exports des scores pour la recherche
+DOSSIER_EXPORTS = DOSSIER_DONNEES / "exports"
+
+# Correspondances complémentaires des libellés des exports des logiciels de cotation
+CHEMIN_CORRESPONDANCES_IMPORT = DOSSIER_DONNEES / "correspondances_import.json"
+
+# Cache des rapports rendus (partagé entre processus)
+DOSSIER_CACHE_RAPPORTS = DOSSIER_DONNEES / "cache_rapports"
+
+# Tables de référence compilées (normes, valeurs critiques, taux de base)
+CHEMIN_TABLES_REFERENCE = DOSSIER_DONNEES / "tables_reference.nprt"
@@ -1,17 +1,26 @@
 """
 Modèles de données pour NeuroPsy Assist.
+
+Les sous-modules sont importés à la première utilisation d'un nom exporté : importer
+models.patient ou models.scores ne charge pas les modules de calcul (numpy).
 """
 
-from .patient import Patient, Anamnese
-from .scores import ScoreType, Score, ScoreManager
-from .interpretations import interprete_score, get_classification
+from importlib import import_module
+
+_EXPORTS = {
+    'Patient': '.patient',
+    'Anamnese': '.patient',
+    'ScoreType': '.scores',
+    'Score': '.scores',
+    'ScoreManager': '.scores',
+    'interprete_score': '.interpretations',
+    'get_classification': '.interpretations'
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = [
-    'Patient',
-    'Anamnese',
-    'ScoreType',
-    'Score',
-    'ScoreManager',
-    'interprete_score',
-    'get_classification'
-]
+def __getattr__(nom):
+    if nom not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {nom!r}")
+    return getattr(import_module(_EXPORTS[nom], __name__), nom)
@@ -2,17 +2,28 @@
 Algorithmes d'interprétation sémantique des scores.
 """
 
-from typing import Tuple, Optional
+import operator
+from typing import List, Sequence, Tuple, Optional
+
 from models.scores import ScoreType
 from config.constants import (
     STANDARD_CLASSIFICATIONS,
     SCALAIRE_CLASSIFICATIONS,
     T_SCORE_CLASSIFICATIONS,
     INTERPRETATIONS_SEMANTIQUES,
-    INTERPRETATIONS_T_SCORE
+    INTERPRETATIONS_T_SCORE,
+    SEUILS_PROFIL
 )
 
 
+_COMPARAISONS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge
+}
+
+
 def get_classification(valeur: float, score_type: ScoreType) -> Tuple[str, Optional[str]]:
     """
     Détermine la classification d'un score selon son type.
@@ -45,6 +56,51 @@ def get_classification(valeur: float, score_type: ScoreType) -> Tuple[str, Optio
     return "Type de score invalide", None
 
 
+# Tables de classification par type de score : (bornes inférieures, bornes supérieures, libellés, percentiles)
+_TABLES_CLASSIFICATIONS = {
+    ScoreType.STANDARD: ([c[0] for c in STANDARD_CLASSIFICATIONS], [c[1] for c in STANDARD_CLASSIFICATIONS],
+                         [c[2] for c in STANDARD_CLASSIFICATIONS], [c[3] for c in STANDARD_CLASSIFICATIONS]),
+    ScoreType.SCALAIRE: ([c[0] for c in SCALAIRE_CLASSIFICATIONS], [c[1] for c in SCALAIRE_CLASSIFICATIONS],
+                         [c[2] for c in SCALAIRE_CLASSIFICATIONS], [None] * len(SCALAIRE_CLASSIFICATIONS)),
+    ScoreType.T_SCORE: ([c[0] for c in T_SCORE_CLASSIFICATIONS], [c[1] for c in T_SCORE_CLASSIFICATIONS],
+                        [c[2] for c in T_SCORE_CLASSIFICATIONS], [None] * len(T_SCORE_CLASSIFICATIONS)),
+}
+
+
+def classify_scores(valeurs: "np.ndarray", types: "np.ndarray") -> Tuple[List[str], List[Optional[str]]]:
+    """
+    Détermine en une passe la classification d'un lot de scores (comme get_classification).
+    
+    Args:
+        valeurs: Valeurs des scores
+        types: Codes de type de score (models.profile.CODES_TYPES)
+    
+    Returns:
+        Tuple (classifications, percentiles), dans l'ordre des scores
+    """
+    # Import différé : la classification d'un score isolé (get_classification) ne charge pas numpy
+    import numpy as np
+    from models.profile import TYPES_SCORES
+
+    classifications = np.full(len(valeurs), "Non classifié", dtype=object)
+    percentiles = np.full(len(valeurs), None, dtype=object)
+    
+    for code, score_type in enumerate(TYPES_SCORES):
+        lignes = np.flatnonzero(types == code)
+        if not len(lignes):
+            continue
+        minimums, maximums, libelles, centiles = _TABLES_CLASSIFICATIONS[score_type]
+        v = valeurs[lignes, np.newaxis]
+        # Première tranche contenant la valeur (les tranches sont disjointes)
+        correspond = (v >= np.array(minimums, dtype=np.float64)) & (v <= np.array(maximums, dtype=np.float64))
+        classees = correspond.any(axis=1)
+        rangs = correspond.argmax(axis=1)[classees]
+        classifications[lignes[classees]] = np.array(libelles, dtype=object)[rangs]
+        percentiles[lignes[classees]] = np.array(centiles, dtype=object)[rangs]
+    
+    return classifications.tolist(), percentiles.tolist()
+
+
 def interprete_score(valeur: float, score_type: ScoreType, domaine: str = "") -> str:
     """
     Génère une interprétation sémantique d'un score.
@@ -58,7 +114,11 @@ def interprete_score(valeur: float, score_type: ScoreType, domaine: str = "") ->
         Phrase d'interprétation clinique
     """
     classification, _ = get_classification(valeur, score_type)
-    
+    return interprete_classification(classification, valeur, score_type, domaine)
+
+
+def interprete_classification(classification: str, valeur: float, score_type: ScoreType, domaine: str = "") -> str:
+    """Phrase d'interprétation d'un score dont la classification est déjà déterminée (voir interprete_score)."""
     if score_type == ScoreType.T_SCORE:
         interp_data = INTERPRETATIONS_T_SCORE.get(classification)
         if interp_data:
@@ -89,19 +149,12 @@ def est_cliniquement_significatif(valeur: float, score_type: ScoreType) -> bool:
     Returns:
         True si cliniquement significatif
     """
-    if score_type == ScoreType.T_SCORE:
-        # Significatif si T >= 65
-        return valeur >= 65
-    
-    elif score_type == ScoreType.STANDARD:
-        # Significatif si en zone limite ou très faible
-        return valeur < 80
-    
-    elif score_type == ScoreType.SCALAIRE:
-        # Significatif si en zone limite ou très faible
-        return valeur <= 5
+    regle = SEUILS_PROFIL["significatif"].get(score_type.value)
+    if regle is None:
+        return False
     
-    return False
+    seuil, comparaison = regle
+    return _COMPARAISONS[comparaison](valeur, seuil)
 
 
 def get_couleur_score(classification: str, score_type: ScoreType) -> str:
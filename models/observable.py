@@ -0,0 +1,112 @@
+"""
+Modèles observables : numéro de version et notification des modifications.
+
+Chaque modification effective d'un modèle observable incrémente sa version et
+prévient ses abonnés. Les vues dérivées (tableaux récapitulatifs, graphiques,
+résumés) s'abonnent à leurs sources et ne sont recalculées que si l'une d'elles
+a changé depuis le dernier calcul.
+"""
+
+from typing import Any, Callable, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+# Abonné : reçoit le modèle modifié et le nom de l'élément modifié (attribut ou score)
+Abonne = Callable[[Any, str], None]
+
+_ABSENT = object()
+
+
+class Observable:
+    """Modèle versionné notifiant ses abonnés à chaque modification effective."""
+
+    _version: int = 0
+
+    @property
+    def version(self) -> int:
+        """Compteur de modifications : change à chaque modification effective."""
+        return self._version
+
+    def subscribe(self, abonne: Abonne) -> Callable[[], None]:
+        """
+        Abonne une fonction aux modifications du modèle.
+
+        Returns:
+            Fonction de désabonnement
+        """
+        abonnes = self.__dict__.setdefault("_abonnes", [])
+        abonnes.append(abonne)
+
+        def desabonner() -> None:
+            if abonne in abonnes:
+                abonnes.remove(abonne)
+
+        return desabonner
+
+    def _signaler(self, element: str) -> None:
+        """Incrémente la version et prévient les abonnés d'une modification."""
+        object.__setattr__(self, "_version", self._version + 1)
+        for abonne in list(self.__dict__.get("_abonnes", ())):
+            abonne(self, element)
+
+    def __getstate__(self):
+        # Les abonnés (fonctions, vues) ne font pas partie de l'état du modèle
+        etat = dict(self.__dict__)
+        etat.pop("_abonnes", None)
+        return etat
+
+
+class ObservableModel(Observable):
+    """Modèle observable dont toute affectation d'attribut public modifiant sa valeur est signalée."""
+
+    def __setattr__(self, nom: str, valeur: Any) -> None:
+        ancienne = self.__dict__.get(nom, _ABSENT)
+        object.__setattr__(self, nom, valeur)
+        if not nom.startswith("_") and ancienne is not _ABSENT and ancienne != valeur:
+            self._signaler(nom)
+
+
+class DerivedView(Generic[T]):
+    """
+    Donnée dérivée de modèles observables, recalculée uniquement après une modification.
+
+    La vue s'abonne à ses sources : tant qu'aucune n'est modifiée (et que les sources
+    restent les mêmes objets), get() retourne la valeur déjà calculée.
+    """
+
+    def __init__(self):
+        self._sources: Tuple[Observable, ...] = ()
+        self._desabonnements: List[Callable[[], None]] = []
+        self._perimee = True
+        self._valeur: Optional[T] = None
+
+    def get(self, sources: Sequence[Observable], calcul: Callable[[], T]) -> T:
+        """
+        Retourne la valeur de la vue, en la recalculant si ses sources ont changé.
+
+        Args:
+            sources: Modèles dont dépend la vue
+            calcul: Calcul de la valeur à partir des sources
+        """
+        sources = tuple(sources)
+        if len(sources) != len(self._sources) or any(a is not b for a, b in zip(sources, self._sources)):
+            self._lier(sources)
+
+        if self._perimee:
+            self._valeur = calcul()
+            self._perimee = False
+
+        return self._valeur
+
+    def invalidate(self, *_) -> None:
+        """Marque la vue comme périmée (appelée par les sources modifiées)."""
+        self._perimee = True
+
+    def _lier(self, sources: Tuple[Observable, ...]) -> None:
+        """Remplace les abonnements de la vue par des abonnements aux nouvelles sources."""
+        for desabonner in self._desabonnements:
+            desabonner()
+        self._desabonnements = [source.subscribe(self.invalidate) for source in sources]
+        self._sources = sources
+        self._perimee = True
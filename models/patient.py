@@ -2,14 +2,18 @@
 Modèle de données pour les patients et l'anamnèse.
 """
 
-from dataclasses import dataclass, field
+import hashlib
+import unicodedata
+from dataclasses import dataclass, field, fields
 from datetime import date
-from typing import Optional, List
+from typing import Dict, Optional, List
+
+from models.observable import ObservableModel
 
 
 @dataclass
-class Patient:
-    """Informations sur le patient."""
+class Patient(ObservableModel):
+    """Informations sur le patient (toute modification d'un champ incrémente `version`)."""
     
     nom: str = ""
     prenom: str = ""
@@ -32,11 +36,53 @@ class Patient:
     def format_nom_complet(self) -> str:
         """Retourne le nom complet du patient."""
         return f"{self.prenom} {self.nom}".strip()
+    
+    def get_identifiant(self) -> Optional[str]:
+        """
+        Retourne un identifiant pseudonymisé et stable du patient.
+        
+        L'identifiant est dérivé du nom, du prénom et de la date de naissance
+        (insensible à la casse et aux accents). None si l'identité est incomplète.
+        """
+        if not (self.nom.strip() and self.prenom.strip() and self.date_naissance):
+            return None
+        
+        cle = "|".join([_normaliser(self.nom), _normaliser(self.prenom), self.date_naissance.isoformat()])
+        return hashlib.sha256(cle.encode("utf-8")).hexdigest()[:32]
+    
+    def to_dict(self) -> Dict:
+        """Convertit le patient en dictionnaire (dates au format ISO)."""
+        return {
+            'nom': self.nom,
+            'prenom': self.prenom,
+            'date_naissance': self.date_naissance.isoformat() if self.date_naissance else None,
+            'date_examen': self.date_examen.isoformat() if self.date_examen else None,
+            'classe': self.classe,
+            'ecole': self.ecole
+        }
+    
+    @classmethod
+    def from_dict(cls, donnees: Dict) -> "Patient":
+        """Reconstruit un patient à partir de to_dict."""
+        return cls(
+            nom=donnees['nom'],
+            prenom=donnees['prenom'],
+            date_naissance=date.fromisoformat(donnees['date_naissance']) if donnees['date_naissance'] else None,
+            date_examen=date.fromisoformat(donnees['date_examen']) if donnees['date_examen'] else None,
+            classe=donnees['classe'],
+            ecole=donnees['ecole']
+        )
+
+
+def _normaliser(texte: str) -> str:
+    """Normalise un texte pour la comparaison (casse, accents, espaces)."""
+    decompose = unicodedata.normalize("NFKD", texte.strip().casefold())
+    return " ".join("".join(c for c in decompose if not unicodedata.combining(c)).split())
 
 
 @dataclass
-class Anamnese:
-    """Données anamnestiques du patient."""
+class Anamnese(ObservableModel):
+    """Données anamnestiques du patient (toute modification d'un champ incrémente `version`)."""
     
     # Motif de consultation
     motif_consultation: str = ""
@@ -86,3 +132,12 @@ class Anamnese:
             self.strategies_observees,
             self.autres_observations
         ])
+    
+    def to_dict(self) -> Dict:
+        """Convertit l'anamnèse en dictionnaire."""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+    
+    @classmethod
+    def from_dict(cls, donnees: Dict) -> "Anamnese":
+        """Reconstruit une anamnèse à partir de to_dict (les champs absents restent vides)."""
+        return cls(**{f.name: donnees[f.name] for f in fields(cls) if f.name in donnees})
@@ -0,0 +1,163 @@
+"""
+Représentation unifiée du profil : tous les scores valides de toutes les batteries
+convertis en scores z dans un vecteur contigu.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from models.scores import Score, ScoreManager, ScoreType
+from config.constants import NORMES_TYPES_SCORES, SEUILS_PROFIL
+
+
+# Codes entiers des types de scores (index dans les tables de normes)
+TYPES_SCORES = list(ScoreType)
+CODES_TYPES = {score_type: code for code, score_type in enumerate(TYPES_SCORES)}
+
+MOYENNES_TYPES = np.array([NORMES_TYPES_SCORES[t.value]["moyenne"] for t in TYPES_SCORES], dtype=np.float64)
+ECARTS_TYPES = np.array([NORMES_TYPES_SCORES[t.value]["ecart_type"] for t in TYPES_SCORES], dtype=np.float64)
+SENS_TYPES = np.array([NORMES_TYPES_SCORES[t.value]["sens"] for t in TYPES_SCORES], dtype=np.float64)
+
+
+def _compiler_critere(critere: str) -> Dict[str, np.ndarray]:
+    """
+    Traduit les seuils bruts d'un critère (SEUILS_PROFIL) en seuils z orientés par type.
+
+    Le z orienté est positif quand le score est favorable : une comparaison sur la
+    valeur brute s'inverse donc pour les types dont le sens est négatif (scores T).
+    """
+    n = len(TYPES_SCORES)
+    tables = {
+        'seuil': np.zeros(n, dtype=np.float64),
+        'inferieur': np.zeros(n, dtype=bool),
+        'strict': np.zeros(n, dtype=bool),
+        'actif': np.zeros(n, dtype=bool),
+    }
+
+    for code, score_type in enumerate(TYPES_SCORES):
+        regle = SEUILS_PROFIL[critere].get(score_type.value)
+        if regle is None:
+            continue
+
+        valeur, comparaison = regle
+        sens = SENS_TYPES[code]
+        inferieur = comparaison in ("<", "<=")
+
+        # Même suite d'opérations que pour les scores : égalité exacte au seuil
+        tables['seuil'][code] = (valeur - MOYENNES_TYPES[code]) / ECARTS_TYPES[code] * sens
+        tables['inferieur'][code] = inferieur if sens > 0 else not inferieur
+        tables['strict'][code] = comparaison in ("<", ">")
+        tables['actif'][code] = True
+
+    return tables
+
+
+_CRITERES = {critere: _compiler_critere(critere) for critere in SEUILS_PROFIL}
+
+
+@dataclass
+class UnifiedProfile:
+    """
+    Profil unifié multi-batteries.
+
+    Chaque position i du profil correspond au score `scores[i]`, avec ses métadonnées
+    (batterie, domaine, type, sens) stockées dans des tableaux parallèles.
+    """
+
+    scores: List[Score]
+    batteries: np.ndarray
+    noms: np.ndarray
+    domaines: np.ndarray
+    types: np.ndarray
+    valeurs: np.ndarray
+    z: np.ndarray
+    sens: np.ndarray
+
+    @classmethod
+    def from_managers(cls, managers: Dict[str, Optional[ScoreManager]]) -> "UnifiedProfile":
+        """
+        Construit le profil à partir des gestionnaires de scores.
+
+        Args:
+            managers: Gestionnaires indexés par nom de batterie (wisc_v, teach, brown, etc.)
+
+        Returns:
+            Profil contenant tous les scores valides, dans l'ordre des gestionnaires
+        """
+        scores = []
+        batteries = []
+
+        for nom_batterie, manager in managers.items():
+            if manager:
+                valides = manager.get_valid_scores()
+                scores.extend(valides)
+                batteries.extend([nom_batterie] * len(valides))
+
+        n = len(scores)
+        types = np.fromiter((CODES_TYPES[s.type_score] for s in scores), dtype=np.int8, count=n)
+        valeurs = np.fromiter((s.valeur for s in scores), dtype=np.float64, count=n)
+
+        return cls(
+            scores=scores,
+            batteries=np.array(batteries, dtype=object),
+            noms=np.array([s.nom for s in scores], dtype=object),
+            domaines=np.array([s.domaine for s in scores], dtype=object),
+            types=types,
+            valeurs=valeurs,
+            z=(valeurs - MOYENNES_TYPES[types]) / ECARTS_TYPES[types],
+            sens=SENS_TYPES[types]
+        )
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    @property
+    def z_oriente(self) -> np.ndarray:
+        """Scores z orientés : positifs si favorables, quel que soit le type de score."""
+        return self.z * self.sens
+
+    def mask_batteries(self, *batteries: str) -> np.ndarray:
+        """Masque des scores appartenant aux batteries données."""
+        return np.isin(self.batteries, list(batteries))
+
+    def mask_type(self, score_type: ScoreType) -> np.ndarray:
+        """Masque des scores d'un type donné."""
+        return self.types == CODES_TYPES[score_type]
+
+    def mask_critere(self, critere: str) -> np.ndarray:
+        """
+        Évalue un critère de SEUILS_PROFIL sur tout le profil.
+
+        Args:
+            critere: 'force', 'fragilite' ou 'significatif'
+
+        Returns:
+            Masque booléen des scores satisfaisant le critère
+        """
+        tables = _CRITERES[critere]
+        seuil = tables['seuil'][self.types]
+        strict = tables['strict'][self.types]
+        z = self.z_oriente
+
+        inferieur = np.where(strict, z < seuil, z <= seuil)
+        superieur = np.where(strict, z > seuil, z >= seuil)
+
+        return tables['actif'][self.types] & np.where(tables['inferieur'][self.types], inferieur, superieur)
+
+    def mask_forces(self) -> np.ndarray:
+        """Masque des points forts du profil."""
+        return self.mask_critere('force')
+
+    def mask_fragilites(self) -> np.ndarray:
+        """Masque des fragilités du profil."""
+        return self.mask_critere('fragilite')
+
+    def mask_significatifs(self) -> np.ndarray:
+        """Masque des scores cliniquement significatifs."""
+        return self.mask_critere('significatif')
+
+    def select(self, mask: np.ndarray) -> List[Score]:
+        """Retourne les scores sélectionnés par un masque, dans l'ordre du profil."""
+        return [self.scores[i] for i in np.flatnonzero(mask)]
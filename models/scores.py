@@ -2,10 +2,22 @@
 Gestion des scores psychométriques.
 """
 
+import bisect
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
 from enum import Enum
 
+from models.observable import Observable
+
+
+# Un instantané de l'état est conservé tous les N événements du journal
+INTERVALLE_INSTANTANE = 50
+
+# Opérations du journal des scores
+AJOUT = "ajout"
+MODIFICATION = "modification"
+RETRAIT = "retrait"
+
 
 class ScoreType(Enum):
     """Types de scores psychométriques."""
@@ -37,16 +49,165 @@ class Score:
         return f"{self.nom}: {self.valeur} ({self.classification})"
 
 
+@dataclass(frozen=True)
+class ScoreEvent:
+    """Événement du journal d'un gestionnaire de scores."""
+    
+    sequence: int  # Version du gestionnaire après l'événement (1, 2, ...)
+    operation: str  # AJOUT, MODIFICATION ou RETRAIT
+    nom: str
+    score: Optional[Score] = None  # Score enregistré (None pour un retrait)
+    precedent: Optional[Score] = None  # Score remplacé ou retiré (None pour un ajout)
+
+
 @dataclass
-class ScoreManager:
-    """Gestionnaire de scores pour un test ou une batterie."""
+class ScoreManager(Observable):
+    """
+    Gestionnaire de scores pour un test ou une batterie.
+    
+    Les statistiques dérivées (scores valides, scores par type, hétérogénéité) sont
+    mises en cache. Les modifications doivent passer par add_score et remove_score :
+    elles invalident uniquement les statistiques qui dépendent du score modifié,
+    incrémentent `version` et préviennent les abonnés (voir models.observable).
+    
+    Chaque modification est consignée dans un journal en ajout seul (ajout, modification,
+    retrait), complété d'un instantané de l'état tous les INTERVALLE_INSTANTANE événements.
+    Le journal permet d'annuler et rétablir des modifications, de reconstruire l'état à
+    une version donnée et de ne persister que les événements nouveaux (events_since).
+    """
     
     nom_test: str
     scores: Dict[str, Score] = field(default_factory=dict)
+    informateur: str = ""  # Pour les questionnaires (Parent, Enseignant, etc.)
+    # Clé de statistique -> (noms de scores dont elle dépend, None pour tous ; valeur)
+    _cache: Dict[Tuple, Tuple[Optional[FrozenSet[str]], Any]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _journal: List[ScoreEvent] = field(default_factory=list, init=False, repr=False, compare=False)
+    # Instantanés (version, scores) par version croissante ; le premier est l'état initial
+    _instantanes: List[Tuple[int, Dict[str, Score]]] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    _annulables: List[ScoreEvent] = field(default_factory=list, init=False, repr=False, compare=False)
+    _retablissables: List[ScoreEvent] = field(default_factory=list, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._instantanes.append((0, dict(self.scores)))
     
     def add_score(self, score: Score) -> None:
-        """Ajoute un score au gestionnaire."""
-        self.scores[score.nom] = score
+        """Ajoute un score au gestionnaire (sans effet s'il est identique au score enregistré)."""
+        if self.scores.get(score.nom) == score:
+            return
+        self._annulables.append(self._enregistrer(score.nom, score))
+        self._retablissables.clear()
+    
+    def remove_score(self, nom: str) -> bool:
+        """
+        Retire un score du gestionnaire.
+        
+        Returns:
+            True si un score a été retiré
+        """
+        if nom not in self.scores:
+            return False
+        self._annulables.append(self._enregistrer(nom, None))
+        self._retablissables.clear()
+        return True
+    
+    @property
+    def can_undo(self) -> bool:
+        """Vrai si une modification peut être annulée."""
+        return bool(self._annulables)
+    
+    @property
+    def can_redo(self) -> bool:
+        """Vrai si une modification annulée peut être rétablie."""
+        return bool(self._retablissables)
+    
+    def undo(self) -> Optional[ScoreEvent]:
+        """
+        Annule la dernière modification (ajout, modification ou retrait).
+        
+        L'annulation est elle-même consignée dans le journal comme un nouvel événement.
+        
+        Returns:
+            L'événement d'annulation, ou None s'il n'y a rien à annuler
+        """
+        if not self._annulables:
+            return None
+        evenement = self._annulables.pop()
+        self._retablissables.append(evenement)
+        return self._enregistrer(evenement.nom, evenement.precedent)
+    
+    def redo(self) -> Optional[ScoreEvent]:
+        """
+        Rétablit la dernière modification annulée.
+        
+        Returns:
+            L'événement de rétablissement, ou None s'il n'y a rien à rétablir
+        """
+        if not self._retablissables:
+            return None
+        evenement = self._retablissables.pop()
+        retabli = self._enregistrer(evenement.nom, evenement.score)
+        self._annulables.append(retabli)
+        return retabli
+    
+    def events_since(self, version: int) -> List[ScoreEvent]:
+        """Événements postérieurs à une version (persistance incrémentale du journal)."""
+        return self._journal[max(version, 0):]
+    
+    def state_at(self, version: Optional[int] = None) -> Dict[str, Score]:
+        """
+        Reconstruit les scores à une version donnée.
+        
+        L'état est reconstruit à partir de l'instantané le plus récent antérieur à la
+        version demandée, en rejouant les événements suivants.
+        
+        Args:
+            version: Version à reconstruire (la version courante par défaut)
+        
+        Returns:
+            Scores indexés par nom
+        """
+        version = self._version if version is None else version
+        if not 0 <= version <= self._version:
+            raise ValueError(f"Version inconnue : {version}")
+        
+        position = bisect.bisect_right([v for v, _ in self._instantanes], version) - 1
+        depart, scores = self._instantanes[position]
+        scores = dict(scores)
+        
+        for evenement in self._journal[depart:version]:
+            if evenement.score is None:
+                del scores[evenement.nom]
+            else:
+                scores[evenement.nom] = evenement.score
+        
+        return scores
+    
+    @classmethod
+    def from_events(cls, nom_test: str, evenements: Iterable[ScoreEvent], informateur: str = "",
+                    scores: Optional[Dict[str, Score]] = None) -> "ScoreManager":
+        """
+        Reconstruit un gestionnaire à partir d'un état initial et de son journal.
+        
+        Args:
+            nom_test: Nom du test
+            evenements: Événements du journal, dans l'ordre
+            informateur: Informateur éventuel
+            scores: État initial (instantané de la version 0)
+        
+        Returns:
+            Gestionnaire dans l'état de son dernier événement (sans historique d'annulation)
+        """
+        manager = cls(nom_test, dict(scores or {}), informateur)
+        for evenement in evenements:
+            if evenement.sequence != manager._version + 1:
+                raise ValueError(f"Journal discontinu : événement {evenement.sequence} "
+                                 f"après la version {manager._version}")
+            manager._enregistrer(evenement.nom, evenement.score)
+        return manager
     
     def get_score(self, nom: str) -> Optional[Score]:
         """Récupère un score par son nom."""
@@ -54,15 +215,18 @@ class ScoreManager:
     
     def get_valid_scores(self) -> List[Score]:
         """Retourne la liste des scores valides."""
-        return [s for s in self.scores.values() if s.is_valid()]
+        return list(self._valides())
     
     def has_scores(self) -> bool:
         """Vérifie si au moins un score est renseigné."""
-        return len(self.get_valid_scores()) > 0
+        return len(self._valides()) > 0
     
     def get_scores_by_type(self, score_type: ScoreType) -> List[Score]:
         """Retourne les scores d'un type donné."""
-        return [s for s in self.get_valid_scores() if s.type_score == score_type]
+        return list(self._mettre_en_cache(
+            ("type", score_type), None,
+            lambda: tuple(s for s in self._valides() if s.type_score == score_type)
+        ))
     
     def calculate_profile_heterogeneity(self, score_names: List[str]) -> Dict[str, any]:
         """
@@ -71,6 +235,13 @@ class ScoreManager:
         Returns:
             Dict contenant 'is_homogeneous', 'ecart_max', 'scores_min', 'scores_max'
         """
+        noms = tuple(score_names)
+        resultat = self._mettre_en_cache(
+            ("heterogeneite", noms), frozenset(noms), lambda: self._heterogeneite(noms)
+        )
+        return {**resultat, 'scores_min': list(resultat['scores_min']), 'scores_max': list(resultat['scores_max'])}
+    
+    def _heterogeneite(self, score_names: Tuple[str, ...]) -> Dict[str, any]:
         from config.constants import HETEROGENEITE_SEUIL
         
         valid_scores = []
@@ -102,14 +273,79 @@ class ScoreManager:
             'scores_max': scores_max
         }
     
+    def _valides(self) -> Tuple[Score, ...]:
+        """Scores valides (tuple partagé, en cache)."""
+        return self._mettre_en_cache(
+            ("valides",), None, lambda: tuple(s for s in self.scores.values() if s.is_valid())
+        )
+    
+    def _mettre_en_cache(self, cle: Tuple, dependances: Optional[FrozenSet[str]], calcul: Callable[[], Any]) -> Any:
+        """Retourne une statistique en cache, en la calculant si elle a été invalidée."""
+        entree = self._cache.get(cle)
+        if entree is None:
+            entree = (dependances, calcul())
+            self._cache[cle] = entree
+        return entree[1]
+    
+    def _enregistrer(self, nom: str, score: Optional[Score]) -> ScoreEvent:
+        """Applique une modification (score None : retrait) et la consigne dans le journal."""
+        precedent = self.scores.get(nom)
+        if score is None:
+            del self.scores[nom]
+            operation = RETRAIT
+        else:
+            self.scores[nom] = score
+            operation = AJOUT if precedent is None else MODIFICATION
+        self._invalider(nom)
+        
+        evenement = ScoreEvent(self._version + 1, operation, nom, score, precedent)
+        self._journal.append(evenement)
+        if evenement.sequence % INTERVALLE_INSTANTANE == 0:
+            self._instantanes.append((evenement.sequence, dict(self.scores)))
+        
+        # Les abonnés sont prévenus une fois l'événement consigné
+        self._signaler(nom)
+        
+        return evenement
+    
+    def _invalider(self, nom: str) -> None:
+        """Invalide les statistiques dépendant d'un score."""
+        for cle, (dependances, _) in list(self._cache.items()):
+            if dependances is None or nom in dependances:
+                del self._cache[cle]
+    
     def to_dict(self) -> Dict:
-        """Convertit le gestionnaire en dictionnaire."""
+        """
+        Convertit le gestionnaire en dictionnaire (sans perte, scores non renseignés inclus).
+        
+        Les scores sont stockés par colonnes : une liste par champ de Score, dans l'ordre
+        des scores du gestionnaire (voir utils.serialization).
+        """
+        scores = list(self.scores.values())
         return {
             'nom_test': self.nom_test,
-            'scores': {nom: {
-                'valeur': score.valeur,
-                'classification': score.classification,
-                'percentile': score.percentile,
-                'interpretation': score.interpretation
-            } for nom, score in self.scores.items() if score.is_valid()}
+            'informateur': self.informateur,
+            'scores': {
+                'nom': [s.nom for s in scores],
+                'valeur': [s.valeur for s in scores],
+                'type_score': [s.type_score.value for s in scores],
+                'domaine': [s.domaine for s in scores],
+                'percentile': [s.percentile for s in scores],
+                'classification': [s.classification for s in scores],
+                'interpretation': [s.interpretation for s in scores]
+            }
         }
+    
+    @classmethod
+    def from_dict(cls, donnees: Dict) -> "ScoreManager":
+        """Reconstruit un gestionnaire à partir de to_dict (état initial, sans journal)."""
+        colonnes = donnees['scores']
+        types = {t.value: t for t in ScoreType}
+        scores = [
+            Score(nom, valeur, types[type_score], domaine, percentile, classification, interpretation)
+            for nom, valeur, type_score, domaine, percentile, classification, interpretation in zip(
+                colonnes['nom'], colonnes['valeur'], colonnes['type_score'], colonnes['domaine'],
+                colonnes['percentile'], colonnes['classification'], colonnes['interpretation']
+            )
+        ]
+        return cls(donnees['nom_test'], {s.nom: s for s in scores}, donnees.get('informateur', ""))
@@ -8,5 +8,6 @@ __all__ = [
     'kabc_ii',
     'attention',
     'comportement',
-    'rapport'
+    'rapport',
+    'cohorte'
 ]
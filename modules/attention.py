@@ -6,6 +6,8 @@ import streamlit as st
 import pandas as pd
 from models.scores import Score, ScoreManager, ScoreType
 from models.interpretations import get_classification, interprete_score
+from modules.saisie import case_renseigne, champ_score
+from modules.vues import vue_derivee
 from config.constants import TEACH_STRUCTURE, NEPSY_II_STRUCTURE
 
 
@@ -28,17 +30,10 @@ def render_attention_module():
                 col1, col2 = st.columns([2, 1])
                 
                 with col1:
-                    valeur = st.number_input(
-                        subtest,
-                        min_value=1,
-                        max_value=19,
-                        value=10,
-                        step=1,
-                        key=f"teach_{subtest.replace(' ', '_')}"
-                    )
+                    valeur = champ_score(subtest, teach_manager, subtest, f"teach_{subtest.replace(' ', '_')}", 10, 1, 19)
                 
                 with col2:
-                    renseigne = st.checkbox("✓", key=f"teach_{subtest.replace(' ', '_')}_renseigne")
+                    renseigne = case_renseigne("✓", teach_manager, subtest, f"teach_{subtest.replace(' ', '_')}_renseigne")
                 
                 if renseigne:
                     classification, _ = get_classification(valeur, ScoreType.SCALAIRE)
@@ -61,17 +56,8 @@ def render_attention_module():
         
         # Tableau récapitulatif
         with st.expander("📋 Tableau Récapitulatif TEA-Ch"):
-            valid_scores = teach_manager.get_valid_scores()
-            if valid_scores:
-                df_data = []
-                for score in valid_scores:
-                    df_data.append({
-                        "Subtest": score.nom,
-                        "Score": int(score.valeur),
-                        "Classification": score.classification
-                    })
-                df = pd.DataFrame(df_data)
-                st.dataframe(df, use_container_width=True)
+            df = vue_derivee("recapitulatif_teach", [teach_manager], lambda: _tableau_recapitulatif(teach_manager))
+            st.dataframe(df, use_container_width=True)
     
     st.session_state.teach_manager = teach_manager
     
@@ -89,17 +75,10 @@ def render_attention_module():
                 col1, col2 = st.columns([2, 1])
                 
                 with col1:
-                    valeur = st.number_input(
-                        subtest,
-                        min_value=1,
-                        max_value=19,
-                        value=10,
-                        step=1,
-                        key=f"nepsy_{subtest.replace(' ', '_')}"
-                    )
+                    valeur = champ_score(subtest, nepsy_manager, subtest, f"nepsy_{subtest.replace(' ', '_')}", 10, 1, 19)
                 
                 with col2:
-                    renseigne = st.checkbox("✓", key=f"nepsy_{subtest.replace(' ', '_')}_renseigne")
+                    renseigne = case_renseigne("✓", nepsy_manager, subtest, f"nepsy_{subtest.replace(' ', '_')}_renseigne")
                 
                 if renseigne:
                     classification, _ = get_classification(valeur, ScoreType.SCALAIRE)
@@ -122,16 +101,19 @@ def render_attention_module():
         
         # Tableau récapitulatif
         with st.expander("📋 Tableau Récapitulatif NEPSY-II"):
-            valid_scores = nepsy_manager.get_valid_scores()
-            if valid_scores:
-                df_data = []
-                for score in valid_scores:
-                    df_data.append({
-                        "Subtest": score.nom,
-                        "Score": int(score.valeur),
-                        "Classification": score.classification
-                    })
-                df = pd.DataFrame(df_data)
-                st.dataframe(df, use_container_width=True)
+            df = vue_derivee("recapitulatif_nepsy_ii", [nepsy_manager], lambda: _tableau_recapitulatif(nepsy_manager))
+            st.dataframe(df, use_container_width=True)
     
     st.session_state.nepsy_ii_manager = nepsy_manager
+
+
+def _tableau_recapitulatif(manager: ScoreManager) -> pd.DataFrame:
+    """Tableau récapitulatif des subtests renseignés."""
+    return pd.DataFrame([
+        {
+            "Subtest": score.nom,
+            "Score": int(score.valeur),
+            "Classification": score.classification
+        }
+        for score in manager.get_valid_scores()
+    ])
@@ -0,0 +1,183 @@
+"""
+Sauvegarde automatique de l'évaluation en cours et reprise d'un brouillon.
+"""
+
+import uuid
+from typing import Dict, Tuple
+
+import streamlit as st
+
+from models.patient import Patient, Anamnese
+from models.scores import ScoreManager
+from utils.autosave import Autosaver, Draft, delete_draft, list_drafts
+from utils.serialization import Case
+from utils.vault import ClinicCipher, load_key
+
+
+# Batteries de la session : clé de batterie -> clé du gestionnaire dans la session
+BATTERIES_SESSION = {
+    "wisc_v": "wisc_v_manager",
+    "kabc_ii": "kabc_ii_manager",
+    "teach": "teach_manager",
+    "nepsy_ii": "nepsy_ii_manager",
+    "brown": "brown_manager",
+    "conners_parent": "conners_parent_manager",
+    "conners_teacher": "conners_teacher_manager"
+}
+
+
+@st.cache_resource
+def get_clinic_cipher() -> ClinicCipher:
+    """Retourne le chiffrement du cabinet (clé locale créée au premier usage)."""
+    return ClinicCipher(load_key())
+
+
+def get_autosaver() -> Autosaver:
+    """Retourne la sauvegarde automatique de la session (un brouillon chiffré par évaluation)."""
+    if 'autosave' not in st.session_state:
+        st.session_state.autosave = Autosaver(uuid.uuid4().hex, chiffrement=get_clinic_cipher())
+    return st.session_state.autosave
+
+
+def sauvegarder_brouillon():
+    """
+    Capture l'évaluation en cours pour la sauvegarde automatique.
+
+    Appelée à la fin de chaque exécution de la page ; l'écriture sur disque a lieu en
+    arrière-plan. Une évaluation encore vide n'est pas sauvegardée.
+    """
+    case = Case(
+        st.session_state.get('patient') or Patient(),
+        st.session_state.get('anamnese') or Anamnese(),
+        _managers_session()
+    )
+
+    if case.patient.format_nom_complet() or case.anamnese.has_content() or any(
+            m.scores for m in case.managers.values()):
+        get_autosaver().capture(case)
+
+
+def abandonner_brouillon():
+    """Supprime le brouillon de la session (nouvelle évaluation)."""
+    if 'autosave' in st.session_state:
+        st.session_state.autosave.discard()
+
+
+def render_reprise_brouillon():
+    """Propose de reprendre le dernier brouillon non terminé, au démarrage d'une session."""
+    if st.session_state.get('brouillon_verifie'):
+        return
+
+    brouillons = list_drafts(exclure=get_autosaver().identifiant, chiffrement=get_clinic_cipher())
+    if not brouillons:
+        st.session_state.brouillon_verifie = True
+        return
+
+    brouillon = brouillons[0]
+    nom = brouillon.case.patient.format_nom_complet() or "patient non renseigné"
+    st.warning(f"📝 Évaluation non terminée ({nom}, {brouillon.modifie_le.strftime('%d/%m/%Y %H:%M')})")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        if st.button("Reprendre", use_container_width=True):
+            restaurer_brouillon(brouillon)
+            st.rerun()
+
+    with col2:
+        if st.button("Ignorer", use_container_width=True):
+            delete_draft(brouillon.identifiant)
+            st.rerun()
+
+
+def restaurer_brouillon(brouillon: Draft):
+    """Restaure un brouillon dans la session ; le brouillon continue d'être mis à jour."""
+    case = brouillon.case
+
+    abandonner_brouillon()
+    st.session_state.autosave = Autosaver(brouillon.identifiant, chiffrement=get_clinic_cipher())
+    st.session_state.patient = case.patient
+    st.session_state.anamnese = case.anamnese
+
+    informateurs = st.session_state.setdefault('conners_informateurs', {})
+
+    for cle, manager in case.managers.items():
+        st.session_state[BATTERIES_SESSION.get(cle, f"{cle}_manager")] = manager
+        if cle not in BATTERIES_SESSION:
+            informateurs[cle] = manager.informateur
+        _renseigner_widgets(cle, manager)
+
+    st.session_state.brouillon_verifie = True
+
+
+def fusionner_scores(managers: Dict[str, ScoreManager]) -> int:
+    """
+    Ajoute des scores (ex: importés) aux gestionnaires de la session.
+
+    Les informateurs Conners-3 supplémentaires sont rapprochés par leur libellé.
+
+    Returns:
+        Nombre de scores ajoutés ou modifiés
+    """
+    informateurs = st.session_state.setdefault('conners_informateurs', {})
+    n_scores = 0
+
+    for cle, manager in managers.items():
+        if cle not in BATTERIES_SESSION:
+            cle = next((c for c, label in informateurs.items() if label == manager.informateur),
+                       f"conners_{len(informateurs) + 1}")
+            informateurs[cle] = manager.informateur
+
+        cle_session = BATTERIES_SESSION.get(cle, f"{cle}_manager")
+        if cle_session not in st.session_state:
+            st.session_state[cle_session] = ScoreManager(manager.nom_test, informateur=manager.informateur)
+
+        session = st.session_state[cle_session]
+        version = session.version
+        for score in manager.get_valid_scores():
+            session.add_score(score)
+        n_scores += session.version - version
+        _renseigner_widgets(cle, manager)
+
+    return n_scores
+
+
+def _managers_session() -> Dict[str, ScoreManager]:
+    """Gestionnaires de scores de la session, par clé de batterie."""
+    managers = {cle: st.session_state[cle_session] for cle, cle_session in BATTERIES_SESSION.items()
+                if cle_session in st.session_state}
+
+    for cle in st.session_state.get('conners_informateurs', {}):
+        if f'{cle}_manager' in st.session_state:
+            managers[cle] = st.session_state[f'{cle}_manager']
+
+    return managers
+
+
+def _renseigner_widgets(cle: str, manager: ScoreManager):
+    """Reporte les scores dans les champs de saisie, y compris ceux déjà créés (voir modules.saisie)."""
+    for score in manager.get_valid_scores():
+        cle_valeur, cle_renseigne = _cles_widgets(cle, score.nom)
+        st.session_state[cle_valeur] = score.valeur
+        st.session_state[cle_renseigne] = True
+
+
+def _cles_widgets(batterie: str, nom: str) -> Tuple[str, str]:
+    """Clés de session de la saisie d'un score (valeur, case « Renseigné ») dans les modules."""
+    if batterie == "wisc_v":
+        if "_" in nom:
+            _, subtest = nom.split("_", 1)
+            cle = f"wisc_v_subtest_{subtest.replace(' ', '_')}"
+        else:
+            cle = f"wisc_v_{nom}"
+    elif batterie == "kabc_ii":
+        cle = f"kabc_ii_{nom}"
+    elif batterie == "teach":
+        cle = f"teach_{nom.replace(' ', '_')}"
+    elif batterie == "nepsy_ii":
+        cle = f"nepsy_{nom.replace(' ', '_')}"
+    else:
+        # Brown et Conners-3 (un préfixe par informateur)
+        cle = f"{batterie}_{nom.replace(' ', '_').replace('/', '_')}"
+
+    return cle, f"{cle}_renseigne"
@@ -0,0 +1,176 @@
+"""
+Module UI pour les statistiques de cohorte.
+"""
+
+from datetime import date, datetime
+
+import streamlit as st
+import numpy as np
+import plotly.graph_objects as go
+from modules.rapport import get_case_store
+from modules.brouillon import get_clinic_cipher
+from utils.cohort import CohortAnalytics, CohortStatistics, BORNES_HISTOGRAMME, prevalence_pivot
+from utils.export import FORMATS_EXPORT, export_scores
+from config.settings import DOSSIER_EXPORTS
+
+
+# Batteries proposées à l'export (motif GLOB -> libellé)
+BATTERIES_EXPORT = {
+    "wisc_v": "WISC-V",
+    "kabc_ii": "K-ABC II",
+    "teach": "TEA-Ch",
+    "nepsy_ii": "NEPSY-II",
+    "brown": "Brown",
+    "conners_*": "Conners-3"
+}
+
+
+def render_cohorte_module():
+    """Affiche le tableau de bord des statistiques de cohorte."""
+    
+    st.title("📊 Statistiques de Cohorte")
+    
+    st.info("💡 Statistiques calculées sur l'ensemble des évaluations enregistrées dans l'historique")
+    
+    revision = get_case_store().get_revision()
+    n_evaluations = revision[0]
+    
+    if not n_evaluations:
+        st.warning("⚠️ Aucune évaluation enregistrée. Enregistrez des évaluations depuis la page de génération du rapport.")
+        return
+    
+    # Les statistiques ne sont recalculées que si l'historique a changé
+    stats = compute_cohort_statistics(revision)
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Évaluations", n_evaluations)
+    
+    with col2:
+        st.metric("Profils WISC-V", stats.n_profils)
+    
+    with col3:
+        taux = stats.taux_heterogeneite
+        st.metric("Profils hétérogènes", f"{taux:.1%}" if taux is not None else "-")
+    
+    # WISC-V
+    st.subheader("🧠 Distribution des Indices WISC-V")
+    
+    distribution = stats.distribution_wisc()
+    
+    if distribution.empty:
+        st.info("Aucun indice WISC-V enregistré")
+    else:
+        st.dataframe(distribution, use_container_width=True)
+        
+        indice = st.selectbox("Indice", distribution["Indice"].tolist(), key="cohorte_indice")
+        render_histogramme_chart(stats, indice)
+        
+        with st.expander("Répartition par classification"):
+            st.dataframe(stats.classifications_wisc(), use_container_width=True)
+    
+    # Conners-3
+    st.subheader("📝 Prévalence des Échelles Conners-3 Significatives")
+    
+    if stats.conners_par_age.empty:
+        st.info("Aucune cotation Conners-3 enregistrée")
+    else:
+        tab_age, tab_classe = st.tabs(["Par âge", "Par classe"])
+        
+        with tab_age:
+            render_prevalence_heatmap(prevalence_pivot(stats.conners_par_age), "Âge")
+        
+        with tab_classe:
+            render_prevalence_heatmap(prevalence_pivot(stats.conners_par_classe), "Classe")
+    
+    # Export
+    with st.expander("📤 Export des Scores pour la Recherche", expanded=False):
+        render_export()
+
+
+@st.cache_data(max_entries=1)
+def compute_cohort_statistics(revision: tuple) -> CohortStatistics:
+    """Calcule les statistiques de cohorte (mises en cache pour une révision de l'historique)."""
+    return CohortAnalytics(get_case_store()).compute()
+
+
+def render_export():
+    """Exporte les scores de l'historique (Parquet ou CSV) dans le dossier des exports."""
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        format_export = st.radio("Format", list(FORMATS_EXPORT), horizontal=True,
+                                 key="export_format")
+        batteries = st.multiselect("Batteries (toutes si aucune)", list(BATTERIES_EXPORT),
+                                   format_func=BATTERIES_EXPORT.get, key="export_batteries")
+    
+    with col2:
+        debut = st.date_input("Examens à partir du", value=None, min_value=date(2000, 1, 1),
+                              format="DD/MM/YYYY", key="export_debut")
+        fin = st.date_input("Examens jusqu'au", value=None, min_value=date(2000, 1, 1),
+                            format="DD/MM/YYYY", key="export_fin")
+    
+    chiffrer = st.checkbox("Chiffrer le fichier avec la clé du cabinet", value=True, key="export_chiffrer")
+    
+    if st.button("📤 Exporter", use_container_width=True):
+        chemin = DOSSIER_EXPORTS / f"scores_{datetime.now():%Y%m%d_%H%M%S}.{FORMATS_EXPORT[format_export]}"
+        with st.spinner("Export en cours..."):
+            try:
+                bilan = export_scores(get_case_store(), chemin, format_export, debut, fin, batteries or None,
+                                      chiffrement=get_clinic_cipher() if chiffrer else None)
+            except (OSError, ValueError) as e:
+                st.error(f"❌ {str(e)}")
+                return
+        st.success(f"✅ {bilan.n_scores} scores de {bilan.n_evaluations} évaluations exportés dans {bilan.chemin}")
+
+
+def render_histogramme_chart(stats: CohortStatistics, indice: str):
+    """Génère l'histogramme d'un indice WISC-V."""
+    
+    valeurs = np.arange(BORNES_HISTOGRAMME[0], BORNES_HISTOGRAMME[1] + 1)
+    
+    fig = go.Figure(go.Bar(
+        x=valeurs,
+        y=stats.histogrammes_wisc[indice],
+        marker_color='#1f77b4',
+        hovertemplate='Score %{x}<br>Effectif: %{y}<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        title=f"Distribution de l'indice {indice}",
+        xaxis_title="Score Standard",
+        yaxis_title="Effectif",
+        xaxis=dict(range=list(BORNES_HISTOGRAMME)),
+        height=400,
+        showlegend=False
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def render_prevalence_heatmap(tableau, label_groupe: str):
+    """Génère une carte de chaleur des prévalences (groupes × échelles)."""
+    
+    fig = go.Figure(go.Heatmap(
+        z=tableau.to_numpy() * 100,
+        x=tableau.columns.tolist(),
+        y=[str(g) for g in tableau.index],
+        colorscale="Reds",
+        zmin=0,
+        zmax=100,
+        hovertemplate=f'{label_groupe} %{{y}}<br>%{{x}}<br>Prévalence: %{{z:.0f}}%<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        xaxis_title="Échelle",
+        yaxis_title=label_groupe,
+        yaxis_type="category",
+        height=450,
+        xaxis_tickangle=-45
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.dataframe(tableau.style.format("{:.0%}"), use_container_width=True)
@@ -3,10 +3,14 @@ Module UI pour les questionnaires comportementaux (Brown et Conners-3).
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 from models.scores import Score, ScoreManager, ScoreType
 from models.interpretations import get_classification, interprete_score, est_cliniquement_significatif
-from config.constants import BROWN_ECHELLES, CONNERS_3_ECHELLES
+from utils.informants import InformantComparison, libelles_distincts
+from modules.saisie import case_renseigne, champ_score
+from modules.vues import vue_derivee
+from config.constants import BROWN_ECHELLES, CONNERS_3_ECHELLES, CONNERS_3_TYPES_INFORMATEURS
 
 
 def render_comportement_module():
@@ -27,17 +31,10 @@ def render_comportement_module():
             col1, col2 = st.columns([2, 1])
             
             with col1:
-                valeur = st.number_input(
-                    echelle,
-                    min_value=20,
-                    max_value=80,
-                    value=50,
-                    step=1,
-                    key=f"brown_{echelle.replace(' ', '_').replace('/', '_')}"
-                )
+                valeur = champ_score(echelle, brown_manager, echelle, f"brown_{echelle.replace(' ', '_').replace('/', '_')}", 50, 20, 80)
             
             with col2:
-                renseigne = st.checkbox("✓", key=f"brown_{echelle.replace(' ', '_').replace('/', '_')}_renseigne")
+                renseigne = case_renseigne("✓", brown_manager, echelle, f"brown_{echelle.replace(' ', '_').replace('/', '_')}_renseigne")
             
             if renseigne:
                 classification, _ = get_classification(valeur, ScoreType.T_SCORE)
@@ -64,101 +61,137 @@ def render_comportement_module():
         
         # Tableau récapitulatif
         with st.expander("📋 Tableau Récapitulatif Brown"):
-            valid_scores = brown_manager.get_valid_scores()
-            if valid_scores:
-                df_data = []
-                for score in valid_scores:
-                    significatif = est_cliniquement_significatif(score.valeur, ScoreType.T_SCORE)
-                    df_data.append({
-                        "Échelle": score.nom,
-                        "Score T": int(score.valeur),
-                        "Classification": score.classification,
-                        "Significatif": "⚠️ Oui" if significatif else "Non"
-                    })
-                df = pd.DataFrame(df_data)
-                st.dataframe(df, use_container_width=True)
+            df = vue_derivee("recapitulatif_brown", [brown_manager], lambda: _tableau_recapitulatif(brown_manager))
+            st.dataframe(df, use_container_width=True)
     
     st.session_state.brown_manager = brown_manager
     
     # Conners-3
     st.header("🔴 Échelle Conners-3")
     
-    st.info("💡 Renseignez les scores pour les versions Parent ET Enseignant si disponibles")
+    st.info("💡 Renseignez les scores pour les versions Parent ET Enseignant si disponibles, "
+            "ainsi que tout informateur supplémentaire (second parent, autres enseignants, auto-questionnaire)")
+    
+    if 'conners_informateurs' not in st.session_state:
+        st.session_state.conners_informateurs = {}
     
     # Conners-3 Parent
     st.subheader("👨‍👩‍👧 Version Parent")
+    conners_parent = _render_conners_informant("conners_parent", "Parent", "Conners-3 Parent")
     
-    if 'conners_parent_manager' not in st.session_state:
-        st.session_state.conners_parent_manager = ScoreManager("Conners-3 Parent")
+    # Conners-3 Enseignant
+    st.subheader("👨‍🏫 Version Enseignant")
+    conners_teacher = _render_conners_informant("conners_teacher", "Enseignant", "Conners-3 Enseignant")
     
-    conners_parent = st.session_state.conners_parent_manager
+    libelles = ["Parent", "Enseignant"]
+    informateurs = [conners_parent, conners_teacher]
     
-    with st.expander("Échelles Conners-3 Parent (Scores T)", expanded=False):
-        for echelle in CONNERS_3_ECHELLES:
-            col1, col2 = st.columns([2, 1])
-            
-            with col1:
-                valeur = st.number_input(
-                    echelle,
-                    min_value=20,
-                    max_value=80,
-                    value=50,
-                    step=1,
-                    key=f"conners_parent_{echelle.replace(' ', '_').replace('/', '_')}"
-                )
+    # Informateurs supplémentaires
+    for cle, label in st.session_state.conners_informateurs.items():
+        st.subheader(f"👤 Version {label}")
+        libelles.append(label)
+        informateurs.append(_render_conners_informant(cle, label, f"Conners-3 {label}"))
+    
+    # Libellés numérotés si plusieurs informateurs portent le même (import, dossier restauré)
+    raters = dict(zip(libelles_distincts(libelles), informateurs))
+    
+    with st.expander("➕ Ajouter un informateur"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            type_informateur = st.selectbox("Type d'informateur", CONNERS_3_TYPES_INFORMATEURS,
+                                            key="conners_nouvel_informateur_type")
+        
+        with col2:
+            precision = st.text_input("Précision (ex: père, professeur de français)",
+                                      key="conners_nouvel_informateur_precision")
+        
+        if st.button("Ajouter l'informateur", key="conners_ajouter_informateur"):
+            label = f"{type_informateur} ({precision.strip()})" if precision.strip() else type_informateur
             
-            with col2:
-                renseigne = st.checkbox("✓", key=f"conners_parent_{echelle.replace(' ', '_').replace('/', '_')}_renseigne")
+            if label in libelles:
+                st.warning(f"⚠️ L'informateur « {label} » existe déjà")
+            else:
+                cle = f"conners_{len(st.session_state.conners_informateurs) + 1}"
+                st.session_state.conners_informateurs[cle] = label
+                st.rerun()
+    
+    # Comparaison entre informateurs
+    raters = {label: manager for label, manager in raters.items() if manager.has_scores()}
+    
+    if len(raters) >= 2:
+        st.subheader(f"🔍 Comparaison {' / '.join(raters)}")
+        
+        with st.expander("Analyse Croisée"):
+            comparaison = vue_derivee(
+                "comparaison_conners", list(raters.values()),
+                lambda: InformantComparison.from_managers(raters, CONNERS_3_ECHELLES)
+            )
+            comparables = comparaison.echelles_comparables
             
-            if renseigne:
-                classification, _ = get_classification(valeur, ScoreType.T_SCORE)
-                interpretation = interprete_score(valeur, ScoreType.T_SCORE, echelle.lower())
-                significatif = est_cliniquement_significatif(valeur, ScoreType.T_SCORE)
+            if comparables.any():
+                etendues = comparaison.etendues()
+                divergences = comparaison.mask_divergences()
                 
-                score = Score(
-                    nom=echelle,
-                    valeur=valeur,
-                    type_score=ScoreType.T_SCORE,
-                    domaine=echelle.lower(),
-                    classification=classification,
-                    interpretation=interpretation
+                df_comp = pd.DataFrame(
+                    comparaison.matrice[:, comparables].T,
+                    columns=[f"{label} (T)" for label in comparaison.informateurs]
                 )
-                conners_parent.add_score(score)
+                df_comp.insert(0, "Échelle", [e for e, c in zip(CONNERS_3_ECHELLES, comparables) if c])
+                df_comp["Écart"] = etendues[comparables].astype(int)
+                df_comp["Convergence"] = np.where(divergences[comparables], "⚠️ Divergent", "✅ Convergent")
+                st.dataframe(df_comp, use_container_width=True)
                 
-                if significatif:
-                    st.error(f"⚠️ **{classification}** - Cliniquement significatif")
+                if len(raters) > 2:
+                    df_paires = pd.DataFrame([
+                        {
+                            "Informateurs": " / ".join(paire['informateurs']),
+                            "Échelles communes": paire['n_echelles'],
+                            "Accord": f"{paire['accord']:.0%}",
+                            "Écart moyen": round(paire['ecart_moyen'], 1),
+                            "Corrélation": round(paire['correlation'], 2) if paire['correlation'] is not None else "-"
+                        }
+                        for paire in comparaison.statistiques_paires() if paire['n_echelles']
+                    ])
+                    st.markdown("**Accord par paire d'informateurs**")
+                    st.dataframe(df_paires, use_container_width=True)
+                
+                if divergences.any():
+                    st.warning(f"⚠️ {int(divergences.sum())} échelle(s) présentent des divergences notables entre les informateurs")
                 else:
-                    st.success(f"✅ {classification}")
-    
-    if conners_parent.has_scores():
-        st.success("✅ Scores Conners-3 Parent enregistrés")
-    
-    st.session_state.conners_parent_manager = conners_parent
-    
-    # Conners-3 Enseignant
-    st.subheader("👨‍🏫 Version Enseignant")
+                    st.success("✅ Convergence globale entre les informateurs")
+
+
+
+def _tableau_recapitulatif(manager: ScoreManager) -> pd.DataFrame:
+    """Tableau récapitulatif des échelles renseignées (significativité clinique incluse)."""
+    return pd.DataFrame([
+        {
+            "Échelle": score.nom,
+            "Score T": int(score.valeur),
+            "Classification": score.classification,
+            "Significatif": "⚠️ Oui" if est_cliniquement_significatif(score.valeur, ScoreType.T_SCORE) else "Non"
+        }
+        for score in manager.get_valid_scores()
+    ])
+
+def _render_conners_informant(cle: str, label: str, nom_test: str) -> ScoreManager:
+    """Affiche la saisie Conners-3 d'un informateur et retourne son gestionnaire."""
     
-    if 'conners_teacher_manager' not in st.session_state:
-        st.session_state.conners_teacher_manager = ScoreManager("Conners-3 Enseignant")
+    if f'{cle}_manager' not in st.session_state:
+        st.session_state[f'{cle}_manager'] = ScoreManager(nom_test, informateur=label)
     
-    conners_teacher = st.session_state.conners_teacher_manager
+    manager = st.session_state[f'{cle}_manager']
     
-    with st.expander("Échelles Conners-3 Enseignant (Scores T)", expanded=False):
+    with st.expander(f"Échelles Conners-3 {label} (Scores T)", expanded=False):
         for echelle in CONNERS_3_ECHELLES:
             col1, col2 = st.columns([2, 1])
             
             with col1:
-                valeur = st.number_input(
-                    echelle,
-                    min_value=20,
-                    max_value=80,
-                    value=50,
-                    step=1,
-                    key=f"conners_teacher_{echelle.replace(' ', '_').replace('/', '_')}"
-                )
+                valeur = champ_score(echelle, manager, echelle, f"{cle}_{echelle.replace(' ', '_').replace('/', '_')}", 50, 20, 80)
             
             with col2:
-                renseigne = st.checkbox("✓", key=f"conners_teacher_{echelle.replace(' ', '_').replace('/', '_')}_renseigne")
+                renseigne = case_renseigne("✓", manager, echelle, f"{cle}_{echelle.replace(' ', '_').replace('/', '_')}_renseigne")
             
             if renseigne:
                 classification, _ = get_classification(valeur, ScoreType.T_SCORE)
@@ -173,47 +206,16 @@ def render_comportement_module():
                     classification=classification,
                     interpretation=interpretation
                 )
-                conners_teacher.add_score(score)
+                manager.add_score(score)
                 
                 if significatif:
                     st.error(f"⚠️ **{classification}** - Cliniquement significatif")
                 else:
                     st.success(f"✅ {classification}")
     
-    if conners_teacher.has_scores():
-        st.success("✅ Scores Conners-3 Enseignant enregistrés")
+    if manager.has_scores():
+        st.success(f"✅ Scores Conners-3 {label} enregistrés")
     
-    st.session_state.conners_teacher_manager = conners_teacher
+    st.session_state[f'{cle}_manager'] = manager
     
-    # Comparaison Parent vs Enseignant
-    if conners_parent.has_scores() and conners_teacher.has_scores():
-        st.subheader("🔍 Comparaison Parent / Enseignant")
-        
-        with st.expander("Analyse Croisée"):
-            comparison_data = []
-            
-            for echelle in CONNERS_3_ECHELLES:
-                score_parent = conners_parent.get_score(echelle)
-                score_teacher = conners_teacher.get_score(echelle)
-                
-                if score_parent and score_parent.is_valid() and score_teacher and score_teacher.is_valid():
-                    diff = abs(score_parent.valeur - score_teacher.valeur)
-                    convergence = "✅ Convergent" if diff < 10 else "⚠️ Divergent"
-                    
-                    comparison_data.append({
-                        "Échelle": echelle,
-                        "Parent (T)": int(score_parent.valeur),
-                        "Enseignant (T)": int(score_teacher.valeur),
-                        "Écart": int(diff),
-                        "Convergence": convergence
-                    })
-            
-            if comparison_data:
-                df_comp = pd.DataFrame(comparison_data)
-                st.dataframe(df_comp, use_container_width=True)
-                
-                divergents = [d for d in comparison_data if "Divergent" in d["Convergence"]]
-                if divergents:
-                    st.warning(f"⚠️ {len(divergents)} échelle(s) présentent des divergences notables entre les informateurs")
-                else:
-                    st.success("✅ Convergence globale entre les informateurs")
+    return manager
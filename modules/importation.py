@@ -0,0 +1,46 @@
+"""
+Module UI pour l'import des exports des logiciels de cotation.
+"""
+
+import streamlit as st
+from utils.importers import EXTENSIONS_IMPORT, read_exports, load_mapping
+from modules.brouillon import fusionner_scores
+
+
+def render_import_scores():
+    """Importe dans l'évaluation en cours les scores d'exports CSV ou XML des éditeurs."""
+    
+    fichiers = st.file_uploader(
+        "Exports des logiciels de cotation (CSV, XML)",
+        type=[extension.lstrip(".") for extension in EXTENSIONS_IMPORT],
+        accept_multiple_files=True,
+        key="import_exports"
+    )
+    
+    if fichiers and st.button("📥 Importer les scores", use_container_width=True):
+        try:
+            rapports = read_exports([(fichier, fichier.name) for fichier in fichiers], load_mapping())
+        except ValueError as e:
+            st.error(f"❌ {str(e)}")
+            return
+        
+        n_scores = 0
+        avertissements = []
+        for rapport in rapports:
+            n_scores += fusionner_scores(rapport.managers)
+            if rapport.non_reconnues:
+                avertissements.append(f"{rapport.source} : échelles non reconnues ({', '.join(rapport.non_reconnues)})")
+            avertissements.extend(f"{rapport.source} : {erreur}" for erreur in rapport.erreurs)
+        
+        # Bilan affiché après la nouvelle exécution de la page
+        st.session_state.import_bilan = (n_scores, avertissements)
+        st.rerun()
+    
+    if 'import_bilan' in st.session_state:
+        n_scores, avertissements = st.session_state.pop('import_bilan')
+        if n_scores:
+            st.success(f"✅ {n_scores} score(s) importé(s)")
+        else:
+            st.warning("⚠️ Aucun score importé")
+        for avertissement in avertissements:
+            st.warning(f"⚠️ {avertissement}")
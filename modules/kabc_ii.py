@@ -6,6 +6,8 @@ import streamlit as st
 import pandas as pd
 from models.scores import Score, ScoreManager, ScoreType
 from models.interpretations import get_classification, interprete_score
+from modules.saisie import case_renseigne, champ_score
+from modules.vues import vue_derivee
 from config.constants import KABC_II_STRUCTURE
 
 
@@ -31,17 +33,10 @@ def render_kabc_ii_module():
             col1, col2 = st.columns([2, 1])
             
             with col1:
-                valeur = st.number_input(
-                    f"Score {idx}",
-                    min_value=40,
-                    max_value=160,
-                    value=100,
-                    step=1,
-                    key=f"kabc_ii_{idx}"
-                )
+                valeur = champ_score(f"Score {idx}", manager, idx, f"kabc_ii_{idx}", 100, 40, 160)
             
             with col2:
-                renseigne = st.checkbox("Renseigné", key=f"kabc_ii_{idx}_renseigne")
+                renseigne = case_renseigne("Renseigné", manager, idx, f"kabc_ii_{idx}_renseigne")
             
             if renseigne:
                 classification, percentile = get_classification(valeur, ScoreType.STANDARD)
@@ -81,22 +76,25 @@ def render_kabc_ii_module():
         # Tableau récapitulatif
         st.subheader("📋 Tableau Récapitulatif")
         
-        valid_scores = manager.get_valid_scores()
+        df = vue_derivee("recapitulatif_kabc_ii", [manager], lambda: _tableau_recapitulatif(manager))
         
-        if valid_scores:
-            df_data = []
-            for score in valid_scores:
-                df_data.append({
-                    "Indice": score.nom,
-                    "Score": int(score.valeur),
-                    "Classification": score.classification,
-                    "Percentile": score.percentile or "-"
-                })
-            
-            df = pd.DataFrame(df_data)
+        if not df.empty:
             st.dataframe(df, use_container_width=True)
     
     st.session_state.kabc_ii_manager = manager
     
     if manager.has_scores():
         st.success("✅ Scores KABC-II enregistrés")
+
+
+def _tableau_recapitulatif(manager: ScoreManager) -> pd.DataFrame:
+    """Tableau récapitulatif des indices renseignés."""
+    return pd.DataFrame([
+        {
+            "Indice": score.nom,
+            "Score": int(score.valeur),
+            "Classification": score.classification,
+            "Percentile": score.percentile or "-"
+        }
+        for score in manager.get_valid_scores()
+    ])
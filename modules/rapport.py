@@ -2,11 +2,42 @@
 Module UI pour la génération du rapport.
 """
 
+from typing import Optional
+
 import streamlit as st
+import pandas as pd
 import plotly.graph_objects as go
-from utils.semantic_engine import generate_rapport_complet
+from utils.semantic_engine import SemanticEngine
+from utils.renderers import render_document, get_renderer
+from utils.document import Document
+from utils.revisions import ReportRevisions
+from utils.templates import TEMPLATE_STANDARD, VARIABLES_TEMPLATE, list_templates, load_template, save_template
+from utils.informants import InformantComparison, libelles_distincts
+from utils.case_store import CaseStore
+from utils.similarity import SimilarityIndex, embed_managers
+from utils.validation import validate_managers
+from utils.serialization import Case
+from utils.vault import CaseVault
+from modules.brouillon import get_clinic_cipher
+from modules.vues import vue_derivee
 from models.scores import ScoreType
 from models.interpretations import get_couleur_score, est_cliniquement_significatif
+from config.constants import CONNERS_3_ECHELLES, CONNERS_3_INFORMATEURS, LANGUES_RAPPORT, LANGUE_DEFAUT
+
+
+# Rédaction par le moteur sémantique, sans modèle personnalisé
+MODELE_STANDARD = "Standard"
+
+# Formats proposés au téléchargement (format de rendu -> libellé)
+FORMATS_TELECHARGEMENT = {
+    "markdown": "Markdown",
+    "html": "HTML",
+    "texte": "Texte brut"
+}
+
+
+# Couleurs des informateurs dans les graphiques de comparaison
+COULEURS_INFORMATEURS = ['#FF6B6B', '#4ECDC4', '#FFB347', '#6A5ACD', '#77DD77', '#C71585', '#1E90FF']
 
 
 def render_rapport_module():
@@ -46,6 +77,10 @@ def render_rapport_module():
     if 'conners_teacher_manager' in st.session_state:
         managers['conners_teacher'] = st.session_state.conners_teacher_manager
     
+    for cle in st.session_state.get('conners_informateurs', {}):
+        if f'{cle}_manager' in st.session_state:
+            managers[cle] = st.session_state[f'{cle}_manager']
+    
     # Vérifier qu'au moins un test a été complété
     has_tests = any(m.has_scores() for m in managers.values())
     
@@ -90,6 +125,40 @@ def render_rapport_module():
             
             if 'conners_teacher' in managers and managers['conners_teacher'].has_scores():
                 st.write(f"✅ Conners Enseignant ({len(managers['conners_teacher'].get_valid_scores())} scores)")
+            
+            for cle, label in st.session_state.get('conners_informateurs', {}).items():
+                if cle in managers and managers[cle].has_scores():
+                    st.write(f"✅ Conners {label} ({len(managers[cle].get_valid_scores())} scores)")
+    
+    # Historique du patient
+    st.subheader("🕑 Historique du Patient")
+    
+    store = get_case_store()
+    patient_id = patient.get_identifiant()
+    historique = store.get_history(patient_id, avant=patient.date_examen) if patient_id else []
+    
+    if not patient_id:
+        st.info("ℹ️ Renseignez le nom, le prénom et la date de naissance pour accéder à l'historique du patient")
+    elif historique:
+        dates = ", ".join(r.date_examen.strftime('%d/%m/%Y') for r in historique)
+        st.success(f"✅ {len(historique)} évaluation(s) antérieure(s) : {dates}. "
+                   "La comparaison avec la plus récente sera intégrée au rapport.")
+    else:
+        st.info("ℹ️ Aucune évaluation antérieure enregistrée pour ce patient")
+    
+    if patient_id and st.button("💾 Enregistrer l'évaluation dans l'historique", use_container_width=True):
+        try:
+            store.save_evaluation(patient, managers)
+            st.success("✅ Évaluation enregistrée dans l'historique")
+            for avertissement in validate_managers(managers).avertissements():
+                st.warning(f"⚠️ {avertissement.batterie} / {avertissement.echelle} : {avertissement.message}")
+        except ValueError as e:
+            st.error(f"❌ {str(e)}")
+    
+    # Cas similaires
+    with st.expander("🔎 Cas Similaires", expanded=False):
+        # Toutes les évaluations du patient sont exclues (y compris l'évaluation actuelle enregistrée)
+        render_similar_cases(store, managers, store.get_evaluation_ids(patient_id) if patient_id else [], patient_id)
     
     # Visualisations
     st.subheader("📈 Visualisations")
@@ -99,50 +168,301 @@ def render_rapport_module():
         with st.expander("Profil WISC-V", expanded=True):
             render_wisc_profile_chart(managers['wisc_v'])
     
-    # Graphique comparaison Conners
-    if ('conners_parent' in managers and managers['conners_parent'].has_scores() and
-        'conners_teacher' in managers and managers['conners_teacher'].has_scores()):
-        with st.expander("Comparaison Parent / Enseignant (Conners)", expanded=True):
-            render_conners_comparison_chart(managers['conners_parent'], managers['conners_teacher'])
+    # Graphique comparaison Conners (libellés numérotés si plusieurs informateurs portent le même)
+    informateurs = {
+        cle: manager for cle, manager in managers.items()
+        if cle.startswith('conners_') and manager.has_scores()
+    }
+    libelles = libelles_distincts(
+        manager.informateur or CONNERS_3_INFORMATEURS.get(cle) or manager.nom_test
+        for cle, manager in informateurs.items()
+    )
+    raters = dict(zip(libelles, informateurs.values()))
+    
+    if len(raters) >= 2:
+        with st.expander(f"Comparaison {' / '.join(raters)} (Conners)", expanded=True):
+            comparaison = vue_derivee(
+                "comparaison_conners_rapport", list(raters.values()),
+                lambda: InformantComparison.from_managers(raters, CONNERS_3_ECHELLES)
+            )
+            render_informant_comparison_chart(comparaison)
     
     # Génération du rapport
     st.subheader("📝 Rapport Clinique")
     
+    # Modèles personnalisés du clinicien
+    with st.expander("🧩 Modèles de Rapport", expanded=False):
+        render_template_editor()
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        langue = st.selectbox(
+            "Langue du rapport",
+            list(LANGUES_RAPPORT),
+            index=list(LANGUES_RAPPORT).index(st.session_state.get('rapport_langue', LANGUE_DEFAUT)),
+            format_func=lambda code: LANGUES_RAPPORT[code]["nom"]
+        )
+    
+    with col2:
+        modeles = [MODELE_STANDARD] + list_templates()
+        modele = st.selectbox(
+            "Modèle de rapport",
+            modeles,
+            index=modeles.index(st.session_state.get('rapport_modele', MODELE_STANDARD))
+            if st.session_state.get('rapport_modele') in modeles else 0
+        )
+    
     if st.button("🔄 Générer le Rapport", type="primary", use_container_width=True):
         with st.spinner("Génération du rapport en cours..."):
             try:
-                rapport = generate_rapport_complet(patient, anamnese, **managers)
-                
-                st.session_state.rapport_genere = rapport
+                # Le moteur conserve les analyses des scores pour les changements de langue ou de modèle
+                st.session_state.rapport_moteur = SemanticEngine(patient, anamnese, historique, **managers)
+                rediger_rapport(langue, modele, "Génération")
                 st.success("✅ Rapport généré avec succès !")
             
             except Exception as e:
                 st.error(f"❌ Erreur lors de la génération du rapport : {str(e)}")
                 return
     
+    elif 'rapport_moteur' in st.session_state and (langue, modele) != (st.session_state.get('rapport_langue'),
+                                                                      st.session_state.get('rapport_modele')):
+        # Changement de langue ou de modèle : nouvelle rédaction, sans nouvelle analyse des scores
+        # (sauf si des scores ont été modifiés depuis la génération)
+        if st.session_state.rapport_moteur.scores_modifies():
+            st.session_state.rapport_moteur = SemanticEngine(patient, anamnese, historique, **managers)
+        try:
+            rediger_rapport(langue, modele, f"Rédaction ({LANGUES_RAPPORT[langue]['nom']}, {modele})")
+        except ValueError as e:
+            st.error(f"❌ {e}")
+    
     # Affichage et téléchargement du rapport
-    if 'rapport_genere' in st.session_state:
+    if 'rapport_document' in st.session_state:
         st.markdown("---")
         
+        if st.session_state.rapport_moteur.donnees_modifiees():
+            st.warning("⚠️ Des données ont été modifiées depuis la génération : régénérez le rapport pour les prendre en compte.")
+        
+        revisions = st.session_state.rapport_revisions
+        
         # Aperçu du rapport
-        with st.expander("👁️ Aperçu du Rapport", expanded=False):
+        with st.expander(f"👁️ Aperçu du Rapport (version {revisions.courante.numero})", expanded=False):
             st.markdown(st.session_state.rapport_genere)
         
-        # Bouton de téléchargement
-        st.download_button(
-            label="📥 Télécharger le Rapport (Markdown)",
-            data=st.session_state.rapport_genere,
-            file_name=f"rapport_{patient.nom}_{patient.prenom}.md".replace(" ", "_"),
-            mime="text/markdown",
-            use_container_width=True
-        )
+        # Modification manuelle
+        with st.expander("✏️ Modifier le Rapport", expanded=False):
+            texte = st.text_area(
+                "Contenu Markdown",
+                value=st.session_state.rapport_genere,
+                height=500,
+                key=f"edition_rapport_{revisions.courante.numero}"
+            )
+            
+            if st.button("💾 Enregistrer les modifications", use_container_width=True):
+                if revisions.commit(texte, "Modification"):
+                    set_version_courante(revisions)
+                    st.rerun()
+                else:
+                    st.info("ℹ️ Aucune modification par rapport à la version courante")
+        
+        # Versions successives
+        if len(revisions) > 1:
+            with st.expander(f"🕑 Versions du Rapport ({len(revisions)})", expanded=False):
+                render_revisions(revisions)
+        
+        # Boutons de téléchargement (rendus à partir du document, sans nouvelle analyse)
+        nom_fichier = f"rapport_{patient.nom}_{patient.prenom}".replace(" ", "_")
+        colonnes = st.columns(len(FORMATS_TELECHARGEMENT))
+        
+        for colonne, (format_rapport, libelle) in zip(colonnes, FORMATS_TELECHARGEMENT.items()):
+            renderer = get_renderer(format_rapport)
+            donnees = (st.session_state.rapport_genere if format_rapport == "markdown"
+                       else renderer.render(st.session_state.rapport_document))
+            
+            with colonne:
+                st.download_button(
+                    label=f"📥 {libelle}",
+                    data=donnees,
+                    file_name=f"{nom_fichier}.{renderer.extension}",
+                    mime=renderer.mime,
+                    use_container_width=True
+                )
+        
+        st.info("💡 Le rapport est disponible en Markdown, en HTML (imprimable en PDF depuis le navigateur) "
+               "et en texte brut.")
+        
+        if st.button("🔒 Archiver le dossier et le rapport (coffre chiffré)", use_container_width=True):
+            try:
+                get_vault().save(Case(patient, anamnese, managers), st.session_state.rapport_genere)
+                st.success("✅ Dossier et rapport archivés dans le coffre chiffré")
+            except (OSError, ValueError) as e:
+                st.error(f"❌ {str(e)}")
+
+
+def rediger_rapport(langue: str, modele: str, origine: str):
+    """Rédige le rapport du moteur courant (langue, modèle) et l'enregistre comme nouvelle version."""
+    moteur = st.session_state.rapport_moteur
+    
+    if modele == MODELE_STANDARD:
+        document = moteur.generate_document(langue)
+    else:
+        document = load_template(modele).document(moteur, langue)
+    
+    revisions = st.session_state.setdefault('rapport_revisions', ReportRevisions())
+    revisions.commit(render_document(document, "markdown"), origine)
+    st.session_state.rapport_document = document
+    st.session_state.rapport_genere = revisions.texte()
+    st.session_state.rapport_langue = langue
+    st.session_state.rapport_modele = modele
+
+
+def render_template_editor():
+    """Édition et enregistrement d'un modèle de rapport (validé avant enregistrement)."""
+    
+    modeles = list_templates()
+    base = st.selectbox("Partir du modèle", ["Nouveau modèle"] + modeles)
+    source = TEMPLATE_STANDARD if base == "Nouveau modèle" else load_template(base).source
+    
+    nom = st.text_input("Nom du modèle", value="" if base == "Nouveau modèle" else base)
+    texte = st.text_area("Contenu (Markdown et balises Jinja2)", value=source, height=300,
+                         key=f"edition_modele_{base}")
+    
+    if st.checkbox("Afficher les variables disponibles"):
+        st.table(pd.DataFrame({"Variable": list(VARIABLES_TEMPLATE), "Contenu": list(VARIABLES_TEMPLATE.values())}))
+    
+    if st.button("💾 Enregistrer le modèle", use_container_width=True):
+        try:
+            save_template(nom, texte)
+            st.success(f"✅ Modèle « {nom} » enregistré")
+        except ValueError as e:
+            st.error(f"❌ {e}")
+
+
+def set_version_courante(revisions: ReportRevisions):
+    """Met à jour le texte et le document du rapport à partir de la dernière version."""
+    st.session_state.rapport_genere = revisions.texte()
+    st.session_state.rapport_document = Document.from_markdown(
+        st.session_state.rapport_genere, st.session_state.get('rapport_langue', LANGUE_DEFAUT)
+    )
+
+
+def render_revisions(revisions: ReportRevisions):
+    """Affiche les versions du rapport, leur comparaison par section et la restauration."""
+    
+    st.dataframe(pd.DataFrame([
+        {
+            "Version": r.numero,
+            "Origine": r.origine,
+            "Heure": r.horodatage.strftime('%H:%M:%S'),
+            "Lignes": r.n_lignes,
+            "Lignes stockées": r.n_lignes_stockees
+        }
+        for r in revisions
+    ]), use_container_width=True, hide_index=True)
+    
+    numeros = [r.numero for r in revisions]
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        ancienne = st.selectbox("Comparer la version", numeros, index=len(numeros) - 2)
+    
+    with col2:
+        nouvelle = st.selectbox("avec la version", numeros, index=len(numeros) - 1)
+    
+    differences = [d for d in revisions.diff(ancienne, nouvelle) if d.statut != "inchangée"]
+    
+    if not differences:
+        st.info("ℹ️ Les deux versions sont identiques")
+    
+    for difference in differences:
+        st.markdown(f"**{difference.titre or 'En-tête'}** — section {difference.statut}")
+        st.code("\n".join(difference.lignes), language="diff")
+    
+    st.markdown("---")
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        numero = st.selectbox("Version à restaurer", numeros[:-1], index=len(numeros) - 2)
+    
+    with col2:
+        st.write("")
+        if st.button("↩️ Restaurer", use_container_width=True):
+            revisions.restore(numero)
+            set_version_courante(revisions)
+            st.rerun()
+
+
+@st.cache_resource
+def get_case_store() -> CaseStore:
+    """Retourne l'historique des évaluations partagé entre les sessions."""
+    return CaseStore()
+
+
+@st.cache_resource
+def get_vault() -> CaseVault:
+    """Retourne le coffre chiffré des dossiers, partagé entre les sessions."""
+    return CaseVault(chiffrement=get_clinic_cipher())
+
+
+@st.cache_resource
+def get_similarity_index() -> SimilarityIndex:
+    """Retourne l'index des profils, construit une fois puis tenu à jour à chaque enregistrement."""
+    return SimilarityIndex.from_store(get_case_store())
+
+
+def render_similar_cases(store: CaseStore, managers: dict, exclure: list, patient_id: Optional[str] = None,
+                         k: int = 5):
+    """Affiche les évaluations enregistrées d'autres patients dont le profil est le plus proche de l'évaluation actuelle."""
+    index = get_similarity_index()
+    
+    if not len(index):
+        st.info("ℹ️ Aucune évaluation enregistrée dans l'historique")
+        return
+    
+    voisins = index.query(*embed_managers(managers), k=k, exclure=exclure)
+    
+    if not voisins:
+        st.info("ℹ️ Aucun profil comparable (au moins 3 échelles communes sont nécessaires)")
+        return
+    
+    evaluations = {r.id: r for r in store.get_evaluations([v.evaluation_id for v in voisins])}
+    lignes = []
+    
+    for voisin in voisins:
+        evaluation = evaluations.get(voisin.evaluation_id)
+        # Évaluation supprimée entre-temps, ou enregistrée pour ce patient depuis la requête
+        if evaluation is None or (patient_id is not None and evaluation.patient_id == patient_id):
+            continue
         
-        st.info("💡 Le rapport a été généré au format Markdown. Vous pouvez l'ouvrir avec un éditeur de texte "
-               "ou le convertir en PDF avec un outil comme Pandoc.")
+        qit = evaluation.managers['wisc_v'].get_score("IQT") if 'wisc_v' in evaluation.managers else None
+        lignes.append({
+            "Date": evaluation.date_examen.strftime('%d/%m/%Y'),
+            "Âge": evaluation.age,
+            "Classe": evaluation.classe or "",
+            "QIT": qit.valeur if qit and qit.is_valid() else None,
+            "Distance (z)": round(voisin.distance, 2),
+            "Échelles communes": voisin.n_communes
+        })
+    
+    st.dataframe(pd.DataFrame(lignes), use_container_width=True, hide_index=True)
+    st.caption("Distance : écart quadratique moyen des scores z sur les échelles communes aux deux évaluations.")
 
 
 def render_wisc_profile_chart(wisc_v_manager):
-    """Génère un graphique du profil WISC-V."""
+    """Affiche le graphique du profil WISC-V (reconstruit seulement si les scores WISC-V ont changé)."""
+    
+    fig = vue_derivee("graphique_wisc_v", [wisc_v_manager], lambda: _figure_profil_wisc(wisc_v_manager))
+    
+    if fig is None:
+        st.info("Aucun indice WISC-V renseigné")
+        return
+    
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def _figure_profil_wisc(wisc_v_manager) -> Optional[go.Figure]:
+    """Construit le graphique du profil WISC-V (None si aucun indice principal n'est renseigné)."""
     
     indices = ["ICV", "IVS", "IRF", "IMT", "IVT"]
     scores_data = []
@@ -157,8 +477,7 @@ def render_wisc_profile_chart(wisc_v_manager):
             colors.append(get_couleur_score(score.classification, ScoreType.STANDARD))
     
     if not scores_data:
-        st.info("Aucun indice WISC-V renseigné")
-        return
+        return None
     
     # Créer le graphique
     fig = go.Figure()
@@ -192,31 +511,21 @@ def render_wisc_profile_chart(wisc_v_manager):
         showlegend=False
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 
-def render_conners_comparison_chart(conners_parent, conners_teacher):
-    """Génère un graphique de comparaison Parent/Enseignant."""
-    
-    from config.constants import CONNERS_3_ECHELLES
+def render_informant_comparison_chart(comparaison: InformantComparison):
+    """Génère un graphique de comparaison entre informateurs (une série par informateur)."""
     
-    echelles = []
-    scores_parent = []
-    scores_teacher = []
+    comparables = comparaison.echelles_comparables
     
-    for echelle in CONNERS_3_ECHELLES:
-        score_p = conners_parent.get_score(echelle)
-        score_t = conners_teacher.get_score(echelle)
-        
-        if score_p and score_p.is_valid() and score_t and score_t.is_valid():
-            echelles.append(echelle)
-            scores_parent.append(score_p.valeur)
-            scores_teacher.append(score_t.valeur)
-    
-    if not echelles:
-        st.info("Pas de données comparables entre Parent et Enseignant")
+    if not comparables.any():
+        st.info("Pas de données comparables entre les informateurs")
         return
     
+    echelles = [e for e, c in zip(comparaison.echelles, comparables) if c]
+    matrice = comparaison.matrice[:, comparables]
+    
     fig = go.Figure()
     
     # Zones de référence
@@ -225,22 +534,16 @@ def render_conners_comparison_chart(conners_parent, conners_teacher):
     fig.add_hrect(y0=60, y1=65, fillcolor="lightyellow", opacity=0.1, line_width=0, annotation_text="Moyen Haut")
     fig.add_hrect(y0=40, y1=60, fillcolor="lightgreen", opacity=0.1, line_width=0, annotation_text="Moyen")
     
-    fig.add_trace(go.Bar(
-        x=echelles,
-        y=scores_parent,
-        name='Parent',
-        marker_color='#FF6B6B'
-    ))
-    
-    fig.add_trace(go.Bar(
-        x=echelles,
-        y=scores_teacher,
-        name='Enseignant',
-        marker_color='#4ECDC4'
-    ))
+    for i, informateur in enumerate(comparaison.informateurs):
+        fig.add_trace(go.Bar(
+            x=echelles,
+            y=matrice[i],
+            name=informateur,
+            marker_color=COULEURS_INFORMATEURS[i % len(COULEURS_INFORMATEURS)]
+        ))
     
     fig.update_layout(
-        title="Comparaison Parent / Enseignant - Conners-3",
+        title=f"Comparaison {' / '.join(comparaison.informateurs)} - Conners-3",
         xaxis_title="Échelle",
         yaxis_title="Score T",
         yaxis=dict(range=[30, 80]),
@@ -252,15 +555,13 @@ def render_conners_comparison_chart(conners_parent, conners_teacher):
     st.plotly_chart(fig, use_container_width=True)
     
     # Analyse des divergences
-    divergences = []
-    for i, echelle in enumerate(echelles):
-        diff = abs(scores_parent[i] - scores_teacher[i])
-        if diff >= 10:
-            divergences.append((echelle, diff))
-    
-    if divergences:
-        st.warning(f"⚠️ {len(divergences)} échelle(s) avec divergence(s) notable(s) (écart ≥10 points)")
-        for echelle, diff in divergences:
-            st.write(f"- {echelle}: écart de {diff:.0f} points")
+    divergences = comparaison.mask_divergences()
+    
+    if divergences.any():
+        etendues = comparaison.etendues()
+        st.warning(f"⚠️ {int(divergences.sum())} échelle(s) avec divergence(s) notable(s) "
+                   f"(écart ≥{comparaison.seuil:.0f} points)")
+        for j in divergences.nonzero()[0]:
+            st.write(f"- {comparaison.echelles[j]}: écart de {etendues[j]:.0f} points")
     else:
         st.success("✅ Bonne convergence entre les informateurs")
@@ -0,0 +1,48 @@
+"""
+Champs de saisie des scores, initialisés depuis les gestionnaires de scores.
+
+Streamlit oublie l'état d'un widget dès qu'il n'est plus affiché : en revenant sur une
+page, les champs seraient recréés avec leur valeur par défaut. Leur état est donc
+initialisé depuis le gestionnaire lorsqu'ils apparaissent, et un score n'est retiré que
+lorsque l'utilisateur décoche sa case, jamais parce qu'une case est recréée décochée.
+
+La valeur initiale passe par l'état de session et non par le paramètre `value` : un
+widget dont les paramètres changent est recréé et perd la saisie en cours.
+"""
+
+import streamlit as st
+
+from models.scores import ScoreManager
+
+
+def champ_score(libelle: str, manager: ScoreManager, nom: str, cle: str,
+                defaut: int, minimum: int, maximum: int) -> int:
+    """
+    Champ de saisie de la valeur d'un score.
+
+    À son apparition, le champ reprend la valeur enregistrée (arrondie et ramenée dans
+    ses bornes), ou la valeur par défaut si le score n'est pas enregistré.
+    """
+    if cle not in st.session_state:
+        score = manager.get_score(nom)
+        st.session_state[cle] = defaut if score is None else min(max(int(round(score.valeur)), minimum), maximum)
+
+    return st.number_input(libelle, min_value=minimum, max_value=maximum, step=1, key=cle)
+
+
+def case_renseigne(libelle: str, manager: ScoreManager, nom: str, cle: str) -> bool:
+    """
+    Case « Renseigné » d'un score, cochée à son apparition si le score est enregistré.
+
+    Décocher la case retire le score du gestionnaire.
+    """
+    if cle not in st.session_state:
+        st.session_state[cle] = nom in manager.scores
+
+    return st.checkbox(libelle, key=cle, on_change=_retirer_si_decoche, args=(manager, nom, cle))
+
+
+def _retirer_si_decoche(manager: ScoreManager, nom: str, cle: str) -> None:
+    """Retire le score dont la case vient d'être décochée par l'utilisateur."""
+    if not st.session_state[cle]:
+        manager.remove_score(nom)
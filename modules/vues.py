@@ -0,0 +1,32 @@
+"""
+Vues dérivées conservées dans la session Streamlit.
+
+Les tableaux récapitulatifs, graphiques et résumés ne sont recalculés que si le
+patient, l'anamnèse ou les gestionnaires de scores dont ils dépendent ont changé
+depuis la précédente exécution de la page.
+"""
+
+from typing import Callable, Sequence, TypeVar
+
+import streamlit as st
+
+from models.observable import DerivedView, Observable
+
+
+T = TypeVar("T")
+
+
+def vue_derivee(cle: str, sources: Sequence[Observable], calcul: Callable[[], T]) -> T:
+    """
+    Retourne une vue dérivée de la session, recalculée seulement si ses sources ont changé.
+
+    Args:
+        cle: Identifiant de la vue dans la session
+        sources: Modèles observables dont dépend la vue
+        calcul: Calcul de la vue à partir des sources
+    """
+    vues = st.session_state.setdefault('vues_derivees', {})
+    vue = vues.get(cle)
+    if vue is None:
+        vue = vues[cle] = DerivedView()
+    return vue.get(sources, calcul)
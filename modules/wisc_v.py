@@ -6,6 +6,8 @@ import streamlit as st
 import pandas as pd
 from models.scores import Score, ScoreManager, ScoreType
 from models.interpretations import get_classification, interprete_score
+from modules.saisie import case_renseigne, champ_score
+from modules.vues import vue_derivee
 from config.constants import WISC_V_STRUCTURE
 
 
@@ -33,17 +35,10 @@ def render_wisc_v_module():
             col1, col2 = st.columns([2, 1])
             
             with col1:
-                valeur = st.number_input(
-                    f"Score {idx}",
-                    min_value=40,
-                    max_value=160,
-                    value=100,
-                    step=1,
-                    key=f"wisc_v_{idx}"
-                )
+                valeur = champ_score(f"Score {idx}", manager, idx, f"wisc_v_{idx}", 100, 40, 160)
             
             with col2:
-                renseigne = st.checkbox("Renseigné", key=f"wisc_v_{idx}_renseigne")
+                renseigne = case_renseigne("Renseigné", manager, idx, f"wisc_v_{idx}_renseigne")
             
             if renseigne:
                 classification, percentile = get_classification(valeur, ScoreType.STANDARD)
@@ -70,17 +65,10 @@ def render_wisc_v_module():
                     col_s1, col_s2 = st.columns([2, 1])
                     
                     with col_s1:
-                        val_sub = st.number_input(
-                            subtest,
-                            min_value=1,
-                            max_value=19,
-                            value=10,
-                            step=1,
-                            key=f"wisc_v_subtest_{subtest.replace(' ', '_')}"
-                        )
+                        val_sub = champ_score(subtest, manager, f"{idx}_{subtest}", f"wisc_v_subtest_{subtest.replace(' ', '_')}", 10, 1, 19)
                     
                     with col_s2:
-                        rens_sub = st.checkbox("✓", key=f"wisc_v_subtest_{subtest.replace(' ', '_')}_renseigne")
+                        rens_sub = case_renseigne("✓", manager, f"{idx}_{subtest}", f"wisc_v_subtest_{subtest.replace(' ', '_')}_renseigne")
                     
                     if rens_sub:
                         class_sub, _ = get_classification(val_sub, ScoreType.SCALAIRE)
@@ -107,17 +95,10 @@ def render_wisc_v_module():
             col1, col2 = st.columns([2, 1])
             
             with col1:
-                valeur = st.number_input(
-                    f"{idx} - {info['nom']}",
-                    min_value=40,
-                    max_value=160,
-                    value=100,
-                    step=1,
-                    key=f"wisc_v_{idx}"
-                )
+                valeur = champ_score(f"{idx} - {info['nom']}", manager, idx, f"wisc_v_{idx}", 100, 40, 160)
             
             with col2:
-                renseigne = st.checkbox("Renseigné", key=f"wisc_v_{idx}_renseigne")
+                renseigne = case_renseigne("Renseigné", manager, idx, f"wisc_v_{idx}_renseigne")
             
             if renseigne:
                 classification, percentile = get_classification(valeur, ScoreType.STANDARD)
@@ -154,22 +135,25 @@ def render_wisc_v_module():
         # Tableau récapitulatif
         st.subheader("📋 Tableau Récapitulatif")
         
-        valid_scores = [s for s in manager.get_valid_scores() if s.type_score == ScoreType.STANDARD]
+        df = vue_derivee("recapitulatif_wisc_v", [manager], lambda: _tableau_recapitulatif(manager))
         
-        if valid_scores:
-            df_data = []
-            for score in valid_scores:
-                df_data.append({
-                    "Indice": score.nom,
-                    "Score": int(score.valeur),
-                    "Classification": score.classification,
-                    "Percentile": score.percentile or "-"
-                })
-            
-            df = pd.DataFrame(df_data)
+        if not df.empty:
             st.dataframe(df, use_container_width=True)
     
     st.session_state.wisc_v_manager = manager
     
     if manager.has_scores():
         st.success("✅ Scores WISC-V enregistrés")
+
+
+def _tableau_recapitulatif(manager: ScoreManager) -> pd.DataFrame:
+    """Tableau récapitulatif des indices (notes standard) renseignés."""
+    return pd.DataFrame([
+        {
+            "Indice": score.nom,
+            "Score": int(score.valeur),
+            "Classification": score.classification,
+            "Percentile": score.percentile or "-"
+        }
+        for score in manager.get_scores_by_type(ScoreType.STANDARD)
+    ])
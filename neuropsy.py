@@ -0,0 +1,186 @@
+"""
+NeuroPsy Assist - ligne de commande (sans Streamlit, démarrage rapide).
+
+Seuls les modules nécessaires à la commande demandée sont importés : la classification
+de scores ne charge ni numpy ni le moteur de rapport, ce qui convient aux boucles shell
+et aux vérifications d'intégration continue.
+
+Utilisation :
+    python neuropsy.py render DOSSIER [--langue fr] [--format markdown|html|texte|docx] [--modele NOM] [-o SORTIE]
+    python neuropsy.py validate DOSSIER [DOSSIER ...]
+    python neuropsy.py classify standard|scalaire|t_score [VALEUR ...]
+    python neuropsy.py export SORTIE [options de python -m utils.export]
+    python neuropsy.py batch DOSSIER [DOSSIER ...] -d DESTINATION [--chiffrer] [options de python -m utils.batch]
+
+DOSSIER est un dossier sérialisé (utils.serialization, JSON ou binaire) ou « - » pour
+l'entrée standard. Sans valeur, classify lit les valeurs sur l'entrée standard. Les rapports
+rendus sont conservés dans le cache du cabinet (utils.artifacts) : un dossier déjà rendu
+est relu sans charger le moteur de rapport.
+"""
+
+import argparse
+import sys
+from typing import Optional
+
+from config.constants import LANGUE_DEFAUT, LANGUES_RAPPORT
+
+
+FORMATS_RAPPORT = ("markdown", "html", "texte", "docx")
+
+
+def _lire_octets(chemin: str) -> bytes:
+    if chemin == "-":
+        return sys.stdin.buffer.read()
+    with open(chemin, "rb") as fichier:
+        return fichier.read()
+
+
+def _lire_dossier(chemin: str, donnees: Optional[bytes] = None):
+    """Lit un dossier sérialisé (format détecté d'après son en-tête)."""
+    from utils.serialization import ENTETE_BINAIRE, loads_binary, loads_json
+
+    if donnees is None:
+        donnees = _lire_octets(chemin)
+
+    if donnees.startswith(ENTETE_BINAIRE):
+        return loads_binary(donnees)
+    return loads_json(donnees.decode("utf-8"))
+
+
+def render(args) -> int:
+    """Rédige le rapport d'un dossier (relu dans le cache s'il a déjà été rendu)."""
+    donnees = _lire_octets(args.dossier)
+    modele = None
+    if args.modele is not None:
+        from utils.templates import load_template
+        modele = load_template(args.modele)
+
+    def rediger() -> bytes:
+        from utils.semantic_engine import SemanticEngine
+        from utils.docx_renderer import render_bytes
+
+        case = _lire_dossier(args.dossier, donnees)
+        moteur = SemanticEngine(case.patient, case.anamnese, **case.managers)
+        document = moteur.generate_document(args.langue) if modele is None else modele.document(moteur, args.langue)
+        return render_bytes(document, args.format)
+
+    if args.sans_cache:
+        contenu = rediger()
+    else:
+        from utils.artifacts import ArtifactCache, artifact_key
+        from utils.vault import ClinicCipher, load_key
+
+        cache = ArtifactCache(chiffrement=ClinicCipher(load_key()))
+        cle = artifact_key(donnees, args.langue, args.format, modele.empreinte if modele is not None else "")
+        contenu = cache.get_or_render(cle, rediger)
+
+    if args.sortie is None:
+        sys.stdout.buffer.write(contenu)
+    else:
+        with open(args.sortie, "wb") as fichier:
+            fichier.write(contenu)
+    return 0
+
+
+def validate(args) -> int:
+    """Valide les scores de dossiers ; code de sortie 1 si un dossier comporte une erreur."""
+    from utils.validation import ERREUR, validate_managers
+
+    code = 0
+    for chemin in args.dossiers:
+        try:
+            rapport = validate_managers(_lire_dossier(chemin).managers)
+        except (OSError, ValueError) as e:
+            print(f"{chemin} : {e}")
+            code = 1
+            continue
+
+        etat = "valide" if rapport.est_valide else f"{len(rapport.erreurs())} erreur(s)"
+        print(f"{chemin} : {rapport.n_scores} scores, {etat}, {len(rapport.avertissements())} avertissement(s)")
+        for probleme in rapport.problemes:
+            marque = "✗" if probleme.gravite == ERREUR else "!"
+            print(f"  {marque} {probleme.batterie} / {probleme.echelle} : {probleme.message}")
+        if not rapport.est_valide:
+            code = 1
+
+    return code
+
+
+def classify(args) -> int:
+    """Classe des scores (une ligne par valeur : valeur, classification, percentile)."""
+    from models.scores import ScoreType
+    from models.interpretations import get_classification
+
+    score_type = ScoreType(args.type)
+    valeurs = args.valeurs or sys.stdin.read().split()
+
+    for texte in valeurs:
+        try:
+            valeur = float(texte.replace(",", "."))
+        except ValueError:
+            print(f"Valeur invalide : {texte}", file=sys.stderr)
+            return 1
+        classification, percentile = get_classification(valeur, score_type)
+        print(f"{texte}\t{classification}\t{percentile or ''}")
+
+    return 0
+
+
+def export(args) -> int:
+    """Exporte les scores de l'historique (arguments transmis à utils.export)."""
+    from utils.export import main as export_main
+
+    export_main(args.arguments)
+    return 0
+
+
+def batch(args) -> int:
+    """Rend les rapports d'une file de dossiers en parallèle (arguments transmis à utils.batch)."""
+    from utils.batch import main as batch_main
+
+    return batch_main(args.arguments)
+
+
+def main(argv=None) -> int:
+    """Point d'entrée de la commande neuropsy."""
+    parser = argparse.ArgumentParser(prog="neuropsy", description="NeuroPsy Assist en ligne de commande")
+    commandes = parser.add_subparsers(dest="commande", required=True)
+
+    commande = commandes.add_parser("render", help="Rédiger le rapport d'un dossier")
+    commande.add_argument("dossier", help="Dossier sérialisé (JSON ou binaire), - pour l'entrée standard")
+    commande.add_argument("--langue", choices=list(LANGUES_RAPPORT), default=LANGUE_DEFAUT, help="Langue du rapport")
+    commande.add_argument("--format", choices=FORMATS_RAPPORT, default="markdown", help="Format du rapport")
+    commande.add_argument("--modele", help="Modèle de rapport enregistré")
+    commande.add_argument("-o", "--sortie", help="Fichier de sortie (sortie standard par défaut)")
+    commande.add_argument("--sans-cache", action="store_true", help="Rédiger sans consulter le cache des rapports")
+    commande.set_defaults(action=render)
+
+    commande = commandes.add_parser("validate", help="Valider les scores de dossiers")
+    commande.add_argument("dossiers", nargs="+", help="Dossiers sérialisés, - pour l'entrée standard")
+    commande.set_defaults(action=validate)
+
+    commande = commandes.add_parser("classify", help="Classer des scores")
+    commande.add_argument("type", choices=["standard", "scalaire", "t_score"], help="Type de score")
+    commande.add_argument("valeurs", nargs="*", help="Valeurs (entrée standard si absentes)")
+    commande.set_defaults(action=classify)
+
+    # Arguments des commandes export et batch transmis tels quels à leur module (aide comprise)
+    commande = commandes.add_parser("export", add_help=False, help="Exporter les scores de l'historique")
+    commande.set_defaults(action=export)
+
+    commande = commandes.add_parser("batch", add_help=False, help="Rendre les rapports d'une file de dossiers")
+    commande.set_defaults(action=batch)
+
+    args, reste = parser.parse_known_args(argv)
+    if reste and args.action not in (export, batch):
+        parser.error(f"arguments non reconnus : {' '.join(reste)}")
+    args.arguments = reste
+
+    try:
+        return args.action(args)
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"neuropsy : {e}\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+"""
+Cache disque des rapports rendus (adressé par le contenu).
+
+Un rapport rendu est identifié par l'empreinte SHA-256 de tout ce qui le détermine :
+dossier sérialisé, langue, format, modèle, catalogue de traduction et code du moteur.
+Rendre à nouveau le même dossier (second téléchargement, lot relancé) se réduit à la
+lecture d'un fichier ; toute modification du dossier, d'un modèle, d'une traduction ou
+du code change l'empreinte, sans invalidation explicite.
+
+Plusieurs processus (serveurs, processus de rédaction) peuvent partager le même cache :
+l'index SQLite (dates d'utilisation, tailles, compteurs de succès) est protégé par ses
+transactions et les fichiers sont écrits de façon atomique. Au-delà de la taille
+maximale, les rapports les moins récemment utilisés sont supprimés.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from utils.i18n import chemin_catalogue
+from utils.vault import ClinicCipher, write_atomic
+from config.constants import LANGUE_DEFAUT
+from config.settings import DOSSIER_CACHE_RAPPORTS
+
+
+# Taille maximale des rapports conservés (octets)
+TAILLE_MAX_CACHE = 256 * 1024 * 1024
+
+# Code dont dépend le rendu d'un rapport (son empreinte fait partie de la clé)
+DOSSIERS_CODE = ("config", "models", "utils")
+
+EXTENSION_ARTEFACT = ".artefact"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artefacts (
+    cle TEXT PRIMARY KEY,
+    taille INTEGER NOT NULL,
+    utilise_le REAL NOT NULL
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_artefacts_utilisation ON artefacts(utilise_le);
+
+CREATE TABLE IF NOT EXISTS compteurs (
+    nom TEXT PRIMARY KEY,
+    valeur INTEGER NOT NULL
+) WITHOUT ROWID;
+
+INSERT OR IGNORE INTO compteurs VALUES ('succes', 0), ('echecs', 0), ('taille', 0);
+"""
+
+
+@dataclass
+class CacheStats:
+    """Statistiques d'un cache (cumulées sur tous les processus qui le partagent)."""
+
+    succes: int = 0
+    echecs: int = 0
+    n_artefacts: int = 0
+    taille: int = 0
+
+    @property
+    def taux_succes(self) -> float:
+        """Part des lectures servies par le cache (0 si aucune lecture)."""
+        total = self.succes + self.echecs
+        return self.succes / total if total else 0.0
+
+
+@lru_cache(maxsize=None)
+def empreinte_moteur() -> str:
+    """Empreinte du code de rendu (modifiée par toute mise à jour de l'application)."""
+    racine = Path(__file__).resolve().parent.parent
+    empreinte = hashlib.sha256()
+    for chemin in sorted(p for dossier in DOSSIERS_CODE for p in (racine / dossier).glob("*.py")):
+        empreinte.update(chemin.name.encode("utf-8"))
+        empreinte.update(chemin.read_bytes())
+    return empreinte.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def empreinte_catalogue(langue: str) -> str:
+    """Empreinte du catalogue de traduction d'une langue (vide pour la langue source)."""
+    if langue == LANGUE_DEFAUT:
+        return ""
+    empreinte = hashlib.sha256()
+    for extension in ("po", "mo"):
+        chemin = chemin_catalogue(langue, extension)
+        if chemin.exists():
+            empreinte.update(chemin.read_bytes())
+    return empreinte.hexdigest()
+
+
+def artifact_key(dossier: bytes, langue: str, format_rapport: str, modele: str = "") -> str:
+    """
+    Clé d'un rapport rendu.
+
+    Args:
+        dossier: Dossier sérialisé (utils.serialization, JSON ou binaire)
+        langue: Langue du rapport
+        format_rapport: Format de rendu
+        modele: Empreinte du modèle de rapport (ReportTemplate.empreinte), vide pour la rédaction standard
+    """
+    empreinte = hashlib.sha256()
+    for partie in (empreinte_moteur(), empreinte_catalogue(langue), modele, langue, format_rapport):
+        empreinte.update(partie.encode("utf-8") + b"\x00")
+    empreinte.update(dossier)
+    return empreinte.hexdigest()
+
+
+class ArtifactCache:
+    """Cache disque des rapports rendus, partageable entre processus."""
+
+    def __init__(self, dossier: Path = DOSSIER_CACHE_RAPPORTS, taille_max: int = TAILLE_MAX_CACHE,
+                 chiffrement: Optional[ClinicCipher] = None):
+        """
+        Ouvre (ou crée) le cache.
+
+        Args:
+            dossier: Dossier du cache
+            taille_max: Taille maximale des rapports conservés (octets)
+            chiffrement: Chiffrement du cabinet (rapports stockés en clair si None)
+        """
+        self.dossier = dossier
+        self.taille_max = taille_max
+        self.chiffrement = chiffrement
+        dossier.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(dossier / "index.sqlite3"), timeout=30, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        # Index reconstructible : pas de synchronisation disque à chaque transaction
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Ferme l'index du cache."""
+        self._conn.close()
+
+    def get(self, cle: str) -> Optional[bytes]:
+        """Retourne un rapport rendu, ou None s'il n'est pas (ou plus) dans le cache."""
+        contenu = None
+        illisible = False
+        try:
+            donnees = self._chemin(cle).read_bytes()
+            contenu = self.chiffrement.decrypt(donnees, cle.encode("ascii")) if self.chiffrement else donnees
+        except OSError:
+            # Absent, ou supprimé par un autre processus
+            pass
+        except ValueError:
+            # Altéré, ou chiffré avec une autre clé de cabinet
+            illisible = True
+
+        with self._transaction():
+            if contenu is None:
+                self._retirer(self._conn.execute("SELECT cle, taille FROM artefacts WHERE cle = ?", (cle,)).fetchall())
+                self._incrementer("echecs", 1)
+            else:
+                self._conn.execute("UPDATE artefacts SET utilise_le = ? WHERE cle = ?", (time.time(), cle))
+                self._incrementer("succes", 1)
+
+        if illisible:
+            self._chemin(cle).unlink(missing_ok=True)
+
+        return contenu
+
+    def put(self, cle: str, contenu: bytes) -> None:
+        """Enregistre un rapport rendu, puis supprime les moins récemment utilisés au-delà de la taille maximale."""
+        donnees = self.chiffrement.encrypt(contenu, cle.encode("ascii")) if self.chiffrement else contenu
+        chemin = self._chemin(cle)
+        chemin.parent.mkdir(exist_ok=True)
+        write_atomic(chemin, donnees)
+
+        with self._transaction():
+            precedent = self._conn.execute("SELECT taille FROM artefacts WHERE cle = ?", (cle,)).fetchone()
+            self._conn.execute("INSERT OR REPLACE INTO artefacts VALUES (?, ?, ?)", (cle, len(donnees), time.time()))
+            self._incrementer("taille", len(donnees) - (precedent[0] if precedent else 0))
+
+            exces = self._compteur("taille") - self.taille_max
+            perimes = []
+            if exces > 0:
+                for ancien, taille in self._conn.execute(
+                        "SELECT cle, taille FROM artefacts WHERE cle != ? ORDER BY utilise_le", (cle,)):
+                    perimes.append((ancien, taille))
+                    exces -= taille
+                    if exces <= 0:
+                        break
+                self._retirer(perimes)
+
+        for ancien, _ in perimes:
+            self._chemin(ancien).unlink(missing_ok=True)
+
+    def get_or_render(self, cle: str, rendre: Callable[[], bytes]) -> bytes:
+        """Retourne le rapport du cache, ou le rend et l'enregistre."""
+        contenu = self.get(cle)
+        if contenu is None:
+            contenu = rendre()
+            self.put(cle, contenu)
+        return contenu
+
+    def stats(self) -> CacheStats:
+        """Statistiques du cache (tous processus confondus)."""
+        with self._lock:
+            compteurs = dict(self._conn.execute("SELECT nom, valeur FROM compteurs"))
+            n_artefacts = self._conn.execute("SELECT COUNT(*) FROM artefacts").fetchone()[0]
+        return CacheStats(compteurs["succes"], compteurs["echecs"], n_artefacts, compteurs["taille"])
+
+    def clear(self) -> None:
+        """Vide le cache (les statistiques sont remises à zéro)."""
+        with self._transaction():
+            self._conn.execute("DELETE FROM artefacts")
+            self._conn.execute("UPDATE compteurs SET valeur = 0")
+
+        for chemin in self.dossier.glob(f"*/*{EXTENSION_ARTEFACT}"):
+            chemin.unlink(missing_ok=True)
+
+    def _chemin(self, cle: str) -> Path:
+        # Un sous-dossier par préfixe : dossiers de taille raisonnable
+        return self.dossier / cle[:2] / f"{cle}{EXTENSION_ARTEFACT}"
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """Transaction d'écriture (verrou de la base pris dès le début : pas d'interblocage entre processus)."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _retirer(self, artefacts) -> None:
+        self._conn.executemany("DELETE FROM artefacts WHERE cle = ?", [(cle,) for cle, _ in artefacts])
+        self._incrementer("taille", -sum(taille for _, taille in artefacts))
+
+    def _incrementer(self, nom: str, delta: int) -> None:
+        self._conn.execute("UPDATE compteurs SET valeur = valeur + ? WHERE nom = ?", (delta, nom))
+
+    def _compteur(self, nom: str) -> int:
+        return self._conn.execute("SELECT valeur FROM compteurs WHERE nom = ?", (nom,)).fetchone()[0]
+
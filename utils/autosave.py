@@ -0,0 +1,358 @@
+"""
+Sauvegarde automatique du dossier en cours (brouillon) et reprise après interruption.
+
+Le dossier est capturé à chaque exécution de la page (sans effet s'il n'a pas changé)
+puis écrit sur disque par un fil d'exécution dédié, après un délai sans nouvelle
+modification : une saisie rapide ne produit qu'une écriture.
+
+Un brouillon est composé de deux fichiers :
+- le dossier complet (format binaire de utils.serialization), remplacé de façon
+  atomique (écriture d'un fichier temporaire puis renommage) ;
+- un journal des modifications de scores postérieures, complété en fin de fichier.
+
+Seules les modifications de scores sont journalisées ; une modification du patient,
+de l'anamnèse ou de la liste des batteries entraîne la réécriture du dossier complet.
+
+Avec la clé du cabinet (utils.vault), le dossier et chaque ligne du journal sont chiffrés.
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from models.scores import Score, ScoreEvent, ScoreType
+from utils.serialization import Case, case_from_dict, case_to_dict, decode_binary, encode_binary
+from utils.vault import ClinicCipher, write_atomic
+from config.settings import DOSSIER_BROUILLONS
+
+
+# Délai sans modification avant l'écriture du brouillon (secondes)
+DELAI_AUTOSAVE = 1.0
+
+# Délai maximal d'écriture pendant une saisie continue (secondes)
+ATTENTE_MAX_AUTOSAVE = 5.0
+
+# Nombre d'événements journalisés au-delà duquel le dossier complet est réécrit
+MAX_EVENEMENTS_JOURNAL = 500
+
+EXTENSION_BROUILLON = ".npsy"
+EXTENSION_JOURNAL = ".journal"
+
+
+@dataclass
+class Draft:
+    """Brouillon enregistré sur disque."""
+
+    identifiant: str
+    modifie_le: datetime
+    case: Case
+
+
+class Autosaver:
+    """Sauvegarde automatique d'un dossier dans un brouillon (écritures différées et groupées)."""
+
+    def __init__(self, identifiant: str, dossier: Path = DOSSIER_BROUILLONS,
+                 delai: float = DELAI_AUTOSAVE, attente_max: float = ATTENTE_MAX_AUTOSAVE,
+                 chiffrement: Optional[ClinicCipher] = None):
+        """
+        Args:
+            identifiant: Identifiant du brouillon (nom des fichiers)
+            dossier: Dossier des brouillons
+            delai: Délai sans modification avant écriture
+            attente_max: Délai maximal d'écriture pendant une saisie continue
+            chiffrement: Chiffrement du cabinet (brouillon en clair si None)
+        """
+        self.identifiant = identifiant
+        self.dossier = dossier
+        self.chiffrement = chiffrement
+        self.delai = delai
+        self.attente_max = attente_max
+
+        self._condition = threading.Condition()
+        self._fil: Optional[threading.Thread] = None
+        self._arret = False
+        self._immediat = False
+        self._en_cours = False
+        self._erreur: Optional[Exception] = None
+
+        # Captures en attente d'écriture : dossier complet (et versions des gestionnaires), événements suivants
+        self._complet: Optional[Tuple[Dict[str, Any], Dict[str, int]]] = None
+        self._evenements: List[Tuple[str, ScoreEvent]] = []
+        self._premiere_modification: Optional[float] = None
+        self._derniere_modification = 0.0
+
+        # État de la dernière capture (fil de la page)
+        self._empreinte: Optional[Tuple] = None
+        self._structure: Optional[Tuple] = None
+        self._versions: Dict[str, int] = {}
+        self._a_compacter = False
+
+        # État des fichiers (fil d'écriture)
+        self._generation = 0
+        self._n_journal = 0
+
+    @property
+    def chemin(self) -> Path:
+        """Fichier du dossier complet."""
+        return self.dossier / f"{self.identifiant}{EXTENSION_BROUILLON}"
+
+    @property
+    def chemin_journal(self) -> Path:
+        """Journal des modifications de scores."""
+        return self.dossier / f"{self.identifiant}{EXTENSION_JOURNAL}"
+
+    @property
+    def erreur(self) -> Optional[Exception]:
+        """Dernière erreur d'écriture (None si la dernière écriture a réussi)."""
+        return self._erreur
+
+    def capture(self, case: Case) -> None:
+        """
+        Capture l'état du dossier pour une écriture différée.
+
+        Appelée depuis la page à chaque exécution : sans modification depuis la capture
+        précédente, la capture ne fait rien ; sinon seuls les événements de scores
+        nouveaux sont relevés, sauf changement de structure (dossier complet).
+        """
+        managers = case.managers
+        structure = (id(case.patient), case.patient.version, id(case.anamnese), case.anamnese.version,
+                     tuple((cle, id(m)) for cle, m in managers.items()))
+        empreinte = (structure, tuple(m.version for m in managers.values()))
+
+        if empreinte == self._empreinte:
+            return
+
+        with self._condition:
+            if structure != self._structure or self._a_compacter:
+                self._complet = (case_to_dict(case), {cle: m.version for cle, m in managers.items()})
+                self._evenements = []
+                self._a_compacter = False
+            else:
+                for cle, manager in managers.items():
+                    self._evenements.extend((cle, e) for e in manager.events_since(self._versions[cle]))
+
+            self._empreinte = empreinte
+            self._structure = structure
+            self._versions = {cle: m.version for cle, m in managers.items()}
+
+            maintenant = time.monotonic()
+            self._derniere_modification = maintenant
+            if self._premiere_modification is None:
+                self._premiere_modification = maintenant
+
+            self._demarrer()
+            self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Écrit immédiatement les captures en attente.
+
+        Returns:
+            True si tout a été écrit avant l'expiration du délai
+        """
+        with self._condition:
+            self._immediat = self._en_attente()
+            self._condition.notify_all()
+            return self._condition.wait_for(lambda: not self._en_attente() and not self._en_cours, timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Écrit les captures en attente puis arrête le fil d'écriture."""
+        self.flush(timeout)
+        with self._condition:
+            self._arret = True
+            self._condition.notify_all()
+
+    def discard(self) -> None:
+        """Arrête la sauvegarde et supprime le brouillon (nouvelle évaluation)."""
+        with self._condition:
+            self._arret = True
+            self._complet = None
+            self._evenements = []
+            self._condition.notify_all()
+            self._condition.wait_for(lambda: not self._en_cours)
+        delete_draft(self.identifiant, self.dossier)
+
+    def _en_attente(self) -> bool:
+        return self._complet is not None or bool(self._evenements)
+
+    def _demarrer(self) -> None:
+        if self._fil is None and not self._arret:
+            self._fil = threading.Thread(target=self._boucle, name=f"autosave-{self.identifiant}", daemon=True)
+            self._fil.start()
+
+    def _boucle(self) -> None:
+        """Fil d'écriture : attend la fin d'une rafale de modifications puis écrit."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._en_attente() or self._arret)
+                if not self._en_attente():
+                    return
+
+                # Regroupe les modifications rapprochées
+                while not (self._immediat or self._arret):
+                    echeance = min(self._derniere_modification + self.delai,
+                                   self._premiere_modification + self.attente_max)
+                    restant = echeance - time.monotonic()
+                    if restant <= 0:
+                        break
+                    self._condition.wait(restant)
+
+                complet, evenements = self._complet, self._evenements
+                self._complet, self._evenements = None, []
+                self._premiere_modification = None
+                self._immediat = False
+                self._en_cours = True
+
+            try:
+                self._ecrire(complet, evenements)
+                self._erreur = None
+            except OSError as e:
+                # Le brouillon sera réécrit en entier à la prochaine capture
+                self._erreur = e
+                with self._condition:
+                    self._a_compacter = True
+            finally:
+                with self._condition:
+                    self._en_cours = False
+                    self._condition.notify_all()
+
+    def _ecrire(self, complet: Optional[Tuple[Dict[str, Any], Dict[str, int]]],
+                evenements: List[Tuple[str, ScoreEvent]]) -> None:
+        self.dossier.mkdir(parents=True, exist_ok=True)
+
+        if complet is not None:
+            dossier, versions = complet
+            self._generation += 1
+            donnees = encode_binary({"generation": self._generation, "versions": versions, "dossier": dossier})
+            if self.chiffrement is not None:
+                donnees = self.chiffrement.encrypt(donnees, self.identifiant.encode())
+            write_atomic(self.chemin, donnees)
+            # Les lignes d'une génération antérieure sont ignorées : le journal peut être vidé ensuite
+            self.chemin_journal.write_bytes(b"")
+            self._n_journal = 0
+
+        if evenements:
+            lignes = "".join(
+                _chiffrer_ligne(json.dumps({"g": self._generation, "b": cle, "n": e.sequence, "nom": e.nom,
+                                            "s": _score_vers_liste(e.score)}, ensure_ascii=False),
+                                self.chiffrement, self.identifiant) + "\n"
+                for cle, e in evenements
+            )
+            with open(self.chemin_journal, "a", encoding="utf-8") as fichier:
+                fichier.write(lignes)
+                fichier.flush()
+                os.fsync(fichier.fileno())
+            self._n_journal += len(evenements)
+
+            if self._n_journal > MAX_EVENEMENTS_JOURNAL:
+                with self._condition:
+                    self._a_compacter = True
+
+
+def list_drafts(dossier: Path = DOSSIER_BROUILLONS, exclure: Optional[str] = None,
+                chiffrement: Optional[ClinicCipher] = None) -> List[Draft]:
+    """
+    Brouillons enregistrés, du plus récent au plus ancien (les brouillons illisibles sont ignorés).
+
+    Args:
+        dossier: Dossier des brouillons
+        exclure: Identifiant à ignorer (brouillon de la session courante)
+        chiffrement: Chiffrement du cabinet (brouillons en clair si None)
+    """
+    if not dossier.exists():
+        return []
+
+    brouillons = []
+
+    for chemin in dossier.glob(f"*{EXTENSION_BROUILLON}"):
+        identifiant = chemin.name[:-len(EXTENSION_BROUILLON)]
+        if identifiant == exclure:
+            continue
+        try:
+            case = load_draft(identifiant, dossier, chiffrement)
+        except (OSError, ValueError):
+            continue
+        journal = chemin.with_suffix(EXTENSION_JOURNAL)
+        modifie = max(chemin.stat().st_mtime, journal.stat().st_mtime if journal.exists() else 0)
+        brouillons.append(Draft(identifiant, datetime.fromtimestamp(modifie), case))
+
+    return sorted(brouillons, key=lambda b: b.modifie_le, reverse=True)
+
+
+def load_draft(identifiant: str, dossier: Path = DOSSIER_BROUILLONS,
+               chiffrement: Optional[ClinicCipher] = None) -> Case:
+    """
+    Recharge un brouillon : dossier complet puis modifications journalisées.
+
+    Une dernière ligne de journal incomplète (interruption pendant l'écriture) est ignorée.
+
+    Raises:
+        ValueError: Si le brouillon est introuvable ou illisible (ou chiffré avec une autre clé)
+    """
+    chemin = dossier / f"{identifiant}{EXTENSION_BROUILLON}"
+    if not chemin.exists():
+        raise ValueError(f"Brouillon introuvable : {identifiant}")
+
+    donnees = chemin.read_bytes()
+    if chiffrement is not None:
+        donnees = chiffrement.decrypt(donnees, identifiant.encode())
+    donnees = decode_binary(donnees)
+    case = case_from_dict(donnees["dossier"])
+    versions = donnees["versions"]
+
+    journal = chemin.with_suffix(EXTENSION_JOURNAL)
+    lignes = journal.read_text(encoding="utf-8").splitlines() if journal.exists() else []
+
+    for ligne in lignes:
+        try:
+            evenement = json.loads(_dechiffrer_ligne(ligne, chiffrement, identifiant))
+        except ValueError:
+            break
+        manager = case.managers.get(evenement["b"])
+        if evenement["g"] != donnees["generation"] or manager is None or evenement["n"] <= versions[evenement["b"]]:
+            continue
+        score = _score_depuis_liste(evenement["s"])
+        if score is None:
+            manager.remove_score(evenement["nom"])
+        else:
+            manager.add_score(score)
+
+    return case
+
+
+def delete_draft(identifiant: str, dossier: Path = DOSSIER_BROUILLONS) -> None:
+    """Supprime un brouillon."""
+    for extension in (EXTENSION_BROUILLON, EXTENSION_JOURNAL):
+        (dossier / f"{identifiant}{extension}").unlink(missing_ok=True)
+
+
+def _chiffrer_ligne(ligne: str, chiffrement: Optional[ClinicCipher], identifiant: str) -> str:
+    if chiffrement is None:
+        return ligne
+    return base64.b64encode(chiffrement.encrypt(ligne.encode("utf-8"), identifiant.encode())).decode("ascii")
+
+
+def _dechiffrer_ligne(ligne: str, chiffrement: Optional[ClinicCipher], identifiant: str) -> str:
+    if chiffrement is None:
+        return ligne
+    return chiffrement.decrypt(base64.b64decode(ligne, validate=True), identifiant.encode()).decode("utf-8")
+
+
+def _score_vers_liste(score: Optional[Score]) -> Optional[List]:
+    if score is None:
+        return None
+    return [score.nom, score.valeur, score.type_score.value, score.domaine, score.percentile,
+            score.classification, score.interpretation]
+
+
+def _score_depuis_liste(champs: Optional[List]) -> Optional[Score]:
+    if champs is None:
+        return None
+    nom, valeur, type_score, domaine, percentile, classification, interpretation = champs
+    return Score(nom, valeur, ScoreType(type_score), domaine, percentile, classification, interpretation)
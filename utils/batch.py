@@ -0,0 +1,292 @@
+"""
+Rendu par lot des rapports d'une file de dossiers (courriers DOCX ou formats texte).
+
+Les documents sont répartis sur des processus de travail. Chaque processus prépare une
+seule fois ce qui est commun à tous les documents : moteur de rapport, catalogue de
+traduction, modèle, mise en page des courriers (styles, polices, en-tête, légende des
+classifications) et cache des rapports rendus. Il écrit ensuite chaque document
+directement dans son fichier de destination : seul le bilan du document (durée, erreur)
+revient au processus principal.
+
+Un document en échec est repris seul, dans un processus dédié, une fois le lot terminé :
+un dossier qui fait échouer ou interrompre son processus ne retarde ni ne compromet les
+autres. Les documents peuvent être chiffrés en flux avec la clé du cabinet (déchiffrement :
+python -m utils.vault ENTREE SORTIE).
+
+Utilisation en ligne de commande :
+    python -m utils.batch DOSSIER [DOSSIER ...] -d DESTINATION [--format docx|markdown|html|texte]
+                          [--langue fr] [--modele NOM] [--processus N] [--sans-cache] [--chiffrer]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from utils.artifacts import ArtifactCache, artifact_key
+from utils.docx_renderer import FORMATS_DOCUMENTS, extension_format, mise_en_page, render_bytes
+from utils.i18n import get_catalogue
+from utils.semantic_engine import SemanticEngine
+from utils.serialization import ENTETE_BINAIRE, loads_binary, loads_json
+from utils.templates import load_template
+from utils.vault import ClinicCipher, load_key, write_atomic
+from config.constants import LANGUE_DEFAUT, LANGUES_RAPPORT
+
+
+# Documents confiés à chaque processus à la fois (au-delà : en attente dans le processus principal)
+DOCUMENTS_PAR_PROCESSUS = 2
+
+# Préparation d'un processus de travail (voir _preparer_processus)
+_CONTEXTE: Dict[str, Any] = {}
+
+
+@dataclass
+class DocumentResult:
+    """Bilan du rendu d'un document du lot."""
+
+    source: str
+    destination: str
+    duree: float = 0.0  # Secondes, lecture du dossier et écriture du document comprises
+    depuis_cache: bool = False
+    tentatives: int = 1
+    erreur: Optional[str] = None
+
+    @property
+    def reussi(self) -> bool:
+        """Document écrit dans son fichier de destination."""
+        return self.erreur is None
+
+
+def _preparer_processus(langue: str, format_rapport: str, modele: Optional[str], cache: bool,
+                        chiffrer: bool) -> None:
+    """Prépare un processus de travail : ressources communes à tous les documents du lot."""
+    get_catalogue(langue)
+    if format_rapport == "docx":
+        mise_en_page(langue)
+
+    chiffrement = ClinicCipher(load_key()) if cache or chiffrer else None
+    _CONTEXTE.update(
+        langue=langue,
+        format=format_rapport,
+        modele=load_template(modele) if modele is not None else None,
+        cache=ArtifactCache(chiffrement=chiffrement) if cache else None,
+        chiffrement=chiffrement if chiffrer else None
+    )
+
+
+def render_document_file(source: str, destination: str) -> DocumentResult:
+    """
+    Rend le rapport d'un dossier sérialisé dans son fichier de destination (processus de travail).
+
+    Les erreurs du document sont rapportées dans son bilan, sans interrompre le lot.
+    """
+    debut = time.perf_counter()
+    langue, format_rapport, modele, cache = (_CONTEXTE[c] for c in ("langue", "format", "modele", "cache"))
+    depuis_cache = True
+
+    def rediger() -> bytes:
+        nonlocal depuis_cache
+        depuis_cache = False
+        case = loads_binary(donnees) if donnees.startswith(ENTETE_BINAIRE) else loads_json(donnees.decode("utf-8"))
+        # Le processus de travail est l'unité de parallélisme : sections rédigées séquentiellement
+        moteur = SemanticEngine(case.patient, case.anamnese, parallele=False, **case.managers)
+        document = moteur.generate_document(langue) if modele is None else modele.document(moteur, langue)
+        return render_bytes(document, format_rapport)
+
+    try:
+        donnees = Path(source).read_bytes()
+        if cache is None:
+            contenu = rediger()
+        else:
+            cle = artifact_key(donnees, langue, format_rapport, modele.empreinte if modele is not None else "")
+            contenu = cache.get_or_render(cle, rediger)
+        _ecrire(Path(destination), contenu, _CONTEXTE["chiffrement"])
+    except (OSError, ValueError) as e:
+        return DocumentResult(source, destination, time.perf_counter() - debut, erreur=str(e))
+    except Exception as e:
+        return DocumentResult(source, destination, time.perf_counter() - debut, erreur=f"{type(e).__name__} : {e}")
+
+    return DocumentResult(source, destination, time.perf_counter() - debut, depuis_cache)
+
+
+def _ecrire(destination: Path, contenu: bytes, chiffrement: Optional[ClinicCipher]) -> None:
+    """
+    Écrit un document dans son fichier de destination, chiffré en flux si demandé.
+
+    Le fichier est écrit sous un nom temporaire puis renommé : un document interrompu ne
+    laisse pas de fichier partiel.
+    """
+    if chiffrement is None:
+        write_atomic(destination, contenu)
+        return
+
+    temporaire = destination.with_name(f"{destination.name}.tmp")
+    try:
+        with open(temporaire, "wb") as fichier:
+            with chiffrement.encrypt_stream(fichier) as sortie:
+                sortie.write(contenu)
+            fichier.flush()
+            os.fsync(fichier.fileno())
+
+        os.replace(temporaire, destination)
+    finally:
+        temporaire.unlink(missing_ok=True)
+
+
+def render_batch(documents: Sequence[Tuple[Path, Path]], langue: str = LANGUE_DEFAUT, format_rapport: str = "docx",
+                 modele: Optional[str] = None, processus: Optional[int] = None,
+                 cache: bool = True, chiffrer: bool = False) -> Iterator[DocumentResult]:
+    """
+    Rend les rapports d'une file de dossiers, en parallèle.
+
+    Les bilans sont produits au fur et à mesure que les documents sont écrits. Les documents
+    en échec sont repris un par un, dans un processus dédié, après les autres ; leur bilan
+    final indique deux tentatives.
+
+    Args:
+        documents: Couples (dossier sérialisé, fichier de destination)
+        langue: Langue des rapports
+        format_rapport: Format de rendu (voir utils.docx_renderer.FORMATS_DOCUMENTS)
+        modele: Nom d'un modèle de rapport enregistré (rédaction standard si None)
+        processus: Nombre de processus de travail (nombre de cœurs par défaut)
+        cache: Consulter et alimenter le cache des rapports rendus
+        chiffrer: Chiffrer les documents avec la clé du cabinet
+
+    Raises:
+        ValueError: Si la langue, le format ou le modèle sont invalides
+    """
+    if langue not in LANGUES_RAPPORT:
+        raise ValueError(f"Langue de rapport non prise en charge : {langue}")
+    extension_format(format_rapport)
+    if modele is not None:
+        load_template(modele)
+    if cache or chiffrer:
+        # Clé du cabinet créée ou vérifiée une fois, avant la préparation des processus
+        load_key()
+
+    preparation = (langue, format_rapport, modele, cache, chiffrer)
+    processus = min(processus or os.cpu_count() or 1, max(len(documents), 1))
+    a_reprendre: List[Tuple[str, str]] = []
+
+    restants = ((str(source), str(destination)) for source, destination in documents)
+    en_cours: Dict[Future, Tuple[str, str]] = {}
+    executeur = _executeur(processus, preparation)
+    try:
+        while True:
+            for document in islice(restants, processus * DOCUMENTS_PAR_PROCESSUS - len(en_cours)):
+                en_cours[executeur.submit(render_document_file, *document)] = document
+            if not en_cours:
+                break
+
+            termines, _ = wait(en_cours, return_when=FIRST_COMPLETED)
+            interrompu = False
+            for future in termines:
+                document = en_cours.pop(future)
+                try:
+                    bilan = future.result()
+                except BrokenProcessPool:
+                    interrompu = True
+                    a_reprendre.append(document)
+                    continue
+                if bilan.reussi:
+                    yield bilan
+                else:
+                    a_reprendre.append(document)
+
+            if interrompu:
+                # Un processus s'est arrêté brutalement : le document en cause n'est pas connu,
+                # tous les documents en cours sont repris un par un
+                a_reprendre.extend(en_cours.values())
+                en_cours.clear()
+                executeur.shutdown(wait=False, cancel_futures=True)
+                executeur = _executeur(processus, preparation)
+    finally:
+        executeur.shutdown(cancel_futures=True)
+
+    yield from _reprendre(a_reprendre, preparation)
+
+
+def _reprendre(documents: List[Tuple[str, str]], preparation: tuple) -> Iterator[DocumentResult]:
+    """Reprend des documents en échec un par un, dans un processus dédié."""
+    executeur = None
+    try:
+        for source, destination in documents:
+            if executeur is None:
+                executeur = _executeur(1, preparation)
+
+            debut = time.perf_counter()
+            try:
+                bilan = executeur.submit(render_document_file, source, destination).result()
+            except BrokenProcessPool:
+                executeur.shutdown(wait=False)
+                executeur = None
+                bilan = DocumentResult(source, destination, time.perf_counter() - debut,
+                                       erreur="Processus de rendu interrompu par ce dossier")
+
+            bilan.tentatives = 2
+            yield bilan
+    finally:
+        if executeur is not None:
+            executeur.shutdown()
+
+
+def _executeur(processus: int, preparation: tuple) -> ProcessPoolExecutor:
+    # Processus démarrés à neuf (spawn) : aucun état du processus principal n'est hérité
+    return ProcessPoolExecutor(max_workers=processus, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=_preparer_processus, initargs=preparation)
+
+
+def main(argv=None) -> int:
+    """Point d'entrée en ligne de commande : rend les rapports d'une file de dossiers."""
+    parser = argparse.ArgumentParser(description="Rendu par lot des rapports NeuroPsy Assist")
+    parser.add_argument("dossiers", nargs="+", type=Path, help="Dossiers sérialisés (JSON ou binaire)")
+    parser.add_argument("-d", "--destination", type=Path, required=True, help="Dossier des documents rendus")
+    parser.add_argument("--format", choices=FORMATS_DOCUMENTS, default="docx", help="Format des documents")
+    parser.add_argument("--langue", choices=list(LANGUES_RAPPORT), default=LANGUE_DEFAUT, help="Langue des rapports")
+    parser.add_argument("--modele", help="Modèle de rapport enregistré")
+    parser.add_argument("--processus", type=int, help="Nombre de processus de travail (nombre de cœurs par défaut)")
+    parser.add_argument("--sans-cache", action="store_true", help="Rédiger sans consulter le cache des rapports")
+    parser.add_argument("--chiffrer", action="store_true", help="Chiffrer les documents avec la clé du cabinet")
+    args = parser.parse_args(argv)
+
+    extension = extension_format(args.format)
+    documents = [(dossier, args.destination / f"{dossier.stem}.{extension}") for dossier in args.dossiers]
+    destinations = [destination for _, destination in documents]
+    if len(set(destinations)) != len(destinations):
+        parser.error("plusieurs dossiers portent le même nom : leurs documents s'écraseraient")
+    args.destination.mkdir(parents=True, exist_ok=True)
+
+    debut = time.perf_counter()
+    bilans = []
+    try:
+        for bilan in render_batch(documents, args.langue, args.format, args.modele, args.processus,
+                                  not args.sans_cache, args.chiffrer):
+            bilans.append(bilan)
+            etat = "cache" if bilan.depuis_cache else "rendu" if bilan.reussi else "ÉCHEC"
+            reprise = " (repris)" if bilan.tentatives > 1 else ""
+            print(f"{bilan.duree * 1000:8.1f} ms  {etat:<5}  {bilan.destination}{reprise}"
+                  + (f" : {bilan.erreur}" if bilan.erreur else ""), flush=True)
+    except ValueError as e:
+        parser.exit(1, f"{e}\n")
+    duree = time.perf_counter() - debut
+
+    reussis = [b for b in bilans if b.reussi]
+    print(f"{len(reussis)} document(s) sur {len(bilans)} en {duree:.2f} s "
+          f"({len(bilans) / duree:.1f} documents/s), dont {sum(b.depuis_cache for b in reussis)} depuis le cache")
+    if reussis:
+        plus_long = max(reussis, key=lambda b: b.duree)
+        print(f"Durée par document : moyenne {sum(b.duree for b in reussis) / len(reussis) * 1000:.1f} ms, "
+              f"maximum {plus_long.duree * 1000:.1f} ms ({plus_long.source})")
+
+    return 0 if len(reussis) == len(bilans) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
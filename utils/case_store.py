@@ -0,0 +1,350 @@
+"""
+Historique indexé des évaluations (base SQLite locale).
+"""
+
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from models.patient import Patient
+from models.scores import Score, ScoreManager, ScoreType
+from utils.validation import ERREUR, validate_managers
+from config.settings import CHEMIN_HISTORIQUE
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS evaluations (
+    id INTEGER PRIMARY KEY,
+    patient_id TEXT NOT NULL,
+    date_examen TEXT NOT NULL,
+    age INTEGER,
+    classe TEXT NOT NULL DEFAULT '',
+    enregistre_le TEXT NOT NULL,
+    UNIQUE (patient_id, date_examen)
+);
+
+CREATE TABLE IF NOT EXISTS batteries (
+    evaluation_id INTEGER NOT NULL REFERENCES evaluations(id) ON DELETE CASCADE,
+    batterie TEXT NOT NULL,
+    nom_test TEXT NOT NULL,
+    informateur TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (evaluation_id, batterie)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS scores (
+    evaluation_id INTEGER NOT NULL REFERENCES evaluations(id) ON DELETE CASCADE,
+    batterie TEXT NOT NULL,
+    nom TEXT NOT NULL,
+    type_score TEXT NOT NULL,
+    valeur REAL NOT NULL,
+    domaine TEXT NOT NULL DEFAULT '',
+    classification TEXT NOT NULL DEFAULT '',
+    percentile TEXT,
+    PRIMARY KEY (evaluation_id, batterie, nom)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_evaluations_date ON evaluations(date_examen);
+"""
+
+# Colonnes disponibles pour CaseStore.iter_score_chunks (nom -> expression SQL)
+_EXPRESSIONS_COLONNES = {
+    "evaluation_id": "e.id",
+    "patient_id": "e.patient_id",
+    "date_examen": "e.date_examen",
+    "age": "e.age",
+    "classe": "e.classe",
+    "batterie": "s.batterie",
+    "informateur": "b.informateur",
+    "nom": "s.nom",
+    "type_score": "s.type_score",
+    "valeur": "s.valeur",
+    "classification": "s.classification",
+}
+COLONNES_SCORES = tuple(_EXPRESSIONS_COLONNES)
+
+
+@dataclass
+class EvaluationRecord:
+    """Évaluation enregistrée dans l'historique."""
+
+    id: int
+    patient_id: str
+    date_examen: date
+    age: Optional[int] = None
+    classe: str = ""
+    managers: Dict[str, ScoreManager] = field(default_factory=dict)
+
+
+class CaseStore:
+    """
+    Historique des évaluations.
+
+    Les évaluations sont indexées par identifiant patient pseudonymisé
+    (Patient.get_identifiant) et date d'examen ; les scores sont stockés
+    une ligne par score, regroupés physiquement par évaluation.
+    """
+
+    def __init__(self, chemin: Path = CHEMIN_HISTORIQUE):
+        """
+        Ouvre (ou crée) la base de l'historique.
+
+        Args:
+            chemin: Chemin du fichier SQLite (":memory:" pour une base temporaire)
+        """
+        if str(chemin) != ":memory:":
+            Path(chemin).parent.mkdir(parents=True, exist_ok=True)
+
+        self.chemin = chemin
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[int, Dict[str, ScoreManager], Optional[int]], None]] = []
+        self._conn = sqlite3.connect(str(chemin), check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Ferme la connexion à la base."""
+        self._conn.close()
+
+    def add_listener(self, callback: Callable[[int, Dict[str, ScoreManager], Optional[int]], None]) -> None:
+        """
+        Abonne une fonction aux enregistrements d'évaluations.
+
+        Args:
+            callback: Appelée avec (identifiant enregistré, gestionnaires, identifiant remplacé ou None)
+        """
+        self._listeners.append(callback)
+
+    def save_evaluation(self, patient: Patient, managers: Dict[str, ScoreManager]) -> int:
+        """
+        Enregistre (ou remplace) l'évaluation d'un patient à sa date d'examen.
+
+        Args:
+            patient: Patient évalué (identité complète et date d'examen requises)
+            managers: Gestionnaires de scores indexés par batterie
+
+        Returns:
+            Identifiant de l'évaluation enregistrée
+
+        Raises:
+            ValueError: Si l'identité est incomplète ou si des scores sont invalides
+                (les incohérences entre indices et subtests ne bloquent pas l'enregistrement)
+        """
+        patient_id = patient.get_identifiant()
+        if patient_id is None or patient.date_examen is None:
+            raise ValueError("Nom, prénom, date de naissance et date d'examen sont requis "
+                             "pour enregistrer l'évaluation")
+
+        validation = validate_managers(managers)
+        if not validation.est_valide:
+            raise ValueError(f"Scores invalides :\n{validation.resume(ERREUR)}")
+
+        batteries = [(cle, m) for cle, m in managers.items() if m and m.has_scores()]
+
+        with self._lock, self._conn:
+            remplace = self._conn.execute(
+                "SELECT id FROM evaluations WHERE patient_id = ? AND date_examen = ?",
+                (patient_id, patient.date_examen.isoformat())
+            ).fetchone()
+            if remplace:
+                self._conn.execute("DELETE FROM evaluations WHERE id = ?", remplace)
+            evaluation_id = self._conn.execute(
+                "INSERT INTO evaluations (patient_id, date_examen, age, classe, enregistre_le) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (patient_id, patient.date_examen.isoformat(), patient.get_age_at_exam(),
+                 patient.classe, datetime.now().isoformat(timespec="seconds"))
+            ).lastrowid
+            self._conn.executemany(
+                "INSERT INTO batteries VALUES (?, ?, ?, ?)",
+                [(evaluation_id, cle, m.nom_test, m.informateur) for cle, m in batteries]
+            )
+            self._conn.executemany(
+                "INSERT INTO scores VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(evaluation_id, cle, s.nom, s.type_score.value, float(s.valeur),
+                  s.domaine, s.classification, s.percentile)
+                 for cle, m in batteries for s in m.get_valid_scores()]
+            )
+
+        for callback in self._listeners:
+            callback(evaluation_id, dict(batteries), remplace[0] if remplace else None)
+
+        return evaluation_id
+
+    def get_history(self, patient_id: str, avant: Optional[date] = None) -> List[EvaluationRecord]:
+        """
+        Récupère les évaluations d'un patient, de la plus ancienne à la plus récente.
+
+        Args:
+            patient_id: Identifiant pseudonymisé du patient
+            avant: Si renseignée, seules les évaluations strictement antérieures sont retournées
+
+        Returns:
+            Évaluations avec leurs scores
+        """
+        requete = "SELECT id, patient_id, date_examen, age, classe FROM evaluations WHERE patient_id = ?"
+        params = [patient_id]
+
+        if avant is not None:
+            requete += " AND date_examen < ?"
+            params.append(avant.isoformat())
+
+        with self._lock:
+            lignes = self._conn.execute(requete + " ORDER BY date_examen", params).fetchall()
+
+        records = [
+            EvaluationRecord(id=id_, patient_id=pid, date_examen=date.fromisoformat(d), age=age, classe=classe)
+            for id_, pid, d, age, classe in lignes
+        ]
+        self._load_scores(records)
+
+        return records
+
+    def get_evaluation_ids(self, patient_id: str) -> List[int]:
+        """Identifiants de toutes les évaluations d'un patient (sans chargement des scores)."""
+        with self._lock:
+            lignes = self._conn.execute("SELECT id FROM evaluations WHERE patient_id = ?", (patient_id,)).fetchall()
+        return [id_ for id_, in lignes]
+
+    def get_evaluations(self, ids: Sequence[int]) -> List[EvaluationRecord]:
+        """
+        Récupère des évaluations par identifiant, dans l'ordre demandé.
+
+        Args:
+            ids: Identifiants d'évaluations (les identifiants inconnus sont ignorés)
+
+        Returns:
+            Évaluations avec leurs scores
+        """
+        if not ids:
+            return []
+
+        marqueurs = ",".join("?" * len(ids))
+
+        with self._lock:
+            lignes = self._conn.execute(
+                f"SELECT id, patient_id, date_examen, age, classe FROM evaluations WHERE id IN ({marqueurs})",
+                list(ids)
+            ).fetchall()
+
+        par_id = {
+            id_: EvaluationRecord(id=id_, patient_id=pid, date_examen=date.fromisoformat(d), age=age, classe=classe)
+            for id_, pid, d, age, classe in lignes
+        }
+        self._load_scores(par_id.values())
+
+        return [par_id[i] for i in ids if i in par_id]
+
+    def count_evaluations(self) -> int:
+        """Nombre total d'évaluations enregistrées."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+
+    def get_revision(self) -> Tuple[int, int]:
+        """
+        Retourne un marqueur de révision de l'historique (nombre d'évaluations, dernier identifiant).
+
+        Le marqueur change à chaque enregistrement, y compris lors du remplacement d'une évaluation.
+        """
+        with self._lock:
+            return tuple(self._conn.execute("SELECT COUNT(*), COALESCE(MAX(id), 0) FROM evaluations").fetchone())
+
+    def iter_score_chunks(self, taille_lot: int = 2000, batteries: Optional[Sequence[str]] = None,
+                          debut: Optional[date] = None, fin: Optional[date] = None,
+                          colonnes: Sequence[str] = COLONNES_SCORES) -> Iterator[List[Tuple]]:
+        """
+        Parcourt les scores de toutes les évaluations par lots d'évaluations complètes.
+
+        Chaque lot contient les lignes d'au plus `taille_lot` évaluations,
+        triées par évaluation : une évaluation n'est jamais répartie sur deux lots.
+        La lecture utilise sa propre connexion et n'accumule pas les lots déjà retournés.
+
+        Args:
+            taille_lot: Nombre maximal d'évaluations par lot
+            batteries: Motifs GLOB des batteries à inclure (ex: ['wisc_v', 'conners_*'])
+            debut: Date d'examen minimale (incluse)
+            fin: Date d'examen maximale (incluse)
+            colonnes: Colonnes à lire, parmi COLONNES_SCORES
+
+        Yields:
+            Listes de tuples ordonnés selon `colonnes`
+        """
+        filtres_dates = ""
+        params_dates = []
+
+        if debut is not None:
+            filtres_dates += " AND e.date_examen >= ?"
+            params_dates.append(debut.isoformat())
+        if fin is not None:
+            filtres_dates += " AND e.date_examen <= ?"
+            params_dates.append(fin.isoformat())
+
+        filtre_batteries = ""
+        if batteries:
+            filtre_batteries = " AND (" + " OR ".join("s.batterie GLOB ?" for _ in batteries) + ")"
+
+        requete_ids = f"SELECT e.id FROM evaluations e WHERE e.id > ?{filtres_dates} ORDER BY e.id LIMIT ?"
+        jointure_batteries = ""
+        if "informateur" in colonnes:
+            jointure_batteries = "JOIN batteries b ON b.evaluation_id = s.evaluation_id AND b.batterie = s.batterie "
+
+        requete_scores = (
+            f"SELECT {', '.join(_EXPRESSIONS_COLONNES[c] for c in colonnes)} "
+            "FROM evaluations e "
+            "JOIN scores s ON s.evaluation_id = e.id "
+            f"{jointure_batteries}"
+            f"WHERE e.id BETWEEN ? AND ?{filtres_dates}{filtre_batteries} "
+            "ORDER BY e.id"
+        )
+
+        conn = sqlite3.connect(str(self.chemin)) if str(self.chemin) != ":memory:" else self._conn
+        dernier_id = 0
+
+        try:
+            while True:
+                ids = [r[0] for r in conn.execute(requete_ids, [dernier_id, *params_dates, taille_lot])]
+                if not ids:
+                    return
+
+                params = [ids[0], ids[-1], *params_dates, *(batteries or [])]
+                lignes = conn.execute(requete_scores, params).fetchall()
+                dernier_id = ids[-1]
+
+                if lignes:
+                    yield lignes
+        finally:
+            if conn is not self._conn:
+                conn.close()
+
+    def _load_scores(self, records: Iterable[EvaluationRecord]) -> None:
+        """Charge les gestionnaires de scores d'un ensemble d'évaluations."""
+        par_id = {r.id: r for r in records}
+        if not par_id:
+            return
+
+        marqueurs = ",".join("?" * len(par_id))
+
+        with self._lock:
+            batteries = self._conn.execute(
+                f"SELECT evaluation_id, batterie, nom_test, informateur FROM batteries "
+                f"WHERE evaluation_id IN ({marqueurs})", list(par_id)
+            ).fetchall()
+            scores = self._conn.execute(
+                f"SELECT evaluation_id, batterie, nom, type_score, valeur, domaine, classification, percentile "
+                f"FROM scores WHERE evaluation_id IN ({marqueurs})", list(par_id)
+            ).fetchall()
+
+        for evaluation_id, batterie, nom_test, informateur in batteries:
+            par_id[evaluation_id].managers[batterie] = ScoreManager(nom_test, informateur=informateur)
+
+        for evaluation_id, batterie, nom, type_score, valeur, domaine, classification, percentile in scores:
+            par_id[evaluation_id].managers[batterie].add_score(Score(
+                nom=nom,
+                valeur=valeur,
+                type_score=ScoreType(type_score),
+                domaine=domaine,
+                percentile=percentile,
+                classification=classification
+            ))
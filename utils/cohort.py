@@ -0,0 +1,218 @@
+"""
+Statistiques de cohorte sur l'ensemble des évaluations enregistrées.
+
+Utilisation en ligne de commande :
+    python -m utils.cohort [--base CHEMIN] [--lot N]
+"""
+
+import argparse
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from models.interpretations import get_classification
+from models.scores import ScoreType
+from utils.case_store import CaseStore
+from config.constants import HETEROGENEITE_SEUIL, SEUILS_PROFIL, CONNERS_3_ECHELLES
+from config.settings import CHEMIN_HISTORIQUE
+
+
+# Indices WISC-V suivis et indices entrant dans le calcul d'hétérogénéité
+INDICES_WISC_COHORTE = ["ICV", "IVS", "IRF", "IMT", "IVT", "IQT"]
+INDICES_HETEROGENEITE = ["ICV", "IVS", "IRF", "IMT", "IVT"]
+
+# Bornes des histogrammes de notes standard (valeurs entières incluses)
+BORNES_HISTOGRAMME = (40, 160)
+
+# Colonnes lues dans l'historique
+COLONNES_COHORTE = ("evaluation_id", "age", "classe", "batterie", "nom", "valeur")
+
+_COMPARAISONS_NP = {"<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal}
+
+
+@dataclass
+class CohortStatistics:
+    """Agrégats de cohorte (tailles fixes, indépendantes du nombre d'évaluations)."""
+
+    n_evaluations: int = 0  # Évaluations comportant au moins un score WISC-V ou Conners-3
+    histogrammes_wisc: Dict[str, np.ndarray] = field(default_factory=dict)
+    n_profils: int = 0
+    n_heterogenes: int = 0
+    conners_par_age: pd.DataFrame = field(default_factory=pd.DataFrame)
+    conners_par_classe: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    @property
+    def taux_heterogeneite(self) -> Optional[float]:
+        """Proportion de profils WISC-V hétérogènes."""
+        return self.n_heterogenes / self.n_profils if self.n_profils else None
+
+    def distribution_wisc(self) -> pd.DataFrame:
+        """Effectif, moyenne, écart-type et quartiles de chaque indice WISC-V."""
+        valeurs = np.arange(BORNES_HISTOGRAMME[0], BORNES_HISTOGRAMME[1] + 1, dtype=np.float64)
+        lignes = []
+
+        for indice, effectifs in self.histogrammes_wisc.items():
+            n = int(effectifs.sum())
+            if not n:
+                continue
+
+            moyenne = (effectifs * valeurs).sum() / n
+            variance = (effectifs * (valeurs - moyenne) ** 2).sum() / max(n - 1, 1)
+            cumul = np.cumsum(effectifs)
+            quartiles = [valeurs[np.searchsorted(cumul, q * n)] for q in (0.25, 0.5, 0.75)]
+
+            lignes.append({
+                "Indice": indice,
+                "N": n,
+                "Moyenne": round(moyenne, 1),
+                "Écart-type": round(np.sqrt(variance), 1),
+                "Q1": quartiles[0],
+                "Médiane": quartiles[1],
+                "Q3": quartiles[2]
+            })
+
+        return pd.DataFrame(lignes)
+
+    def classifications_wisc(self) -> pd.DataFrame:
+        """Effectifs par classification pour chaque indice WISC-V (indices en lignes)."""
+        valeurs = np.arange(BORNES_HISTOGRAMME[0], BORNES_HISTOGRAMME[1] + 1)
+        labels = [get_classification(v, ScoreType.STANDARD)[0] for v in valeurs]
+
+        tableau = pd.DataFrame(
+            {indice: pd.Series(effectifs, index=labels).groupby(level=0, sort=False).sum()
+             for indice, effectifs in self.histogrammes_wisc.items()}
+        )
+        return tableau.T.astype(int)
+
+
+class CohortAnalytics:
+    """
+    Calcul des statistiques de cohorte à partir de l'historique.
+
+    Les scores sont lus par lots d'évaluations complètes, convertis en colonnes
+    pandas/NumPy, puis fusionnés dans des accumulateurs de taille fixe : la mémoire
+    utilisée dépend de la taille des lots, pas du nombre total d'évaluations.
+    """
+
+    def __init__(self, store: CaseStore, taille_lot: int = 5000):
+        """
+        Args:
+            store: Historique des évaluations
+            taille_lot: Nombre d'évaluations chargées par lot
+        """
+        self.store = store
+        self.taille_lot = taille_lot
+
+    def compute(self) -> CohortStatistics:
+        """Parcourt l'historique et calcule l'ensemble des agrégats."""
+        stats = CohortStatistics()
+        taille = BORNES_HISTOGRAMME[1] - BORNES_HISTOGRAMME[0] + 1
+        stats.histogrammes_wisc = {idx: np.zeros(taille, dtype=np.int64) for idx in INDICES_WISC_COHORTE}
+        lots = self.store.iter_score_chunks(self.taille_lot, batteries=["wisc_v", "conners_*"],
+                                            colonnes=COLONNES_COHORTE)
+
+        for lot in lots:
+            df = pd.DataFrame.from_records(lot, columns=COLONNES_COHORTE)
+            stats.n_evaluations += df["evaluation_id"].nunique()
+            est_wisc = (df["batterie"] == "wisc_v").to_numpy()
+
+            wisc = df[est_wisc & df["nom"].isin(INDICES_WISC_COHORTE).to_numpy()]
+            self._accumuler_histogrammes(stats, wisc)
+            self._accumuler_heterogeneite(stats, wisc)
+
+            # Seules les batteries Conners-3 restent après le filtre de la requête
+            conners = df[~est_wisc]
+            if not conners.empty:
+                conners = conners.assign(significatif=self._significatifs_t(conners["valeur"].to_numpy()))
+                stats.conners_par_age = self._fusionner(stats.conners_par_age, self._prevalence(conners, "age"))
+                stats.conners_par_classe = self._fusionner(stats.conners_par_classe,
+                                                           self._prevalence(conners, "classe"))
+
+        return stats
+
+    @staticmethod
+    def _accumuler_histogrammes(stats: CohortStatistics, wisc: pd.DataFrame) -> None:
+        """Ajoute les valeurs d'un lot aux histogrammes des indices WISC-V."""
+        minimum, maximum = BORNES_HISTOGRAMME
+        valeurs = np.clip(np.rint(wisc["valeur"].to_numpy()), minimum, maximum).astype(np.intp) - minimum
+        noms = wisc["nom"].to_numpy()
+
+        for indice, histogramme in stats.histogrammes_wisc.items():
+            histogramme += np.bincount(valeurs[noms == indice], minlength=len(histogramme))
+
+    @staticmethod
+    def _accumuler_heterogeneite(stats: CohortStatistics, wisc: pd.DataFrame) -> None:
+        """Compte les profils WISC-V hétérogènes d'un lot (écart maximal entre indices)."""
+        principaux = wisc[wisc["nom"].isin(INDICES_HETEROGENEITE)]
+        etendues = principaux.groupby("evaluation_id")["valeur"].agg(["min", "max", "count"])
+        etendues = etendues[etendues["count"] >= 2]
+
+        stats.n_profils += len(etendues)
+        stats.n_heterogenes += int(((etendues["max"] - etendues["min"]) >= HETEROGENEITE_SEUIL).sum())
+
+    @staticmethod
+    def _significatifs_t(valeurs: np.ndarray) -> np.ndarray:
+        """Applique le seuil de significativité des scores T à un tableau de valeurs."""
+        seuil, comparaison = SEUILS_PROFIL["significatif"]["t_score"]
+        return _COMPARAISONS_NP[comparaison](valeurs, seuil)
+
+    @staticmethod
+    def _prevalence(conners: pd.DataFrame, groupe: str) -> pd.DataFrame:
+        """Effectifs cotés et significatifs par groupe et échelle Conners-3."""
+        return conners.groupby([groupe, "nom"], dropna=False)["significatif"].agg(n="count", n_significatifs="sum")
+
+    @staticmethod
+    def _fusionner(total: pd.DataFrame, partiel: pd.DataFrame) -> pd.DataFrame:
+        """Ajoute les effectifs d'un lot aux effectifs cumulés et met à jour la prévalence."""
+        if not total.empty:
+            partiel = total[["n", "n_significatifs"]].add(partiel, fill_value=0)
+
+        return partiel.assign(prevalence=partiel["n_significatifs"] / partiel["n"])
+
+
+def prevalence_pivot(prevalences: pd.DataFrame) -> pd.DataFrame:
+    """Met en forme une table de prévalence (groupes en lignes, échelles Conners-3 en colonnes)."""
+    if prevalences.empty:
+        return pd.DataFrame()
+
+    tableau = prevalences["prevalence"].unstack("nom")
+    colonnes = [e for e in CONNERS_3_ECHELLES if e in tableau.columns]
+    return tableau[colonnes + [c for c in tableau.columns if c not in colonnes]]
+
+
+def main(argv=None) -> None:
+    """Point d'entrée en ligne de commande : affiche les statistiques de cohorte."""
+    parser = argparse.ArgumentParser(description="Statistiques de cohorte NeuroPsy Assist")
+    parser.add_argument("--base", type=Path, default=CHEMIN_HISTORIQUE, help="Base SQLite de l'historique")
+    parser.add_argument("--lot", type=int, default=5000, help="Nombre d'évaluations par lot")
+    args = parser.parse_args(argv)
+
+    stats = CohortAnalytics(CaseStore(args.base), args.lot).compute()
+
+    print(f"Évaluations analysées : {stats.n_evaluations}")
+    print()
+
+    if not stats.n_evaluations:
+        return
+
+    print("Distribution des indices WISC-V")
+    print(stats.distribution_wisc().to_string(index=False))
+    print()
+
+    if stats.taux_heterogeneite is not None:
+        print(f"Profils hétérogènes : {stats.n_heterogenes}/{stats.n_profils} ({stats.taux_heterogeneite:.1%})")
+        print()
+
+    with pd.option_context("display.float_format", "{:.0%}".format, "display.width", 200):
+        print("Prévalence des échelles Conners-3 significatives par âge")
+        print(prevalence_pivot(stats.conners_par_age).to_string())
+        print()
+        print("Prévalence des échelles Conners-3 significatives par classe")
+        print(prevalence_pivot(stats.conners_par_classe).to_string())
+
+
+if __name__ == "__main__":
+    main()
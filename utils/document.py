@@ -0,0 +1,203 @@
+"""
+Modèle de document du rapport : sections, paragraphes, tableaux et listes.
+
+Le moteur sémantique produit ce document une seule fois ; les moteurs de rendu
+(utils/renderers.py) le convertissent ensuite vers chaque format sans refaire
+l'analyse des scores.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Sequence, Union
+
+
+_GRAS = re.compile(r"\*\*(.+?)\*\*")
+_TITRE = re.compile(r"^(#{1,6}) (?:(\d+)\. )?(.*)$")
+_ELEMENT_LISTE = re.compile(r"^(?:(-)|(\d+)\.) (.*)$")
+
+
+@dataclass
+class Texte:
+    """Fragment de texte, éventuellement en gras."""
+
+    texte: str
+    gras: bool = False
+
+
+Ligne = List[Texte]
+
+
+def inline(texte: str) -> Ligne:
+    """
+    Découpe un texte rédigé par le moteur en fragments (les segments **...** sont en gras).
+
+    Réservé aux phrases du moteur : les saisies du clinicien sont passées telles
+    quelles dans un Texte pour ne jamais être interprétées.
+    """
+    fragments = []
+    position = 0
+
+    for correspondance in _GRAS.finditer(texte):
+        if correspondance.start() > position:
+            fragments.append(Texte(texte[position:correspondance.start()]))
+        fragments.append(Texte(correspondance.group(1), gras=True))
+        position = correspondance.end()
+
+    if position < len(texte):
+        fragments.append(Texte(texte[position:]))
+
+    return fragments
+
+
+def champ(libelle: str, valeur: str, deux_points: str = " :") -> Ligne:
+    """Ligne « **Libellé :** valeur » (la valeur n'est pas interprétée)."""
+    return [Texte(f"{libelle}{deux_points}", gras=True), Texte(f" {valeur}")]
+
+
+@dataclass
+class Paragraphe:
+    """Paragraphe d'une ou plusieurs lignes."""
+
+    lignes: List[Ligne]
+
+    @classmethod
+    def de(cls, *lignes: Union[str, Ligne]) -> "Paragraphe":
+        """Construit un paragraphe ; les lignes fournies en texte passent par inline()."""
+        return cls([inline(ligne) if isinstance(ligne, str) else ligne for ligne in lignes])
+
+    def texte(self) -> str:
+        """Texte brut du paragraphe."""
+        return "\n".join("".join(f.texte for f in ligne) for ligne in self.lignes)
+
+
+@dataclass
+class Tableau:
+    """Tableau : en-têtes et lignes de cellules textuelles."""
+
+    entetes: List[str]
+    lignes: List[List[str]] = field(default_factory=list)
+
+    def ajouter(self, *cellules) -> None:
+        """Ajoute une ligne au tableau."""
+        self.lignes.append([str(c) for c in cellules])
+
+
+@dataclass
+class Liste:
+    """Liste à puces ou numérotée."""
+
+    elements: List[Ligne] = field(default_factory=list)
+    ordonnee: bool = False
+
+    @classmethod
+    def de(cls, elements: Sequence[Union[str, Ligne]], ordonnee: bool = False) -> "Liste":
+        """Construit une liste ; les éléments fournis en texte passent par inline()."""
+        return cls([inline(e) if isinstance(e, str) else e for e in elements], ordonnee)
+
+
+@dataclass
+class Section:
+    """
+    Section titrée (niveau 1 à 4) contenant des blocs et des sous-sections.
+
+    `cle` identifie les sections de premier rang (clé du registre des sections).
+    """
+
+    titre: str
+    niveau: int
+    numero: Optional[int] = None
+    blocs: List["Bloc"] = field(default_factory=list)
+    cle: str = ""
+
+    @property
+    def intitule(self) -> str:
+        """Titre précédé de son numéro éventuel."""
+        return f"{self.numero}. {self.titre}" if self.numero is not None else self.titre
+
+    def ajouter(self, *blocs: "Bloc") -> "Section":
+        """Ajoute des blocs à la section et la retourne."""
+        self.blocs.extend(blocs)
+        return self
+
+    def paragraphe(self, *lignes: Union[str, Ligne]) -> Paragraphe:
+        """Ajoute un paragraphe (voir Paragraphe.de)."""
+        paragraphe = Paragraphe.de(*lignes)
+        self.blocs.append(paragraphe)
+        return paragraphe
+
+    def sous_section(self, titre: str) -> "Section":
+        """Ajoute une sous-section de niveau inférieur."""
+        section = Section(titre, self.niveau + 1)
+        self.blocs.append(section)
+        return section
+
+    def parcourir(self) -> Iterator["Bloc"]:
+        """Parcourt les blocs de la section et de ses sous-sections, en profondeur."""
+        for bloc in self.blocs:
+            yield bloc
+            if isinstance(bloc, Section):
+                yield from bloc.parcourir()
+
+
+Bloc = Union[Paragraphe, Tableau, Liste, Section]
+
+
+@dataclass
+class Document:
+    """Rapport complet : sections de premier rang dans l'ordre du rapport."""
+
+    sections: List[Section] = field(default_factory=list)
+    langue: str = "fr"
+
+    def section(self, cle: str) -> Optional[Section]:
+        """Retourne la section de premier rang portant une clé du registre."""
+        return next((s for s in self.sections if s.cle == cle), None)
+
+    @classmethod
+    def from_markdown(cls, texte: str, langue: str = "fr") -> "Document":
+        """
+        Reconstruit un document à partir du Markdown produit par MarkdownRenderer.
+
+        Permet de rendre dans les autres formats un rapport modifié à la main. Seul le
+        sous-ensemble utilisé par les rapports est reconnu : titres, tableaux, listes et
+        paragraphes avec segments en gras.
+        """
+        document = cls(langue=langue)
+        pile: List[Section] = []
+        racine = Section("", 0)
+
+        for bloc in re.split(r"\n\s*\n", texte.strip("\n")):
+            lignes = bloc.split("\n")
+
+            # Un titre peut être immédiatement suivi de contenu (saisie manuelle)
+            titre = _TITRE.match(lignes[0])
+            if titre:
+                section = Section(titre.group(3), len(titre.group(1)),
+                                  int(titre.group(2)) if titre.group(2) else None)
+                # Les titres de niveau 1 et 2 sont des sections de premier rang
+                while pile and (pile[-1].niveau >= section.niveau or section.niveau <= 2):
+                    pile.pop()
+                if pile:
+                    pile[-1].ajouter(section)
+                else:
+                    document.sections.append(section)
+                pile.append(section)
+                lignes = lignes[1:]
+                if not lignes:
+                    continue
+
+            parent = pile[-1] if pile else racine
+
+            if all(ligne.startswith("|") for ligne in lignes) and len(lignes) >= 2:
+                cellules = [[c.strip() for c in ligne.strip().strip("|").split("|")] for ligne in lignes]
+                parent.ajouter(Tableau(cellules[0], cellules[2:]))
+            elif all(_ELEMENT_LISTE.match(ligne) for ligne in lignes):
+                elements = [_ELEMENT_LISTE.match(ligne) for ligne in lignes]
+                parent.ajouter(Liste([inline(e.group(3)) for e in elements], ordonnee=elements[0].group(1) is None))
+            else:
+                parent.ajouter(Paragraphe.de(*lignes))
+
+        if racine.blocs:
+            document.sections.insert(0, Section("", 1, blocs=racine.blocs))
+
+        return document
@@ -0,0 +1,318 @@
+"""
+Rendu DOCX des rapports (courriers WordprocessingML, sans dépendance externe).
+
+Un fichier DOCX est une archive ZIP : le texte du rapport (word/document.xml) y côtoie
+des parties identiques pour tous les courriers d'une langue (styles, polices, en-tête et
+pied de page, légende des classifications). Ces parties sont construites une seule fois
+par processus (mise_en_page) ; rendre un courrier se réduit à produire le corps du
+document et à l'archiver avec elles.
+"""
+
+import re
+import zipfile
+from dataclasses import dataclass
+from functools import lru_cache
+from io import BytesIO
+from typing import BinaryIO, Iterable, Iterator, List, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+from utils.document import Document, Section, Paragraphe, Tableau, Liste, Texte, Ligne
+from utils.i18n import get_catalogue
+from utils.renderers import RENDERERS, get_renderer, render_document
+from config.constants import (
+    STANDARD_CLASSIFICATIONS,
+    SCALAIRE_CLASSIFICATIONS,
+    T_SCORE_CLASSIFICATIONS,
+    LANGUE_DEFAUT
+)
+
+
+_W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_ENTETE_XML = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+# Caractères interdits en XML 1.0 (retirés des saisies)
+_CARACTERES_INTERDITS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+# Date fixe des entrées de l'archive : un même rapport produit toujours le même fichier
+_DATE_ARCHIVE = (1980, 1, 1, 0, 0, 0)
+
+# Page A4, marges de 2,5 cm (vingtièmes de point)
+LARGEUR_PAGE = 11906
+HAUTEUR_PAGE = 16838
+MARGE = 1418
+LARGEUR_TEXTE = LARGEUR_PAGE - 2 * MARGE
+
+POLICE = "Georgia"
+
+# Taille des titres par niveau (demi-points)
+TAILLES_TITRES = {1: 32, 2: 28, 3: 24, 4: 22}
+
+_TYPES_CONTENU = f"""{_ENTETE_XML}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">\
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>\
+<Default Extension="xml" ContentType="application/xml"/>\
+<Override PartName="/word/document.xml" \
+ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>\
+<Override PartName="/word/styles.xml" \
+ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>\
+<Override PartName="/word/fontTable.xml" \
+ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.fontTable+xml"/>\
+<Override PartName="/word/header1.xml" \
+ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.header+xml"/>\
+<Override PartName="/word/footer1.xml" \
+ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.footer+xml"/>\
+</Types>"""
+
+_RELATIONS_PAQUET = f"""{_ENTETE_XML}<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">\
+<Relationship Id="rId1" Type="{_R}/officeDocument" Target="word/document.xml"/>\
+</Relationships>"""
+
+_RELATIONS_DOCUMENT = f"""{_ENTETE_XML}<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">\
+<Relationship Id="rId1" Type="{_R}/styles" Target="styles.xml"/>\
+<Relationship Id="rId2" Type="{_R}/fontTable" Target="fontTable.xml"/>\
+<Relationship Id="rId3" Type="{_R}/header" Target="header1.xml"/>\
+<Relationship Id="rId4" Type="{_R}/footer" Target="footer1.xml"/>\
+</Relationships>"""
+
+_POLICES = f"""{_ENTETE_XML}<w:fonts xmlns:w="{_W}">\
+<w:font w:name="{POLICE}"><w:panose1 w:val="02040502050405020303"/><w:charset w:val="00"/>\
+<w:family w:val="roman"/><w:pitch w:val="variable"/></w:font>\
+</w:fonts>"""
+
+# Propriétés de section : page, marges, en-tête et pied de page
+_SECTION = (f'<w:sectPr><w:headerReference w:type="default" r:id="rId3"/>'
+            f'<w:footerReference w:type="default" r:id="rId4"/>'
+            f'<w:pgSz w:w="{LARGEUR_PAGE}" w:h="{HAUTEUR_PAGE}"/>'
+            f'<w:pgMar w:top="{MARGE}" w:right="{MARGE}" w:bottom="{MARGE}" w:left="{MARGE}" '
+            f'w:header="709" w:footer="709" w:gutter="0"/></w:sectPr>')
+
+
+@dataclass(frozen=True)
+class MiseEnPage:
+    """Parties communes aux courriers d'une langue (construites une fois par processus)."""
+
+    parties: Tuple[Tuple[str, bytes], ...]  # Parties de l'archive, hors corps du document
+    legende: str  # Légende des classifications (XML du corps)
+
+
+def _texte(texte: str) -> str:
+    return escape(_CARACTERES_INTERDITS.sub("", texte))
+
+
+def _run(texte: str, gras: bool = False) -> str:
+    proprietes = "<w:rPr><w:b/></w:rPr>" if gras else ""
+    return f'<w:r>{proprietes}<w:t xml:space="preserve">{_texte(texte)}</w:t></w:r>'
+
+
+def _paragraphe(runs: str, style: str = "") -> str:
+    proprietes = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+    return f"<w:p>{proprietes}{runs}</w:p>"
+
+
+def _ligne(ligne: Ligne) -> str:
+    return "".join(_run(f.texte, f.gras) for f in ligne)
+
+
+def _tableau(entetes: Sequence[str], lignes: Iterable[Sequence[str]]) -> str:
+    largeur = LARGEUR_TEXTE // max(len(entetes), 1)
+    morceaux = ['<w:tbl><w:tblPr><w:tblStyle w:val="TableGrid"/><w:tblW w:w="5000" w:type="pct"/></w:tblPr>',
+                "<w:tblGrid>", f'<w:gridCol w:w="{largeur}"/>' * len(entetes), "</w:tblGrid>",
+                "<w:tr><w:trPr><w:tblHeader/></w:trPr>"]
+    # Ligne d'en-tête répétée sur chaque page
+    for entete in entetes:
+        morceaux.append('<w:tc><w:tcPr><w:shd w:val="clear" w:color="auto" w:fill="EEEEEE"/></w:tcPr>'
+                        f'{_paragraphe(_run(entete, gras=True), "TableContents")}</w:tc>')
+    morceaux.append("</w:tr>")
+
+    for cellules in lignes:
+        # Lignes incomplètes (rapport modifié à la main) complétées par des cellules vides
+        cellules = list(cellules[:len(entetes)]) + [""] * (len(entetes) - len(cellules))
+        morceaux.append("<w:tr>")
+        morceaux.extend(f'<w:tc>{_paragraphe(_run(c), "TableContents")}</w:tc>' for c in cellules)
+        morceaux.append("</w:tr>")
+
+    morceaux.append("</w:tbl>")
+    return "".join(morceaux)
+
+
+def _blocs(blocs: Iterable) -> Iterator[str]:
+    """XML du corps pour une suite de blocs du document."""
+    for bloc in blocs:
+        if isinstance(bloc, Section):
+            if bloc.intitule:
+                yield _paragraphe(_run(bloc.intitule), f"Heading{min(max(bloc.niveau, 1), 4)}")
+            yield from _blocs(bloc.blocs)
+        elif isinstance(bloc, Paragraphe):
+            yield _paragraphe("<w:r><w:br/></w:r>".join(_ligne(ligne) for ligne in bloc.lignes))
+        elif isinstance(bloc, Tableau):
+            yield _tableau(bloc.entetes, bloc.lignes)
+            # Espace après le tableau (et paragraphe requis si le tableau termine le document)
+            yield "<w:p/>"
+        elif isinstance(bloc, Liste):
+            for i, element in enumerate(bloc.elements, 1):
+                puce = f"{i}." if bloc.ordonnee else "•"
+                yield _paragraphe(f"{_run(puce)}<w:r><w:tab/></w:r>{_ligne(element)}", "ListParagraph")
+
+
+def _styles(langue: str) -> str:
+    titres = "".join(
+        f'<w:style w:type="paragraph" w:styleId="Heading{niveau}"><w:name w:val="heading {niveau}"/>'
+        f'<w:basedOn w:val="Normal"/><w:next w:val="Normal"/><w:uiPriority w:val="9"/><w:qFormat/>'
+        f'<w:pPr><w:keepNext/><w:spacing w:before="{360 if niveau <= 2 else 240}" w:after="120"/>'
+        f'<w:outlineLvl w:val="{niveau - 1}"/></w:pPr>'
+        f'<w:rPr><w:b/><w:sz w:val="{taille}"/><w:szCs w:val="{taille}"/></w:rPr></w:style>'
+        for niveau, taille in TAILLES_TITRES.items()
+    )
+    bordure = 'w:val="single" w:sz="4" w:space="0" w:color="999999"'
+    return (
+        f'{_ENTETE_XML}<w:styles xmlns:w="{_W}">'
+        f'<w:docDefaults><w:rPrDefault><w:rPr>'
+        f'<w:rFonts w:ascii="{POLICE}" w:hAnsi="{POLICE}" w:eastAsia="{POLICE}" w:cs="{POLICE}"/>'
+        f'<w:sz w:val="22"/><w:szCs w:val="22"/><w:lang w:val="{langue}"/></w:rPr></w:rPrDefault>'
+        f'<w:pPrDefault><w:pPr><w:spacing w:after="120" w:line="288" w:lineRule="auto"/></w:pPr>'
+        f'</w:pPrDefault></w:docDefaults>'
+        f'<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/><w:qFormat/>'
+        f'</w:style>'
+        f'{titres}'
+        f'<w:style w:type="paragraph" w:styleId="ListParagraph"><w:name w:val="List Paragraph"/>'
+        f'<w:basedOn w:val="Normal"/><w:pPr><w:spacing w:after="60"/>'
+        f'<w:tabs><w:tab w:val="left" w:pos="567"/></w:tabs><w:ind w:left="567" w:hanging="283"/></w:pPr>'
+        f'</w:style>'
+        f'<w:style w:type="paragraph" w:styleId="TableContents"><w:name w:val="Table Contents"/>'
+        f'<w:basedOn w:val="Normal"/><w:pPr><w:spacing w:before="40" w:after="40"/></w:pPr>'
+        f'<w:rPr><w:sz w:val="20"/><w:szCs w:val="20"/></w:rPr></w:style>'
+        f'<w:style w:type="paragraph" w:styleId="Header"><w:name w:val="header"/><w:basedOn w:val="Normal"/>'
+        f'<w:pPr><w:spacing w:after="0"/><w:jc w:val="right"/></w:pPr>'
+        f'<w:rPr><w:color w:val="666666"/><w:sz w:val="16"/><w:szCs w:val="16"/></w:rPr></w:style>'
+        f'<w:style w:type="paragraph" w:styleId="Footer"><w:name w:val="footer"/><w:basedOn w:val="Header"/>'
+        f'<w:pPr><w:jc w:val="center"/></w:pPr></w:style>'
+        f'<w:style w:type="table" w:default="1" w:styleId="TableNormal"><w:name w:val="Normal Table"/>'
+        f'<w:tblPr><w:tblInd w:w="0" w:type="dxa"/><w:tblCellMar><w:top w:w="0" w:type="dxa"/>'
+        f'<w:left w:w="108" w:type="dxa"/><w:bottom w:w="0" w:type="dxa"/><w:right w:w="108" w:type="dxa"/>'
+        f'</w:tblCellMar></w:tblPr></w:style>'
+        f'<w:style w:type="table" w:styleId="TableGrid"><w:name w:val="Table Grid"/>'
+        f'<w:basedOn w:val="TableNormal"/><w:tblPr><w:tblBorders>'
+        f'<w:top {bordure}/><w:left {bordure}/><w:bottom {bordure}/><w:right {bordure}/>'
+        f'<w:insideH {bordure}/><w:insideV {bordure}/></w:tblBorders></w:tblPr></w:style>'
+        f'</w:styles>'
+    )
+
+
+def _intervalle(minimum, maximum) -> str:
+    return f"≥ {minimum}" if maximum == float("inf") else f"{minimum}–{maximum}"
+
+
+def _legende(t) -> str:
+    """Légende des classifications (mêmes libellés que les tableaux du rapport)."""
+    section = Section(t("Légende des classifications"), 2)
+
+    section.paragraphe([Texte(t("Notes standard (moyenne 100, écart type 15)"))])
+    section.ajouter(Tableau([t("Note"), t("Classification"), t("Percentile")],
+                            [[_intervalle(mini, maxi), t(libelle), percentile]
+                             for mini, maxi, libelle, percentile in STANDARD_CLASSIFICATIONS]))
+
+    section.paragraphe([Texte(t("Notes scalaires (moyenne 10, écart type 3)"))])
+    section.ajouter(Tableau([t("Note"), t("Classification")],
+                            [[_intervalle(mini, maxi), t(libelle)] for mini, maxi, libelle in SCALAIRE_CLASSIFICATIONS]))
+
+    section.paragraphe([Texte(t("Scores T (moyenne 50, écart type 10)"))])
+    section.ajouter(Tableau([t("Score T"), t("Classification")],
+                            [[_intervalle(mini, maxi), t(libelle)] for mini, maxi, libelle, _ in T_SCORE_CLASSIFICATIONS]))
+
+    return "".join(_blocs([section]))
+
+
+
+@lru_cache(maxsize=None)
+def mise_en_page(langue: str = LANGUE_DEFAUT) -> MiseEnPage:
+    """
+    Parties communes aux courriers d'une langue : styles, polices, en-tête, pied de page
+    et légende des classifications (construites à la première demande, puis réutilisées).
+
+    Raises:
+        ValueError: Si la langue n'est pas prise en charge
+    """
+    t = get_catalogue(langue).gettext
+
+    titre = t("COMPTE-RENDU D'EXAMEN NEUROPSYCHOLOGIQUE")
+    entete = _paragraphe(_run(f"{t('Confidentiel')} · {titre}"), "Header")
+    pied = _paragraphe(
+        f'{_run(t("Page") + " ")}<w:fldSimple w:instr=" PAGE "><w:r><w:t>1</w:t></w:r></w:fldSimple>'
+        f'{_run(" / ")}<w:fldSimple w:instr=" NUMPAGES "><w:r><w:t>1</w:t></w:r></w:fldSimple>',
+        "Footer"
+    )
+
+    parties = (
+        ("[Content_Types].xml", _TYPES_CONTENU),
+        ("_rels/.rels", _RELATIONS_PAQUET),
+        ("word/_rels/document.xml.rels", _RELATIONS_DOCUMENT),
+        ("word/styles.xml", _styles(langue)),
+        ("word/fontTable.xml", _POLICES),
+        ("word/header1.xml", f'{_ENTETE_XML}<w:hdr xmlns:w="{_W}">{entete}</w:hdr>'),
+        ("word/footer1.xml", f'{_ENTETE_XML}<w:ftr xmlns:w="{_W}">{pied}</w:ftr>'),
+    )
+
+    return MiseEnPage(tuple((nom, contenu.encode("utf-8")) for nom, contenu in parties), _legende(t))
+
+
+class DocxRenderer:
+    """Rendu DOCX : courrier A4 avec en-tête, pagination et légende des classifications."""
+
+    format = "docx"
+    extension = "docx"
+    mime = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+    def __init__(self, legende: bool = True):
+        """
+        Args:
+            legende: Ajouter la légende des classifications en fin de courrier
+        """
+        self.legende = legende
+
+    def body(self, document: Document) -> str:
+        """XML du corps du courrier (word/document.xml)."""
+        morceaux = [f'{_ENTETE_XML}<w:document xmlns:w="{_W}" xmlns:r="{_R}"><w:body>']
+        morceaux.extend(_blocs(document.sections))
+        if self.legende:
+            morceaux.append(mise_en_page(document.langue).legende)
+        morceaux.append(f"{_SECTION}</w:body></w:document>")
+        return "".join(morceaux)
+
+    def write(self, document: Document, flux: BinaryIO) -> None:
+        """Écrit le courrier dans un flux binaire."""
+        parties = mise_en_page(document.langue).parties
+        corps = ("word/document.xml", self.body(document).encode("utf-8"))
+
+        with zipfile.ZipFile(flux, "w", zipfile.ZIP_DEFLATED) as archive:
+            # [Content_Types].xml en tête de l'archive, comme le produisent les traitements de texte
+            for nom, contenu in parties[:1] + (corps,) + parties[1:]:
+                entree = zipfile.ZipInfo(nom, _DATE_ARCHIVE)
+                entree.compress_type = zipfile.ZIP_DEFLATED
+                archive.writestr(entree, contenu)
+
+    def render(self, document: Document) -> bytes:
+        """Retourne le courrier DOCX."""
+        flux = BytesIO()
+        self.write(document, flux)
+        return flux.getvalue()
+
+
+# Formats de rendu des documents (DOCX et formats texte)
+FORMATS_DOCUMENTS: List[str] = [DocxRenderer.format, *RENDERERS]
+
+
+def extension_format(format: str) -> str:
+    """
+    Extension des fichiers d'un format de rapport (DOCX ou format de utils.renderers).
+
+    Raises:
+        ValueError: Si le format n'est pas pris en charge
+    """
+    return DocxRenderer.extension if format == DocxRenderer.format else get_renderer(format).extension
+
+
+def render_bytes(document: Document, format: str = DocxRenderer.format) -> bytes:
+    """Rend un document en octets : courrier DOCX, ou format texte de utils.renderers (UTF-8)."""
+    if format == DocxRenderer.format:
+        return DocxRenderer().render(document)
+    return render_document(document, format).encode("utf-8")
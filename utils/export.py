@@ -0,0 +1,154 @@
+"""
+Export des scores de l'historique pour la recherche (Parquet ou CSV).
+
+Une ligne par score : identifiant patient pseudonymisé, date d'examen, âge, batterie,
+informateur, échelle, type de score, valeur et classification. Les évaluations sont
+lues par lots, converties en lots colonnes puis écrites au fur et à mesure : la mémoire
+utilisée dépend de la taille des lots, pas du nombre d'évaluations exportées.
+
+Utilisation en ligne de commande :
+    python -m utils.export SORTIE [--format parquet|csv] [--debut AAAA-MM-JJ] [--fin AAAA-MM-JJ]
+                                  [--batterie MOTIF ...] [--lot N] [--chiffrer]
+"""
+
+import argparse
+import os
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from utils.case_store import CaseStore
+from utils.vault import ClinicCipher, load_key
+from config.settings import CHEMIN_HISTORIQUE
+
+
+# Colonnes exportées et leur type
+SCHEMA_EXPORT = pa.schema([
+    ("patient_id", pa.string()),
+    ("date_examen", pa.date32()),
+    ("age", pa.int16()),
+    ("batterie", pa.string()),
+    ("informateur", pa.string()),
+    ("nom", pa.string()),
+    ("type_score", pa.string()),
+    ("valeur", pa.float64()),
+    ("classification", pa.string()),
+])
+
+# Colonnes lues dans l'historique (l'identifiant d'évaluation sert au décompte)
+COLONNES_EXPORT = ("evaluation_id", *SCHEMA_EXPORT.names)
+
+# Formats d'export (format -> extension)
+FORMATS_EXPORT = {
+    "parquet": "parquet",
+    "csv": "csv"
+}
+
+
+@dataclass
+class ExportSummary:
+    """Bilan d'un export."""
+
+    chemin: Path
+    n_evaluations: int = 0
+    n_scores: int = 0
+
+
+def export_scores(store: CaseStore, chemin: Path, format_export: str = "parquet",
+                  debut: Optional[date] = None, fin: Optional[date] = None,
+                  batteries: Optional[Sequence[str]] = None, taille_lot: int = 2000,
+                  chiffrement: Optional[ClinicCipher] = None) -> ExportSummary:
+    """
+    Exporte les scores de l'historique dans un fichier Parquet ou CSV.
+
+    Le fichier est écrit sous un nom temporaire puis renommé : un export interrompu
+    ne laisse pas de fichier partiel.
+
+    Args:
+        store: Historique des évaluations
+        chemin: Fichier de sortie
+        format_export: Format du fichier, parmi FORMATS_EXPORT
+        debut: Date d'examen minimale (incluse)
+        fin: Date d'examen maximale (incluse)
+        batteries: Motifs GLOB des batteries à exporter (ex: ['wisc_v', 'conners_*'])
+        taille_lot: Nombre d'évaluations lues par lot
+        chiffrement: Chiffrement du cabinet (fichier chiffré en flux si fourni)
+
+    Raises:
+        ValueError: Si le format est inconnu
+    """
+    if format_export not in FORMATS_EXPORT:
+        raise ValueError(f"Format d'export inconnu : {format_export}")
+
+    bilan = ExportSummary(chemin)
+    chemin.parent.mkdir(parents=True, exist_ok=True)
+    temporaire = chemin.with_name(f"{chemin.name}.tmp")
+
+    try:
+        with open(temporaire, "wb") as fichier:
+            sortie = chiffrement.encrypt_stream(fichier) if chiffrement is not None else fichier
+            ecrivain = (pq.ParquetWriter(sortie, SCHEMA_EXPORT) if format_export == "parquet"
+                        else pa_csv.CSVWriter(sortie, SCHEMA_EXPORT))
+
+            for lot in store.iter_score_chunks(taille_lot, batteries=batteries, debut=debut, fin=fin,
+                                               colonnes=COLONNES_EXPORT):
+                n_evaluations, batch = _lot_colonnes(lot)
+                ecrivain.write_batch(batch)
+                bilan.n_evaluations += n_evaluations
+                bilan.n_scores += batch.num_rows
+
+            ecrivain.close()
+            if sortie is not fichier:
+                sortie.close()
+            fichier.flush()
+            os.fsync(fichier.fileno())
+
+        os.replace(temporaire, chemin)
+    finally:
+        temporaire.unlink(missing_ok=True)
+
+    return bilan
+
+
+def _lot_colonnes(lot: List[Tuple]) -> Tuple[int, pa.RecordBatch]:
+    """Convertit un lot de lignes en lot colonnes (et compte ses évaluations)."""
+    evaluations, *colonnes = zip(*lot)
+    # Les lignes sont triées par évaluation
+    n_evaluations = 1 + sum(1 for a, b in zip(evaluations, evaluations[1:]) if a != b)
+
+    tableaux = []
+    for champ, valeurs in zip(SCHEMA_EXPORT, colonnes):
+        if champ.name == "date_examen":
+            tableaux.append(pa.array(valeurs, pa.string()).cast(champ.type))
+        else:
+            tableaux.append(pa.array(valeurs, champ.type))
+
+    return n_evaluations, pa.RecordBatch.from_arrays(tableaux, schema=SCHEMA_EXPORT)
+
+
+def main(argv=None) -> None:
+    """Point d'entrée en ligne de commande : exporte les scores de l'historique."""
+    parser = argparse.ArgumentParser(description="Export des scores NeuroPsy Assist pour la recherche")
+    parser.add_argument("sortie", type=Path, help="Fichier de sortie")
+    parser.add_argument("--format", choices=list(FORMATS_EXPORT), default="parquet", help="Format du fichier")
+    parser.add_argument("--base", type=Path, default=CHEMIN_HISTORIQUE, help="Base SQLite de l'historique")
+    parser.add_argument("--debut", type=date.fromisoformat, help="Date d'examen minimale (AAAA-MM-JJ)")
+    parser.add_argument("--fin", type=date.fromisoformat, help="Date d'examen maximale (AAAA-MM-JJ)")
+    parser.add_argument("--batterie", action="append", help="Batterie à exporter (motif, répétable)")
+    parser.add_argument("--lot", type=int, default=2000, help="Nombre d'évaluations par lot")
+    parser.add_argument("--chiffrer", action="store_true", help="Chiffrer le fichier avec la clé du cabinet")
+    args = parser.parse_args(argv)
+
+    bilan = export_scores(CaseStore(args.base), args.sortie, args.format, args.debut, args.fin,
+                          args.batterie, args.lot, ClinicCipher(load_key()) if args.chiffrer else None)
+
+    print(f"{bilan.n_scores} scores de {bilan.n_evaluations} évaluations exportés dans {bilan.chemin}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Catalogues de traduction du rapport.
+
+Le français est la langue source : chaque phrase du moteur sert d'identifiant de
+message. Les traductions sont rédigées dans locales/<langue>/LC_MESSAGES/rapport.po
+puis compilées au format binaire gettext (.mo), que la bibliothèque standard charge
+par recherche dichotomique sans analyser le texte source.
+
+Un catalogue n'est chargé qu'à la première demande de sa langue, puis conservé pour
+toute la durée du processus (donc partagé entre les sessions de l'application).
+"""
+
+import ast
+import gettext
+import io
+import struct
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List
+
+from config.constants import LANGUE_DEFAUT, LANGUES_RAPPORT
+from config.settings import DOSSIER_LOCALES
+
+
+DOMAINE = "rapport"
+
+# Nombre magique des catalogues .mo (écrits en petit-boutiste)
+_MAGIQUE_MO = 0x950412de
+
+
+def chemin_catalogue(langue: str, extension: str = "po") -> Path:
+    """Chemin du catalogue source (.po) ou compilé (.mo) d'une langue."""
+    return DOSSIER_LOCALES / langue / "LC_MESSAGES" / f"{DOMAINE}.{extension}"
+
+
+def parse_po(texte: str) -> Dict[str, str]:
+    """
+    Lit un catalogue .po.
+
+    Seul le sous-ensemble utilisé par les catalogues du rapport est reconnu : entrées
+    msgid/msgstr sur une ou plusieurs lignes, commentaires et drapeau « fuzzy ».
+    Les entrées floues ou non traduites sont ignorées (la phrase française est alors
+    conservée).
+
+    Returns:
+        Messages (identifiant -> traduction), en-tête inclus (identifiant vide)
+    """
+    messages: Dict[str, str] = {}
+    entree: Dict[str, List[str]] = {}
+    champ_courant = None
+    flou = False
+
+    def terminer():
+        identifiant = "".join(entree.get("msgid", []))
+        traduction = "".join(entree.get("msgstr", []))
+        if "msgid" in entree and traduction and not flou:
+            messages[identifiant] = traduction
+
+    for numero, ligne in enumerate(texte.splitlines(), 1):
+        ligne = ligne.strip()
+
+        if not ligne:
+            continue
+
+        if ligne.startswith("#"):
+            if "msgstr" in entree:
+                terminer()
+                entree, champ_courant, flou = {}, None, False
+            if ligne.startswith("#,") and "fuzzy" in ligne:
+                flou = True
+            continue
+
+        mot, _, reste = ligne.partition(" ")
+        if mot in ("msgid", "msgstr"):
+            if mot == "msgid" and "msgstr" in entree:
+                terminer()
+                entree, flou = {}, False
+            champ_courant = mot
+            entree[mot] = []
+            ligne = reste.strip()
+
+        if champ_courant is None or not ligne.startswith('"'):
+            raise ValueError(f"Ligne {numero} du catalogue non reconnue : {ligne}")
+
+        entree[champ_courant].append(ast.literal_eval(ligne))
+
+    terminer()
+
+    return messages
+
+
+def compile_mo(messages: Dict[str, str]) -> bytes:
+    """
+    Compile des messages au format binaire gettext (.mo).
+
+    Les identifiants sont triés (ordre des octets UTF-8) comme l'exige la recherche
+    dichotomique du format ; aucune table de hachage n'est produite.
+    """
+    cles = sorted(messages, key=lambda cle: cle.encode("utf-8"))
+    identifiants = [cle.encode("utf-8") for cle in cles]
+    traductions = [messages[cle].encode("utf-8") for cle in cles]
+
+    n = len(cles)
+    debut_identifiants = 7 * 4
+    debut_traductions = debut_identifiants + n * 8
+    position = debut_traductions + n * 8
+
+    index_identifiants, index_traductions = [], []
+    for chaine in identifiants:
+        index_identifiants.append((len(chaine), position))
+        position += len(chaine) + 1
+    for chaine in traductions:
+        index_traductions.append((len(chaine), position))
+        position += len(chaine) + 1
+
+    tampon = io.BytesIO()
+    tampon.write(struct.pack("<7I", _MAGIQUE_MO, 0, n, debut_identifiants, debut_traductions, 0, 0))
+    for longueur, decalage in index_identifiants + index_traductions:
+        tampon.write(struct.pack("<2I", longueur, decalage))
+    for chaine in identifiants + traductions:
+        tampon.write(chaine + b"\0")
+
+    return tampon.getvalue()
+
+
+def compiler_catalogue(langue: str) -> Path:
+    """
+    Compile le catalogue .po d'une langue vers son fichier .mo.
+
+    Returns:
+        Chemin du catalogue compilé
+    """
+    source = chemin_catalogue(langue, "po")
+    cible = chemin_catalogue(langue, "mo")
+    cible.write_bytes(compile_mo(parse_po(source.read_text(encoding="utf-8"))))
+    return cible
+
+
+@lru_cache(maxsize=None)
+def get_catalogue(langue: str) -> gettext.NullTranslations:
+    """
+    Retourne le catalogue d'une langue, chargé à la première demande.
+
+    Le catalogue compilé est utilisé tel quel s'il est à jour ; s'il manque ou si la
+    source .po est plus récente, la source est compilée en mémoire.
+
+    Raises:
+        ValueError: Si la langue n'est pas prise en charge
+    """
+    if langue not in LANGUES_RAPPORT:
+        raise ValueError(f"Langue de rapport non prise en charge : {langue}")
+
+    if langue == LANGUE_DEFAUT:
+        return gettext.NullTranslations()
+
+    source = chemin_catalogue(langue, "po")
+    binaire = chemin_catalogue(langue, "mo")
+
+    if binaire.exists() and (not source.exists() or binaire.stat().st_mtime >= source.stat().st_mtime):
+        with binaire.open("rb") as fichier:
+            return gettext.GNUTranslations(fichier)
+
+    contenu = compile_mo(parse_po(source.read_text(encoding="utf-8")))
+    return gettext.GNUTranslations(io.BytesIO(contenu))
+
+
+def main(langues: List[str]) -> None:
+    """Compile les catalogues des langues demandées (toutes par défaut)."""
+    for langue in langues or [l for l in LANGUES_RAPPORT if l != LANGUE_DEFAUT]:
+        print(compiler_catalogue(langue))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,586 @@
+"""
+Import des exports des logiciels de cotation des éditeurs (CSV, XML).
+
+Les exports sont lus en flux (ligne par ligne pour le CSV, élément par élément pour le
+XML) ; les libellés d'échelles, de batteries et d'informateurs sont rapprochés des
+structures de config.constants par une table de correspondance, extensible par un
+fichier JSON. Les scores de tous les exports importés ensemble sont ensuite classés
+et contrôlés en une seule passe vectorisée. Un dossier d'exports est lu en parallèle
+sur plusieurs processus.
+
+Utilisation en ligne de commande :
+    python -m utils.importers EXPORT_OU_DOSSIER [...] [--correspondances FICHIER]
+                                                  [--processus N] [--enregistrer] [--base CHEMIN]
+"""
+
+import argparse
+import codecs
+import csv
+import io
+import json
+import os
+import re
+import unicodedata
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import chain, repeat
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+import numpy as np
+
+from models.patient import Patient
+from models.scores import Score, ScoreManager
+from models.profile import TYPES_SCORES, CODES_TYPES
+from models.interpretations import classify_scores, interprete_classification
+from utils.case_store import CaseStore
+from config.constants import (
+    WISC_V_STRUCTURE, KABC_II_STRUCTURE, TEACH_STRUCTURE, NEPSY_II_STRUCTURE, BROWN_ECHELLES,
+    CONNERS_3_ECHELLES, CONNERS_3_INFORMATEURS, TYPES_ECHELLES, BORNES_TYPES_SCORES,
+    ALIAS_BATTERIES_IMPORT, ALIAS_ECHELLES_IMPORT, ALIAS_INFORMATEURS_IMPORT, COLONNES_IMPORT
+)
+from config.settings import CHEMIN_CORRESPONDANCES_IMPORT, CHEMIN_HISTORIQUE
+
+
+EXTENSIONS_IMPORT = (".csv", ".xml")
+
+# Nom du test des gestionnaires créés, par famille de batterie
+NOMS_TESTS = {
+    "wisc_v": "WISC-V",
+    "kabc_ii": "KABC-II",
+    "teach": "TEA-Ch",
+    "nepsy_ii": "NEPSY-II",
+    "brown": "Brown"
+}
+
+# Informateur Conners-3 retenu quand l'export n'en indique pas
+INFORMATEUR_DEFAUT = "Parent"
+
+# Taille de l'échantillon lu pour détecter l'encodage et le séparateur d'un CSV
+TAILLE_ECHANTILLON = 64 * 1024
+
+# Délimiteurs reconnus des exports CSV (virgule, point-virgule des exports en français, tabulation)
+DELIMITEURS_CSV = (",", ";", "\t")
+
+_ROLES_SCORE = ("echelle", "valeur")
+_ROLES_IDENTITE = ("nom", "prenom", "date_naissance", "date_examen")
+_CODES_TYPES_VALEURS = {t.value: CODES_TYPES[t] for t in TYPES_SCORES}
+_BORNES = np.array([BORNES_TYPES_SCORES[t.value] for t in TYPES_SCORES], dtype=np.float64)
+
+
+@lru_cache(maxsize=4096)
+def normaliser_libelle(texte: str) -> str:
+    """Forme de comparaison d'un libellé : sans casse, accents, espaces ni ponctuation ("TScore" = "T-Score")."""
+    decompose = unicodedata.normalize("NFKD", texte)
+    sans_accents = "".join(c for c in decompose if not unicodedata.combining(c))
+    return re.sub(r"[\W_]+", "", sans_accents.casefold())
+
+
+@dataclass
+class ImportMapping:
+    """Table de correspondance des libellés des exports (libellés normalisés)."""
+
+    batteries: Dict[str, str] = field(default_factory=dict)  # Libellé -> famille de batterie
+    echelles: Dict[str, Dict[str, str]] = field(default_factory=dict)  # Famille -> libellé -> échelle
+    informateurs: Dict[str, str] = field(default_factory=dict)  # Libellé -> informateur
+    colonnes: Dict[str, str] = field(default_factory=dict)  # Libellé -> rôle (COLONNES_IMPORT)
+
+    @classmethod
+    def default(cls) -> "ImportMapping":
+        """Correspondances par défaut : structures des batteries et alias de config.constants."""
+        correspondances = cls()
+
+        reconnus = {
+            **{("wisc_v", idx): [idx, info["nom"]] for idx, info in WISC_V_STRUCTURE.items()},
+            **{("wisc_v", f"{idx}_{subtest}"): [subtest]
+               for idx, info in WISC_V_STRUCTURE.items() for subtest in info["subtests"]},
+            **{("kabc_ii", idx): [idx, info["nom"]] for idx, info in KABC_II_STRUCTURE.items()},
+            **{("teach", subtest): [subtest] for subtests in TEACH_STRUCTURE.values() for subtest in subtests},
+            **{("nepsy_ii", subtest): [subtest] for subtests in NEPSY_II_STRUCTURE.values() for subtest in subtests},
+            **{("brown", echelle): [echelle] for echelle in BROWN_ECHELLES},
+            **{("conners", echelle): [echelle] for echelle in CONNERS_3_ECHELLES}
+        }
+        for cle, alias in ALIAS_ECHELLES_IMPORT.items():
+            reconnus.setdefault(cle, []).extend(alias)
+
+        for (famille, echelle), alias in reconnus.items():
+            correspondances.add_scale(famille, echelle, alias)
+        for famille, alias in ALIAS_BATTERIES_IMPORT.items():
+            correspondances.add_battery(famille, [famille, *alias])
+        for informateur, alias in ALIAS_INFORMATEURS_IMPORT.items():
+            correspondances.informateurs.update((normaliser_libelle(a), informateur) for a in alias)
+        for role, alias in COLONNES_IMPORT.items():
+            correspondances.colonnes.update((normaliser_libelle(a), role) for a in alias)
+
+        return correspondances
+
+    @classmethod
+    def from_file(cls, chemin: Path) -> "ImportMapping":
+        """
+        Correspondances par défaut complétées par un fichier JSON.
+
+        Format : {"batteries": {famille: [libellés]}, "echelles": {famille: {échelle: [libellés]}},
+        "informateurs": {informateur: [libellés]}, "colonnes": {rôle: [libellés]}}
+
+        Raises:
+            ValueError: Si le fichier est invalide ou désigne une échelle ou un rôle inconnus
+        """
+        correspondances = cls.default()
+
+        try:
+            donnees = json.loads(chemin.read_text(encoding="utf-8"))
+            for famille, alias in donnees.get("batteries", {}).items():
+                if famille not in correspondances.echelles:
+                    raise ValueError(f"Batterie inconnue : {famille}")
+                correspondances.add_battery(famille, alias)
+            for famille, echelles in donnees.get("echelles", {}).items():
+                for echelle, alias in echelles.items():
+                    if (famille, echelle) not in TYPES_ECHELLES:
+                        raise ValueError(f"Échelle inconnue : {famille} / {echelle}")
+                    correspondances.add_scale(famille, echelle, alias)
+            for informateur, alias in donnees.get("informateurs", {}).items():
+                correspondances.informateurs.update((normaliser_libelle(a), informateur) for a in alias)
+            for role, alias in donnees.get("colonnes", {}).items():
+                if role not in COLONNES_IMPORT:
+                    raise ValueError(f"Rôle de colonne inconnu : {role}")
+                correspondances.colonnes.update((normaliser_libelle(a), role) for a in alias)
+        except (json.JSONDecodeError, AttributeError, TypeError) as e:
+            raise ValueError(f"Fichier de correspondances invalide ({chemin}) : {e}") from None
+
+        return correspondances
+
+    def add_battery(self, famille: str, alias: Sequence[str]) -> None:
+        """Associe des libellés de batterie à une famille de batterie."""
+        self.batteries.update((normaliser_libelle(a), famille) for a in alias)
+
+    def add_scale(self, famille: str, echelle: str, alias: Sequence[str]) -> None:
+        """Associe des libellés d'échelle à une échelle d'une famille de batterie."""
+        self.echelles.setdefault(famille, {}).update((normaliser_libelle(a), echelle) for a in alias)
+
+    def resolve(self, echelle: str, batterie: str = "") -> Optional[Tuple[str, str]]:
+        """
+        Retrouve l'échelle correspondant à un libellé.
+
+        Sans batterie reconnue, le libellé doit désigner une seule échelle toutes batteries confondues.
+
+        Returns:
+            (famille de batterie, échelle), ou None si le libellé est inconnu ou ambigu
+        """
+        libelle = normaliser_libelle(echelle)
+        famille = self.batteries.get(normaliser_libelle(batterie)) if batterie else None
+
+        if famille is not None:
+            nom = self.echelles.get(famille, {}).get(libelle)
+            return (famille, nom) if nom is not None else None
+
+        candidats = {(f, echelles[libelle]) for f, echelles in self.echelles.items() if libelle in echelles}
+        return candidats.pop() if len(candidats) == 1 else None
+
+
+def load_mapping(chemin: Path = CHEMIN_CORRESPONDANCES_IMPORT) -> ImportMapping:
+    """Correspondances du cabinet (fichier JSON s'il existe, correspondances par défaut sinon)."""
+    return ImportMapping.from_file(chemin) if chemin.exists() else ImportMapping.default()
+
+
+@dataclass
+class ImportedReport:
+    """Scores importés d'un export."""
+
+    source: str
+    managers: Dict[str, ScoreManager] = field(default_factory=dict)
+    patient: Optional[Patient] = None  # Identité du patient, si l'export la mentionne
+    non_reconnues: List[str] = field(default_factory=list)  # Libellés d'échelles non reconnus
+    erreurs: List[str] = field(default_factory=list)
+
+    @property
+    def n_scores(self) -> int:
+        """Nombre de scores importés."""
+        return sum(len(m.scores) for m in self.managers.values())
+
+
+@dataclass
+class _ExportBrut:
+    """Contenu d'un export avant classification (retourné par les processus de lecture)."""
+
+    source: str
+    batteries: List[str] = field(default_factory=list)  # Clé de batterie de chaque score
+    noms: List[str] = field(default_factory=list)
+    valeurs: List[float] = field(default_factory=list)
+    informateurs: Dict[str, str] = field(default_factory=dict)  # Clé de batterie Conners-3 -> informateur
+    identite: Dict[str, str] = field(default_factory=dict)
+    non_reconnues: List[str] = field(default_factory=list)
+    erreurs: List[str] = field(default_factory=list)
+
+
+def parse_csv(flux: TextIO, correspondances: ImportMapping) -> Iterator[Dict[str, str]]:
+    """
+    Lit un export CSV en flux.
+
+    Les lignes « libellé, valeur » précédant un tableau (batterie, informateur) s'appliquent
+    aux lignes suivantes ; un tableau commence par une ligne d'en-tête comportant au moins
+    une colonne d'échelle et une colonne de valeur.
+
+    Yields:
+        Un dictionnaire rôle -> texte par score ou par élément d'identité du patient
+    """
+    echantillon = flux.read(TAILLE_ECHANTILLON)
+    echantillon += flux.readline()
+    delimiteur = _delimiteur(echantillon, correspondances)
+
+    contexte: Dict[str, str] = {}
+    roles_colonnes: Optional[List[Optional[str]]] = None
+
+    for ligne in csv.reader(chain(io.StringIO(echantillon), flux), csv.excel, delimiter=delimiteur):
+        cellules = [c.strip() for c in ligne]
+        if not any(cellules):
+            continue
+
+        roles = [correspondances.colonnes.get(normaliser_libelle(c)) for c in cellules]
+
+        if all(r in roles for r in _ROLES_SCORE):
+            roles_colonnes = roles
+        elif roles[0] is not None and roles[0] not in _ROLES_SCORE and len([c for c in cellules if c]) == 2:
+            valeur = next(c for c in cellules[1:] if c)
+            if roles[0] in _ROLES_IDENTITE:
+                yield {roles[0]: valeur}
+            else:
+                contexte[roles[0]] = valeur
+        elif roles_colonnes is not None:
+            enregistrement = dict(contexte)
+            enregistrement.update((r, c) for r, c in zip(roles_colonnes, cellules) if r is not None and c)
+            yield enregistrement
+
+
+def _delimiteur(echantillon: str, correspondances: ImportMapping) -> str:
+    """
+    Délimiteur d'un export CSV : celui qui découpe la ligne d'en-tête du tableau des scores.
+
+    Les lignes « libellé, valeur » qui précèdent le tableau n'ont pas le même nombre de
+    colonnes que celui-ci : la détection ne repose donc que sur la ligne d'en-tête. Sans
+    tableau reconnu, le délimiteur le plus fréquent de l'échantillon est retenu.
+    """
+    for delimiteur in DELIMITEURS_CSV:
+        for ligne in csv.reader(io.StringIO(echantillon), csv.excel, delimiter=delimiteur):
+            roles = {correspondances.colonnes.get(normaliser_libelle(c.strip())) for c in ligne}
+            if all(r in roles for r in _ROLES_SCORE):
+                return delimiteur
+
+    return max(DELIMITEURS_CSV, key=echantillon.count)
+
+
+def parse_xml(flux: BinaryIO, correspondances: ImportMapping) -> Iterator[Dict[str, str]]:
+    """
+    Lit un export XML en flux (les éléments lus sont libérés au fur et à mesure).
+
+    Un score est un élément dont les attributs ou les éléments enfants fournissent une
+    échelle et une valeur ; la batterie et l'informateur s'appliquent aux éléments suivants
+    de même niveau et à leurs descendants. L'identité du patient peut figurer n'importe où.
+
+    Yields:
+        Un dictionnaire rôle -> texte par score ou par élément d'identité du patient
+    """
+    # Par élément ouvert : (contexte transmis aux descendants, champs propres)
+    pile: List[Tuple[Dict[str, str], Dict[str, str]]] = [({}, {})]
+
+    for evenement, element in ET.iterparse(flux, events=("start", "end")):
+        if evenement == "start":
+            contexte, champs = dict(pile[-1][0]), {}
+            for attribut, valeur in element.attrib.items():
+                role = correspondances.colonnes.get(normaliser_libelle(_nom_local(attribut)))
+                if role in _ROLES_SCORE:
+                    champs[role] = valeur.strip()
+                elif role in _ROLES_IDENTITE:
+                    yield {role: valeur.strip()}
+                elif role is not None:
+                    contexte[role] = valeur.strip()
+            pile.append((contexte, champs))
+            continue
+
+        contexte, champs = pile.pop()
+        texte = (element.text or "").strip()
+        role = correspondances.colonnes.get(normaliser_libelle(_nom_local(element.tag)))
+
+        if len(element) == 0 and texte and role is not None and role not in champs:
+            if champs:
+                # Ex: <Score scale="VCI">112</Score>
+                champs[role] = texte
+            elif role in _ROLES_SCORE:
+                pile[-1][1][role] = texte
+            elif role in _ROLES_IDENTITE:
+                yield {role: texte}
+            else:
+                pile[-1][0][role] = texte
+
+        if all(r in champs for r in _ROLES_SCORE):
+            yield {**contexte, **champs}
+
+        element.clear()
+
+
+def read_exports(exports: Sequence[Tuple[BinaryIO, str]],
+                 correspondances: Optional[ImportMapping] = None) -> List[ImportedReport]:
+    """
+    Importe des exports déjà ouverts en binaire (ex: fichiers téléversés).
+
+    Args:
+        exports: Couples (contenu, nom de l'export) ; l'extension du nom détermine le format
+        correspondances: Table de correspondance (celle du cabinet par défaut)
+
+    Returns:
+        Un rapport d'import par export
+    """
+    correspondances = correspondances or load_mapping()
+    return _construire_rapports([_lire_flux(flux, source, correspondances) for flux, source in exports])
+
+
+def import_exports(chemins: Sequence[Path], correspondances: Optional[ImportMapping] = None,
+                   processus: Optional[int] = None) -> List[ImportedReport]:
+    """
+    Importe des exports, lus en parallèle, puis classe tous leurs scores en une passe.
+
+    Args:
+        chemins: Fichiers d'export (CSV ou XML)
+        correspondances: Table de correspondance (celle du cabinet par défaut)
+        processus: Nombre de processus de lecture (nombre de cœurs par défaut, 1 pour une lecture séquentielle)
+
+    Returns:
+        Un rapport d'import par fichier, dans l'ordre des chemins
+    """
+    correspondances = correspondances or load_mapping()
+
+    if len(chemins) < 2 or processus == 1:
+        bruts = [_lire_fichier(chemin, correspondances) for chemin in chemins]
+    else:
+        processus = processus or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=processus) as executeur:
+            lot = max(1, len(chemins) // (4 * processus))
+            bruts = list(executeur.map(_lire_fichier, chemins, repeat(correspondances), chunksize=lot))
+
+    return _construire_rapports(bruts)
+
+
+def import_folder(dossier: Path, correspondances: Optional[ImportMapping] = None,
+                  processus: Optional[int] = None) -> List[ImportedReport]:
+    """Importe tous les exports CSV et XML d'un dossier (voir import_exports)."""
+    chemins = sorted(c for c in dossier.iterdir() if c.suffix.lower() in EXTENSIONS_IMPORT)
+    return import_exports(chemins, correspondances, processus)
+
+
+def _lire_fichier(chemin: Path, correspondances: ImportMapping) -> _ExportBrut:
+    try:
+        with open(chemin, "rb") as flux:
+            return _lire_flux(flux, chemin.name, correspondances)
+    except OSError as e:
+        return _ExportBrut(chemin.name, erreurs=[f"Lecture impossible : {e}"])
+
+
+def _lire_flux(flux: BinaryIO, source: str, correspondances: ImportMapping) -> _ExportBrut:
+    """Lit un export et rapproche ses libellés (sans classification)."""
+    brut = _ExportBrut(source)
+
+    try:
+        if source.lower().endswith(".xml"):
+            enregistrements = parse_xml(flux, correspondances)
+        else:
+            enregistrements = parse_csv(_texte(flux), correspondances)
+
+        n_lignes_scores = 0
+        for enregistrement in enregistrements:
+            n_lignes_scores += all(r in enregistrement for r in _ROLES_SCORE)
+            _ajouter_score(brut, enregistrement, correspondances)
+    except (ET.ParseError, csv.Error, UnicodeDecodeError) as e:
+        brut.erreurs.append(f"Export illisible : {e}")
+    else:
+        if not n_lignes_scores:
+            brut.erreurs.append("Aucun score trouvé : tableau des scores (colonnes échelle et valeur) non reconnu")
+
+    return brut
+
+
+def _texte(flux: BinaryIO) -> TextIO:
+    """Ouvre un export CSV en texte (UTF-8, ou Windows-1252 si l'échantillon n'est pas en UTF-8)."""
+    echantillon = flux.read(TAILLE_ECHANTILLON)
+    flux.seek(0)
+    try:
+        codecs.getincrementaldecoder("utf-8-sig")().decode(echantillon, final=False)
+        encodage = "utf-8-sig"
+    except UnicodeDecodeError:
+        encodage = "cp1252"
+    return io.TextIOWrapper(flux, encoding=encodage, newline="")
+
+
+def _ajouter_score(brut: _ExportBrut, enregistrement: Dict[str, str], correspondances: ImportMapping) -> None:
+    for role in _ROLES_IDENTITE:
+        if role in enregistrement:
+            brut.identite.setdefault(role, enregistrement[role])
+
+    if not all(r in enregistrement for r in _ROLES_SCORE):
+        return
+
+    libelle = enregistrement["echelle"]
+    echelle = correspondances.resolve(libelle, enregistrement.get("batterie", ""))
+    if echelle is None:
+        if libelle not in brut.non_reconnues:
+            brut.non_reconnues.append(libelle)
+        return
+
+    texte = enregistrement["valeur"].replace(",", ".")
+    try:
+        valeur = float(texte)
+    except ValueError:
+        brut.erreurs.append(f"{libelle} : valeur illisible ({enregistrement['valeur']})")
+        return
+
+    famille, nom = echelle
+    batterie = famille
+    if famille == "conners":
+        libelle_informateur = enregistrement.get("informateur", "")
+        informateur = correspondances.informateurs.get(normaliser_libelle(libelle_informateur),
+                                                       libelle_informateur or INFORMATEUR_DEFAUT)
+        batterie = next((cle for cle, label in CONNERS_3_INFORMATEURS.items() if label == informateur),
+                        f"conners_{normaliser_libelle(informateur)}")
+        brut.informateurs[batterie] = informateur
+
+    brut.batteries.append(batterie)
+    brut.noms.append(nom)
+    brut.valeurs.append(valeur)
+
+
+def _construire_rapports(bruts: Sequence[_ExportBrut]) -> List[ImportedReport]:
+    """Classe en une passe les scores de tous les exports puis construit les gestionnaires."""
+    batteries = [b for brut in bruts for b in brut.batteries]
+    noms = [n for brut in bruts for n in brut.noms]
+    valeurs = np.array([v for brut in bruts for v in brut.valeurs], dtype=np.float64)
+    types = np.array([_CODES_TYPES_VALEURS[TYPES_ECHELLES[(_famille(b), n)]] for b, n in zip(batteries, noms)],
+                     dtype=np.int8)
+
+    classifications, percentiles = classify_scores(valeurs, types)
+    hors_bornes = (valeurs < _BORNES[types, 0]) | (valeurs > _BORNES[types, 1])
+
+    rapports = []
+    debut = 0
+
+    for brut in bruts:
+        erreurs = list(brut.erreurs)
+        rapport = ImportedReport(brut.source, patient=_patient(brut.identite, erreurs),
+                                 non_reconnues=brut.non_reconnues, erreurs=erreurs)
+
+        for i in range(debut, debut + len(brut.noms)):
+            batterie, nom, type_score = batteries[i], noms[i], TYPES_SCORES[types[i]]
+            if hors_bornes[i]:
+                minimum, maximum = _BORNES[types[i]]
+                rapport.erreurs.append(f"{nom} : valeur {valeurs[i]:g} hors des bornes {minimum:g}-{maximum:g}")
+                continue
+
+            manager = rapport.managers.get(batterie)
+            if manager is None:
+                informateur = brut.informateurs.get(batterie, "")
+                nom_test = f"Conners-3 {informateur}" if informateur else NOMS_TESTS[batterie]
+                manager = rapport.managers[batterie] = ScoreManager(nom_test, informateur=informateur)
+
+            valeur = int(valeurs[i]) if valeurs[i].is_integer() else float(valeurs[i])
+            domaine = _domaine(batterie, nom)
+            manager.add_score(Score(
+                nom=nom,
+                valeur=valeur,
+                type_score=type_score,
+                domaine=domaine,
+                percentile=percentiles[i],
+                classification=classifications[i],
+                interpretation=interprete_classification(classifications[i], valeur, type_score, domaine)
+            ))
+
+        debut += len(brut.noms)
+        rapports.append(rapport)
+
+    return rapports
+
+
+def _famille(batterie: str) -> str:
+    return "conners" if batterie.startswith("conners_") else batterie
+
+
+def _domaine(batterie: str, nom: str) -> str:
+    """Domaine du score, tel que renseigné par les modules de saisie."""
+    structure = {"wisc_v": WISC_V_STRUCTURE, "kabc_ii": KABC_II_STRUCTURE}.get(batterie, {})
+    if nom in structure:
+        return structure[nom]["domaine"]
+    return nom.split("_", 1)[-1].lower() if batterie == "wisc_v" else nom.lower()
+
+
+def _patient(identite: Dict[str, str], erreurs: List[str]) -> Optional[Patient]:
+    if not identite:
+        return None
+
+    patient = Patient(nom=identite.get("nom", ""), prenom=identite.get("prenom", ""))
+    for role in ("date_naissance", "date_examen"):
+        if role in identite:
+            jour = _date(identite[role])
+            if jour is None:
+                erreurs.append(f"Date illisible : {identite[role]}")
+            setattr(patient, role, jour)
+    return patient
+
+
+def _date(texte: str) -> Optional[date]:
+    for format_date in ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y"):
+        try:
+            return datetime.strptime(texte.strip()[:10], format_date).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _nom_local(nom: str) -> str:
+    """Nom XML sans espace de noms."""
+    return nom.rsplit("}", 1)[-1]
+
+
+def main(argv=None) -> None:
+    """Point d'entrée en ligne de commande : importe des exports et les enregistre dans l'historique."""
+    parser = argparse.ArgumentParser(description="Import des exports des logiciels de cotation")
+    parser.add_argument("exports", type=Path, nargs="+", help="Fichiers d'export ou dossiers")
+    parser.add_argument("--correspondances", type=Path, default=CHEMIN_CORRESPONDANCES_IMPORT,
+                        help="Fichier JSON de correspondances complémentaires")
+    parser.add_argument("--processus", type=int, help="Nombre de processus de lecture")
+    parser.add_argument("--enregistrer", action="store_true",
+                        help="Enregistrer les évaluations dans l'historique (identité du patient requise)")
+    parser.add_argument("--base", type=Path, default=CHEMIN_HISTORIQUE, help="Base SQLite de l'historique")
+    args = parser.parse_args(argv)
+
+    chemins = []
+    for chemin in args.exports:
+        if chemin.is_dir():
+            chemins.extend(sorted(c for c in chemin.iterdir() if c.suffix.lower() in EXTENSIONS_IMPORT))
+        else:
+            chemins.append(chemin)
+
+    try:
+        rapports = import_exports(chemins, load_mapping(args.correspondances), args.processus)
+    except ValueError as e:
+        parser.exit(1, f"{e}\n")
+
+    store = CaseStore(args.base) if args.enregistrer else None
+
+    for rapport in rapports:
+        print(f"{rapport.source} : {rapport.n_scores} scores ({', '.join(rapport.managers) or 'aucune batterie'})")
+        if rapport.non_reconnues:
+            print(f"  Échelles non reconnues : {', '.join(rapport.non_reconnues)}")
+        for erreur in rapport.erreurs:
+            print(f"  {erreur}")
+
+        if store is not None and rapport.managers:
+            if rapport.patient is None or rapport.patient.get_identifiant() is None:
+                print("  Non enregistré : identité du patient incomplète")
+                continue
+            try:
+                store.save_evaluation(rapport.patient, rapport.managers)
+            except ValueError as e:
+                print(f"  Non enregistré : {e}")
+
+
+if __name__ == "__main__":
+    main()
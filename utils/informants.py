@@ -0,0 +1,158 @@
+"""
+Comparaison multi-informateurs des questionnaires comportementaux.
+"""
+
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from models.scores import ScoreManager
+from config.constants import SEUIL_DIVERGENCE_INFORMATEURS
+
+
+def libelles_distincts(libelles: Iterable[str]) -> List[str]:
+    """
+    Rend distincts les libellés d'informateurs : les homonymes sont numérotés (« Parent (2) »).
+
+    Plusieurs informateurs peuvent porter le même libellé (import, dossier restauré) ; indexer
+    les cotations par libellé confondrait alors leurs évaluations.
+    """
+    distincts: List[str] = []
+
+    for libelle in libelles:
+        candidat, rang = libelle, 1
+        while candidat in distincts:
+            rang += 1
+            candidat = f"{libelle} ({rang})"
+        distincts.append(candidat)
+
+    return distincts
+
+
+@dataclass
+class InformantComparison:
+    """
+    Matrice informateur × échelle et statistiques d'accord associées.
+
+    Les échelles non renseignées par un informateur valent NaN dans la matrice.
+    """
+
+    informateurs: List[str]
+    echelles: List[str]
+    matrice: np.ndarray
+    seuil: float = SEUIL_DIVERGENCE_INFORMATEURS
+
+    @classmethod
+    def from_managers(cls, raters: Dict[str, ScoreManager], echelles: List[str],
+                      seuil: float = SEUIL_DIVERGENCE_INFORMATEURS) -> "InformantComparison":
+        """
+        Construit la comparaison à partir des gestionnaires de chaque informateur.
+
+        Args:
+            raters: Gestionnaires indexés par libellé d'informateur (Parent, Enseignant, etc.)
+            echelles: Échelles communes à comparer (ex: CONNERS_3_ECHELLES)
+            seuil: Écart (en points T) à partir duquel deux cotations divergent
+
+        Returns:
+            Comparaison couvrant toutes les échelles données
+        """
+        matrice = np.full((len(raters), len(echelles)), np.nan)
+
+        for i, manager in enumerate(raters.values()):
+            for j, echelle in enumerate(echelles):
+                score = manager.get_score(echelle)
+                if score and score.is_valid():
+                    matrice[i, j] = score.valeur
+
+        return cls(list(raters.keys()), list(echelles), matrice, seuil)
+
+    @property
+    def renseignes(self) -> np.ndarray:
+        """Masque informateur × échelle des cotations renseignées."""
+        return ~np.isnan(self.matrice)
+
+    @property
+    def echelles_comparables(self) -> np.ndarray:
+        """Masque des échelles cotées par au moins deux informateurs."""
+        return self.renseignes.sum(axis=0) >= 2
+
+    @property
+    def paires(self) -> List[Tuple[int, int]]:
+        """Paires d'informateurs (indices), dans l'ordre de saisie."""
+        return list(combinations(range(len(self.informateurs)), 2))
+
+    def etendues(self) -> np.ndarray:
+        """Écart maximal entre informateurs pour chaque échelle (NaN si non comparable)."""
+        comparables = self.echelles_comparables
+        etendues = np.full(len(self.echelles), np.nan)
+
+        if comparables.any():
+            sous_matrice = self.matrice[:, comparables]
+            etendues[comparables] = np.nanmax(sous_matrice, axis=0) - np.nanmin(sous_matrice, axis=0)
+
+        return etendues
+
+    def mask_convergences(self) -> np.ndarray:
+        """Échelles comparables sur lesquelles tous les informateurs concordent."""
+        with np.errstate(invalid='ignore'):
+            return self.echelles_comparables & (self.etendues() < self.seuil)
+
+    def mask_divergences(self) -> np.ndarray:
+        """Échelles comparables présentant au moins un écart notable entre informateurs."""
+        with np.errstate(invalid='ignore'):
+            return self.echelles_comparables & (self.etendues() >= self.seuil)
+
+    def extremes(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Indices des informateurs cotant le plus bas et le plus haut pour chaque échelle."""
+        bas = np.where(self.renseignes, self.matrice, np.inf).argmin(axis=0)
+        haut = np.where(self.renseignes, self.matrice, -np.inf).argmax(axis=0)
+        return bas, haut
+
+    def statistiques_paires(self) -> List[Dict[str, object]]:
+        """
+        Calcule l'accord de chaque paire d'informateurs sur leurs échelles communes.
+
+        Returns:
+            Liste de dictionnaires contenant 'informateurs', 'n_echelles', 'accord'
+            (proportion d'échelles sous le seuil), 'ecart_moyen', 'ecart_max' et
+            'correlation' (Pearson, None si moins de trois échelles communes ou variance nulle)
+        """
+        paires = self.paires
+        if not paires:
+            return []
+
+        i, j = np.array(paires).T
+        a = self.matrice[i]
+        b = self.matrice[j]
+        communs = ~np.isnan(a) & ~np.isnan(b)
+        n = communs.sum(axis=1)
+        n_div = np.maximum(n, 1)
+
+        ecarts = np.where(communs, np.abs(a - b), 0.0)
+        accord = (communs & (ecarts < self.seuil)).sum(axis=1) / n_div
+        ecart_moyen = ecarts.sum(axis=1) / n_div
+        ecart_max = ecarts.max(axis=1)
+
+        # Corrélation de Pearson sur les échelles communes de chaque paire
+        a0 = np.where(communs, a, 0.0)
+        b0 = np.where(communs, b, 0.0)
+        a_c = np.where(communs, a0 - (a0.sum(axis=1) / n_div)[:, None], 0.0)
+        b_c = np.where(communs, b0 - (b0.sum(axis=1) / n_div)[:, None], 0.0)
+        denominateur = np.sqrt((a_c ** 2).sum(axis=1) * (b_c ** 2).sum(axis=1))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            correlation = (a_c * b_c).sum(axis=1) / denominateur
+        correlation_valide = (n >= 3) & (denominateur > 0)
+
+        return [
+            {
+                'informateurs': (self.informateurs[p], self.informateurs[q]),
+                'n_echelles': int(n[k]),
+                'accord': float(accord[k]) if n[k] else None,
+                'ecart_moyen': float(ecart_moyen[k]) if n[k] else None,
+                'ecart_max': float(ecart_max[k]) if n[k] else None,
+                'correlation': float(correlation[k]) if correlation_valide[k] else None
+            }
+            for k, (p, q) in enumerate(paires)
+        ]
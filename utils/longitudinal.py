@@ -0,0 +1,157 @@
+"""
+Comparaison longitudinale (retest) par indice de changement fiable.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from models.scores import ScoreManager
+from models.profile import UnifiedProfile, TYPES_SCORES, ECARTS_TYPES
+from utils.case_store import EvaluationRecord
+from config.constants import (
+    FIDELITE_TEST_RETEST_DEFAUT,
+    FIDELITES_TEST_RETEST,
+    EFFETS_PRATIQUE,
+    SEUIL_CHANGEMENT_FIABLE
+)
+
+
+@dataclass
+class RetestComparison:
+    """
+    Scores alignés (batterie, échelle) entre une évaluation antérieure et l'évaluation actuelle.
+
+    L'indice de changement fiable (ICF) suit Jacobson et Truax, corrigé de l'effet
+    de pratique attendu : ICF = (actuel - antérieur - pratique) / (√2 · ET · √(1 - r)).
+    """
+
+    batteries: np.ndarray
+    noms: np.ndarray
+    types: np.ndarray
+    sens: np.ndarray
+    anterieur: np.ndarray
+    actuel: np.ndarray
+    fidelite: np.ndarray
+    effet_pratique: np.ndarray
+    date_anterieure: date
+    date_actuelle: Optional[date] = None
+
+    @classmethod
+    def from_profiles(cls, anterieur: UnifiedProfile, actuel: UnifiedProfile, date_anterieure: date,
+                      date_actuelle: Optional[date] = None) -> "RetestComparison":
+        """
+        Aligne deux profils sur les échelles communes (même batterie, même nom).
+
+        Args:
+            anterieur: Profil de l'évaluation antérieure
+            actuel: Profil de l'évaluation actuelle
+            date_anterieure: Date de l'évaluation antérieure
+            date_actuelle: Date de l'évaluation actuelle
+
+        Returns:
+            Comparaison limitée aux échelles présentes dans les deux évaluations
+        """
+        positions = {cle: i for i, cle in enumerate(zip(anterieur.batteries, anterieur.noms))}
+        i_actuel = []
+        i_anterieur = []
+
+        for i, cle in enumerate(zip(actuel.batteries, actuel.noms)):
+            j = positions.get(cle)
+            if j is not None and anterieur.types[j] == actuel.types[i]:
+                i_actuel.append(i)
+                i_anterieur.append(j)
+
+        i_actuel = np.array(i_actuel, dtype=np.intp)
+        i_anterieur = np.array(i_anterieur, dtype=np.intp)
+        batteries = actuel.batteries[i_actuel]
+        noms = actuel.noms[i_actuel]
+        types = actuel.types[i_actuel]
+
+        fidelite = np.array([
+            FIDELITES_TEST_RETEST.get((b, n), FIDELITE_TEST_RETEST_DEFAUT[TYPES_SCORES[t].value])
+            for b, n, t in zip(batteries, noms, types)
+        ], dtype=np.float64)
+        effet_pratique = np.array([EFFETS_PRATIQUE.get((b, n), 0) for b, n in zip(batteries, noms)],
+                                  dtype=np.float64)
+
+        return cls(
+            batteries=batteries,
+            noms=noms,
+            types=types,
+            sens=actuel.sens[i_actuel],
+            anterieur=anterieur.valeurs[i_anterieur],
+            actuel=actuel.valeurs[i_actuel],
+            fidelite=fidelite,
+            effet_pratique=effet_pratique,
+            date_anterieure=date_anterieure,
+            date_actuelle=date_actuelle
+        )
+
+    def __len__(self) -> int:
+        return len(self.noms)
+
+    @property
+    def delta(self) -> np.ndarray:
+        """Évolution brute (actuel - antérieur)."""
+        return self.actuel - self.anterieur
+
+    @property
+    def delta_corrige(self) -> np.ndarray:
+        """Évolution corrigée de l'effet de pratique attendu."""
+        return self.delta - self.effet_pratique
+
+    @property
+    def erreur_difference(self) -> np.ndarray:
+        """Erreur standard de la différence entre deux passations."""
+        sem = ECARTS_TYPES[self.types] * np.sqrt(1 - self.fidelite)
+        return np.sqrt(2) * sem
+
+    @property
+    def icf(self) -> np.ndarray:
+        """Indice de changement fiable de chaque échelle."""
+        return self.delta_corrige / self.erreur_difference
+
+    def mask_ameliorations(self) -> np.ndarray:
+        """Échelles présentant une amélioration fiable (sens favorable du score)."""
+        return self.icf * self.sens >= SEUIL_CHANGEMENT_FIABLE
+
+    def mask_baisses(self) -> np.ndarray:
+        """Échelles présentant une dégradation fiable (sens défavorable du score)."""
+        return self.icf * self.sens <= -SEUIL_CHANGEMENT_FIABLE
+
+    def intervalle_mois(self) -> Optional[int]:
+        """Intervalle en mois entre les deux évaluations."""
+        if self.date_actuelle is None:
+            return None
+        return ((self.date_actuelle.year - self.date_anterieure.year) * 12
+                + self.date_actuelle.month - self.date_anterieure.month)
+
+
+def compare_with_history(historique: List[EvaluationRecord], managers: Dict[str, ScoreManager],
+                         date_actuelle: Optional[date] = None) -> Optional[RetestComparison]:
+    """
+    Compare l'évaluation actuelle avec la plus récente évaluation antérieure de l'historique.
+
+    Args:
+        historique: Évaluations enregistrées du patient (CaseStore.get_history)
+        managers: Gestionnaires de scores de l'évaluation actuelle
+        date_actuelle: Date de l'évaluation actuelle
+
+    Returns:
+        Comparaison, ou None si aucune évaluation antérieure n'est disponible
+    """
+    anterieures = [r for r in historique if date_actuelle is None or r.date_examen < date_actuelle]
+    if not anterieures:
+        return None
+
+    precedente = max(anterieures, key=lambda r: r.date_examen)
+
+    return RetestComparison.from_profiles(
+        UnifiedProfile.from_managers(precedente.managers),
+        UnifiedProfile.from_managers(managers),
+        precedente.date_examen,
+        date_actuelle
+    )
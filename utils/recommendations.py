@@ -0,0 +1,161 @@
+"""
+Moteur de règles de recommandation.
+
+Les règles (REGLES_RECOMMANDATIONS) portent sur des attributs structurés des scores
+(batterie, échelle, domaine, classification, type, niveau). Elles sont compilées une
+fois en un index attribut -> règles ; l'évaluation parcourt le profil une seule fois.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+import numpy as np
+
+from models.profile import UnifiedProfile, TYPES_SCORES
+from config.constants import DOMAINES_ECHELLES, REGLES_RECOMMANDATIONS, SEUILS_PROFIL
+
+
+# Attributs reconnus, du plus sélectif au moins sélectif (choix de la clé d'index)
+ATTRIBUTS_REGLES = ("echelle", "batterie", "domaine", "classification", "niveau", "type")
+
+# Niveaux évalués sur le profil (critères de SEUILS_PROFIL)
+NIVEAUX = tuple(SEUILS_PROFIL)
+
+
+@dataclass(frozen=True)
+class RecommendationRule:
+    """Règle compilée : conditions (attribut, valeurs admises) et recommandation produite."""
+
+    recommandation: str
+    priorite: int
+    conditions: Tuple[Tuple[str, FrozenSet[str]], ...]
+    rang: int  # Ordre de déclaration, départage les priorités égales
+
+    def accepte(self, attributs: Set[Tuple[str, str]]) -> bool:
+        """Vérifie que chaque condition est satisfaite par l'un des attributs du score."""
+        return all(
+            any((attribut, valeur) in attributs for valeur in valeurs)
+            for attribut, valeurs in self.conditions
+        )
+
+
+@dataclass
+class Recommendation:
+    """Recommandation retenue pour un profil."""
+
+    texte: str
+    priorite: int
+    sources: List[str] = field(default_factory=list)  # Échelles ayant déclenché la recommandation
+
+
+def famille_batterie(batterie: str) -> str:
+    """Famille d'une clé de batterie (les informateurs Conners-3 forment la famille "conners")."""
+    return "conners" if batterie.startswith("conners_") else batterie
+
+
+class RecommendationEngine:
+    """Règles de recommandation indexées par couple (attribut, valeur)."""
+
+    def __init__(self, regles: Iterable[Dict]):
+        """
+        Compile les règles.
+
+        Args:
+            regles: Règles déclaratives (voir REGLES_RECOMMANDATIONS)
+
+        Raises:
+            ValueError: Si une règle utilise un attribut inconnu
+        """
+        self.regles: List[RecommendationRule] = []
+        self._index: Dict[Tuple[str, str], List[RecommendationRule]] = {}
+        self._inconditionnelles: List[RecommendationRule] = []
+
+        for rang, regle in enumerate(regles):
+            conditions = []
+
+            for attribut, valeurs in regle.get("conditions", {}).items():
+                if attribut not in ATTRIBUTS_REGLES:
+                    raise ValueError(f"Attribut de règle inconnu : {attribut}")
+                valeurs = (valeurs,) if isinstance(valeurs, str) else tuple(valeurs)
+                conditions.append((attribut, frozenset(valeurs)))
+
+            # La condition la plus sélective sert de clé d'index
+            conditions.sort(key=lambda c: ATTRIBUTS_REGLES.index(c[0]))
+            compilee = RecommendationRule(regle["recommandation"], regle.get("priorite", 0),
+                                          tuple(conditions), rang)
+            self.regles.append(compilee)
+
+            if not conditions:
+                self._inconditionnelles.append(compilee)
+                continue
+
+            attribut, valeurs = conditions[0]
+            for valeur in valeurs:
+                self._index.setdefault((attribut, valeur), []).append(compilee)
+
+    def evaluate(self, profil: UnifiedProfile) -> List[Recommendation]:
+        """
+        Évalue les règles sur un profil.
+
+        Args:
+            profil: Profil unifié de l'évaluation
+
+        Returns:
+            Recommandations sans doublon, triées par priorité décroissante puis ordre de déclaration
+        """
+        niveaux = {niveau: profil.mask_critere(niveau) for niveau in NIVEAUX}
+        retenues: Dict[str, Tuple[int, int, List[str]]] = {}
+
+        for regle in self._inconditionnelles:
+            self._retenir(retenues, regle, None)
+
+        for i, score in enumerate(profil.scores):
+            attributs = self._attributs(profil, i, niveaux)
+            vues = set()
+
+            for cle in attributs:
+                for regle in self._index.get(cle, ()):
+                    if regle.rang not in vues and regle.accepte(attributs):
+                        vues.add(regle.rang)
+                        self._retenir(retenues, regle, score.nom)
+
+        ordre = sorted(retenues.items(), key=lambda item: (-item[1][0], item[1][1]))
+
+        return [Recommendation(texte, priorite, sources) for texte, (priorite, _, sources) in ordre]
+
+    @staticmethod
+    def _attributs(profil: UnifiedProfile, i: int, niveaux: Dict[str, np.ndarray]) -> Set[Tuple[str, str]]:
+        """Attributs structurés du score i du profil."""
+        score = profil.scores[i]
+        batterie = profil.batteries[i]
+        famille = famille_batterie(batterie)
+
+        attributs = {
+            ("echelle", score.nom),
+            ("batterie", batterie),
+            ("batterie", famille),
+            ("classification", score.classification),
+            ("type", TYPES_SCORES[profil.types[i]].value)
+        }
+        attributs.update(("domaine", d) for d in DOMAINES_ECHELLES.get((famille, score.nom), ()))
+        attributs.update(("niveau", niveau) for niveau, masque in niveaux.items() if masque[i])
+
+        return attributs
+
+    @staticmethod
+    def _retenir(retenues: Dict[str, Tuple[int, int, List[str]]], regle: RecommendationRule, source) -> None:
+        """Ajoute une recommandation (un même texte garde sa priorité la plus élevée)."""
+        if not regle.recommandation:
+            return
+
+        priorite, rang, sources = retenues.get(regle.recommandation, (regle.priorite, regle.rang, []))
+        if (regle.priorite, -regle.rang) > (priorite, -rang):
+            priorite, rang = regle.priorite, regle.rang
+        if source is not None and source not in sources:
+            sources.append(source)
+
+        retenues[regle.recommandation] = (priorite, rang, sources)
+
+
+# Règles compilées au chargement du module
+MOTEUR_RECOMMANDATIONS = RecommendationEngine(REGLES_RECOMMANDATIONS)
@@ -0,0 +1,304 @@
+"""
+Tables de référence (normes, valeurs critiques, taux de base) projetées en mémoire.
+
+Les tables sont compilées dans un fichier binaire de disposition fixe, ouvert par
+projection en mémoire (mmap) : l'ouverture ne lit que l'en-tête et le répertoire, les
+tables sont des vues NumPy en lecture seule sur le fichier (aucune copie), et tous les
+processus qui ouvrent le même fichier (Streamlit, processus de rédaction) partagent
+les mêmes pages mémoire.
+
+Disposition du fichier (petit-boutiste) :
+    En-tête (16 octets) : signature b"NPRT", version, nombre de tables, taille du fichier
+    Répertoire : une entrée de 128 octets par table (nom, type NumPy, dimensions, position, taille)
+    Données : tables contiguës (ordre C), chacune alignée sur 64 octets
+
+Tables de normes d'une batterie (conversion notes brutes -> notes normées) :
+    normes/<batterie>/ages      bornes inférieures des tranches d'âge, en mois (croissantes)
+    normes/<batterie>/subtests  noms des subtests (UTF-8)
+    normes/<batterie>/notes     notes normées [tranche d'âge, subtest, note brute] (-1 : non définie)
+
+Les tables sont remplacées en bloc (fichier recompilé puis renommé) : un processus qui a
+ouvert l'ancien fichier continue de le lire jusqu'à sa fermeture.
+
+Compilation des normes en ligne de commande (CSV : batterie, age_min_mois, subtest, brut, note) :
+    python -m utils.reference_tables SOURCE.csv [SOURCE.csv ...] [--sortie FICHIER]
+"""
+
+import argparse
+import csv
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from config.settings import CHEMIN_TABLES_REFERENCE
+
+
+SIGNATURE = b"NPRT"
+VERSION_FORMAT = 1
+
+# Alignement des tables dans le fichier (ligne de cache)
+ALIGNEMENT = 64
+
+DIMENSIONS_MAX = 4
+TYPES_ACCEPTES = "biufS"  # Booléens, entiers, réels, chaînes d'octets
+
+NOTE_NON_DEFINIE = -1
+
+COLONNES_NORMES = ("batterie", "age_min_mois", "subtest", "brut", "note")
+
+_ENTETE = struct.Struct("<4sHHQ")
+_ENTREE = struct.Struct(f"<48s16sB3x{DIMENSIONS_MAX}IQQ28x")
+
+
+class ReferenceTables:
+    """Tables de référence d'un fichier compilé, en lecture seule."""
+
+    def __init__(self, chemin: Path = CHEMIN_TABLES_REFERENCE):
+        """
+        Ouvre un fichier de tables (seuls l'en-tête et le répertoire sont lus).
+
+        Raises:
+            ValueError: Si le fichier est absent, tronqué ou d'un format inconnu
+        """
+        self.chemin = chemin
+        try:
+            with open(chemin, "rb") as fichier:
+                self._mmap = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Tables de référence illisibles ({chemin}) : {e}") from None
+
+        if len(self._mmap) < _ENTETE.size:
+            raise ValueError(f"Tables de référence invalides ({chemin}) : fichier tronqué")
+        signature, version, n_tables, taille = _ENTETE.unpack_from(self._mmap, 0)
+        if signature != SIGNATURE or version != VERSION_FORMAT:
+            raise ValueError(f"Tables de référence invalides ({chemin}) : format inconnu")
+        if taille != len(self._mmap):
+            raise ValueError(f"Tables de référence invalides ({chemin}) : fichier tronqué")
+
+        self._repertoire: Dict[str, Tuple[np.dtype, Tuple[int, ...], int]] = {}
+        for i in range(n_tables):
+            nom, type_table, n_dimensions, *dimensions, position, _ = _ENTREE.unpack_from(
+                self._mmap, _ENTETE.size + i * _ENTREE.size)
+            self._repertoire[nom.rstrip(b"\0").decode("utf-8")] = (
+                np.dtype(type_table.rstrip(b"\0").decode("ascii")), tuple(dimensions[:n_dimensions]), position)
+
+        self._vues: Dict[str, np.ndarray] = {}
+
+    def __contains__(self, nom: str) -> bool:
+        return nom in self._repertoire
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._repertoire)
+
+    def __len__(self) -> int:
+        return len(self._repertoire)
+
+    def __getitem__(self, nom: str) -> np.ndarray:
+        """
+        Retourne une table (vue en lecture seule sur le fichier, sans copie).
+
+        Raises:
+            KeyError: Si la table n'existe pas
+        """
+        vue = self._vues.get(nom)
+        if vue is None:
+            type_table, dimensions, position = self._repertoire[nom]
+            vue = np.frombuffer(self._mmap, dtype=type_table, count=int(np.prod(dimensions)),
+                                offset=position).reshape(dimensions)
+            self._vues[nom] = vue
+        return vue
+
+    def batteries(self) -> List[str]:
+        """Batteries dont les normes sont disponibles."""
+        return sorted({nom.split("/")[1] for nom in self._repertoire if nom.startswith("normes/")})
+
+    def norms(self, batterie: str) -> "NormTable":
+        """
+        Retourne les normes d'une batterie.
+
+        Raises:
+            ValueError: Si le fichier ne contient pas de normes pour cette batterie
+        """
+        prefixe = f"normes/{batterie}/"
+        if f"{prefixe}notes" not in self:
+            raise ValueError(f"Aucune norme disponible pour la batterie {batterie}")
+        subtests = tuple(nom.decode("utf-8") for nom in self[f"{prefixe}subtests"])
+        return NormTable(batterie, self[f"{prefixe}ages"], subtests, self[f"{prefixe}notes"])
+
+
+@dataclass(frozen=True)
+class NormTable:
+    """Normes d'une batterie : vues sur le fichier de tables de référence."""
+
+    batterie: str
+    ages: np.ndarray  # Bornes inférieures des tranches d'âge (mois)
+    subtests: Tuple[str, ...]
+    notes: np.ndarray  # [tranche d'âge, subtest, note brute]
+
+    def band(self, age_mois: int) -> np.ndarray:
+        """
+        Notes normées de la tranche d'âge d'un patient ([subtest, note brute], vue sans copie).
+
+        Raises:
+            ValueError: Si l'âge précède la première tranche
+        """
+        return self.notes[self._tranche(age_mois)]
+
+    def convert(self, age_mois: int, subtests: Sequence[str], bruts: Sequence[int]) -> np.ndarray:
+        """
+        Convertit des notes brutes en notes normées (NOTE_NON_DEFINIE hors de la table).
+
+        Args:
+            age_mois: Âge du patient à la date d'examen, en mois
+            subtests: Subtest de chaque note brute
+            bruts: Notes brutes
+
+        Raises:
+            ValueError: Si l'âge précède la première tranche ou si un subtest est inconnu
+        """
+        inconnus = sorted(set(subtests) - set(self.subtests))
+        if inconnus:
+            raise ValueError(f"Subtest(s) inconnu(s) pour {self.batterie} : {', '.join(inconnus)}")
+
+        tranche = self.band(age_mois)
+        colonnes = np.array([self.subtests.index(s) for s in subtests], dtype=np.intp)
+        bruts = np.asarray(bruts, dtype=np.intp)
+        definies = (bruts >= 0) & (bruts < tranche.shape[1])
+
+        notes = np.full(len(bruts), NOTE_NON_DEFINIE, dtype=tranche.dtype)
+        notes[definies] = tranche[colonnes[definies], bruts[definies]]
+        return notes
+
+    def _tranche(self, age_mois: int) -> int:
+        tranche = int(np.searchsorted(self.ages, age_mois, side="right")) - 1
+        if tranche < 0:
+            raise ValueError(f"Âge hors des normes de {self.batterie} : {age_mois} mois")
+        return tranche
+
+
+@lru_cache(maxsize=None)
+def load_reference_tables(chemin: Path = CHEMIN_TABLES_REFERENCE) -> ReferenceTables:
+    """Retourne les tables de référence, ouvertes une seule fois par processus."""
+    return ReferenceTables(chemin)
+
+
+def write_tables(chemin: Path, tables: Mapping[str, np.ndarray]) -> None:
+    """
+    Écrit des tables dans un fichier (fichier temporaire renommé : les processus qui
+    lisent l'ancien fichier ne sont pas affectés).
+
+    Raises:
+        ValueError: Si un nom, un type ou un nombre de dimensions n'est pas pris en charge
+    """
+    tableaux = {}
+    for nom, tableau in tables.items():
+        tableau = np.asarray(tableau)
+        if tableau.dtype.kind not in TYPES_ACCEPTES or tableau.ndim > DIMENSIONS_MAX:
+            raise ValueError(f"Table {nom} : type {tableau.dtype} ou dimensions {tableau.shape} non pris en charge")
+        if len(nom.encode("utf-8")) > 48:
+            raise ValueError(f"Nom de table trop long : {nom}")
+        tableaux[nom] = np.ascontiguousarray(tableau, dtype=tableau.dtype.newbyteorder("<"))
+
+    entrees = []
+    position = _aligner(_ENTETE.size + len(tableaux) * _ENTREE.size)
+    for nom, tableau in tableaux.items():
+        dimensions = list(tableau.shape) + [0] * (DIMENSIONS_MAX - tableau.ndim)
+        entrees.append(_ENTREE.pack(nom.encode("utf-8"), tableau.dtype.str.encode("ascii"), tableau.ndim,
+                                    *dimensions, position, tableau.nbytes))
+        position = _aligner(position + tableau.nbytes)
+
+    chemin.parent.mkdir(parents=True, exist_ok=True)
+    temporaire = chemin.with_name(f"{chemin.name}.tmp")
+    try:
+        with open(temporaire, "wb") as fichier:
+            fichier.write(_ENTETE.pack(SIGNATURE, VERSION_FORMAT, len(tableaux), position))
+            fichier.write(b"".join(entrees))
+            for tableau in tableaux.values():
+                fichier.write(b"\0" * (_aligner(fichier.tell()) - fichier.tell()))
+                fichier.write(tableau.tobytes())
+            fichier.write(b"\0" * (position - fichier.tell()))
+            fichier.flush()
+            os.fsync(fichier.fileno())
+        os.replace(temporaire, chemin)
+    finally:
+        temporaire.unlink(missing_ok=True)
+
+
+def compile_norms(sources: Iterable[Path]) -> Dict[str, np.ndarray]:
+    """
+    Compile des normes au format CSV (une ligne par note brute) en tables denses.
+
+    Colonnes : batterie, age_min_mois, subtest, brut, note (séparateur ',' ou ';').
+
+    Raises:
+        ValueError: Si une colonne manque ou si une valeur n'est pas un entier
+    """
+    normes: Dict[str, Dict[Tuple[int, str, int], int]] = {}
+
+    for source in sources:
+        with open(source, newline="", encoding="utf-8-sig") as fichier:
+            dialecte = csv.Sniffer().sniff(fichier.readline(), delimiters=",;\t")
+            fichier.seek(0)
+            lecteur = csv.DictReader(fichier, dialect=dialecte)
+            manquantes = set(COLONNES_NORMES) - set(lecteur.fieldnames or [])
+            if manquantes:
+                raise ValueError(f"{source} : colonne(s) manquante(s) : {', '.join(sorted(manquantes))}")
+
+            for ligne in lecteur:
+                try:
+                    cle = (int(ligne["age_min_mois"]), ligne["subtest"].strip(), int(ligne["brut"]))
+                    normes.setdefault(ligne["batterie"].strip(), {})[cle] = int(ligne["note"])
+                except ValueError:
+                    raise ValueError(f"{source}, ligne {lecteur.line_num} : valeur non entière") from None
+
+    tables = {}
+    for batterie, notes in normes.items():
+        ages = sorted({age for age, _, _ in notes})
+        subtests = list(dict.fromkeys(subtest for _, subtest, _ in notes))
+        rangs_ages = {age: i for i, age in enumerate(ages)}
+        rangs_subtests = {subtest: i for i, subtest in enumerate(subtests)}
+
+        dense = np.full((len(ages), len(subtests), max(brut for _, _, brut in notes) + 1), NOTE_NON_DEFINIE,
+                        dtype=np.int16)
+        lignes, colonnes, bruts = zip(*((rangs_ages[a], rangs_subtests[s], b) for a, s, b in notes))
+        dense[lignes, colonnes, bruts] = list(notes.values())
+
+        tables[f"normes/{batterie}/ages"] = np.array(ages, dtype=np.int16)
+        tables[f"normes/{batterie}/subtests"] = np.array([s.encode("utf-8") for s in subtests])
+        tables[f"normes/{batterie}/notes"] = dense
+
+    return tables
+
+
+def _aligner(position: int) -> int:
+    return -(-position // ALIGNEMENT) * ALIGNEMENT
+
+
+def main(argv=None) -> None:
+    """Point d'entrée en ligne de commande : compile des normes CSV en fichier de tables."""
+    parser = argparse.ArgumentParser(description="Compilation des tables de référence NeuroPsy Assist")
+    parser.add_argument("sources", type=Path, nargs="+", help="Normes au format CSV")
+    parser.add_argument("--sortie", type=Path, default=CHEMIN_TABLES_REFERENCE, help="Fichier de tables")
+    args = parser.parse_args(argv)
+
+    try:
+        write_tables(args.sortie, compile_norms(args.sources))
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"{e}\n")
+
+    tables = ReferenceTables(args.sortie)
+    for batterie in tables.batteries():
+        normes = tables.norms(batterie)
+        print(f"{batterie} : {len(normes.ages)} tranches d'âge, {len(normes.subtests)} subtests, "
+              f"notes brutes 0-{normes.notes.shape[2] - 1}")
+    print(f"Tables écrites dans {args.sortie}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Moteurs de rendu du document de rapport (Markdown, HTML, texte brut).
+
+Chaque moteur produit le rendu par morceaux (iter_render) : un consommateur peut
+écrire dans un flux ou afficher le rapport au fur et à mesure, sans construire la
+chaîne complète.
+"""
+
+import html
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Iterator, TextIO
+
+from utils.document import Document, Section, Paragraphe, Tableau, Liste, Ligne
+
+
+class DocumentRenderer(ABC):
+    """Moteur de rendu de base (les moteurs définissent iter_render)."""
+
+    format = ""
+    extension = ""
+    mime = ""
+
+    @abstractmethod
+    def iter_render(self, document: Document) -> Iterator[str]:
+        """Produit le rendu du document par morceaux."""
+
+    def render(self, document: Document) -> str:
+        """Retourne le rendu complet du document."""
+        return "".join(self.iter_render(document))
+
+    def write(self, document: Document, flux: TextIO) -> None:
+        """Écrit le rendu du document dans un flux texte."""
+        for morceau in self.iter_render(document):
+            flux.write(morceau)
+
+
+class MarkdownRenderer(DocumentRenderer):
+    """Rendu Markdown : blocs séparés par une ligne vide."""
+
+    format = "markdown"
+    extension = "md"
+    mime = "text/markdown"
+
+    def iter_render(self, document: Document) -> Iterator[str]:
+        premier = True
+
+        for bloc in self._blocs(document.sections):
+            if not premier:
+                yield "\n\n"
+            yield bloc
+            premier = False
+
+        yield "\n"
+
+    def _blocs(self, blocs: Iterable) -> Iterator[str]:
+        for bloc in blocs:
+            if isinstance(bloc, Section):
+                yield f"{'#' * bloc.niveau} {bloc.intitule}"
+                yield from self._blocs(bloc.blocs)
+            elif isinstance(bloc, Paragraphe):
+                yield "\n".join(self._ligne(ligne) for ligne in bloc.lignes)
+            elif isinstance(bloc, Tableau):
+                lignes = [self._ligne_tableau(bloc.entetes),
+                          "|" + "|".join("-" * (len(e) + 2) for e in bloc.entetes) + "|"]
+                lignes.extend(self._ligne_tableau(cellules) for cellules in bloc.lignes)
+                yield "\n".join(lignes)
+            elif isinstance(bloc, Liste):
+                yield "\n".join(
+                    f"{f'{i}.' if bloc.ordonnee else '-'} {self._ligne(element)}"
+                    for i, element in enumerate(bloc.elements, 1)
+                )
+
+    @staticmethod
+    def _ligne(ligne: Ligne) -> str:
+        return "".join(f"**{f.texte}**" if f.gras else f.texte for f in ligne)
+
+    @staticmethod
+    def _ligne_tableau(cellules) -> str:
+        return "| " + " | ".join(cellules) + " |"
+
+
+class HTMLRenderer(DocumentRenderer):
+    """Rendu HTML autonome (feuille de style intégrée), prêt à imprimer."""
+
+    format = "html"
+    extension = "html"
+    mime = "text/html"
+
+    STYLE = (
+        "body{font-family:Georgia,serif;max-width:48em;margin:2em auto;line-height:1.5;color:#222}"
+        "table{border-collapse:collapse;margin:1em 0}"
+        "th,td{border:1px solid #999;padding:.3em .6em;text-align:left}"
+        "th{background:#eee}"
+    )
+
+    def iter_render(self, document: Document) -> Iterator[str]:
+        titre = document.sections[0].intitule if document.sections else ""
+        yield (f'<!DOCTYPE html>\n<html lang="{document.langue}">\n<head>\n<meta charset="utf-8">\n'
+               f"<title>{html.escape(titre)}</title>\n<style>{self.STYLE}</style>\n</head>\n<body>\n")
+        yield from self._blocs(document.sections)
+        yield "</body>\n</html>\n"
+
+    def _blocs(self, blocs: Iterable) -> Iterator[str]:
+        for bloc in blocs:
+            if isinstance(bloc, Section):
+                niveau = min(bloc.niveau, 6)
+                yield f"<h{niveau}>{html.escape(bloc.intitule)}</h{niveau}>\n"
+                yield from self._blocs(bloc.blocs)
+            elif isinstance(bloc, Paragraphe):
+                yield "<p>" + "<br>\n".join(self._ligne(ligne) for ligne in bloc.lignes) + "</p>\n"
+            elif isinstance(bloc, Tableau):
+                entetes = "".join(f"<th>{html.escape(e)}</th>" for e in bloc.entetes)
+                lignes = "".join(
+                    "<tr>" + "".join(f"<td>{html.escape(c)}</td>" for c in cellules) + "</tr>\n"
+                    for cellules in bloc.lignes
+                )
+                yield f"<table>\n<thead><tr>{entetes}</tr></thead>\n<tbody>\n{lignes}</tbody>\n</table>\n"
+            elif isinstance(bloc, Liste):
+                balise = "ol" if bloc.ordonnee else "ul"
+                elements = "".join(f"<li>{self._ligne(e)}</li>\n" for e in bloc.elements)
+                yield f"<{balise}>\n{elements}</{balise}>\n"
+
+    @staticmethod
+    def _ligne(ligne: Ligne) -> str:
+        return "".join(
+            f"<strong>{html.escape(f.texte)}</strong>" if f.gras else html.escape(f.texte)
+            for f in ligne
+        )
+
+
+class TextRenderer(DocumentRenderer):
+    """Rendu texte brut : titres soulignés, tableaux alignés en colonnes."""
+
+    format = "texte"
+    extension = "txt"
+    mime = "text/plain"
+
+    SOULIGNEMENTS = {1: "=", 2: "=", 3: "-"}
+
+    def iter_render(self, document: Document) -> Iterator[str]:
+        premier = True
+
+        for bloc in self._blocs(document.sections):
+            if not premier:
+                yield "\n\n"
+            yield bloc
+            premier = False
+
+        yield "\n"
+
+    def _blocs(self, blocs: Iterable) -> Iterator[str]:
+        for bloc in blocs:
+            if isinstance(bloc, Section):
+                soulignement = self.SOULIGNEMENTS.get(bloc.niveau)
+                titre = bloc.intitule
+                yield f"{titre}\n{soulignement * len(titre)}" if soulignement else titre
+                yield from self._blocs(bloc.blocs)
+            elif isinstance(bloc, Paragraphe):
+                yield bloc.texte()
+            elif isinstance(bloc, Tableau):
+                lignes = [bloc.entetes] + bloc.lignes
+                largeurs = [max(len(ligne[j]) for ligne in lignes if j < len(ligne))
+                            for j in range(len(bloc.entetes))]
+                rendu = ["  ".join(c.ljust(l) for c, l in zip(ligne, largeurs)).rstrip() for ligne in lignes]
+                rendu.insert(1, "  ".join("-" * l for l in largeurs))
+                yield "\n".join(rendu)
+            elif isinstance(bloc, Liste):
+                yield "\n".join(
+                    f"{f'{i}.' if bloc.ordonnee else '-'} {''.join(f.texte for f in element)}"
+                    for i, element in enumerate(bloc.elements, 1)
+                )
+
+
+RENDERERS: Dict[str, DocumentRenderer] = {
+    renderer.format: renderer for renderer in (MarkdownRenderer(), HTMLRenderer(), TextRenderer())
+}
+
+
+def get_renderer(format: str) -> DocumentRenderer:
+    """
+    Retourne le moteur de rendu d'un format.
+
+    Raises:
+        ValueError: Si le format n'est pas pris en charge
+    """
+    try:
+        return RENDERERS[format]
+    except KeyError:
+        raise ValueError(f"Format de rapport non pris en charge : {format}") from None
+
+
+def render_document(document: Document, format: str = "markdown") -> str:
+    """Rend un document dans le format demandé."""
+    return get_renderer(format).render(document)
@@ -0,0 +1,195 @@
+"""
+Registre des sections du rapport et des analyses dérivées qu'elles consomment.
+
+Chaque section déclare les gestionnaires de scores (motifs de clés de batteries) et
+les analyses dérivées dont elle dépend. Les analyses sont calculées une seule fois
+par rapport, à la première demande, puis partagées entre les sections.
+"""
+
+import fnmatch
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from models.scores import ScoreManager
+
+
+@dataclass(frozen=True)
+class DerivedAnalysis:
+    """Donnée dérivée des scores, partagée entre les sections d'un rapport."""
+
+    cle: str
+    calcul: Callable[[Any], Any]  # Reçoit le moteur de rapport
+    dependances: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class ReportSection:
+    """
+    Section du rapport.
+
+    Sans condition explicite, une section déclarant des gestionnaires n'est rendue que
+    si l'un d'eux contient des scores ; une section sans gestionnaire est toujours rendue.
+    """
+
+    cle: str
+    ordre: int
+    rendu: Callable[[Any], Any]  # Reçoit le moteur de rapport, retourne la Section du document
+    managers: Tuple[str, ...] = ()  # Motifs de clés de batteries (ex: "conners_*")
+    analyses: Tuple[str, ...] = ()
+    condition: Optional[Callable[[Any], bool]] = None
+
+    def consomme(self, managers: Dict[str, ScoreManager]) -> Dict[str, ScoreManager]:
+        """Retourne les gestionnaires correspondant aux motifs déclarés par la section."""
+        return {
+            cle: manager for cle, manager in managers.items()
+            if any(fnmatch.fnmatchcase(cle, motif) for motif in self.managers)
+        }
+
+    def est_active(self, engine) -> bool:
+        """Vérifie si la section doit figurer dans le rapport."""
+        if self.condition is not None:
+            return bool(self.condition(engine))
+        if not self.managers:
+            return True
+        return any(manager and manager.has_scores() for manager in self.consomme(engine.managers).values())
+
+
+class SectionRegistry:
+    """Sections du rapport (triées par ordre) et analyses dérivées disponibles."""
+
+    def __init__(self):
+        self._sections: Dict[str, ReportSection] = {}
+        self._analyses: Dict[str, DerivedAnalysis] = {}
+
+    def register_section(self, section: ReportSection, remplacer: bool = False) -> ReportSection:
+        """
+        Enregistre une section.
+
+        Args:
+            section: Section à ajouter
+            remplacer: Autorise le remplacement d'une section de même clé
+
+        Returns:
+            La section enregistrée
+        """
+        if section.cle in self._sections and not remplacer:
+            raise ValueError(f"Section déjà enregistrée : {section.cle}")
+        self._sections[section.cle] = section
+        return section
+
+    def register_analysis(self, analyse: DerivedAnalysis, remplacer: bool = False) -> DerivedAnalysis:
+        """
+        Enregistre une analyse dérivée.
+
+        Args:
+            analyse: Analyse à ajouter
+            remplacer: Autorise le remplacement d'une analyse de même clé
+
+        Returns:
+            L'analyse enregistrée
+        """
+        if analyse.cle in self._analyses and not remplacer:
+            raise ValueError(f"Analyse déjà enregistrée : {analyse.cle}")
+        self._analyses[analyse.cle] = analyse
+        return analyse
+
+    def unregister_section(self, cle: str) -> None:
+        """Retire une section du registre."""
+        self._sections.pop(cle, None)
+
+    def sections(self) -> List[ReportSection]:
+        """Sections enregistrées, dans l'ordre du rapport."""
+        return sorted(self._sections.values(), key=lambda s: s.ordre)
+
+    def section(self, cle: str) -> ReportSection:
+        """Retourne une section enregistrée."""
+        try:
+            return self._sections[cle]
+        except KeyError:
+            raise ValueError(f"Section inconnue : {cle}") from None
+
+    def analysis(self, cle: str) -> DerivedAnalysis:
+        """Retourne une analyse enregistrée."""
+        try:
+            return self._analyses[cle]
+        except KeyError:
+            raise ValueError(f"Analyse inconnue : {cle}") from None
+
+    def resoudre(self, cles: Iterable[str]) -> List[str]:
+        """
+        Ordonne des analyses et leurs dépendances (chaque dépendance avant ses dépendants).
+
+        Args:
+            cles: Analyses demandées
+
+        Returns:
+            Clés des analyses à calculer, dans un ordre compatible avec leurs dépendances
+
+        Raises:
+            ValueError: Si une analyse est inconnue ou si les dépendances forment un cycle
+        """
+        ordre: List[str] = []
+        etats: Dict[str, bool] = {}  # False : en cours de visite, True : terminée
+
+        def visiter(cle: str) -> None:
+            etat = etats.get(cle)
+            if etat is True:
+                return
+            if etat is False:
+                raise ValueError(f"Dépendance circulaire entre analyses : {cle}")
+
+            etats[cle] = False
+            for dependance in self.analysis(cle).dependances:
+                visiter(dependance)
+            etats[cle] = True
+            ordre.append(cle)
+
+        for cle in cles:
+            visiter(cle)
+
+        return ordre
+
+
+class DerivedData:
+    """
+    Analyses dérivées d'un rapport, calculées à la demande une seule fois.
+
+    Les sections rendues en parallèle partagent cette instance : une analyse demandée
+    simultanément par plusieurs sections est calculée par la première, les autres
+    attendent son résultat.
+    """
+
+    def __init__(self, registre: SectionRegistry, engine):
+        self._registre = registre
+        self._engine = engine
+        self._valeurs: Dict[str, Any] = {}
+        self._verrous: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, cle: str) -> bool:
+        return cle in self._valeurs
+
+    def get(self, cle: str) -> Any:
+        """Retourne la valeur d'une analyse, en la calculant au premier appel."""
+        if cle in self._valeurs:
+            return self._valeurs[cle]
+
+        # Vérifie les dépendances avant de prendre les verrous (un cycle les bloquerait)
+        self._registre.resoudre([cle])
+
+        with self._lock:
+            verrou = self._verrous.setdefault(cle, threading.Lock())
+
+        with verrou:
+            if cle not in self._valeurs:
+                analyse = self._registre.analysis(cle)
+                for dependance in analyse.dependances:
+                    self.get(dependance)
+                self._valeurs[cle] = analyse.calcul(self._engine)
+
+        return self._valeurs[cle]
+
+
+# Registre utilisé par défaut par le moteur de rapport
+REGISTRE_SECTIONS = SectionRegistry()
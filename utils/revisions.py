@@ -0,0 +1,233 @@
+"""
+Historique des versions d'un rapport (générations et modifications du clinicien).
+
+Chaque version est stockée sous forme de delta par lignes par rapport à la version
+précédente ; une version complète (base) est conservée à intervalle régulier pour
+borner le nombre de deltas à rejouer lors d'une restauration.
+"""
+
+import difflib
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+
+# Une version complète est stockée toutes les N versions
+INTERVALLE_BASE = 20
+
+# Titres délimitant les sections pour la comparaison (niveaux 1 et 2)
+_TITRE_SECTION = re.compile(r"^#{1,2} (?:\d+\. )?(.*)$")
+
+# Opération de delta : copie des lignes [debut, fin) de la version précédente, ou lignes insérées
+Operation = Union[Tuple[int, int], List[str]]
+
+
+@dataclass
+class Revision:
+    """Version d'un rapport."""
+
+    numero: int
+    origine: str  # Ex: "Génération", "Modification", "Restauration de la version 2"
+    horodatage: datetime
+    n_lignes: int
+    n_lignes_stockees: int  # Lignes effectivement stockées (insérées, ou toutes pour une base)
+    base: bool = False
+
+
+@dataclass
+class SectionDiff:
+    """Différence d'une section entre deux versions."""
+
+    titre: str
+    statut: str  # "inchangée", "modifiée", "ajoutée" ou "supprimée"
+    lignes: List[str] = field(default_factory=list)  # Diff unifié des lignes (sections modifiées)
+
+
+class ReportRevisions:
+    """Versions successives d'un rapport, stockées par deltas."""
+
+    def __init__(self, intervalle_base: int = INTERVALLE_BASE):
+        self.intervalle_base = intervalle_base
+        self._revisions: List[Revision] = []
+        self._contenus: List[Union[List[str], List[Operation]]] = []  # Base (lignes) ou delta
+        self._derniere: List[str] = []  # Lignes de la dernière version, pour calculer le delta suivant
+
+    def __len__(self) -> int:
+        return len(self._revisions)
+
+    def __iter__(self) -> Iterator[Revision]:
+        return iter(self._revisions)
+
+    @property
+    def courante(self) -> Optional[Revision]:
+        """Dernière version enregistrée."""
+        return self._revisions[-1] if self._revisions else None
+
+    def commit(self, texte: str, origine: str) -> Optional[Revision]:
+        """
+        Enregistre une nouvelle version.
+
+        Args:
+            texte: Contenu Markdown du rapport
+            origine: Origine de la version (génération, modification, restauration)
+
+        Returns:
+            La version créée, ou None si le texte est identique à la version courante
+        """
+        lignes = texte.split("\n")
+
+        if self._revisions and lignes == self._derniere:
+            return None
+
+        numero = len(self._revisions) + 1
+        base = (numero - 1) % self.intervalle_base == 0
+
+        if base:
+            contenu = lignes
+            stockees = len(lignes)
+        else:
+            contenu = self._delta(self._derniere, lignes)
+            stockees = sum(len(op) for op in contenu if isinstance(op, list))
+
+        revision = Revision(numero, origine, datetime.now(), len(lignes), stockees, base)
+        self._revisions.append(revision)
+        self._contenus.append(contenu)
+        self._derniere = lignes
+
+        return revision
+
+    def texte(self, numero: Optional[int] = None) -> str:
+        """
+        Reconstruit le texte d'une version.
+
+        Args:
+            numero: Numéro de version (la version courante par défaut)
+
+        Returns:
+            Contenu Markdown de la version
+        """
+        return "\n".join(self._lignes(numero))
+
+    def restore(self, numero: int) -> Optional[Revision]:
+        """
+        Restaure une version antérieure en l'enregistrant comme nouvelle version.
+
+        Returns:
+            La version créée, ou None si la version restaurée est identique à la version courante
+        """
+        return self.commit(self.texte(numero), f"Restauration de la version {numero}")
+
+    def diff(self, ancienne: int, nouvelle: int) -> List[SectionDiff]:
+        """Compare deux versions section par section (voir diff_sections)."""
+        return diff_sections(self.texte(ancienne), self.texte(nouvelle))
+
+    def taille_stockee(self) -> int:
+        """Nombre de lignes effectivement stockées pour l'ensemble des versions."""
+        return sum(r.n_lignes_stockees for r in self._revisions)
+
+    def _lignes(self, numero: Optional[int]) -> List[str]:
+        """Rejoue les deltas depuis la base la plus proche de la version demandée."""
+        if not self._revisions:
+            return []
+
+        numero = numero or len(self._revisions)
+        if not 1 <= numero <= len(self._revisions):
+            raise ValueError(f"Version inconnue : {numero}")
+
+        if numero == len(self._revisions):
+            return self._derniere
+
+        debut = (numero - 1) // self.intervalle_base * self.intervalle_base
+        lignes = self._contenus[debut]
+
+        for contenu in self._contenus[debut + 1:numero]:
+            lignes = self._appliquer(lignes, contenu)
+
+        return lignes
+
+    @staticmethod
+    def _delta(anciennes: List[str], nouvelles: List[str]) -> List[Operation]:
+        """Calcule le delta transformant les anciennes lignes en nouvelles lignes."""
+        operations: List[Operation] = []
+        comparateur = difflib.SequenceMatcher(None, anciennes, nouvelles, autojunk=False)
+
+        for code, i1, i2, j1, j2 in comparateur.get_opcodes():
+            if code == "equal":
+                operations.append((i1, i2))
+            elif code in ("replace", "insert"):
+                operations.append(nouvelles[j1:j2])
+
+        return operations
+
+    @staticmethod
+    def _appliquer(lignes: List[str], delta: List[Operation]) -> List[str]:
+        """Applique un delta à une version."""
+        resultat: List[str] = []
+
+        for operation in delta:
+            if isinstance(operation, list):
+                resultat.extend(operation)
+            else:
+                resultat.extend(lignes[operation[0]:operation[1]])
+
+        return resultat
+
+
+def _decouper_sections(texte: str) -> Dict[str, List[str]]:
+    """Découpe un rapport Markdown en sections (titre sans numéro -> lignes)."""
+    sections: Dict[str, List[str]] = {}
+    titre = ""
+    lignes: List[str] = []
+
+    for ligne in texte.split("\n"):
+        correspondance = _TITRE_SECTION.match(ligne)
+        if correspondance:
+            if lignes:
+                sections[titre] = lignes
+            titre = correspondance.group(1).strip()
+            lignes = []
+        lignes.append(ligne)
+
+    if lignes:
+        sections[titre] = lignes
+
+    return sections
+
+
+def diff_sections(ancien: str, nouveau: str, contexte: int = 1) -> List[SectionDiff]:
+    """
+    Compare deux rapports section par section.
+
+    Les sections sont appariées par titre, sans tenir compte de leur numéro (une section
+    insérée renumérote les suivantes). Seules les sections dont le contenu diffère sont
+    comparées ligne à ligne.
+
+    Args:
+        ancien: Rapport de référence
+        nouveau: Rapport comparé
+        contexte: Nombre de lignes de contexte autour des modifications
+
+    Returns:
+        Différences dans l'ordre du nouveau rapport, suivies des sections supprimées
+    """
+    anciennes = _decouper_sections(ancien)
+    nouvelles = _decouper_sections(nouveau)
+    differences = []
+
+    for titre, lignes in nouvelles.items():
+        avant = anciennes.get(titre)
+
+        if avant is None:
+            differences.append(SectionDiff(titre, "ajoutée", [f"+{ligne}" for ligne in lignes]))
+        elif avant == lignes:
+            differences.append(SectionDiff(titre, "inchangée"))
+        else:
+            diff = difflib.unified_diff(avant, lignes, n=contexte, lineterm="")
+            differences.append(SectionDiff(titre, "modifiée", list(diff)[2:]))
+
+    for titre, lignes in anciennes.items():
+        if titre not in nouvelles:
+            differences.append(SectionDiff(titre, "supprimée", [f"-{ligne}" for ligne in lignes]))
+
+    return differences
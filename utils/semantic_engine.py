@@ -2,201 +2,327 @@
 Moteur de génération sémantique du rapport clinique.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import threading
+import numpy as np
 from models.patient import Patient, Anamnese
-from models.scores import ScoreManager, ScoreType
-from models.interpretations import est_cliniquement_significatif, get_recommandation
-from config.constants import WISC_V_STRUCTURE, KABC_II_STRUCTURE
+from models.scores import Score, ScoreManager, ScoreType
+from models.profile import UnifiedProfile
+from utils.informants import InformantComparison, libelles_distincts
+from utils.case_store import EvaluationRecord
+from utils.longitudinal import compare_with_history, RetestComparison
+from utils.recommendations import MOTEUR_RECOMMANDATIONS
+from utils.document import Document, Section, Paragraphe, Tableau, Liste, Texte, Ligne, champ
+from utils.renderers import render_document
+from utils.report_registry import (
+    REGISTRE_SECTIONS,
+    SectionRegistry,
+    ReportSection,
+    DerivedAnalysis,
+    DerivedData
+)
+from utils.i18n import get_catalogue
+from config.constants import (
+    WISC_V_STRUCTURE,
+    KABC_II_STRUCTURE,
+    CONNERS_3_INFORMATEURS,
+    SEUIL_CHANGEMENT_FIABLE,
+    INTERPRETATIONS_SEMANTIQUES,
+    INTERPRETATIONS_T_SCORE,
+    LIBELLES_DOMAINES,
+    SYNTHESES_QIT,
+    SYNTHESE_QIT_DEFAUT,
+    LANGUE_DEFAUT,
+    LANGUES_RAPPORT
+)
+
+
+# Indices WISC-V pris en compte dans l'analyse d'homogénéité du profil
+INDICES_HOMOGENEITE_WISC = ["ICV", "IVS", "IRF", "IMT", "IVT"]
+
+# Pool partagé pour le rendu parallèle des sections
+_EXECUTEUR: Optional[ThreadPoolExecutor] = None
+_EXECUTEUR_LOCK = threading.Lock()
+
+
+def _get_executeur() -> ThreadPoolExecutor:
+    """Retourne le pool de rendu des sections, créé au premier rapport."""
+    global _EXECUTEUR
+    
+    with _EXECUTEUR_LOCK:
+        if _EXECUTEUR is None:
+            _EXECUTEUR = ThreadPoolExecutor(thread_name_prefix="rapport")
+        return _EXECUTEUR
 
 
 class SemanticEngine:
     """Moteur de génération du rapport clinique."""
     
-    def __init__(self, patient: Patient, anamnese: Anamnese, **managers):
+    def __init__(self, patient: Patient, anamnese: Anamnese,
+                 historique: Optional[List[EvaluationRecord]] = None,
+                 registre: Optional[SectionRegistry] = None, parallele: bool = True, **managers):
         """
         Initialise le moteur sémantique.
         
         Args:
             patient: Informations patient
             anamnese: Données anamnestiques
+            historique: Évaluations antérieures du patient (CaseStore.get_history)
+            registre: Registre des sections (REGISTRE_SECTIONS par défaut)
+            parallele: Rend les sections indépendantes en parallèle
             **managers: Gestionnaires de scores (wisc_v, kabc_ii, teach, nepsy_ii, etc.)
         """
         self.patient = patient
         self.anamnese = anamnese
+        self.historique = historique or []
         self.managers = managers
+        self.registre = registre or REGISTRE_SECTIONS
+        self.parallele = parallele
+        self.donnees = DerivedData(self.registre, self)
+        self.versions = self._versions_scores()  # Versions des gestionnaires analysés
+        self.versions_saisie = (patient.version, anamnese.version)
+        self.langue = LANGUE_DEFAUT
+        self.t = get_catalogue(LANGUE_DEFAUT).gettext
+        self._redaction = threading.RLock()  # Une rédaction à la fois (langue courante)
+    
+    @property
+    def profil(self) -> UnifiedProfile:
+        """Profil unifié de l'ensemble des scores valides."""
+        return self.donnees.get("profil")
     
-    def generate_rapport(self) -> str:
+    @property
+    def retest(self) -> Optional[RetestComparison]:
+        """Comparaison avec la plus récente évaluation antérieure."""
+        return self.donnees.get("retest")
+    
+    def scores_modifies(self) -> bool:
+        """Vérifie si des scores ont changé depuis la création du moteur (analyses périmées)."""
+        return self._versions_scores() != self.versions
+    
+    def donnees_modifiees(self) -> bool:
+        """Vérifie si des scores, le patient ou l'anamnèse ont changé depuis la création du moteur."""
+        return self.scores_modifies() or (self.patient.version, self.anamnese.version) != self.versions_saisie
+    
+    def _versions_scores(self) -> Dict[str, int]:
+        return {cle: manager.version for cle, manager in self.managers.items() if manager}
+    
+    @property
+    def _decalage(self) -> int:
+        """Les sections suivant la comparaison longitudinale sont renumérotées."""
+        return 1 if self._has_retest() else 0
+    
+    def generate_rapport(self, langue: str = LANGUE_DEFAUT) -> str:
         """Génère le rapport complet en Markdown."""
+        return render_document(self.generate_document(langue), "markdown")
+    
+    def generate_document(self, langue: str = LANGUE_DEFAUT) -> Document:
+        """
+        Génère le document structuré du rapport.
         
-        sections = []
-        
-        # En-tête
-        sections.append(self._generate_header())
+        Les sections actives sont construites sur un pool de threads ; chacune obtient
+        les analyses qu'elle déclare depuis le cache partagé du rapport, puis les
+        sections sont assemblées dans l'ordre du registre. Les analyses ne dépendent
+        pas de la langue : un nouvel appel dans une autre langue ne fait que rédiger.
         
-        # Anamnèse
-        if self.anamnese.has_content():
-            sections.append(self._generate_anamnese_section())
+        Args:
+            langue: Code de la langue du rapport (voir LANGUES_RAPPORT)
+        """
         
-        # Observations cliniques
-        sections.append(self._generate_observations_section())
+        with self.redaction(langue):
+            sections = [s for s in self.registre.sections() if s.est_active(self)]
+            self.registre.resoudre(cle for section in sections for cle in section.analyses)
+            
+            if self.parallele and len(sections) > 1:
+                futures = [_get_executeur().submit(self._render_section, section) for section in sections]
+                contenus = [future.result() for future in futures]
+            else:
+                contenus = [self._render_section(section) for section in sections]
         
-        # Évaluation intellectuelle
-        if self._has_intellectual_assessment():
-            sections.append(self._generate_intellectual_section())
+        return Document(contenus, langue)
+    
+    @contextmanager
+    def redaction(self, langue: str = LANGUE_DEFAUT) -> Iterator["SemanticEngine"]:
+        """
+        Fixe la langue de rédaction pour la durée du bloc.
         
-        # Évaluation attentionnelle
-        if self._has_attention_assessment():
-            sections.append(self._generate_attention_section())
+        Les rédactions d'un même moteur sont sérialisées (la langue est un état du moteur) ;
+        le verrou est réentrant, un bloc peut donc générer des sections ou le document.
+        """
+        with self._redaction:
+            precedente = self.langue, self.t
+            self.langue = langue
+            self.t = get_catalogue(langue).gettext
+            try:
+                yield self
+            finally:
+                self.langue, self.t = precedente
+    
+    def generate_section(self, cle: str, langue: str = LANGUE_DEFAUT) -> Optional[Section]:
+        """
+        Génère une seule section du registre.
         
-        # Évaluation comportementale
-        if self._has_behavioral_assessment():
-            sections.append(self._generate_behavioral_section())
+        Returns:
+            La section, ou None si elle ne s'applique pas à cette évaluation
+        """
+        section = self.registre.section(cle)
         
-        # Synthèse
-        sections.append(self._generate_synthese_section())
+        with self.redaction(langue):
+            if not section.est_active(self):
+                return None
+            return self._render_section(section)
+    
+    def _render_section(self, section: ReportSection) -> Section:
+        """Calcule les analyses déclarées par une section puis la construit."""
         
-        # Recommandations
-        sections.append(self._generate_recommandations_section())
+        for cle in section.analyses:
+            self.donnees.get(cle)
         
-        # Conclusion
-        sections.append(self._generate_conclusion_section())
+        contenu = section.rendu(self)
+        contenu.cle = section.cle
         
-        return "\n\n".join(sections)
+        return contenu
     
-    def _generate_header(self) -> str:
+    def _generate_header(self) -> Section:
         """Génère l'en-tête du rapport."""
         
-        lines = ["# COMPTE-RENDU D'EXAMEN NEUROPSYCHOLOGIQUE", ""]
+        t = self.t
+        section = Section(t("COMPTE-RENDU D'EXAMEN NEUROPSYCHOLOGIQUE"), 1)
+        lignes = []
         
         if self.patient.format_nom_complet():
-            lines.append(f"**Patient :** {self.patient.format_nom_complet()}")
+            lignes.append(self._champ(t("Patient"), self.patient.format_nom_complet()))
         
         if self.patient.date_naissance:
-            lines.append(f"**Date de naissance :** {self.patient.date_naissance.strftime('%d/%m/%Y')}")
+            lignes.append(self._champ(t("Date de naissance"), self._date(self.patient.date_naissance)))
         
         age = self.patient.get_age_at_exam()
         if age:
-            lines.append(f"**Âge à l'examen :** {age} ans")
+            lignes.append(self._champ(t("Âge à l'examen"), t("{age} ans").format(age=age)))
         
         if self.patient.date_examen:
-            lines.append(f"**Date d'examen :** {self.patient.date_examen.strftime('%d/%m/%Y')}")
+            lignes.append(self._champ(t("Date d'examen"), self._date(self.patient.date_examen)))
         
         if self.patient.classe:
-            lines.append(f"**Classe :** {self.patient.classe}")
+            lignes.append(self._champ(t("Classe"), self.patient.classe))
         
         if self.patient.ecole:
-            lines.append(f"**École :** {self.patient.ecole}")
+            lignes.append(self._champ(t("École"), self.patient.ecole))
+        
+        if lignes:
+            section.ajouter(Paragraphe(lignes))
         
-        return "\n".join(lines)
+        return section
     
-    def _generate_anamnese_section(self) -> str:
+    def _generate_anamnese_section(self) -> Section:
         """Génère la section anamnestique."""
         
-        lines = ["## 1. ÉLÉMENTS ANAMNESTIQUES", ""]
+        t = self.t
+        section = Section(t("ÉLÉMENTS ANAMNESTIQUES"), 2, numero=1)
         
         if self.anamnese.motif_consultation:
-            lines.append("### Motif de consultation")
-            lines.append(self.anamnese.motif_consultation)
-            lines.append("")
+            section.sous_section(t("Motif de consultation")).ajouter(
+                Paragraphe([[Texte(self.anamnese.motif_consultation)]])
+            )
         
         if self.anamnese.demandeur:
-            lines.append(f"**Demandeur :** {self.anamnese.demandeur}")
-            lines.append("")
+            section.paragraphe(self._champ(t("Demandeur"), self.anamnese.demandeur))
         
         if any([self.anamnese.grossesse_accouchement, self.anamnese.developpement_moteur, 
                 self.anamnese.developpement_langagier]):
-            lines.append("### Histoire développementale")
+            lignes = []
             
             if self.anamnese.grossesse_accouchement:
-                lines.append(f"**Grossesse et accouchement :** {self.anamnese.grossesse_accouchement}")
+                lignes.append(self._champ(t("Grossesse et accouchement"), self.anamnese.grossesse_accouchement))
             
             if self.anamnese.developpement_moteur:
-                lines.append(f"**Développement moteur :** {self.anamnese.developpement_moteur}")
+                lignes.append(self._champ(t("Développement moteur"), self.anamnese.developpement_moteur))
             
             if self.anamnese.developpement_langagier:
-                lines.append(f"**Développement langagier :** {self.anamnese.developpement_langagier}")
+                lignes.append(self._champ(t("Développement langagier"), self.anamnese.developpement_langagier))
             
-            lines.append("")
+            section.sous_section(t("Histoire développementale")).ajouter(Paragraphe(lignes))
         
         if any([self.anamnese.histoire_scolaire, self.anamnese.redoublements, 
                 self.anamnese.amenagements_existants]):
-            lines.append("### Parcours scolaire")
+            lignes = []
             
             if self.anamnese.histoire_scolaire:
-                lines.append(self.anamnese.histoire_scolaire)
+                lignes.append([Texte(self.anamnese.histoire_scolaire)])
             
             if self.anamnese.redoublements:
-                lines.append(f"**Redoublements :** {self.anamnese.redoublements}")
+                lignes.append(self._champ(t("Redoublements"), self.anamnese.redoublements))
             
             if self.anamnese.amenagements_existants:
-                lines.append(f"**Aménagements existants :** {self.anamnese.amenagements_existants}")
+                lignes.append(self._champ(t("Aménagements existants"), self.anamnese.amenagements_existants))
             
-            lines.append("")
+            section.sous_section(t("Parcours scolaire")).ajouter(Paragraphe(lignes))
         
         if any([self.anamnese.antecedents_medicaux, self.anamnese.antecedents_familiaux, 
                 self.anamnese.suivis_actuels]):
-            lines.append("### Antécédents et suivis")
+            lignes = []
             
             if self.anamnese.antecedents_medicaux:
-                lines.append(f"**Antécédents médicaux :** {self.anamnese.antecedents_medicaux}")
+                lignes.append(self._champ(t("Antécédents médicaux"), self.anamnese.antecedents_medicaux))
             
             if self.anamnese.antecedents_familiaux:
-                lines.append(f"**Antécédents familiaux :** {self.anamnese.antecedents_familiaux}")
+                lignes.append(self._champ(t("Antécédents familiaux"), self.anamnese.antecedents_familiaux))
             
             if self.anamnese.suivis_actuels:
-                lines.append(f"**Suivis actuels :** {self.anamnese.suivis_actuels}")
+                lignes.append(self._champ(t("Suivis actuels"), self.anamnese.suivis_actuels))
             
-            lines.append("")
+            section.sous_section(t("Antécédents et suivis")).ajouter(Paragraphe(lignes))
         
-        return "\n".join(lines)
+        return section
     
-    def _generate_observations_section(self) -> str:
+    def _generate_observations_section(self) -> Section:
         """Génère la section des observations cliniques."""
         
-        lines = ["## 2. OBSERVATIONS CLINIQUES DURANT L'EXAMEN", ""]
+        t = self.t
+        section = Section(t("OBSERVATIONS CLINIQUES DURANT L'EXAMEN"), 2, numero=2)
         
         observations = []
         
         if self.anamnese.comportement:
-            observations.append(f"**Comportement général :** {self.anamnese.comportement}")
+            observations.append(self._champ(t("Comportement général"), self.anamnese.comportement))
         
         if self.anamnese.collaboration:
-            observations.append(f"**Collaboration :** {self.anamnese.collaboration}")
+            observations.append(self._champ(t("Collaboration"), self.anamnese.collaboration))
         
         if self.anamnese.fatigabilite:
-            observations.append(f"**Fatigabilité :** {self.anamnese.fatigabilite}")
+            observations.append(self._champ(t("Fatigabilité"), self.anamnese.fatigabilite))
         
         if self.anamnese.anxiete_performance:
-            observations.append(f"**Anxiété de performance :** {self.anamnese.anxiete_performance}")
+            observations.append(self._champ(t("Anxiété de performance"), self.anamnese.anxiete_performance))
         
         if self.anamnese.strategies_observees:
-            observations.append(f"**Stratégies observées :** {self.anamnese.strategies_observees}")
+            observations.append(self._champ(t("Stratégies observées"), self.anamnese.strategies_observees))
         
         if self.anamnese.autres_observations:
-            observations.append(f"**Autres observations :** {self.anamnese.autres_observations}")
+            observations.append(self._champ(t("Autres observations"), self.anamnese.autres_observations))
         
         if observations:
-            lines.extend(observations)
+            section.ajouter(Paragraphe(observations))
         else:
-            lines.append("L'enfant a collaboré de manière satisfaisante durant l'ensemble de l'examen.")
+            section.paragraphe(t("L'enfant a collaboré de manière satisfaisante durant l'ensemble de l'examen."))
         
-        return "\n".join(lines)
+        return section
     
-    def _generate_intellectual_section(self) -> str:
+    def _generate_intellectual_section(self) -> Section:
         """Génère la section d'évaluation intellectuelle."""
         
-        lines = ["## 3. ÉVALUATION DES FONCTIONS INTELLECTUELLES", ""]
+        t = self.t
+        section = Section(t("ÉVALUATION DES FONCTIONS INTELLECTUELLES"), 2, numero=3)
         
         # WISC-V
         wisc_v = self.managers.get('wisc_v')
         if wisc_v and wisc_v.has_scores():
-            lines.append("### WISC-V - Échelle d'Intelligence de Wechsler")
-            lines.append("")
+            wisc = section.sous_section(t("WISC-V - Échelle d'Intelligence de Wechsler"))
             
             # Tableau des indices
-            lines.append("| Indice | Score | Classification | Percentile |")
-            lines.append("|--------|-------|----------------|------------|")
+            tableau = Tableau([t("Indice"), t("Score"), t("Classification"), t("Percentile")])
             
             indices_principaux = ["ICV", "IVS", "IRF", "IMT", "IVT", "IQT"]
             
@@ -204,444 +330,502 @@ class SemanticEngine:
                 score = wisc_v.get_score(idx)
                 if score and score.is_valid():
                     percentile = score.percentile or "-"
-                    lines.append(f"| {idx} | {int(score.valeur)} | {score.classification} | {percentile} |")
+                    tableau.ajouter(idx, int(score.valeur), t(score.classification), percentile)
             
-            lines.append("")
+            wisc.ajouter(tableau)
             
             # Interprétation narrative
-            lines.append("#### Interprétation")
-            lines.append("")
+            interpretation = wisc.sous_section(t("Interprétation"))
             
             for idx in indices_principaux:
                 score = wisc_v.get_score(idx)
                 if score and score.is_valid():
                     info = WISC_V_STRUCTURE.get(idx, {})
-                    nom_complet = info.get('nom', idx)
-                    lines.append(f"**{nom_complet} ({idx}) :** {score.interpretation}")
-                    lines.append("")
+                    nom_complet = t(info.get('nom', idx))
+                    interpretation.paragraphe(self._champ(f"{nom_complet} ({idx})", self._interpretation(score)))
             
             # Analyse de l'homogénéité
-            hetero = wisc_v.calculate_profile_heterogeneity(["ICV", "IVS", "IRF", "IMT", "IVT"])
+            hetero = self.donnees.get("heterogeneite_wisc")
             
-            lines.append("#### Analyse du profil")
-            lines.append("")
+            analyse = wisc.sous_section(t("Analyse du profil"))
             
             if hetero['is_homogeneous']:
-                lines.append(f"Le profil cognitif apparaît **homogène** (écart maximal de {hetero['ecart_max']:.0f} points), "
-                           "suggérant un développement harmonieux des différentes composantes de l'intelligence.")
+                analyse.paragraphe(t("Le profil cognitif apparaît **homogène** (écart maximal de {ecart} points), "
+                                     "suggérant un développement harmonieux des différentes composantes de l'intelligence.")
+                                   .format(ecart=f"{hetero['ecart_max']:.0f}"))
             else:
-                lines.append(f"Le profil cognitif présente une **hétérogénéité significative** "
-                           f"(écart maximal de {hetero['ecart_max']:.0f} points), révélant des forces et faiblesses contrastées.")
+                analyse.paragraphe(t("Le profil cognitif présente une **hétérogénéité significative** "
+                                     "(écart maximal de {ecart} points), révélant des forces et faiblesses contrastées.")
+                                   .format(ecart=f"{hetero['ecart_max']:.0f}"))
                 
                 if hetero['scores_min'] and hetero['scores_max']:
                     min_indices = ", ".join([s.nom for s in hetero['scores_min']])
                     max_indices = ", ".join([s.nom for s in hetero['scores_max']])
                     
-                    lines.append("")
-                    lines.append(f"- **Points forts :** {max_indices} ({hetero['scores_max'][0].valeur:.0f})")
-                    lines.append(f"- **Points faibles :** {min_indices} ({hetero['scores_min'][0].valeur:.0f})")
-            
-            lines.append("")
+                    analyse.ajouter(Liste([
+                        self._champ(t("Points forts"), f"{max_indices} ({hetero['scores_max'][0].valeur:.0f})"),
+                        self._champ(t("Points faibles"), f"{min_indices} ({hetero['scores_min'][0].valeur:.0f})")
+                    ]))
         
         # KABC-II
         kabc_ii = self.managers.get('kabc_ii')
         if kabc_ii and kabc_ii.has_scores():
-            lines.append("### KABC-II - Batterie d'Évaluation de Kaufman")
-            lines.append("")
+            kabc = section.sous_section(t("KABC-II - Batterie d'Évaluation de Kaufman"))
             
-            lines.append("| Indice | Score | Classification | Percentile |")
-            lines.append("|--------|-------|----------------|------------|")
+            tableau = Tableau([t("Indice"), t("Score"), t("Classification"), t("Percentile")])
             
             for score in kabc_ii.get_valid_scores():
                 percentile = score.percentile or "-"
-                lines.append(f"| {score.nom} | {int(score.valeur)} | {score.classification} | {percentile} |")
+                tableau.ajouter(score.nom, int(score.valeur), t(score.classification), percentile)
             
-            lines.append("")
+            kabc.ajouter(tableau)
             
-            lines.append("#### Interprétation")
-            lines.append("")
+            interpretation = kabc.sous_section(t("Interprétation"))
             
             for score in kabc_ii.get_valid_scores():
                 info = KABC_II_STRUCTURE.get(score.nom, {})
-                nom_complet = info.get('nom', score.nom)
-                lines.append(f"**{nom_complet} ({score.nom}) :** {score.interpretation}")
-                lines.append("")
+                nom_complet = t(info.get('nom', score.nom))
+                interpretation.paragraphe(self._champ(f"{nom_complet} ({score.nom})", self._interpretation(score)))
         
-        return "\n".join(lines)
+        return section
     
-    def _generate_attention_section(self) -> str:
+    def _generate_attention_section(self) -> Section:
         """Génère la section d'évaluation attentionnelle."""
         
-        lines = ["## 4. ÉVALUATION DES FONCTIONS ATTENTIONNELLES ET EXÉCUTIVES", ""]
+        t = self.t
+        section = Section(t("ÉVALUATION DES FONCTIONS ATTENTIONNELLES ET EXÉCUTIVES"), 2, numero=4)
         
         # TEA-Ch
         teach = self.managers.get('teach')
         if teach and teach.has_scores():
-            lines.append("### TEA-Ch - Test d'Évaluation de l'Attention")
-            lines.append("")
-            
-            lines.append("| Subtest | Score | Classification |")
-            lines.append("|---------|-------|----------------|")
-            
-            for score in teach.get_valid_scores():
-                lines.append(f"| {score.nom} | {int(score.valeur)} | {score.classification} |")
-            
-            lines.append("")
+            tea = section.sous_section(t("TEA-Ch - Test d'Évaluation de l'Attention"))
+            tea.ajouter(self._tableau_scores(teach, t("Subtest"), t("Score")))
             
             # Interprétation
-            fragilites = [s for s in teach.get_valid_scores() 
-                         if est_cliniquement_significatif(s.valeur, ScoreType.SCALAIRE)]
+            fragilites = self._scores_significatifs('teach')
             
             if fragilites:
-                lines.append(f"L'évaluation révèle des **fragilités attentionnelles** dans {len(fragilites)} domaine(s) :")
-                lines.append("")
-                for score in fragilites:
-                    lines.append(f"- {score.nom} : {score.interpretation}")
+                tea.paragraphe(t("L'évaluation révèle des **fragilités attentionnelles** dans {n} domaine(s) :")
+                               .format(n=len(fragilites)))
+                tea.ajouter(self._liste_interpretations(fragilites))
             else:
-                lines.append("Les capacités attentionnelles apparaissent **préservées** dans l'ensemble.")
-            
-            lines.append("")
+                tea.paragraphe(t("Les capacités attentionnelles apparaissent **préservées** dans l'ensemble."))
         
         # NEPSY-II
         nepsy = self.managers.get('nepsy_ii')
         if nepsy and nepsy.has_scores():
-            lines.append("### NEPSY-II - Bilan Neuropsychologique")
-            lines.append("")
-            
-            lines.append("| Subtest | Score | Classification |")
-            lines.append("|---------|-------|----------------|")
-            
-            for score in nepsy.get_valid_scores():
-                lines.append(f"| {score.nom} | {int(score.valeur)} | {score.classification} |")
-            
-            lines.append("")
+            section.sous_section(t("NEPSY-II - Bilan Neuropsychologique")).ajouter(
+                self._tableau_scores(nepsy, t("Subtest"), t("Score"))
+            )
         
-        return "\n".join(lines)
+        return section
     
-    def _generate_behavioral_section(self) -> str:
+    def _generate_behavioral_section(self) -> Section:
         """Génère la section d'évaluation comportementale."""
         
-        lines = ["## 5. ÉVALUATION COMPORTEMENTALE", ""]
+        t = self.t
+        section = Section(t("ÉVALUATION COMPORTEMENTALE"), 2, numero=5)
         
         # Brown
         brown = self.managers.get('brown')
         if brown and brown.has_scores():
-            lines.append("### Échelle Brown de Déficit d'Attention")
-            lines.append("")
-            
-            lines.append("| Échelle | Score T | Classification |")
-            lines.append("|---------|---------|----------------|")
-            
-            for score in brown.get_valid_scores():
-                lines.append(f"| {score.nom} | {int(score.valeur)} | {score.classification} |")
-            
-            lines.append("")
+            sous_section = section.sous_section(t("Échelle Brown de Déficit d'Attention"))
+            sous_section.ajouter(self._tableau_scores(brown, t("Échelle"), t("Score T")))
             
             # Items significatifs
-            significatifs = [s for s in brown.get_valid_scores() 
-                           if est_cliniquement_significatif(s.valeur, ScoreType.T_SCORE)]
+            significatifs = self._scores_significatifs('brown')
             
             if significatifs:
-                lines.append(f"**{len(significatifs)} échelle(s) cliniquement significative(s) :**")
-                lines.append("")
-                for score in significatifs:
-                    lines.append(f"- {score.nom} : {score.interpretation}")
-                lines.append("")
+                sous_section.paragraphe(t("**{n} échelle(s) cliniquement significative(s) :**")
+                                        .format(n=len(significatifs)))
+                sous_section.ajouter(self._liste_interpretations(significatifs))
             else:
-                lines.append("Aucune échelle ne présente de score cliniquement significatif.")
-                lines.append("")
+                sous_section.paragraphe(t("Aucune échelle ne présente de score cliniquement significatif."))
         
-        # Conners Parent
-        conners_parent = self.managers.get('conners_parent')
-        if conners_parent and conners_parent.has_scores():
-            lines.append("### Conners-3 - Version Parent")
-            lines.append("")
-            
-            lines.append("| Échelle | Score T | Classification |")
-            lines.append("|---------|---------|----------------|")
-            
-            for score in conners_parent.get_valid_scores():
-                lines.append(f"| {score.nom} | {int(score.valeur)} | {score.classification} |")
-            
-            lines.append("")
-            
-            # Items significatifs
-            significatifs_p = [s for s in conners_parent.get_valid_scores() 
-                             if est_cliniquement_significatif(s.valeur, ScoreType.T_SCORE)]
-            
-            if significatifs_p:
-                lines.append(f"**{len(significatifs_p)} échelle(s) cliniquement significative(s) (Parent) :**")
-                lines.append("")
-                for score in significatifs_p:
-                    lines.append(f"- {score.nom} : {score.interpretation}")
-                lines.append("")
+        # Conners-3 (une version par informateur)
+        informateurs = self.donnees.get("informateurs_conners")
+        # Libellés traduits, numérotés si plusieurs informateurs portent le même
+        informateurs = dict(zip(informateurs, libelles_distincts(t(label) for label in informateurs.values())))
         
-        # Conners Enseignant
-        conners_teacher = self.managers.get('conners_teacher')
-        if conners_teacher and conners_teacher.has_scores():
-            lines.append("### Conners-3 - Version Enseignant")
-            lines.append("")
-            
-            lines.append("| Échelle | Score T | Classification |")
-            lines.append("|---------|---------|----------------|")
+        for cle, label in informateurs.items():
+            manager = self.managers[cle]
             
-            for score in conners_teacher.get_valid_scores():
-                lines.append(f"| {score.nom} | {int(score.valeur)} | {score.classification} |")
-            
-            lines.append("")
+            sous_section = section.sous_section(t("Conners-3 - Version {informateur}").format(informateur=label))
+            sous_section.ajouter(self._tableau_scores(manager, t("Échelle"), t("Score T")))
             
             # Items significatifs
-            significatifs_t = [s for s in conners_teacher.get_valid_scores() 
-                             if est_cliniquement_significatif(s.valeur, ScoreType.T_SCORE)]
+            significatifs = self._scores_significatifs(cle)
             
-            if significatifs_t:
-                lines.append(f"**{len(significatifs_t)} échelle(s) cliniquement significative(s) (Enseignant) :**")
-                lines.append("")
-                for score in significatifs_t:
-                    lines.append(f"- {score.nom} : {score.interpretation}")
-                lines.append("")
+            if significatifs:
+                sous_section.paragraphe([Texte(
+                    t("{n} échelle(s) cliniquement significative(s) ({informateur}) :")
+                    .format(n=len(significatifs), informateur=label),
+                    gras=True
+                )])
+                sous_section.ajouter(self._liste_interpretations(significatifs))
         
         # Analyse croisée
-        if (conners_parent and conners_parent.has_scores() and 
-            conners_teacher and conners_teacher.has_scores()):
-            
-            lines.append("#### Analyse croisée Parent / Enseignant")
-            lines.append("")
-            
-            convergences = []
-            divergences = []
-            
-            for score_p in conners_parent.get_valid_scores():
-                score_t = conners_teacher.get_score(score_p.nom)
-                if score_t and score_t.is_valid():
-                    diff = abs(score_p.valeur - score_t.valeur)
-                    if diff < 10:
-                        convergences.append(score_p.nom)
-                    else:
-                        divergences.append((score_p.nom, diff))
-            
-            if convergences:
-                lines.append(f"**Convergences** observées sur {len(convergences)} échelle(s), "
-                           "suggérant une cohérence inter-informateurs.")
-            
-            if divergences:
-                lines.append("")
-                lines.append(f"**Divergences** notables (écart ≥10 points) sur {len(divergences)} échelle(s) :")
-                for nom, diff in divergences:
-                    lines.append(f"- {nom} (écart de {diff:.0f} points)")
-                lines.append("")
-                lines.append("Ces divergences peuvent refléter des manifestations contextuelles "
-                           "différentes selon l'environnement (domicile vs école).")
-            
-            lines.append("")
-        
-        return "\n".join(lines)
-    
-    def _generate_synthese_section(self) -> str:
+        if len(informateurs) >= 2:
+            section.ajouter(self._generate_analyse_croisee(informateurs))
+        
+        return section
+    
+    def _generate_analyse_croisee(self, informateurs: Dict[str, str]) -> Section:
+        """Génère l'analyse croisée des cotations de plusieurs informateurs (clé de batterie -> libellé distinct)."""
+        
+        t = self.t
+        raters = {label: self.managers[cle] for cle, label in informateurs.items()}
+        echelles = list(dict.fromkeys(s.nom for m in raters.values() for s in m.get_valid_scores()))
+        comparaison = InformantComparison.from_managers(raters, echelles)
+        
+        section = Section(t("Analyse croisée {informateurs}").format(informateurs=' / '.join(raters)), 4)
+        
+        convergences = np.flatnonzero(comparaison.mask_convergences())
+        divergences = np.flatnonzero(comparaison.mask_divergences())
+        etendues = comparaison.etendues()
+        bas, haut = comparaison.extremes()
+        plusieurs = len(raters) > 2
+        
+        if len(convergences):
+            section.paragraphe(t("**Convergences** observées sur {n} échelle(s), "
+                                 "suggérant une cohérence inter-informateurs.").format(n=len(convergences)))
+        
+        if len(divergences):
+            section.paragraphe(t("**Divergences** notables (écart ≥{seuil} points) sur {n} échelle(s) :")
+                               .format(seuil=f"{comparaison.seuil:.0f}", n=len(divergences)))
+            details = []
+            for j in divergences:
+                detail = t("écart de {ecart} points").format(ecart=f"{etendues[j]:.0f}")
+                if plusieurs:
+                    detail += t(" entre {informateur_bas} et {informateur_haut}").format(
+                        informateur_bas=comparaison.informateurs[bas[j]],
+                        informateur_haut=comparaison.informateurs[haut[j]]
+                    )
+                details.append([Texte(f"{echelles[j]} ({detail})")])
+            section.ajouter(Liste(details))
+            section.paragraphe(t("Ces divergences peuvent refléter des manifestations contextuelles "
+                                 "différentes selon l'environnement (domicile vs école)."))
+        
+        if plusieurs:
+            tableau = Tableau([t("Informateurs"), t("Échelles communes"), t("Accord"), t("Écart moyen")])
+            
+            for paire in comparaison.statistiques_paires():
+                if paire['n_echelles']:
+                    tableau.ajouter(' / '.join(paire['informateurs']), paire['n_echelles'],
+                                    f"{paire['accord']:.0%}", f"{paire['ecart_moyen']:.1f}")
+            
+            section.ajouter(tableau)
+        
+        return section
+    
+    def _generate_retest_section(self) -> Section:
+        """Génère la comparaison avec l'évaluation précédente."""
+        
+        t = self.t
+        retest = self.retest
+        section = Section(t("COMPARAISON AVEC L'ÉVALUATION PRÉCÉDENTE"), 2, numero=6)
+        
+        intro = t("Les résultats actuels sont comparés à ceux de l'évaluation du {date}").format(
+            date=self._date(retest.date_anterieure)
+        )
+        intervalle = retest.intervalle_mois()
+        if intervalle is not None:
+            intro += t(" (intervalle de {n} mois)").format(n=intervalle)
+        lignes = [intro + "."]
+        
+        if len(self.historique) > 1:
+            lignes.append(t("{n} évaluations antérieures sont enregistrées pour ce patient.")
+                          .format(n=len(self.historique)))
+        
+        section.paragraphe(*lignes)
+        
+        tableau = Tableau([t("Test"), t("Échelle"), t("Précédent"), t("Actuel"), t("Évolution"),
+                           t("Évolution corrigée"), t("ICF"), t("Changement")])
+        
+        ameliorations = retest.mask_ameliorations()
+        baisses = retest.mask_baisses()
+        
+        for i in range(len(retest)):
+            manager = self.managers[retest.batteries[i]]
+            changement = t("Amélioration") if ameliorations[i] else t("Baisse") if baisses[i] else t("Stable")
+            tableau.ajouter(manager.nom_test, retest.noms[i], f"{retest.anterieur[i]:.0f}",
+                            f"{retest.actuel[i]:.0f}", f"{retest.delta[i]:+.0f}", f"{retest.delta_corrige[i]:+.0f}",
+                            f"{retest.icf[i]:+.2f}", changement)
+        
+        section.ajouter(tableau)
+        
+        if ameliorations.any() or baisses.any():
+            lignes = []
+            if ameliorations.any():
+                lignes.append(t("**Amélioration fiable** sur {n} échelle(s) : {echelles}.").format(
+                    n=int(ameliorations.sum()), echelles=', '.join(retest.noms[ameliorations])
+                ))
+            if baisses.any():
+                lignes.append(t("**Baisse fiable** sur {n} échelle(s) : {echelles}.").format(
+                    n=int(baisses.sum()), echelles=', '.join(retest.noms[baisses])
+                ))
+            section.paragraphe(*lignes)
+            section.paragraphe(t("Un changement est considéré comme fiable lorsque l'indice de changement fiable (ICF), "
+                                 "corrigé de l'effet de pratique attendu, dépasse ±{seuil}.")
+                               .format(seuil=self._decimal(f"{SEUIL_CHANGEMENT_FIABLE:.2f}")))
+        else:
+            section.paragraphe(t("Aucun changement fiable n'est observé : les performances apparaissent **stables** "
+                                 "au regard de l'erreur de mesure et de l'effet de pratique attendu."))
+        
+        return section
+    
+    def _generate_synthese_section(self) -> Section:
         """Génère la synthèse clinique."""
         
-        lines = ["## 6. SYNTHÈSE CLINIQUE", ""]
+        t = self.t
+        section = Section(t("SYNTHÈSE CLINIQUE"), 2, numero=6 + self._decalage)
         
         # Profil intellectuel
         wisc_v = self.managers.get('wisc_v')
         if wisc_v and wisc_v.has_scores():
             iqt = wisc_v.get_score("IQT")
             if iqt and iqt.is_valid():
-                lines.append(f"Le fonctionnement intellectuel global se situe dans la zone **{iqt.classification.lower()}** "
-                           f"(QIT = {int(iqt.valeur)}), reflétant {self._get_synthese_iqt(iqt.classification)}.")
-            
-            hetero = wisc_v.calculate_profile_heterogeneity(["ICV", "IVS", "IRF", "IMT", "IVT"])
+                section.paragraphe(t("Le fonctionnement intellectuel global se situe dans la zone **{classification}** "
+                                     "(QIT = {qit}), reflétant {synthese}.").format(
+                    classification=t(iqt.classification).lower(),
+                    qit=int(iqt.valeur),
+                    synthese=self._get_synthese_iqt(iqt.classification)
+                ))
+            
+            hetero = self.donnees.get("heterogeneite_wisc")
             if not hetero['is_homogeneous']:
-                lines.append("")
-                lines.append("Le profil présente toutefois une **hétérogénéité significative**, "
-                           "avec des compétences contrastées selon les domaines cognitifs évalués.")
-            
-            lines.append("")
+                section.paragraphe(t("Le profil présente toutefois une **hétérogénéité significative**, "
+                                     "avec des compétences contrastées selon les domaines cognitifs évalués."))
         
         # Points forts
-        forces = self._identify_forces()
+        forces = self.donnees.get("forces")
         if forces:
-            lines.append("**Points d'appui identifiés :**")
-            lines.append("")
-            for force in forces:
-                lines.append(f"- {force}")
-            lines.append("")
+            section.paragraphe(t("**Points d'appui identifiés :**"))
+            section.ajouter(Liste([[Texte(self._format_point(score))] for score in forces]))
         
         # Fragilités
-        fragilites = self._identify_fragilites()
+        fragilites = self.donnees.get("fragilites")
         if fragilites:
-            lines.append("**Fragilités objectivées :**")
-            lines.append("")
-            for fragilite in fragilites:
-                lines.append(f"- {fragilite}")
-            lines.append("")
+            section.paragraphe(t("**Fragilités objectivées :**"))
+            section.ajouter(Liste([[Texte(self._format_point(score))] for score in fragilites]))
         
-        return "\n".join(lines)
+        return section
     
-    def _generate_recommandations_section(self) -> str:
+    def _generate_recommandations_section(self) -> Section:
         """Génère les recommandations personnalisées."""
         
-        lines = ["## 7. RECOMMANDATIONS", ""]
-        
-        recommandations = set()
+        t = self.t
+        section = Section(t("RECOMMANDATIONS"), 2, numero=7 + self._decalage)
         
-        # Recommandations basées sur les scores
-        for manager_name, manager in self.managers.items():
-            if manager and manager.has_scores():
-                for score in manager.get_valid_scores():
-                    if score.type_score == ScoreType.STANDARD:
-                        reco = get_recommandation(score.classification)
-                        if reco:
-                            recommandations.add(reco)
+        # Recommandations classées par priorité (moteur de règles)
+        section.ajouter(Liste([[Texte(t(reco.texte))] for reco in self.donnees.get("recommandations")],
+                              ordonnee=True))
         
-        # Recommandations spécifiques
-        fragilites = self._identify_fragilites()
+        return section
+    
+    def _generate_conclusion_section(self) -> Section:
+        """Génère la conclusion."""
         
-        if any("attention" in f.lower() for f in fragilites):
-            recommandations.add("Prévoir des temps de pause réguliers et limiter les distracteurs environnementaux")
-            recommandations.add("Privilégier les consignes courtes et vérifier la compréhension")
+        t = self.t
+        section = Section(t("CONCLUSION"), 2, numero=8 + self._decalage)
         
-        if any("mémoire" in f.lower() for f in fragilites):
-            recommandations.add("Fournir des supports écrits pour compenser les difficultés mnésiques")
-            recommandations.add("Encourager l'utilisation d'outils d'aide à la mémorisation (agenda, pictogrammes)")
+        prenom = self.patient.prenom if self.patient.prenom else t("l'enfant")
+        section.paragraphe([Texte(t("L'évaluation neuropsychologique de {prenom} "
+                                    "met en évidence un profil cognitif et comportemental nuancé, "
+                                    "avec des forces sur lesquelles s'appuyer et des fragilités nécessitant "
+                                    "un accompagnement adapté.").format(prenom=prenom))])
         
-        if any("vitesse" in f.lower() or "traitement" in f.lower() for f in fragilites):
-            recommandations.add("Accorder du temps supplémentaire pour les évaluations et exercices")
-            recommandations.add("Réduire la quantité de travail écrit demandé")
+        section.paragraphe(t("Les recommandations formulées visent à optimiser le développement de l'enfant "
+                             "et à favoriser son épanouissement tant sur le plan scolaire que personnel."))
         
-        # Recommandations comportementales
-        conners_parent = self.managers.get('conners_parent')
-        conners_teacher = self.managers.get('conners_teacher')
+        section.paragraphe(t("Un suivi régulier est préconisé afin d'ajuster les aménagements et accompagnements "
+                             "en fonction de l'évolution de l'enfant."))
         
-        if (conners_parent and conners_parent.has_scores()) or (conners_teacher and conners_teacher.has_scores()):
-            significatifs_comportement = []
-            
-            if conners_parent:
-                significatifs_comportement.extend([s for s in conners_parent.get_valid_scores() 
-                                                  if est_cliniquement_significatif(s.valeur, ScoreType.T_SCORE)])
-            
-            if conners_teacher:
-                significatifs_comportement.extend([s for s in conners_teacher.get_valid_scores() 
-                                                   if est_cliniquement_significatif(s.valeur, ScoreType.T_SCORE)])
-            
-            if significatifs_comportement:
-                recommandations.add("Envisager un accompagnement thérapeutique ciblé (guidance parentale, thérapie cognitivo-comportementale)")
-                recommandations.add("Favoriser un cadre structuré et des routines prévisibles")
+        if self.patient.date_examen:
+            section.paragraphe(t("Fait le {date}").format(date=self._date(self.patient.date_examen)))
         
-        # Recommandations générales
-        recommandations.add("Maintenir une communication régulière entre la famille, l'école et les professionnels suivant l'enfant")
-        recommandations.add("Valoriser systématiquement les efforts et les progrès réalisés")
+        return section
+    
+    def _tableau_scores(self, manager: ScoreManager, colonne_nom: str, colonne_score: str) -> Tableau:
+        """Tableau des scores valides d'une batterie (nom, score, classification)."""
         
-        for i, reco in enumerate(sorted(recommandations), 1):
-            lines.append(f"{i}. {reco}")
+        tableau = Tableau([colonne_nom, colonne_score, self.t("Classification")])
         
-        lines.append("")
+        for score in manager.get_valid_scores():
+            tableau.ajouter(score.nom, int(score.valeur), self.t(score.classification))
         
-        return "\n".join(lines)
+        return tableau
     
-    def _generate_conclusion_section(self) -> str:
-        """Génère la conclusion."""
-        
-        lines = ["## 8. CONCLUSION", ""]
-        
-        prenom = self.patient.prenom if self.patient.prenom else "l'enfant"
-        lines.append(f"L'évaluation neuropsychologique de {prenom} "
-                    "met en évidence un profil cognitif et comportemental nuancé, "
-                    "avec des forces sur lesquelles s'appuyer et des fragilités nécessitant un accompagnement adapté.")
-        lines.append("")
+    def _liste_interpretations(self, scores: List[Score]) -> Liste:
+        """Liste « échelle : interprétation » de scores."""
+        deux_points = self._typographie("deux_points")
+        return Liste([[Texte(f"{score.nom}{deux_points} {self._interpretation(score)}")] for score in scores])
+    
+    def _interpretation(self, score: Score) -> str:
+        """
+        Interprétation d'un score dans la langue du rapport.
         
-        lines.append("Les recommandations formulées visent à optimiser le développement de l'enfant "
-                    "et à favoriser son épanouissement tant sur le plan scolaire que personnel.")
-        lines.append("")
+        En français, l'interprétation enregistrée avec le score est conservée ; dans les
+        autres langues, elle est rédigée à partir du catalogue.
+        """
+        if self.langue == LANGUE_DEFAUT:
+            return score.interpretation
         
-        lines.append("Un suivi régulier est préconisé afin d'ajuster les aménagements et accompagnements "
-                    "en fonction de l'évolution de l'enfant.")
-        lines.append("")
+        interpretations = INTERPRETATIONS_T_SCORE if score.type_score == ScoreType.T_SCORE else INTERPRETATIONS_SEMANTIQUES
+        donnees = interpretations.get(score.classification)
+        if not donnees:
+            return self.t("Score de {valeur} ({classification}).").format(
+                valeur=score.valeur, classification=self.t(score.classification)
+            )
         
-        if self.patient.date_examen:
-            lines.append(f"Fait le {self.patient.date_examen.strftime('%d/%m/%Y')}")
+        return self.t(donnees["phrase"]).replace("{domaine}", self._domaine(score))
+    
+    def _domaine(self, score: Score) -> str:
+        """
+        Libellé du domaine d'un score dans la langue du rapport.
         
-        return "\n".join(lines)
+        Le libellé est déterminé par l'échelle (LIBELLES_DOMAINES) : le domaine enregistré
+        est une saisie en français, éventuellement vide (scores migrés).
+        """
+        return self.t(LIBELLES_DOMAINES.get(score.nom, score.domaine))
+    
+    def _date(self, valeur: date) -> str:
+        """Formate une date (jj/mm/aaaa)."""
+        return valeur.strftime('%d/%m/%Y')
+    
+    def _typographie(self, cle: str) -> str:
+        """Convention typographique de la langue du rapport (voir LANGUES_RAPPORT)."""
+        return LANGUES_RAPPORT[self.langue][cle]
+    
+    def _champ(self, libelle: str, valeur: str) -> Ligne:
+        """Ligne « Libellé : valeur » selon la typographie de la langue du rapport."""
+        return champ(libelle, valeur, self._typographie("deux_points"))
+    
+    def _decimal(self, nombre: str) -> str:
+        """Applique le séparateur décimal de la langue du rapport à un nombre formaté."""
+        return nombre.replace(".", self._typographie("separateur_decimal"))
     
     def _get_synthese_iqt(self, classification: str) -> str:
         """Retourne une phrase de synthèse pour le QIT."""
-        
-        syntheses = {
-            "Très Supérieur": "des capacités intellectuelles exceptionnelles",
-            "Supérieur": "un fonctionnement intellectuel au-dessus de la moyenne",
-            "Moyen Fort": "des compétences cognitives satisfaisantes",
-            "Moyen": "un fonctionnement intellectuel dans la norme attendue",
-            "Moyen Faible": "un fonctionnement intellectuel fragile",
-            "Limite (Zone Frontière)": "des difficultés intellectuelles significatives",
-            "Très Faible": "des difficultés intellectuelles majeures"
-        }
-        
-        return syntheses.get(classification, "un profil cognitif particulier")
+        return self.t(SYNTHESES_QIT.get(classification, SYNTHESE_QIT_DEFAUT))
     
-    def _identify_forces(self) -> List[str]:
+    def _identify_forces(self) -> List[Score]:
         """Identifie les points forts du profil."""
         
-        forces = []
-        
-        for manager_name, manager in self.managers.items():
-            if manager and manager.has_scores():
-                for score in manager.get_valid_scores():
-                    if score.type_score == ScoreType.STANDARD and score.valeur >= 110:
-                        forces.append(f"{score.nom} : {score.domaine} ({score.classification})")
-                    elif score.type_score == ScoreType.SCALAIRE and score.valeur >= 12:
-                        forces.append(f"{score.nom} ({score.classification})")
+        forces = self.profil.select(self.profil.mask_forces())
         
         return forces[:5]  # Limiter à 5 forces principales
     
-    def _identify_fragilites(self) -> List[str]:
+    def _identify_fragilites(self) -> List[Score]:
         """Identifie les fragilités du profil."""
         
-        fragilites = []
-        
-        for manager_name, manager in self.managers.items():
-            if manager and manager.has_scores():
-                for score in manager.get_valid_scores():
-                    if score.type_score == ScoreType.STANDARD and score.valeur < 85:
-                        fragilites.append(f"{score.nom} : {score.domaine} ({score.classification})")
-                    elif score.type_score == ScoreType.SCALAIRE and score.valeur <= 7:
-                        fragilites.append(f"{score.nom} ({score.classification})")
-                    elif score.type_score == ScoreType.T_SCORE and est_cliniquement_significatif(score.valeur, ScoreType.T_SCORE):
-                        fragilites.append(f"{score.nom} ({score.classification})")
+        return self.profil.select(self.profil.mask_fragilites())
+    
+    def _format_point(self, score: Score) -> str:
+        """Formate un point fort ou une fragilité pour la synthèse."""
         
-        return fragilites
+        if score.type_score == ScoreType.STANDARD:
+            return f"{score.nom}{self._typographie('deux_points')} {self._domaine(score)} ({self.t(score.classification)})"
+        return f"{score.nom} ({self.t(score.classification)})"
     
-    def _has_intellectual_assessment(self) -> bool:
-        """Vérifie si une évaluation intellectuelle a été réalisée."""
-        wisc_v = self.managers.get('wisc_v')
-        kabc_ii = self.managers.get('kabc_ii')
-        return (wisc_v and wisc_v.has_scores()) or (kabc_ii and kabc_ii.has_scores())
+    def _scores_significatifs(self, batterie: str) -> List[Score]:
+        """Retourne les scores cliniquement significatifs d'une batterie."""
+        
+        return self.profil.select(self.profil.mask_batteries(batterie) & self.profil.mask_significatifs())
     
-    def _has_attention_assessment(self) -> bool:
-        """Vérifie si une évaluation attentionnelle a été réalisée."""
-        teach = self.managers.get('teach')
-        nepsy = self.managers.get('nepsy_ii')
-        return (teach and teach.has_scores()) or (nepsy and nepsy.has_scores())
+    def _has_retest(self) -> bool:
+        """Vérifie si une comparaison avec une évaluation antérieure est possible."""
+        return self.retest is not None and len(self.retest) > 0
     
-    def _has_behavioral_assessment(self) -> bool:
-        """Vérifie si une évaluation comportementale a été réalisée."""
-        brown = self.managers.get('brown')
-        conners_p = self.managers.get('conners_parent')
-        conners_t = self.managers.get('conners_teacher')
-        return (brown and brown.has_scores()) or (conners_p and conners_p.has_scores()) or \
-               (conners_t and conners_t.has_scores())
+    def _informateurs_conners(self) -> Dict[str, str]:
+        """Retourne les informateurs Conners-3 renseignés (clé de batterie -> libellé)."""
+        
+        informateurs = {}
+        
+        for cle, manager in self.managers.items():
+            if cle.startswith('conners_') and manager and manager.has_scores():
+                informateurs[cle] = (manager.informateur or CONNERS_3_INFORMATEURS.get(cle)
+                                    or manager.nom_test)
+        
+        return informateurs
+
+
+def _heterogeneite_wisc(engine: SemanticEngine) -> Optional[Dict]:
+    """Analyse d'homogénéité des indices principaux du WISC-V."""
+    wisc_v = engine.managers.get('wisc_v')
+    if wisc_v and wisc_v.has_scores():
+        return wisc_v.calculate_profile_heterogeneity(INDICES_HOMOGENEITE_WISC)
+    return None
+
 
+for _analyse in (
+    DerivedAnalysis("profil", lambda e: UnifiedProfile.from_managers(e.managers)),
+    DerivedAnalysis("retest", lambda e: compare_with_history(e.historique, e.managers, e.patient.date_examen)),
+    DerivedAnalysis("informateurs_conners", SemanticEngine._informateurs_conners),
+    DerivedAnalysis("heterogeneite_wisc", _heterogeneite_wisc),
+    DerivedAnalysis("forces", SemanticEngine._identify_forces, ("profil",)),
+    DerivedAnalysis("fragilites", SemanticEngine._identify_fragilites, ("profil",)),
+    DerivedAnalysis("recommandations", lambda e: MOTEUR_RECOMMANDATIONS.evaluate(e.profil), ("profil",)),
+):
+    REGISTRE_SECTIONS.register_analysis(_analyse)
 
-def generate_rapport_complet(patient: Patient, anamnese: Anamnese, **managers) -> str:
+for _section in (
+    ReportSection("en_tete", 0, SemanticEngine._generate_header),
+    ReportSection("anamnese", 10, SemanticEngine._generate_anamnese_section,
+                  condition=lambda e: e.anamnese.has_content()),
+    ReportSection("observations", 20, SemanticEngine._generate_observations_section),
+    ReportSection("intellectuel", 30, SemanticEngine._generate_intellectual_section,
+                  managers=("wisc_v", "kabc_ii"), analyses=("heterogeneite_wisc",)),
+    ReportSection("attention", 40, SemanticEngine._generate_attention_section,
+                  managers=("teach", "nepsy_ii"), analyses=("profil",)),
+    ReportSection("comportement", 50, SemanticEngine._generate_behavioral_section,
+                  managers=("brown", "conners_*"), analyses=("profil", "informateurs_conners")),
+    ReportSection("retest", 60, SemanticEngine._generate_retest_section,
+                  analyses=("retest",), condition=SemanticEngine._has_retest),
+    ReportSection("synthese", 70, SemanticEngine._generate_synthese_section,
+                  analyses=("retest", "heterogeneite_wisc", "forces", "fragilites")),
+    ReportSection("recommandations", 80, SemanticEngine._generate_recommandations_section,
+                  analyses=("retest", "recommandations")),
+    ReportSection("conclusion", 90, SemanticEngine._generate_conclusion_section, analyses=("retest",)),
+):
+    REGISTRE_SECTIONS.register_section(_section)
+
+
+def generate_rapport_complet(patient: Patient, anamnese: Anamnese,
+                             historique: Optional[List[EvaluationRecord]] = None, langue: str = LANGUE_DEFAUT,
+                             **managers) -> str:
     """
     Fonction utilitaire pour générer un rapport complet.
     
     Args:
         patient: Informations patient
         anamnese: Données anamnestiques
+        historique: Évaluations antérieures du patient (optionnel)
+        langue: Langue du rapport (voir LANGUES_RAPPORT)
         **managers: Gestionnaires de scores
     
     Returns:
         Rapport complet en Markdown
     """
-    engine = SemanticEngine(patient, anamnese, **managers)
-    return engine.generate_rapport()
+    engine = SemanticEngine(patient, anamnese, historique, **managers)
+    return engine.generate_rapport(langue)
+
+
+def generate_document_complet(patient: Patient, anamnese: Anamnese,
+                              historique: Optional[List[EvaluationRecord]] = None, langue: str = LANGUE_DEFAUT,
+                              **managers) -> Document:
+    """
+    Fonction utilitaire pour générer le document structuré d'un rapport complet.
+    
+    Args:
+        patient: Informations patient
+        anamnese: Données anamnestiques
+        historique: Évaluations antérieures du patient (optionnel)
+        langue: Langue du rapport (voir LANGUES_RAPPORT)
+        **managers: Gestionnaires de scores
+    
+    Returns:
+        Document du rapport, à rendre avec utils.renderers
+    """
+    engine = SemanticEngine(patient, anamnese, historique, **managers)
+    return engine.generate_document(langue)
@@ -0,0 +1,376 @@
+"""
+Sérialisation sans perte d'un dossier complet (patient, anamnèse, scores).
+
+Le dossier est d'abord converti en dictionnaire versionné (champ "schema"), puis
+encodé en JSON (échange) ou dans un format binaire compact (stockage en masse).
+Les dictionnaires d'anciennes versions du schéma sont migrés au chargement.
+
+Le format binaire regroupe toutes les chaînes dans une table (chaque chaîne n'est
+stockée qu'une fois) et encode les colonnes de scores d'un bloc : listes de chaînes
+en références 32 bits, listes de nombres en réels 64 bits. Le contenu peut en outre
+être compressé (zlib), au prix d'un encodage un peu plus lent.
+"""
+
+import json
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import dataclass, field
+from itertools import accumulate
+from typing import Any, Callable, Dict, List, Tuple
+
+from models.patient import Patient, Anamnese
+from models.scores import ScoreManager
+from config.constants import TYPES_ECHELLES
+
+
+# Version courante du schéma des dossiers
+SCHEMA_VERSION = 2
+
+ENTETE_BINAIRE = b"NPSY"
+
+# Indicateurs suivant l'en-tête binaire
+_BRUT, _COMPRESSE = 0, 1
+
+# Étiquettes du format binaire
+_AUCUN, _VRAI, _FAUX, _ENTIER, _REEL, _TEXTE, _LISTE, _DICT, _TEXTES, _NOMBRES = range(10)
+
+# Référence de chaîne absente (None) dans une liste de chaînes
+_SANS_CHAINE = 0xFFFFFFFF
+
+# Nature des éléments d'une liste de nombres
+_NOMBRE_AUCUN, _NOMBRE_ENTIER, _NOMBRE_REEL = range(3)
+
+# Entiers représentables exactement par un réel 64 bits
+_ENTIER_EXACT = 2 ** 53
+
+# Types des éléments des listes encodées d'un bloc
+_TYPES_TEXTES = {str, type(None)}
+_TYPES_NOMBRES = {int, float, type(None)}
+
+_PETIT_BOUTISTE = sys.byteorder == "little"
+
+
+@dataclass
+class Case:
+    """Dossier complet : patient, anamnèse et gestionnaires de scores par batterie."""
+
+    patient: Patient = field(default_factory=Patient)
+    anamnese: Anamnese = field(default_factory=Anamnese)
+    managers: Dict[str, ScoreManager] = field(default_factory=dict)
+
+
+def case_to_dict(case: Case) -> Dict[str, Any]:
+    """Convertit un dossier en dictionnaire de la version courante du schéma."""
+    return {
+        "schema": SCHEMA_VERSION,
+        "patient": case.patient.to_dict(),
+        "anamnese": case.anamnese.to_dict(),
+        "managers": {cle: manager.to_dict() for cle, manager in case.managers.items()}
+    }
+
+
+def case_from_dict(donnees: Dict[str, Any]) -> Case:
+    """
+    Reconstruit un dossier, après migration éventuelle vers la version courante du schéma.
+
+    Raises:
+        ValueError: Si la version du schéma est inconnue ou les données incomplètes
+    """
+    donnees = migrate(donnees)
+    try:
+        return Case(
+            Patient.from_dict(donnees["patient"]),
+            Anamnese.from_dict(donnees["anamnese"]),
+            {cle: ScoreManager.from_dict(manager) for cle, manager in donnees["managers"].items()}
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Dossier invalide : {e}") from None
+
+
+def dumps_json(case: Case) -> str:
+    """Encode un dossier en JSON."""
+    return json.dumps(case_to_dict(case), ensure_ascii=False, separators=(",", ":"))
+
+
+def loads_json(texte: str) -> Case:
+    """Décode un dossier encodé en JSON."""
+    try:
+        donnees = json.loads(texte)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Dossier invalide : {e}") from None
+    return case_from_dict(donnees)
+
+
+def dumps_binary(case: Case, compression: bool = False) -> bytes:
+    """Encode un dossier dans le format binaire compact (compressé si demandé)."""
+    return encode_binary(case_to_dict(case), compression)
+
+
+def loads_binary(donnees: bytes) -> Case:
+    """Décode un dossier encodé dans le format binaire compact."""
+    return case_from_dict(decode_binary(donnees))
+
+
+# Migrations du schéma : version -> conversion vers la version suivante
+_MIGRATIONS: Dict[int, Callable[[Dict[str, Any]], Dict[str, Any]]] = {}
+
+
+def _migration(version: int):
+    def enregistrer(fonction):
+        _MIGRATIONS[version] = fonction
+        return fonction
+    return enregistrer
+
+
+def migrate(donnees: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Migre un dictionnaire de dossier vers la version courante du schéma.
+
+    Un dictionnaire sans champ "schema" est de version 1.
+    """
+    version = donnees.get("schema", 1)
+
+    while version != SCHEMA_VERSION:
+        if version not in _MIGRATIONS:
+            raise ValueError(f"Version de schéma inconnue : {version}")
+        donnees = _MIGRATIONS[version](donnees)
+        version = donnees["schema"]
+
+    return donnees
+
+
+@_migration(1)
+def _migrer_v1(donnees: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Version 1 : gestionnaires au format de l'ancien ScoreManager.to_dict (scores valides
+    seulement, sans type, domaine ni informateur) ; patient et anamnèse facultatifs.
+
+    Le type de chaque score est déduit de son échelle (TYPES_ECHELLES).
+    """
+    # Import différé : le moteur de recommandations (numpy) n'est chargé que pour les anciens dossiers
+    from utils.recommendations import famille_batterie
+
+    managers = {}
+
+    for cle, manager in donnees.get("managers", {}).items():
+        famille = famille_batterie(cle)
+        scores = manager.get("scores", {})
+        noms = list(scores)
+        inconnues = [nom for nom in noms if (famille, nom) not in TYPES_ECHELLES]
+        if inconnues:
+            raise ValueError(f"Dossier invalide : type de score inconnu pour {cle} / {', '.join(inconnues)}")
+
+        managers[cle] = {
+            "nom_test": manager["nom_test"],
+            "informateur": "",
+            "scores": {
+                "nom": noms,
+                "valeur": [scores[nom]["valeur"] for nom in noms],
+                "type_score": [TYPES_ECHELLES[(famille, nom)] for nom in noms],
+                "domaine": ["" for _ in noms],
+                "percentile": [scores[nom].get("percentile") for nom in noms],
+                "classification": [scores[nom].get("classification", "") for nom in noms],
+                "interpretation": [scores[nom].get("interpretation", "") for nom in noms]
+            }
+        }
+
+    return {
+        "schema": 2,
+        "patient": donnees.get("patient") or Patient().to_dict(),
+        "anamnese": donnees.get("anamnese") or Anamnese().to_dict(),
+        "managers": managers
+    }
+
+
+def encode_binary(valeur: Any, compression: bool = False) -> bytes:
+    """
+    Encode une valeur JSON (None, booléens, nombres, chaînes, listes, dictionnaires).
+
+    Args:
+        valeur: Valeur à encoder
+        compression: Compresse le contenu (environ quatre fois plus petit pour un dossier)
+
+    Raises:
+        ValueError: Si la valeur contient un type non pris en charge
+    """
+    chaines: Dict[str, int] = {}
+    morceaux: List[bytes] = []
+    _encoder(valeur, morceaux, chaines)
+
+    longueurs = array("I", map(len, chaines))
+    table = "".join(chaines).encode("utf-8")
+
+    contenu = b"".join([
+        struct.pack("<I", len(longueurs)), _octets(longueurs),
+        struct.pack("<I", len(table)), table,
+        *morceaux
+    ])
+
+    if compression:
+        return ENTETE_BINAIRE + bytes((_COMPRESSE,)) + zlib.compress(contenu, 1)
+    return ENTETE_BINAIRE + bytes((_BRUT,)) + contenu
+
+
+def decode_binary(donnees: bytes) -> Any:
+    """
+    Décode une valeur encodée par encode_binary.
+
+    Raises:
+        ValueError: Si les données sont tronquées ou ne sont pas au format attendu
+    """
+    if donnees[:len(ENTETE_BINAIRE)] != ENTETE_BINAIRE or len(donnees) <= len(ENTETE_BINAIRE):
+        raise ValueError("Dossier invalide : en-tête binaire absent")
+
+    try:
+        indicateur = donnees[len(ENTETE_BINAIRE)]
+        donnees = donnees[len(ENTETE_BINAIRE) + 1:]
+        if indicateur == _COMPRESSE:
+            decompression = zlib.decompressobj()
+            donnees = decompression.decompress(donnees)
+            if not decompression.eof:
+                raise ValueError("fichier tronqué")
+            if decompression.unused_data:
+                raise ValueError("données superflues")
+        elif indicateur != _BRUT:
+            raise ValueError(f"indicateur inconnu {indicateur}")
+
+        position = 0
+        (n_chaines,) = struct.unpack_from("<I", donnees, position)
+        longueurs = _tableau("I", _champ(donnees, position + 4, 4 * n_chaines))
+        position += 4 + 4 * n_chaines
+
+        (taille,) = struct.unpack_from("<I", donnees, position)
+        table = _champ(donnees, position + 4, taille).decode("utf-8")
+        position += 4 + taille
+
+        fins = list(accumulate(longueurs))
+        chaines = [table[fin - longueur:fin] for fin, longueur in zip(fins, longueurs)]
+
+        valeur, position = _decoder(donnees, position, chaines)
+    except struct.error:
+        # Champ de taille fixe lu au-delà de la fin des données
+        raise ValueError("Dossier invalide : fichier tronqué") from None
+    except (IndexError, ValueError, zlib.error) as e:
+        raise ValueError(f"Dossier invalide : {e}") from None
+
+    if position != len(donnees):
+        raise ValueError("Dossier invalide : données superflues")
+
+    return valeur
+
+
+def _encoder(valeur: Any, morceaux: List[bytes], chaines: Dict[str, int]) -> None:
+    type_valeur = type(valeur)
+
+    if valeur is None:
+        morceaux.append(bytes((_AUCUN,)))
+    elif type_valeur is bool:
+        morceaux.append(bytes((_VRAI if valeur else _FAUX,)))
+    elif type_valeur is int:
+        morceaux.append(struct.pack("<Bq", _ENTIER, valeur))
+    elif type_valeur is float:
+        morceaux.append(struct.pack("<Bd", _REEL, valeur))
+    elif type_valeur is str:
+        morceaux.append(struct.pack("<BI", _TEXTE, chaines.setdefault(valeur, len(chaines))))
+    elif type_valeur is dict:
+        morceaux.append(struct.pack("<BI", _DICT, len(valeur)))
+        for cle, element in valeur.items():
+            if type(cle) is not str:
+                raise ValueError(f"Clé non sérialisable : {cle!r}")
+            morceaux.append(struct.pack("<I", chaines.setdefault(cle, len(chaines))))
+            _encoder(element, morceaux, chaines)
+    elif type_valeur is list:
+        types = set(map(type, valeur))
+        if valeur and types <= _TYPES_TEXTES:
+            references = array("I", [_SANS_CHAINE if e is None else chaines.setdefault(e, len(chaines))
+                                     for e in valeur])
+            morceaux.append(struct.pack("<BI", _TEXTES, len(valeur)))
+            morceaux.append(_octets(references))
+        elif valeur and types <= _TYPES_NOMBRES and (
+                int not in types or all(-_ENTIER_EXACT <= e <= _ENTIER_EXACT for e in valeur if type(e) is int)):
+            natures = bytes(_NOMBRE_AUCUN if e is None else _NOMBRE_ENTIER if type(e) is int else _NOMBRE_REEL
+                            for e in valeur)
+            nombres = array("d", [0.0 if e is None else e for e in valeur])
+            morceaux.append(struct.pack("<BI", _NOMBRES, len(valeur)))
+            morceaux.append(natures)
+            morceaux.append(_octets(nombres))
+        else:
+            morceaux.append(struct.pack("<BI", _LISTE, len(valeur)))
+            for element in valeur:
+                _encoder(element, morceaux, chaines)
+    else:
+        raise ValueError(f"Type non sérialisable : {type_valeur.__name__}")
+
+
+def _decoder(donnees: bytes, position: int, chaines: List[str]) -> Tuple[Any, int]:
+    if position >= len(donnees):
+        raise ValueError("fichier tronqué")
+    etiquette = donnees[position]
+    position += 1
+
+    if etiquette == _AUCUN:
+        return None, position
+    if etiquette == _VRAI:
+        return True, position
+    if etiquette == _FAUX:
+        return False, position
+    if etiquette == _ENTIER:
+        return struct.unpack_from("<q", donnees, position)[0], position + 8
+    if etiquette == _REEL:
+        return struct.unpack_from("<d", donnees, position)[0], position + 8
+    if etiquette == _TEXTE:
+        return chaines[struct.unpack_from("<I", donnees, position)[0]], position + 4
+
+    (n,) = struct.unpack_from("<I", donnees, position)
+    position += 4
+
+    if etiquette == _DICT:
+        resultat = {}
+        for _ in range(n):
+            cle = chaines[struct.unpack_from("<I", donnees, position)[0]]
+            resultat[cle], position = _decoder(donnees, position + 4, chaines)
+        return resultat, position
+    if etiquette == _LISTE:
+        resultat = []
+        for _ in range(n):
+            element, position = _decoder(donnees, position, chaines)
+            resultat.append(element)
+        return resultat, position
+    if etiquette == _TEXTES:
+        references = _tableau("I", _champ(donnees, position, 4 * n))
+        return [None if r == _SANS_CHAINE else chaines[r] for r in references], position + 4 * n
+    if etiquette == _NOMBRES:
+        natures = _champ(donnees, position, n)
+        nombres = _tableau("d", _champ(donnees, position + n, 8 * n))
+        return [
+            None if nature == _NOMBRE_AUCUN else int(nombre) if nature == _NOMBRE_ENTIER else nombre
+            for nature, nombre in zip(natures, nombres)
+        ], position + 9 * n
+
+    raise ValueError(f"étiquette inconnue {etiquette}")
+
+
+def _champ(donnees: bytes, position: int, taille: int) -> bytes:
+    """Champ de `taille` octets à `position`, dont la longueur annoncée doit tenir dans les données."""
+    if position + taille > len(donnees):
+        raise ValueError("fichier tronqué")
+    return donnees[position:position + taille]
+
+
+def _octets(tableau: array) -> bytes:
+    """Octets d'un tableau en petit-boutiste."""
+    if not _PETIT_BOUTISTE:
+        tableau = array(tableau.typecode, tableau)
+        tableau.byteswap()
+    return tableau.tobytes()
+
+
+def _tableau(code: str, octets: bytes) -> array:
+    """Tableau lu depuis des octets en petit-boutiste."""
+    tableau = array(code)
+    tableau.frombytes(octets)
+    if not _PETIT_BOUTISTE:
+        tableau.byteswap()
+    return tableau
@@ -0,0 +1,260 @@
+"""
+Recherche de profils similaires parmi les évaluations enregistrées.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from models.scores import ScoreManager
+from models.profile import UnifiedProfile, CODES_TYPES, MOYENNES_TYPES, ECARTS_TYPES, SENS_TYPES
+from utils.case_store import CaseStore
+from config.constants import (
+    WISC_V_STRUCTURE,
+    KABC_II_STRUCTURE,
+    TEACH_STRUCTURE,
+    NEPSY_II_STRUCTURE,
+    BROWN_ECHELLES,
+    CONNERS_3_ECHELLES,
+    CONNERS_3_INFORMATEURS
+)
+
+
+# Dimensions de l'espace des profils : une par (batterie, échelle)
+# Les informateurs Conners-3 supplémentaires (clés "conners_N") partagent le bloc "conners_autres"
+DIMENSIONS_SIMILARITE = (
+    [("wisc_v", idx) for idx in WISC_V_STRUCTURE]
+    + [("wisc_v", f"{idx}_{subtest}") for idx, info in WISC_V_STRUCTURE.items() for subtest in info['subtests']]
+    + [("kabc_ii", idx) for idx in KABC_II_STRUCTURE]
+    + [("teach", subtest) for subtests in TEACH_STRUCTURE.values() for subtest in subtests]
+    + [("nepsy_ii", subtest) for subtests in NEPSY_II_STRUCTURE.values() for subtest in subtests]
+    + [("brown", echelle) for echelle in BROWN_ECHELLES]
+    + [("conners_parent", echelle) for echelle in CONNERS_3_ECHELLES]
+    + [("conners_teacher", echelle) for echelle in CONNERS_3_ECHELLES]
+    + [("conners_autres", echelle) for echelle in CONNERS_3_ECHELLES]
+)
+
+_POSITIONS = {dimension: i for i, dimension in enumerate(DIMENSIONS_SIMILARITE)}
+_CODES_VALEURS = {score_type.value: code for score_type, code in CODES_TYPES.items()}
+
+# Les scores z orientés sont bornés pour limiter le poids des valeurs extrêmes
+BORNE_Z = 4.0
+
+# Nombre minimal d'échelles communes pour comparer deux profils
+MIN_ECHELLES_COMMUNES = 3
+
+# Nombre de lignes de l'index traitées par bloc lors d'une requête
+TAILLE_BLOC = 32768
+
+
+@dataclass
+class SimilarCase:
+    """Évaluation proche d'un profil de référence."""
+
+    evaluation_id: int
+    distance: float
+    n_communes: int
+
+
+def _positions(batteries: Iterable[str], noms: Iterable[str]) -> np.ndarray:
+    """Dimension de chaque score (-1 si son échelle n'appartient pas à l'espace des profils)."""
+    return np.array([
+        _POSITIONS.get(
+            ("conners_autres", nom)
+            if batterie.startswith("conners_") and batterie not in CONNERS_3_INFORMATEURS
+            else (batterie, nom),
+            -1
+        )
+        for batterie, nom in zip(batteries, noms)
+    ], dtype=np.intp)
+
+
+def embed_managers(managers: Dict[str, ScoreManager]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Projette les scores d'une évaluation dans l'espace des profils.
+
+    Les informateurs Conners-3 supplémentaires sont regroupés : chaque échelle du bloc
+    "conners_autres" reçoit la moyenne de leurs scores z.
+
+    Returns:
+        Tuple (vecteur, masque) : scores z orientés bornés (0 si absent) et masque des échelles renseignées
+    """
+    profil = UnifiedProfile.from_managers(managers)
+    positions = _positions(profil.batteries, profil.noms)
+    connues = positions >= 0
+
+    somme = np.zeros(len(DIMENSIONS_SIMILARITE), dtype=np.float32)
+    effectif = np.zeros(len(DIMENSIONS_SIMILARITE), dtype=np.float32)
+    np.add.at(somme, positions[connues], np.clip(profil.z_oriente[connues], -BORNE_Z, BORNE_Z))
+    np.add.at(effectif, positions[connues], 1.0)
+
+    masque = (effectif > 0).astype(np.float32)
+    return somme / np.maximum(effectif, 1.0), masque
+
+
+class SimilarityIndex:
+    """
+    Index des profils pour la recherche des k plus proches voisins.
+
+    Les profils sont stockés dans une matrice contiguë (une ligne par évaluation) avec
+    leur masque d'échelles renseignées. La distance entre deux profils est la racine
+    de l'écart quadratique moyen sur leurs échelles communes ; elle est calculée par
+    blocs de lignes en produits matriciels. L'index se met à jour incrémentalement.
+    """
+
+    def __init__(self, capacite: int = 1024):
+        d = len(DIMENSIONS_SIMILARITE)
+        self._x = np.zeros((capacite, d), dtype=np.float32)
+        self._x2 = np.zeros((capacite, d), dtype=np.float32)
+        self._m = np.zeros((capacite, d), dtype=np.float32)
+        self._ids = np.full(capacite, -1, dtype=np.int64)
+        self._n = 0
+        self._lignes: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._lignes)
+
+    @classmethod
+    def from_store(cls, store: CaseStore, taille_lot: int = 5000) -> "SimilarityIndex":
+        """
+        Construit l'index à partir de l'historique et l'abonne aux nouveaux enregistrements.
+
+        Args:
+            store: Historique des évaluations
+            taille_lot: Nombre d'évaluations lues par lot
+
+        Returns:
+            Index contenant toutes les évaluations enregistrées
+        """
+        index = cls()
+        colonnes = ("evaluation_id", "batterie", "nom", "type_score", "valeur")
+
+        for lot in store.iter_score_chunks(taille_lot, colonnes=colonnes):
+            evaluation_ids, batteries, noms, types, valeurs = zip(*lot)
+            ids, lignes = np.unique(np.array(evaluation_ids, dtype=np.int64), return_inverse=True)
+            positions = _positions(batteries, noms)
+            codes = np.array([_CODES_VALEURS[t] for t in types], dtype=np.intp)
+            z = (np.array(valeurs, dtype=np.float64) - MOYENNES_TYPES[codes]) / ECARTS_TYPES[codes] * SENS_TYPES[codes]
+
+            connues = positions >= 0
+            cellules = (lignes[connues], positions[connues])
+            x = np.zeros((len(ids), len(DIMENSIONS_SIMILARITE)), dtype=np.float32)
+            effectif = np.zeros_like(x)
+            np.add.at(x, cellules, np.clip(z[connues], -BORNE_Z, BORNE_Z))
+            np.add.at(effectif, cellules, 1.0)
+
+            index.add_batch(ids, x / np.maximum(effectif, 1.0), (effectif > 0).astype(np.float32))
+
+        store.add_listener(index._on_save)
+
+        return index
+
+    def add(self, evaluation_id: int, vecteur: np.ndarray, masque: np.ndarray) -> None:
+        """Ajoute ou remplace le profil d'une évaluation."""
+        self.add_batch(np.array([evaluation_id]), vecteur[None, :], masque[None, :])
+
+    def add_batch(self, ids: np.ndarray, vecteurs: np.ndarray, masques: np.ndarray) -> None:
+        """Ajoute ou remplace les profils de plusieurs évaluations."""
+        with self._lock:
+            for evaluation_id in ids.tolist():
+                if evaluation_id not in self._lignes:
+                    if self._n == len(self._ids):
+                        self._agrandir()
+                    self._lignes[evaluation_id] = self._n
+                    self._ids[self._n] = evaluation_id
+                    self._n += 1
+
+            # Lignes lues après les ajouts : un agrandissement en cours de lot renumérote les lignes
+            lignes = np.fromiter((self._lignes[evaluation_id] for evaluation_id in ids.tolist()),
+                                 dtype=np.intp, count=len(ids))
+
+            vecteurs = vecteurs * masques
+            self._x[lignes] = vecteurs
+            self._x2[lignes] = vecteurs * vecteurs
+            self._m[lignes] = masques
+
+    def remove(self, evaluation_id: int) -> None:
+        """Retire une évaluation de l'index (la ligne est libérée au prochain agrandissement)."""
+        with self._lock:
+            ligne = self._lignes.pop(evaluation_id, None)
+            if ligne is not None:
+                self._ids[ligne] = -1
+                self._x[ligne] = 0
+                self._x2[ligne] = 0
+                self._m[ligne] = 0
+
+    def query(self, vecteur: np.ndarray, masque: np.ndarray, k: int = 5,
+              exclure: Iterable[int] = ()) -> List[SimilarCase]:
+        """
+        Recherche les k évaluations les plus proches d'un profil.
+
+        Args:
+            vecteur: Profil de référence (embed_managers)
+            masque: Échelles renseignées du profil de référence
+            k: Nombre de voisins recherchés
+            exclure: Identifiants d'évaluations à ignorer (ex: évaluations du même patient)
+
+        Returns:
+            Voisins triés par distance croissante
+        """
+        q = (vecteur * masque).astype(np.float32)
+        q2 = q * q
+        mq = masque.astype(np.float32)
+        exclure = np.fromiter(exclure, dtype=np.int64)
+
+        candidats_ids = []
+        candidats_dist = []
+        candidats_n = []
+
+        with self._lock:
+            for debut in range(0, self._n, TAILLE_BLOC):
+                fin = min(debut + TAILLE_BLOC, self._n)
+                ids = self._ids[debut:fin]
+
+                n = self._m[debut:fin] @ mq
+                somme = self._x2[debut:fin] @ mq - 2 * (self._x[debut:fin] @ q) + self._m[debut:fin] @ q2
+                valides = (n >= MIN_ECHELLES_COMMUNES) & (ids >= 0) & ~np.isin(ids, exclure)
+                distances = np.where(valides, np.sqrt(np.maximum(somme, 0) / np.maximum(n, 1)), np.inf)
+
+                meilleurs = np.argpartition(distances, k - 1)[:k] if len(distances) > k else np.arange(len(distances))
+                meilleurs = meilleurs[np.isfinite(distances[meilleurs])]
+
+                candidats_ids.append(ids[meilleurs])
+                candidats_dist.append(distances[meilleurs])
+                candidats_n.append(n[meilleurs])
+
+        if not candidats_ids:
+            return []
+
+        ids = np.concatenate(candidats_ids)
+        distances = np.concatenate(candidats_dist)
+        n = np.concatenate(candidats_n)
+        ordre = np.argsort(distances, kind="stable")[:k]
+
+        return [SimilarCase(int(ids[i]), float(distances[i]), int(n[i])) for i in ordre]
+
+    def _on_save(self, evaluation_id: int, managers: Dict[str, ScoreManager], remplace_id: Optional[int]) -> None:
+        """Met à jour l'index après l'enregistrement d'une évaluation."""
+        if remplace_id is not None:
+            self.remove(remplace_id)
+        self.add(evaluation_id, *embed_managers(managers))
+
+    def _agrandir(self) -> None:
+        """Double la capacité de l'index en compactant les lignes libérées."""
+        actives = np.flatnonzero(self._ids[:self._n] >= 0)
+        capacite = max(2 * len(actives), 1024)
+
+        for nom in ("_x", "_x2", "_m"):
+            ancien = getattr(self, nom)
+            nouveau = np.zeros((capacite, ancien.shape[1]), dtype=ancien.dtype)
+            nouveau[:len(actives)] = ancien[actives]
+            setattr(self, nom, nouveau)
+
+        ids = np.full(capacite, -1, dtype=np.int64)
+        ids[:len(actives)] = self._ids[actives]
+        self._ids = ids
+        self._n = len(actives)
+        self._lignes = {int(evaluation_id): ligne for ligne, evaluation_id in enumerate(ids[:self._n])}
@@ -0,0 +1,282 @@
+"""
+Modèles de rapport personnalisables par le clinicien.
+
+Un modèle est un texte Markdown contenant des balises Jinja2, rendu avec les
+données calculées par le moteur sémantique (scores, profil, recommandations,
+sections du rapport standard). Les modèles sont exécutés dans un environnement
+isolé (sandbox) : ils ne peuvent ni lire de fichiers ni appeler de code arbitraire.
+
+Un modèle est validé et compilé une seule fois : les modèles compilés sont mis en
+cache selon l'empreinte de leur contenu, un lot de rapports rendus avec le même
+modèle ne l'analyse donc qu'une fois. Le cache est borné : les versions successives
+d'un modèle modifié ne s'accumulent pas dans un processus de longue durée.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from jinja2 import StrictUndefined, Template, TemplateError, TemplateSyntaxError, meta, nodes
+from jinja2.sandbox import SandboxedEnvironment
+
+from models.scores import Score
+from utils.document import Document
+from utils.renderers import render_document
+from utils.report_registry import REGISTRE_SECTIONS, SectionRegistry
+from config.constants import LANGUE_DEFAUT
+from config.settings import DOSSIER_TEMPLATES
+
+
+# Variables disponibles dans un modèle
+VARIABLES_TEMPLATE = {
+    "patient": "Informations patient (nom, prenom, classe, ecole, ...)",
+    "anamnese": "Données anamnestiques (motif_consultation, comportement, ...)",
+    "age": "Âge à l'examen (ou rien si inconnu)",
+    "date_naissance": "Date de naissance formatée",
+    "date_examen": "Date d'examen formatée",
+    "langue": "Code de la langue du rapport",
+    "t": "Traduction d'une phrase française dans la langue du rapport : {{ t(\"...\") }}",
+    "scores": "Scores valides par batterie : scores.wisc_v, scores.teach, ...",
+    "forces": "Points forts du profil (scores)",
+    "fragilites": "Fragilités du profil (scores)",
+    "recommandations": "Recommandations, par priorité décroissante",
+    "heterogeneite": "Analyse d'homogénéité WISC-V (ou rien)",
+    "sections": "Sections du rapport standard en Markdown : {{ sections.intellectuel }}",
+    "sections_actives": "Clés des sections du rapport standard applicables, dans l'ordre",
+}
+
+# Modèle reproduisant le rapport standard
+TEMPLATE_STANDARD = """{% for cle in sections_actives %}
+{{ sections[cle] }}
+
+{% endfor %}
+"""
+
+_NOM_TEMPLATE = re.compile(r"^[\w\- ]{1,64}$")
+_EXTENSION = ".md.j2"
+
+_ENVIRONNEMENT = SandboxedEnvironment(
+    undefined=StrictUndefined,
+    autoescape=False,  # Sortie Markdown
+    trim_blocks=True,
+    lstrip_blocks=True,
+    keep_trailing_newline=True
+)
+
+# Nombre de modèles compilés conservés (les moins récemment utilisés sont oubliés)
+TAILLE_CACHE_MODELES = 32
+
+_CACHE: "OrderedDict[str, ReportTemplate]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ReportTemplate:
+    """Modèle de rapport validé et compilé."""
+
+    empreinte: str  # SHA-256 du contenu
+    source: str
+    sections: frozenset  # Sections du rapport standard citées par le modèle
+    _template: Template = field(repr=False, compare=False)
+
+    def render(self, engine, langue: str = LANGUE_DEFAUT) -> str:
+        """
+        Rend le modèle avec les données d'un moteur de rapport.
+
+        Les analyses déjà calculées par le moteur sont réutilisées ; seules les
+        sections référencées par le modèle sont rédigées.
+
+        Raises:
+            ValueError: Si le rendu échoue (donnée absente, opération interdite)
+        """
+        with engine.redaction(langue):
+            try:
+                return self._template.render(_contexte(engine, langue))
+            except TemplateError as e:
+                raise ValueError(f"Erreur lors du rendu du modèle : {e}") from None
+
+    def document(self, engine, langue: str = LANGUE_DEFAUT) -> Document:
+        """Rend le modèle puis le convertit en document (tous formats de téléchargement)."""
+        return Document.from_markdown(self.render(engine, langue), langue)
+
+
+def compile_template(source: str, registre: Optional[SectionRegistry] = None) -> ReportTemplate:
+    """
+    Valide et compile un modèle, ou le retourne depuis le cache.
+
+    Args:
+        source: Contenu du modèle
+        registre: Registre des sections référencées (REGISTRE_SECTIONS par défaut)
+
+    Returns:
+        Modèle compilé
+
+    Raises:
+        ValueError: Si le modèle est syntaxiquement invalide ou référence une variable,
+            une section ou un modèle inconnus
+    """
+    registre = registre or REGISTRE_SECTIONS
+    empreinte = hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    with _CACHE_LOCK:
+        template = _CACHE.get(empreinte)
+        if template is not None:
+            _CACHE.move_to_end(empreinte)
+    if template is not None and template.sections <= _cles_sections(registre):
+        return template
+
+    try:
+        arbre = _ENVIRONNEMENT.parse(source)
+    except TemplateSyntaxError as e:
+        raise ValueError(f"Modèle invalide (ligne {e.lineno}) : {e.message}") from None
+
+    if list(meta.find_referenced_templates(arbre)):
+        raise ValueError("Modèle invalide : les inclusions et héritages de modèles ne sont pas pris en charge")
+
+    inconnues = meta.find_undeclared_variables(arbre) - set(VARIABLES_TEMPLATE)
+    if inconnues:
+        raise ValueError(f"Modèle invalide : variable(s) inconnue(s) : {', '.join(sorted(inconnues))}")
+
+    sections = _sections_referencees(arbre)
+    inconnues = sections - _cles_sections(registre)
+    if inconnues:
+        raise ValueError(f"Modèle invalide : section(s) inconnue(s) : {', '.join(sorted(inconnues))}")
+
+    template = ReportTemplate(empreinte, source, frozenset(sections), _ENVIRONNEMENT.from_string(source))
+
+    with _CACHE_LOCK:
+        _CACHE[empreinte] = template
+        _CACHE.move_to_end(empreinte)
+        while len(_CACHE) > TAILLE_CACHE_MODELES:
+            _CACHE.popitem(last=False)
+
+    return template
+
+
+def list_templates(dossier: Path = DOSSIER_TEMPLATES) -> List[str]:
+    """Noms des modèles enregistrés, par ordre alphabétique."""
+    if not dossier.exists():
+        return []
+    return sorted(chemin.name[:-len(_EXTENSION)] for chemin in dossier.glob(f"*{_EXTENSION}"))
+
+
+def load_template(nom: str, dossier: Path = DOSSIER_TEMPLATES) -> ReportTemplate:
+    """
+    Charge et compile un modèle enregistré.
+
+    Raises:
+        ValueError: Si le modèle est introuvable ou invalide
+    """
+    chemin = _chemin_template(nom, dossier)
+    if not chemin.exists():
+        raise ValueError(f"Modèle introuvable : {nom}")
+    return compile_template(chemin.read_text(encoding="utf-8"))
+
+
+def save_template(nom: str, source: str, dossier: Path = DOSSIER_TEMPLATES) -> ReportTemplate:
+    """
+    Valide puis enregistre un modèle (un modèle invalide n'est jamais enregistré).
+
+    Returns:
+        Modèle compilé
+
+    Raises:
+        ValueError: Si le nom ou le modèle est invalide
+    """
+    template = compile_template(source)
+    chemin = _chemin_template(nom, dossier)
+    chemin.parent.mkdir(parents=True, exist_ok=True)
+    chemin.write_text(source, encoding="utf-8")
+    return template
+
+
+def _chemin_template(nom: str, dossier: Path) -> Path:
+    if not _NOM_TEMPLATE.match(nom):
+        raise ValueError(f"Nom de modèle invalide : {nom}")
+    return dossier / f"{nom}{_EXTENSION}"
+
+
+def _cles_sections(registre: SectionRegistry) -> frozenset:
+    return frozenset(section.cle for section in registre.sections())
+
+
+def _sections_referencees(arbre: nodes.Template) -> set:
+    """Clés de sections citées littéralement (sections.cle ou sections["cle"])."""
+    cles = set()
+
+    for noeud in arbre.find_all((nodes.Getattr, nodes.Getitem)):
+        if not (isinstance(noeud.node, nodes.Name) and noeud.node.name == "sections"):
+            continue
+        if isinstance(noeud, nodes.Getattr):
+            cles.add(noeud.attr)
+        elif isinstance(noeud.arg, nodes.Const) and isinstance(noeud.arg.value, str):
+            cles.add(noeud.arg.value)
+
+    return cles
+
+
+class _SectionsTemplate(Mapping):
+    """Sections du rapport standard, rédigées à la première lecture (Markdown)."""
+
+    def __init__(self, engine, langue: str):
+        self._engine = engine
+        self._langue = langue
+        self._cles = [section.cle for section in engine.registre.sections()]
+        self._rendus: Dict[str, str] = {}
+
+    def __getitem__(self, cle: str) -> str:
+        if cle not in self._rendus:
+            if cle not in self._cles:
+                raise KeyError(cle)
+            section = self._engine.generate_section(cle, self._langue)
+            self._rendus[cle] = render_document(Document([section]), "markdown").strip("\n") if section else ""
+        return self._rendus[cle]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._cles)
+
+    def __len__(self) -> int:
+        return len(self._cles)
+
+
+def _score_template(engine, score: Score) -> Dict[str, Any]:
+    """Données d'un score exposées aux modèles (libellés dans la langue du rapport)."""
+    return {
+        "nom": score.nom,
+        "valeur": score.valeur,
+        "classification": engine.t(score.classification),
+        "percentile": score.percentile or "",
+        "domaine": engine._domaine(score),
+        "interpretation": engine._interpretation(score),
+        "texte": engine._format_point(score)
+    }
+
+
+def _contexte(engine, langue: str) -> Dict[str, Any]:
+    """Variables d'un modèle (voir VARIABLES_TEMPLATE), calculées dans la langue courante du moteur."""
+    patient = engine.patient
+
+    return {
+        "patient": patient,
+        "anamnese": engine.anamnese,
+        "age": patient.get_age_at_exam(),
+        "date_naissance": engine._date(patient.date_naissance) if patient.date_naissance else "",
+        "date_examen": engine._date(patient.date_examen) if patient.date_examen else "",
+        "langue": langue,
+        "t": engine.t,
+        "scores": {
+            cle: [_score_template(engine, score) for score in manager.get_valid_scores()]
+            for cle, manager in engine.managers.items() if manager and manager.has_scores()
+        },
+        "forces": [_score_template(engine, score) for score in engine.donnees.get("forces")],
+        "fragilites": [_score_template(engine, score) for score in engine.donnees.get("fragilites")],
+        "recommandations": [engine.t(reco.texte) for reco in engine.donnees.get("recommandations")],
+        "heterogeneite": engine.donnees.get("heterogeneite_wisc"),
+        "sections": _SectionsTemplate(engine, langue),
+        "sections_actives": [s.cle for s in engine.registre.sections() if s.est_active(engine)],
+    }
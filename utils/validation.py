@@ -0,0 +1,190 @@
+"""
+Validation des scores avant enregistrement ou import.
+
+Tous les scores d'une évaluation sont contrôlés en une passe vectorisée : bornes
+de valeur par type de score, échelles reconnues pour chaque batterie, type de score
+attendu, et cohérence entre chaque indice et la moyenne de ses subtests.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from models.scores import ScoreManager
+from models.profile import TYPES_SCORES, CODES_TYPES, MOYENNES_TYPES, ECARTS_TYPES
+from utils.recommendations import famille_batterie
+from config.constants import TYPES_ECHELLES, INDICES_SUBTESTS, BORNES_TYPES_SCORES, SEUIL_COHERENCE_SUBTESTS
+
+
+ERREUR = "erreur"
+AVERTISSEMENT = "avertissement"
+
+_SEPARATEUR = "\x1f"
+
+# Tables des échelles connues, triées par clé « famille␟échelle » (recherche dichotomique)
+_CLES = np.array(sorted(f"{famille}{_SEPARATEUR}{nom}" for famille, nom in TYPES_ECHELLES))
+_TYPES_ATTENDUS = np.array(
+    [CODES_TYPES[next(t for t in TYPES_SCORES if t.value == TYPES_ECHELLES[tuple(cle.split(_SEPARATEUR))])]
+     for cle in _CLES],
+    dtype=np.int8
+)
+_INDICES = np.array([INDICES_SUBTESTS.get(tuple(cle.split(_SEPARATEUR)), "") for cle in _CLES], dtype=object)
+_FAMILLES = frozenset(famille for famille, _ in TYPES_ECHELLES)
+
+_BORNES = np.array([BORNES_TYPES_SCORES[t.value] for t in TYPES_SCORES], dtype=np.float64)
+
+
+@dataclass(frozen=True)
+class ValidationIssue:
+    """Problème détecté sur un score."""
+
+    batterie: str
+    echelle: str
+    code: str  # "valeur_invalide", "hors_bornes", "batterie_inconnue", "echelle_inconnue", "type_incorrect", "incoherence_indice"
+    gravite: str  # ERREUR (bloquant) ou AVERTISSEMENT
+    message: str
+    valeur: Optional[float] = None
+
+
+@dataclass
+class ValidationReport:
+    """Résultat de la validation d'un lot de scores."""
+
+    n_scores: int
+    problemes: List[ValidationIssue] = field(default_factory=list)
+
+    @property
+    def est_valide(self) -> bool:
+        """Vrai si aucun problème bloquant n'a été détecté."""
+        return not self.erreurs()
+
+    def erreurs(self) -> List[ValidationIssue]:
+        """Problèmes bloquants."""
+        return [p for p in self.problemes if p.gravite == ERREUR]
+
+    def avertissements(self) -> List[ValidationIssue]:
+        """Problèmes non bloquants."""
+        return [p for p in self.problemes if p.gravite == AVERTISSEMENT]
+
+    def par_batterie(self) -> Dict[str, List[ValidationIssue]]:
+        """Problèmes regroupés par batterie."""
+        groupes: Dict[str, List[ValidationIssue]] = {}
+        for probleme in self.problemes:
+            groupes.setdefault(probleme.batterie, []).append(probleme)
+        return groupes
+
+    def resume(self, gravite: Optional[str] = None) -> str:
+        """Résumé textuel des problèmes (une ligne par problème), éventuellement d'une seule gravité."""
+        return "\n".join(f"{p.batterie} / {p.echelle} : {p.message}"
+                         for p in self.problemes if gravite is None or p.gravite == gravite)
+
+
+def validate_managers(managers: Dict[str, Optional[ScoreManager]]) -> ValidationReport:
+    """
+    Valide les scores renseignés de plusieurs gestionnaires.
+
+    Args:
+        managers: Gestionnaires indexés par clé de batterie (wisc_v, conners_parent, ...)
+
+    Returns:
+        Rapport de validation
+    """
+    batteries, noms, types, valeurs = [], [], [], []
+
+    for cle, manager in managers.items():
+        if not manager:
+            continue
+        for score in manager.scores.values():
+            if score.is_valid():
+                batteries.append(cle)
+                noms.append(score.nom)
+                types.append(CODES_TYPES[score.type_score])
+                valeurs.append(score.valeur)
+
+    return validate_scores(batteries, noms, np.array(types, dtype=np.int8), np.array(valeurs, dtype=np.float64))
+
+
+def validate_scores(batteries: List[str], noms: List[str], types: np.ndarray, valeurs: np.ndarray) -> ValidationReport:
+    """
+    Valide un lot de scores décrit par des tableaux parallèles.
+
+    Args:
+        batteries: Clé de batterie de chaque score
+        noms: Nom d'échelle de chaque score
+        types: Codes de type de score (models.profile.CODES_TYPES)
+        valeurs: Valeurs des scores
+
+    Returns:
+        Rapport de validation (erreurs regroupées par type, puis incohérences des indices)
+    """
+    n = len(noms)
+    rapport = ValidationReport(n)
+    if n == 0:
+        return rapport
+
+    batteries = np.asarray(batteries, dtype=object)
+    noms = np.asarray(noms, dtype=object)
+    familles = np.array([famille_batterie(b) for b in batteries], dtype=object)
+
+    # Échelles connues et type attendu (recherche dichotomique dans la table triée)
+    cles = np.array([f"{f}{_SEPARATEUR}{nom}" for f, nom in zip(familles, noms)])
+    positions = np.minimum(np.searchsorted(_CLES, cles), len(_CLES) - 1)
+    connues = _CLES[positions] == cles
+    familles_connues = np.array([f in _FAMILLES for f in familles], dtype=bool)
+
+    finies = np.isfinite(valeurs)
+    hors_bornes = finies & ((valeurs < _BORNES[types, 0]) | (valeurs > _BORNES[types, 1]))
+    type_incorrect = connues & (_TYPES_ATTENDUS[positions] != types)
+
+    masques = (
+        (~finies, "valeur_invalide", lambda i: "Valeur non numérique ou infinie"),
+        (hors_bornes, "hors_bornes", lambda i: "Valeur {valeur:g} hors des bornes {min:g}-{max:g} ({type})".format(
+            valeur=valeurs[i], min=_BORNES[types[i], 0], max=_BORNES[types[i], 1], type=TYPES_SCORES[types[i]].value)),
+        (~familles_connues, "batterie_inconnue", lambda i: f"Batterie inconnue : {batteries[i]}"),
+        (familles_connues & ~connues, "echelle_inconnue", lambda i: f"Échelle inconnue pour la batterie {batteries[i]}"),
+        (type_incorrect, "type_incorrect", lambda i: "Type de score {type} au lieu de {attendu}".format(
+            type=TYPES_SCORES[types[i]].value, attendu=TYPES_SCORES[_TYPES_ATTENDUS[positions[i]]].value)),
+    )
+
+    erreurs = np.zeros(n, dtype=bool)
+    for masque, code, message in masques:
+        erreurs |= masque
+        for i in np.flatnonzero(masque):
+            rapport.problemes.append(ValidationIssue(batteries[i], noms[i], code, ERREUR, message(i),
+                                                     float(valeurs[i])))
+
+    rapport.problemes.extend(_coherence_indices(batteries, noms, types, valeurs, positions, connues & ~erreurs))
+
+    return rapport
+
+
+def _coherence_indices(batteries: np.ndarray, noms: np.ndarray, types: np.ndarray, valeurs: np.ndarray,
+                       positions: np.ndarray, valides: np.ndarray) -> List[ValidationIssue]:
+    """Compare chaque indice (score z) à la moyenne des scores z de ses subtests (au moins deux)."""
+    z = (valeurs - MOYENNES_TYPES[types]) / ECARTS_TYPES[types]
+    indices = _INDICES[positions]
+
+    subtests = valides & (indices != "")
+    if not subtests.any():
+        return []
+
+    groupes = np.array([f"{b}{_SEPARATEUR}{idx}" for b, idx in zip(batteries[subtests], indices[subtests])])
+    cles_groupes, inverse = np.unique(groupes, return_inverse=True)
+    effectifs = np.bincount(inverse)
+    moyennes = np.bincount(inverse, weights=z[subtests]) / effectifs
+
+    cles_scores = np.array([f"{b}{_SEPARATEUR}{nom}" for b, nom in zip(batteries, noms)])
+    rangs = np.minimum(np.searchsorted(cles_groupes, cles_scores), len(cles_groupes) - 1)
+    candidats = valides & (indices == "") & (cles_groupes[rangs] == cles_scores) & (effectifs[rangs] >= 2)
+    incoherents = candidats & (np.abs(z - moyennes[rangs]) > SEUIL_COHERENCE_SUBTESTS)
+
+    return [
+        ValidationIssue(
+            batteries[i], noms[i], "incoherence_indice", AVERTISSEMENT,
+            f"Indice éloigné de la moyenne de ses {effectifs[rangs[i]]} subtests "
+            f"(écart de {abs(z[i] - moyennes[rangs[i]]):.1f} écart-type)",
+            float(valeurs[i])
+        )
+        for i in np.flatnonzero(incoherents)
+    ]
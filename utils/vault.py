@@ -0,0 +1,400 @@
+"""
+Coffre chiffré des dossiers et des rapports (chiffrement authentifié AES-256-GCM).
+
+Chaque cabinet dispose d'un fichier de clé local, créé au premier usage. Les dossiers
+et rapports sont chiffrés individuellement ; leurs métadonnées (identité, date
+d'examen, batteries) sont regroupées dans un index chiffré distinct, déchiffré une
+seule fois à l'ouverture du coffre : lister ou rechercher ne déchiffre aucun dossier.
+
+Les exports volumineux sont chiffrés en flux, par blocs authentifiés successifs
+(le dernier bloc est marqué : un flux tronqué est détecté au déchiffrement).
+
+Déchiffrement d'un export en ligne de commande :
+    python -m utils.vault ENTREE SORTIE [--cle CHEMIN]
+"""
+
+import argparse
+import base64
+import json
+import os
+import secrets
+import struct
+import tempfile
+import threading
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from utils.serialization import Case, dumps_binary, loads_binary
+from config.settings import CHEMIN_CLE_CABINET, DOSSIER_COFFRE
+
+
+TAILLE_CLE = 32  # AES-256
+TAILLE_NONCE = 12
+
+# Taille des blocs des flux chiffrés (octets en clair)
+TAILLE_BLOC_FLUX = 64 * 1024
+
+ENTETE_CHIFFRE = b"NPSC\x01"
+ENTETE_FLUX = b"NPSF\x01"
+
+_TAILLE_PREFIXE_FLUX = 7  # Nonce d'un bloc : préfixe aléatoire, compteur (4 octets), indicateur de dernier bloc
+
+EXTENSION_DOSSIER = ".case"
+EXTENSION_RAPPORT = ".rapport"
+NOM_INDEX = "index.npsc"
+
+
+def load_key(chemin: Path = CHEMIN_CLE_CABINET) -> bytes:
+    """
+    Charge la clé du cabinet, en la créant au premier usage (fichier lisible par son seul propriétaire).
+
+    Raises:
+        ValueError: Si le fichier de clé est invalide
+    """
+    if not chemin.exists():
+        chemin.parent.mkdir(parents=True, exist_ok=True)
+        cle = AESGCM.generate_key(bit_length=TAILLE_CLE * 8)
+        try:
+            descripteur = os.open(chemin, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            # Clé créée entre-temps par une autre session
+            return load_key(chemin)
+        with os.fdopen(descripteur, "w", encoding="ascii") as fichier:
+            fichier.write(base64.b64encode(cle).decode("ascii") + "\n")
+        return cle
+
+    try:
+        cle = base64.b64decode(chemin.read_text(encoding="ascii").strip(), validate=True)
+    except ValueError:
+        cle = b""
+    if len(cle) != TAILLE_CLE:
+        raise ValueError(f"Fichier de clé invalide : {chemin}")
+    return cle
+
+
+def write_atomic(chemin: Path, donnees: bytes) -> None:
+    """
+    Écrit un fichier temporaire puis le renomme : le fichier n'est jamais partiellement écrit.
+
+    Le fichier temporaire porte un nom unique : plusieurs processus peuvent écrire le
+    même fichier simultanément (la dernière écriture l'emporte).
+    """
+    descripteur, temporaire = tempfile.mkstemp(prefix=f"{chemin.name}.", suffix=".tmp", dir=chemin.parent)
+    try:
+        with os.fdopen(descripteur, "wb") as fichier:
+            fichier.write(donnees)
+            fichier.flush()
+            os.fsync(fichier.fileno())
+        os.replace(temporaire, chemin)
+    except BaseException:
+        os.unlink(temporaire)
+        raise
+
+
+class ClinicCipher:
+    """Chiffrement authentifié avec la clé du cabinet."""
+
+    def __init__(self, cle: bytes):
+        if len(cle) != TAILLE_CLE:
+            raise ValueError(f"La clé doit comporter {TAILLE_CLE} octets")
+        self._aead = AESGCM(cle)
+
+    def encrypt(self, donnees: bytes, contexte: bytes = b"") -> bytes:
+        """
+        Chiffre des données.
+
+        Args:
+            donnees: Données en clair
+            contexte: Données associées authentifiées (ex: identifiant du dossier) ;
+                le même contexte est exigé au déchiffrement
+        """
+        nonce = secrets.token_bytes(TAILLE_NONCE)
+        return ENTETE_CHIFFRE + nonce + self._aead.encrypt(nonce, donnees, ENTETE_CHIFFRE + contexte)
+
+    def decrypt(self, donnees: bytes, contexte: bytes = b"") -> bytes:
+        """
+        Déchiffre des données chiffrées par encrypt.
+
+        Raises:
+            ValueError: Si les données ont été altérées, ou chiffrées avec une autre clé ou un autre contexte
+        """
+        debut = len(ENTETE_CHIFFRE)
+        if donnees[:debut] != ENTETE_CHIFFRE:
+            raise ValueError("Données chiffrées invalides")
+        try:
+            return self._aead.decrypt(donnees[debut:debut + TAILLE_NONCE], donnees[debut + TAILLE_NONCE:],
+                                      ENTETE_CHIFFRE + contexte)
+        except InvalidTag:
+            raise ValueError("Données chiffrées altérées ou clé incorrecte") from None
+
+    def encrypt_stream(self, destination: BinaryIO, contexte: bytes = b"") -> "EncryptedWriter":
+        """Ouvre un flux chiffré vers un fichier binaire (à fermer pour écrire le dernier bloc)."""
+        return EncryptedWriter(self._aead, destination, contexte)
+
+    def decrypt_stream(self, source: BinaryIO, contexte: bytes = b"") -> Iterator[bytes]:
+        """
+        Déchiffre un flux écrit par encrypt_stream, bloc par bloc.
+
+        Raises:
+            ValueError: Si le flux a été altéré, tronqué ou chiffré avec une autre clé
+        """
+        entete = source.read(len(ENTETE_FLUX) + _TAILLE_PREFIXE_FLUX)
+        if entete[:len(ENTETE_FLUX)] != ENTETE_FLUX or len(entete) != len(ENTETE_FLUX) + _TAILLE_PREFIXE_FLUX:
+            raise ValueError("Flux chiffré invalide")
+        prefixe = entete[len(ENTETE_FLUX):]
+
+        compteur = 0
+        bloc = _lire_bloc(source)
+        while bloc is not None:
+            suivant = _lire_bloc(source)
+            dernier = suivant is None
+            try:
+                yield self._aead.decrypt(_nonce_flux(prefixe, compteur, dernier), bloc, ENTETE_FLUX + contexte)
+            except InvalidTag:
+                raise ValueError("Flux chiffré altéré, tronqué ou clé incorrecte") from None
+            compteur += 1
+            bloc = suivant
+
+
+class EncryptedWriter:
+    """Écriture d'un flux chiffré par blocs de TAILLE_BLOC_FLUX octets (utilisable avec `with`)."""
+
+    def __init__(self, aead: AESGCM, destination: BinaryIO, contexte: bytes = b""):
+        self._aead = aead
+        self._destination = destination
+        self._contexte = ENTETE_FLUX + contexte
+        self._prefixe = secrets.token_bytes(_TAILLE_PREFIXE_FLUX)
+        self._compteur = 0
+        self._tampon = bytearray()
+        self._position = 0
+        self._ferme = False
+        destination.write(ENTETE_FLUX + self._prefixe)
+
+    @property
+    def closed(self) -> bool:
+        return self._ferme
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        """Nombre d'octets en clair écrits."""
+        return self._position
+
+    def flush(self) -> None:
+        """Sans effet : seuls des blocs complets sont écrits avant la fermeture."""
+
+    def write(self, donnees: bytes) -> int:
+        """Ajoute des données en clair au flux."""
+        if self._ferme:
+            raise ValueError("Flux chiffré fermé")
+        self._tampon += donnees
+        self._position += len(donnees)
+        # Un bloc plein n'est écrit qu'une fois suivi de données : le dernier bloc reste en tampon
+        while len(self._tampon) > TAILLE_BLOC_FLUX:
+            self._ecrire_bloc(bytes(self._tampon[:TAILLE_BLOC_FLUX]), dernier=False)
+            del self._tampon[:TAILLE_BLOC_FLUX]
+        return len(donnees)
+
+    def close(self) -> None:
+        """Écrit le dernier bloc (éventuellement vide)."""
+        if not self._ferme:
+            self._ecrire_bloc(bytes(self._tampon), dernier=True)
+            self._tampon.clear()
+            self._ferme = True
+
+    def __enter__(self) -> "EncryptedWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _ecrire_bloc(self, clair: bytes, dernier: bool) -> None:
+        chiffre = self._aead.encrypt(_nonce_flux(self._prefixe, self._compteur, dernier), clair, self._contexte)
+        self._destination.write(struct.pack("<I", len(chiffre)) + chiffre)
+        self._compteur += 1
+
+
+def _nonce_flux(prefixe: bytes, compteur: int, dernier: bool) -> bytes:
+    return prefixe + struct.pack(">I?", compteur, dernier)
+
+
+def _lire_bloc(source: BinaryIO) -> Optional[bytes]:
+    taille = source.read(4)
+    if not taille:
+        return None
+    if len(taille) != 4:
+        raise ValueError("Flux chiffré tronqué")
+    (n,) = struct.unpack("<I", taille)
+    bloc = source.read(n)
+    if len(bloc) != n:
+        raise ValueError("Flux chiffré tronqué")
+    return bloc
+
+
+@dataclass
+class VaultEntry:
+    """Métadonnées d'un dossier du coffre (stockées dans l'index)."""
+
+    identifiant: str
+    patient_id: Optional[str]
+    nom_complet: str
+    date_examen: Optional[date]
+    age: Optional[int]
+    batteries: List[str] = field(default_factory=list)
+    enregistre_le: datetime = field(default_factory=datetime.now)
+    rapport: bool = False
+
+
+class CaseVault:
+    """Coffre chiffré des dossiers (un fichier par dossier et par rapport, index séparé)."""
+
+    def __init__(self, dossier: Path = DOSSIER_COFFRE, chiffrement: Optional[ClinicCipher] = None):
+        """
+        Ouvre le coffre (l'index est déchiffré une fois).
+
+        Args:
+            dossier: Dossier du coffre
+            chiffrement: Chiffrement du cabinet (clé de CHEMIN_CLE_CABINET par défaut)
+        """
+        self.dossier = dossier
+        self._chiffrement = chiffrement or ClinicCipher(load_key())
+        self._lock = threading.Lock()
+        self._index: Dict[str, VaultEntry] = self._lire_index()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def entries(self) -> List[VaultEntry]:
+        """Dossiers du coffre, du plus récent au plus ancien."""
+        with self._lock:
+            return sorted(self._index.values(), key=lambda e: e.enregistre_le, reverse=True)
+
+    def search(self, texte: str) -> List[VaultEntry]:
+        """Dossiers dont le nom du patient contient le texte (sans tenir compte de la casse)."""
+        recherche = texte.strip().casefold()
+        return [e for e in self.entries() if recherche in e.nom_complet.casefold()]
+
+    def save(self, case: Case, rapport: Optional[str] = None) -> VaultEntry:
+        """
+        Chiffre et enregistre un dossier (et son rapport éventuel).
+
+        Une évaluation déjà présente (même patient, même date d'examen) est remplacée.
+
+        Returns:
+            Métadonnées du dossier enregistré
+        """
+        patient = case.patient
+        patient_id = patient.get_identifiant()
+
+        with self._lock:
+            existant = next((e for e in self._index.values()
+                             if patient_id is not None and e.patient_id == patient_id
+                             and e.date_examen == patient.date_examen), None)
+            identifiant = existant.identifiant if existant else uuid.uuid4().hex
+
+            entree = VaultEntry(
+                identifiant, patient_id, patient.format_nom_complet(), patient.date_examen,
+                patient.get_age_at_exam(),
+                [cle for cle, manager in case.managers.items() if manager.has_scores()],
+                rapport=rapport is not None
+            )
+
+            self.dossier.mkdir(parents=True, exist_ok=True)
+            write_atomic(self._chemin(identifiant, EXTENSION_DOSSIER),
+                         self._chiffrement.encrypt(dumps_binary(case, compression=True), identifiant.encode()))
+            chemin_rapport = self._chemin(identifiant, EXTENSION_RAPPORT)
+            if rapport is not None:
+                write_atomic(chemin_rapport, self._chiffrement.encrypt(rapport.encode("utf-8"), identifiant.encode()))
+            else:
+                chemin_rapport.unlink(missing_ok=True)
+
+            self._index[identifiant] = entree
+            self._ecrire_index()
+
+        return entree
+
+    def load(self, identifiant: str) -> Case:
+        """
+        Déchiffre un dossier.
+
+        Raises:
+            ValueError: Si le dossier est inconnu ou altéré
+        """
+        return loads_binary(self._dechiffrer(identifiant, EXTENSION_DOSSIER))
+
+    def load_report(self, identifiant: str) -> Optional[str]:
+        """Déchiffre le rapport d'un dossier (None s'il n'a pas été enregistré)."""
+        if not self._chemin(identifiant, EXTENSION_RAPPORT).exists():
+            return None
+        return self._dechiffrer(identifiant, EXTENSION_RAPPORT).decode("utf-8")
+
+    def delete(self, identifiant: str) -> None:
+        """Supprime un dossier et son rapport."""
+        with self._lock:
+            if self._index.pop(identifiant, None) is None:
+                return
+            self._ecrire_index()
+            for extension in (EXTENSION_DOSSIER, EXTENSION_RAPPORT):
+                self._chemin(identifiant, extension).unlink(missing_ok=True)
+
+    def _chemin(self, identifiant: str, extension: str) -> Path:
+        return self.dossier / f"{identifiant}{extension}"
+
+    def _dechiffrer(self, identifiant: str, extension: str) -> bytes:
+        if identifiant not in self._index:
+            raise ValueError(f"Dossier inconnu : {identifiant}")
+        return self._chiffrement.decrypt(self._chemin(identifiant, extension).read_bytes(), identifiant.encode())
+
+    def _lire_index(self) -> Dict[str, VaultEntry]:
+        chemin = self.dossier / NOM_INDEX
+        if not chemin.exists():
+            return {}
+
+        index = {}
+        for donnees in json.loads(self._chiffrement.decrypt(chemin.read_bytes(), NOM_INDEX.encode())):
+            donnees["date_examen"] = date.fromisoformat(donnees["date_examen"]) if donnees["date_examen"] else None
+            donnees["enregistre_le"] = datetime.fromisoformat(donnees["enregistre_le"])
+            index[donnees["identifiant"]] = VaultEntry(**donnees)
+        return index
+
+    def _ecrire_index(self) -> None:
+        entrees = [
+            {**asdict(e), "date_examen": e.date_examen.isoformat() if e.date_examen else None,
+             "enregistre_le": e.enregistre_le.isoformat(timespec="seconds")}
+            for e in self._index.values()
+        ]
+        donnees = json.dumps(entrees, ensure_ascii=False).encode("utf-8")
+        self.dossier.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.dossier / NOM_INDEX, self._chiffrement.encrypt(donnees, NOM_INDEX.encode()))
+
+
+def main(argv=None) -> None:
+    """Point d'entrée en ligne de commande : déchiffre un export chiffré avec la clé du cabinet."""
+    parser = argparse.ArgumentParser(description="Déchiffrement d'un export NeuroPsy Assist")
+    parser.add_argument("entree", type=Path, help="Fichier chiffré")
+    parser.add_argument("sortie", type=Path, help="Fichier déchiffré")
+    parser.add_argument("--cle", type=Path, default=CHEMIN_CLE_CABINET, help="Fichier de clé du cabinet")
+    args = parser.parse_args(argv)
+
+    if not args.cle.exists():
+        parser.error(f"Fichier de clé introuvable : {args.cle}")
+
+    chiffrement = ClinicCipher(load_key(args.cle))
+    try:
+        with open(args.entree, "rb") as source, open(args.sortie, "wb") as destination:
+            for bloc in chiffrement.decrypt_stream(source):
+                destination.write(bloc)
+    except ValueError as e:
+        args.sortie.unlink(missing_ok=True)
+        parser.exit(1, f"{e}\n")
+
+
+if __name__ == "__main__":
+    main()